@@ -24,87 +24,47 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize availability flags
-ALGORITHMS_AVAILABLE = False
-ALGORITHM_MODULES = {}
+# Algorithm modules are registered in planning_api.algorithms and imported on
+# first use, so importing the package stays cheap and prints nothing.
 
-# Try to import algorithms package gracefully
-def _import_algorithms():
-    """Import algorithms with graceful error handling"""
-    global ALGORITHMS_AVAILABLE, ALGORITHM_MODULES
-    
-    algorithm_modules = {}
-    
-    # Try importing individual algorithm modules
-    try:
-        from . import algorithms
-        from .algorithms import graph_algorithms
-        algorithm_modules['graph_algorithms'] = graph_algorithms
-        logger.info("Graph algorithms imported successfully")
-    except ImportError as e:
-        logger.warning(f"Graph algorithms not available: {e}")
-    
-    try:
-        from . import algorithms
-        from .algorithms import trees
-        algorithm_modules['trees'] = trees
-        logger.info("Tree algorithms imported successfully")
-    except ImportError as e:
-        logger.warning(f"Tree algorithms not available: {e}")
-    
-    try:
-        from . import algorithms
-        from .algorithms import mathematics
-        algorithm_modules['mathematics'] = mathematics
-        logger.info("Mathematics algorithms imported successfully")
-    except ImportError as e:
-        logger.warning(f"Mathematics algorithms not available: {e}")
-    
-    try:
-        from . import algorithms
-        from .algorithms import utilities
-        algorithm_modules['utilities'] = utilities
-        logger.info("Utilities imported successfully")
-    except ImportError as e:
-        logger.warning(f"Utilities not available: {e}")
-    
-    if algorithm_modules:
-        ALGORITHMS_AVAILABLE = True
-        ALGORITHM_MODULES = algorithm_modules
-        logger.info(f"Partial algorithm support: {list(algorithm_modules.keys())}")
-        return True
-    else:
-        logger.warning("No algorithm modules available")
-        return False
 
-# Try to import algorithms on package initialization
-try:
-    _import_algorithms()
-    if ALGORITHMS_AVAILABLE:
-        print("Urban Planning algorithms loaded successfully")
-    else:
-        print("Urban Planning API running in basic mode (no algorithms)")
-except Exception as e:
-    print(f"Warning: Could not initialize algorithms: {e}")
+def _algorithms():
+    from . import algorithms
+    return algorithms
+
+
+def __getattr__(name):
+    # ALGORITHMS_AVAILABLE and ALGORITHM_MODULES are computed on access
+    if name == 'ALGORITHMS_AVAILABLE':
+        return bool(_algorithms().get_available_algorithms())
+    if name == 'ALGORITHM_MODULES':
+        algorithms = _algorithms()
+        return {
+            module_name: algorithms.load_algorithm_module(module_name)
+            for module_name in algorithms.get_available_algorithms()
+        }
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Package information function
 def get_package_info():
     """Get information about the package and available modules"""
+    available_modules = _algorithms().get_available_algorithms()
     return {
         'version': __version__,
         'author': __author__,
-        'algorithms_available': ALGORITHMS_AVAILABLE,
-        'available_modules': list(ALGORITHM_MODULES.keys()),
+        'algorithms_available': bool(available_modules),
+        'available_modules': available_modules,
         'description': 'Urban Planning API with geometry processing and optional C# converted algorithms'
     }
 
 def get_algorithm_module(module_name):
-    """Get a specific algorithm module if available"""
-    return ALGORITHM_MODULES.get(module_name)
+    """Get a specific algorithm module if available, importing it on first use"""
+    return _algorithms().load_algorithm_module(module_name)
 
 def is_module_available(module_name):
-    """Check if a specific algorithm module is available"""
-    return module_name in ALGORITHM_MODULES
+    """Check if a specific algorithm module is available without importing it"""
+    return _algorithms().is_module_available(module_name)
 
 # Export availability functions for other modules to use
 __all__ = [
@@ -113,4 +73,4 @@ __all__ = [
     'is_module_available',
     'ALGORITHMS_AVAILABLE',
     'ALGORITHM_MODULES'
-]
\ No newline at end of file
+]
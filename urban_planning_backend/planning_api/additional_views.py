@@ -1,5 +1,6 @@
 # planning_api/additional_views.py - Complete implementation
 import logging
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -12,6 +13,8 @@ from .geometry import (
     CurveOperations, OffsetOperations, IntersectionOperations,
     Constants
 )
+from .plan_cache import get_plan_cache
+from .metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -225,6 +228,7 @@ class GeometryInfoView(APIView):
                 'supported_formats': ['flattened_vertices'],
                 'default_tolerance': Constants.DEFAULT_TOLERANCE,
                 'max_vertices': 10000,
+                'result_cache': get_plan_cache().stats(),
                 'timestamp': '2024-01-01T00:00:00Z'
             }
             
@@ -235,4 +239,19 @@ class GeometryInfoView(APIView):
             return Response(
                 {'error': f'Service info failed: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class MetricsView(APIView):
+    """Expose request, algorithm and cache metrics in Prometheus text format"""
+    
+    def get(self, request):
+        try:
+            return HttpResponse(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+        
+        except Exception as e:
+            logger.error(f"Error rendering metrics: {str(e)}", exc_info=True)
+            return Response(
+                {'error': f'Metrics rendering failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
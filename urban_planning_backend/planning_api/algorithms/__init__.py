@@ -1,4 +1,4 @@
-# planning_api/algorithms/__init__.py - COMPLETE FIXED VERSION
+# planning_api/algorithms/__init__.py - Lazy registry of the algorithm modules
 """
 Algorithms package for urban planning
 
@@ -8,281 +8,170 @@ This package contains Python implementations of C# algorithms:
 - trees: Interval trees, Red-Black trees (optional)
 - utilities: Statistics, collection operations, validation (optional)
 
-Each module is imported conditionally to prevent import errors.
+Nothing is imported with the package. Availability is probed from the module
+sources without executing them, and a module is imported the first time one
+of its names is used, e.g. ``algorithms.GraphAdapter`` or
+``load_algorithm_module('trees')``.
 """
 
+import ast
+import importlib
+import importlib.util
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
-# Initialize with empty exports
-__all__ = []
 
-# Module availability flags
-MODULES_AVAILABLE = {
-    'graph_algorithms': False,
-    'mathematics': False,
-    'trees': False,
-    'utilities': False
-}
+class AlgorithmModule:
+    """Registry entry for one optional algorithm module"""
 
-# Try to import graph algorithms
-try:
-    from .graph_algorithms import (
-        DijkstraShortestPaths,
-        CalculateCentrality,
-        DepthFirstSearch,
-        GraphAdapter,
-        Edge,
-        DirectedEdge
-    )
-    __all__.extend([
-        'DijkstraShortestPaths',
-        'CalculateCentrality', 
-        'DepthFirstSearch',
-        'GraphAdapter',
-        'Edge',
-        'DirectedEdge'
-    ])
-    MODULES_AVAILABLE['graph_algorithms'] = True
-    logger.info("Graph algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Graph algorithms not available: {e}")
-    # Create placeholder classes to prevent import errors
-    class DijkstraShortestPaths:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-    
-    class CalculateCentrality:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-    
-    class DepthFirstSearch:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-    
-    class GraphAdapter:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-    
-    class Edge:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-    
-    class DirectedEdge:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Graph algorithms not available")
-
-# Try to import mathematics
-try:
-    from .mathematics import (
-        RootFinding,
-        SolveQuadratic,
-        Parabola,
-        GeometryMath,
-        Point2D,
-        Vector2D
-    )
-    __all__.extend([
-        'RootFinding',
-        'SolveQuadratic',
-        'Parabola',
-        'GeometryMath',
-        'Point2D',
-        'Vector2D'
-    ])
-    MODULES_AVAILABLE['mathematics'] = True
-    logger.info("Mathematics algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Mathematics algorithms not available: {e}")
-    # Create placeholder classes
-    class RootFinding:
-        @staticmethod
-        def bisection(*args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-    
-    class SolveQuadratic:
-        @staticmethod
-        def solve(*args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-    
-    class Parabola:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-    
-    class GeometryMath:
-        @staticmethod
-        def polygon_area(*args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-        
-        @staticmethod
-        def polygon_centroid(*args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-    
-    class Point2D:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-    
-    class Vector2D:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Mathematics algorithms not available")
-
-# Try to import trees
-try:
-    from .trees import (
-        IntervalTree,
-        UInterval,
-        IntervalNode,
-        IntervalTreeOperations
-    )
-    __all__.extend([
-        'IntervalTree',
-        'UInterval', 
-        'IntervalNode',
-        'IntervalTreeOperations'
-    ])
-    MODULES_AVAILABLE['trees'] = True
-    logger.info("Tree algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Tree algorithms not available: {e}")
-    # Create placeholder classes
-    class IntervalTree:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Tree algorithms not available")
-    
-    class UInterval:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Tree algorithms not available")
-    
-    class IntervalNode:
-        def __init__(self, *args, **kwargs):
-            raise NotImplementedError("Tree algorithms not available")
-    
-    class IntervalTreeOperations:
-        @staticmethod
-        def merge_overlapping_intervals(*args, **kwargs):
-            raise NotImplementedError("Tree algorithms not available")
-
-# Try to import utilities
-try:
-    from .utilities import (
-        Statistics,
-        MathUtilities,
-        CollectionUtilities,
-        ListExtensions,
-        Validators
+    def __init__(self, name, exports, requires=()):
+        self.name = name
+        self.exports = tuple(exports)
+        self.requires = tuple(requires)
+        self._probe = None
+        self._module = None
+        self._load_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def qualified_name(self):
+        return f'{__name__}.{self.name}'
+
+    def probe(self):
+        """Return (available, reason) without executing the module
+
+        Checks that the module and its third-party requirements can be found
+        and that the module source defines every exported name.
+        """
+        if self._probe is None:
+            self._probe = self._run_probe()
+        return self._probe
+
+    def _run_probe(self):
+        for requirement in self.requires:
+            if importlib.util.find_spec(requirement) is None:
+                return False, f'requires {requirement}'
+
+        spec = importlib.util.find_spec(self.qualified_name)
+        if spec is None or not spec.origin:
+            return False, 'module not found'
+
+        try:
+            with open(spec.origin, encoding='utf-8') as source:
+                defined = _top_level_names(ast.parse(source.read(), spec.origin))
+        except (OSError, SyntaxError, ValueError) as e:
+            return False, str(e)
+
+        missing = [name for name in self.exports if name not in defined]
+        if missing:
+            return False, f"missing {', '.join(missing)}"
+        return True, None
+
+    def available(self):
+        return self.probe()[0]
+
+    def load(self):
+        """Import the module on first use; returns None when it is unavailable"""
+        if self._module is not None or self._load_error is not None:
+            return self._module
+
+        with self._lock:
+            if self._module is None and self._load_error is None:
+                available, reason = self.probe()
+                if not available:
+                    self._load_error = reason
+                    logger.warning(f"Algorithm module {self.name} not available: {reason}")
+                else:
+                    try:
+                        self._module = importlib.import_module(self.qualified_name)
+                        logger.debug(f"Algorithm module {self.name} loaded")
+                    except Exception as e:
+                        self._load_error = str(e)
+                        self._probe = (False, self._load_error)
+                        logger.warning(f"Algorithm module {self.name} failed to import: {e}")
+
+        return self._module
+
+
+def _top_level_names(tree):
+    """Names bound at module level by classes, functions, assignments and imports"""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+    return names
+
+
+REGISTRY = {
+    entry.name: entry for entry in (
+        AlgorithmModule('graph_algorithms', [
+            'DijkstraShortestPaths', 'CalculateCentrality', 'DepthFirstSearch', 'GraphAdapter',
+            'Edge', 'DirectedEdge', 'EdgeWeightedGraph', 'EdgeWeightedDigraph',
+        ], requires=['numpy']),
+        AlgorithmModule('mathematics', [
+            'RootFinding', 'SolveQuadratic', 'Parabola', 'GeometryMath', 'Point2D', 'Vector2D',
+        ]),
+        AlgorithmModule('trees', [
+            'IntervalTree', 'UInterval', 'IntervalNode', 'IntervalTreeOperations',
+        ]),
+        AlgorithmModule('utilities', [
+            'Statistics', 'MathUtilities', 'CollectionUtilities', 'ListExtensions', 'Validators',
+        ], requires=['numpy']),
     )
-    __all__.extend([
-        'Statistics',
-        'MathUtilities',
-        'CollectionUtilities',
-        'ListExtensions',
-        'Validators'
-    ])
-    MODULES_AVAILABLE['utilities'] = True
-    logger.info("Utilities imported successfully")
-except ImportError as e:
-    logger.warning(f"Utilities not available: {e}")
-    # Create placeholder classes
-    class Statistics:
-        @staticmethod
-        def mean(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def linear_regression(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def correlation_coefficient(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def median(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def standard_deviation(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def variance(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def quartiles(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def interquartile_range(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-    
-    class MathUtilities:
-        @staticmethod
-        def clamp(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-    
-    class CollectionUtilities:
-        @staticmethod
-        def chunk(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def unique(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def group_by(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-        
-        @staticmethod
-        def partition(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-    
-    class ListExtensions:
-        @staticmethod
-        def shuffle(*args, **kwargs):
-            raise NotImplementedError("Utilities not available")
-    
-    class Validators:
-        @staticmethod
-        def validate_range(*args, **kwargs):
-            from dataclasses import dataclass
-            
-            @dataclass
-            class ValidationResult:
-                is_valid: bool = False
-                errors: list = None
-                warnings: list = None
-                
-                def __post_init__(self):
-                    if self.errors is None:
-                        self.errors = ["Utilities not available"]
-                    if self.warnings is None:
-                        self.warnings = []
-            
-            return ValidationResult()
-        
-        @staticmethod
-        def validate_positive(*args, **kwargs):
-            return Validators.validate_range()
-
-# Always export these even if modules aren't available
-__all__.extend(['get_available_algorithms', 'is_module_available', 'MODULES_AVAILABLE'])
+}
+
+# Exported name -> registry entry that provides it
+_EXPORTS = {export: entry for entry in REGISTRY.values() for export in entry.exports}
+
 
 def get_available_algorithms():
     """Get list of available algorithm modules"""
-    return [module for module, available in MODULES_AVAILABLE.items() if available]
+    return [name for name, entry in REGISTRY.items() if entry.available()]
+
 
 def is_module_available(module_name):
-    """Check if a specific module is available"""
-    return MODULES_AVAILABLE.get(module_name, False)
-
-# Print status on import
-available_modules = get_available_algorithms()
-if available_modules:
-    logger.info(f"Available algorithm modules: {available_modules}")
-    print(f"Available algorithm modules: {available_modules}")
-else:
-    logger.warning("No algorithm modules available - running with placeholders")
-    print("No algorithm modules available - running with placeholders")
\ No newline at end of file
+    """Check if a specific module is available, without importing it"""
+    entry = REGISTRY.get(module_name)
+    return entry is not None and entry.available()
+
+
+def load_algorithm_module(module_name):
+    """Import an algorithm module on first use; None if it is unknown or unavailable"""
+    entry = REGISTRY.get(module_name)
+    return entry.load() if entry is not None else None
+
+
+def __getattr__(name):
+    # Algorithm names resolve lazily, importing only the module that defines them
+    if name == 'MODULES_AVAILABLE':
+        return {module_name: entry.available() for module_name, entry in REGISTRY.items()}
+
+    entry = _EXPORTS.get(name)
+    if entry is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = entry.load()
+    if module is None or not hasattr(module, name):
+        raise AttributeError(f"{name} is not available: {entry.probe()[1] or 'import failed'}")
+
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    # Only names that resolve; unresolved exports may be missing from their module,
+    # and dir() consumers such as unittest discovery getattr every listed name
+    return sorted(set(globals()) | {'MODULES_AVAILABLE'})
+
+
+# Algorithm names are left out so a star import does not load every module
+__all__ = ['get_available_algorithms', 'is_module_available', 'load_algorithm_module', 'MODULES_AVAILABLE']
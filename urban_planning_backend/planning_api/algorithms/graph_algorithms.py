@@ -6,7 +6,7 @@ Converted from C# files: DijkstraShortestPaths.cs, CalculateCentrality.cs, etc.
 
 import heapq
 import math
-from typing import Dict, List, Optional, Tuple, Set, Any
+from typing import Callable, Dict, List, Optional, Tuple, Set, Any
 from collections import defaultdict, deque
 from abc import ABC, abstractmethod
 import numpy as np
@@ -506,9 +506,11 @@ class CalculateCentrality:
     """
     
     def __init__(self, graph: 'GraphAdapter', radius: float = float('inf'), 
-                 sub_graphs: List[List[int]] = None):
+                 sub_graphs: List[List[int]] = None,
+                 progress: Optional[Callable[[int, int], None]] = None):
         
         self._graph = graph
+        self._progress = progress  # Called as progress(done, total) after each source vertex
         self._vertices = graph.vertices()
         self._vertices_to_indices = {vertex: i for i, vertex in enumerate(self._vertices)}
         self._sub_graphs = sub_graphs
@@ -535,6 +537,7 @@ class CalculateCentrality:
     
     def _compute_sequential(self):
         """Sequential computation"""
+        vertices_count = len(self._vertices)
         for source in self._vertices:
             source_index = self._vertices_to_indices[source]
             sub_id = self._sub_graphs[source_index] if self._sub_graphs else None
@@ -554,6 +557,9 @@ class CalculateCentrality:
             # Store sub-graph if radius is finite
             if self._radius != float('inf'):
                 self.sub_graphs_result[source_index] = centrality.vertices_within_radius
+            
+            if self._progress:
+                self._progress(source_index + 1, vertices_count)
     
     def _compute_parallel(self):
         """Parallel computation using ThreadPoolExecutor"""
@@ -573,7 +579,7 @@ class CalculateCentrality:
             future_to_vertex = {executor.submit(process_vertex, source): source 
                               for source in self._vertices}
             
-            for future in as_completed(future_to_vertex):
+            for done, future in enumerate(as_completed(future_to_vertex), 1):
                 source, source_index, centrality = future.result()
                 
                 # Thread-safe accumulation
@@ -587,6 +593,9 @@ class CalculateCentrality:
                 
                 if self._radius != float('inf'):
                     self.sub_graphs_result[source_index] = centrality.vertices_within_radius
+                
+                if self._progress:
+                    self._progress(done, len(future_to_vertex))
 
 
 class GraphAdapter:
@@ -11,53 +11,18 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import serializers
+from .timing import span, timed
+from . import metrics
+from . import algorithms
 
 logger = logging.getLogger(__name__)
 
-# Check for available algorithm modules with graceful fallbacks
-GRAPH_ALGORITHMS_AVAILABLE = False
-TREE_ALGORITHMS_AVAILABLE = False
-MATH_ALGORITHMS_AVAILABLE = False
-UTILITIES_AVAILABLE = False
-
-# Try to import graph algorithms
-try:
-    from .algorithms.graph_algorithms import (
-        DijkstraShortestPaths, CalculateCentrality, DepthFirstSearch,
-        GraphAdapter, Edge, DirectedEdge, EdgeWeightedGraph, EdgeWeightedDigraph
-    )
-    GRAPH_ALGORITHMS_AVAILABLE = True
-    logger.info("Graph algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Graph algorithms not available: {e}")
-
-# Try to import tree algorithms
-try:
-    from .algorithms.trees import IntervalTree, UInterval, IntervalNode, IntervalTreeOperations
-    TREE_ALGORITHMS_AVAILABLE = True
-    logger.info("Tree algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Tree algorithms not available: {e}")
-
-# Try to import mathematics
-try:
-    from .algorithms.mathematics import (
-        RootFinding, SolveQuadratic, Parabola, GeometryMath, Point2D, Vector2D
-    )
-    MATH_ALGORITHMS_AVAILABLE = True
-    logger.info("Mathematics algorithms imported successfully")
-except ImportError as e:
-    logger.warning(f"Mathematics algorithms not available: {e}")
-
-# Try to import utilities
-try:
-    from .algorithms.utilities import (
-        Statistics, MathUtilities, CollectionUtilities, ListExtensions, Validators
-    )
-    UTILITIES_AVAILABLE = True
-    logger.info("Utilities imported successfully")
-except ImportError as e:
-    logger.warning(f"Utilities not available: {e}")
+# Availability is probed from the module sources; each algorithm module is
+# imported the first time one of its names is looked up on `algorithms`
+GRAPH_ALGORITHMS_AVAILABLE = algorithms.is_module_available('graph_algorithms')
+TREE_ALGORITHMS_AVAILABLE = algorithms.is_module_available('trees')
+MATH_ALGORITHMS_AVAILABLE = algorithms.is_module_available('mathematics')
+UTILITIES_AVAILABLE = algorithms.is_module_available('utilities')
 
 
 # Serializers for algorithm requests
@@ -224,7 +189,9 @@ class GraphAnalysisView(APIView):
         
         try:
             serializer = GraphAnalysisRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 return Response(
                     {'error': 'Invalid input', 'details': serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
@@ -240,13 +207,13 @@ class GraphAnalysisView(APIView):
             for edge_data in edges_data:
                 try:
                     if algorithm == 'dijkstra':
-                        edge = DirectedEdge(
+                        edge = algorithms.DirectedEdge(
                             edge_data['from'],
                             edge_data['to'],
                             edge_data['weight']
                         )
                     else:
-                        edge = Edge(
+                        edge = algorithms.Edge(
                             edge_data['from'],
                             edge_data['to'],
                             edge_data['weight']
@@ -258,7 +225,11 @@ class GraphAnalysisView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             
-            graph = GraphAdapter(vertices, edges)
+            with span('graph_build'):
+                graph = algorithms.GraphAdapter(vertices, edges)
+            
+            metrics.GRAPH_VERTICES.observe(len(vertices), algorithm=algorithm)
+            metrics.GRAPH_EDGES.observe(len(edges), algorithm=algorithm)
             
             # Run algorithm
             if algorithm == 'dijkstra':
@@ -288,10 +259,11 @@ class GraphAnalysisView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @timed('dijkstra')
     def _run_dijkstra(self, graph, source):
         """Run Dijkstra's shortest path algorithm"""
         try:
-            dijkstra = DijkstraShortestPaths(graph, source)
+            dijkstra = algorithms.DijkstraShortestPaths(graph, source)
             
             result = {
                 'source': source,
@@ -314,10 +286,11 @@ class GraphAnalysisView(APIView):
         except Exception as e:
             return {'error': f'Dijkstra failed: {str(e)}'}
     
+    @timed('centrality')
     def _run_centrality(self, graph, radius):
         """Run centrality calculation"""
         try:
-            centrality = CalculateCentrality(graph, radius)
+            centrality = algorithms.CalculateCentrality(graph, radius)
             
             result = {
                 'betweenness': {str(k): v for k, v in centrality.betweenness.items()},
@@ -330,16 +303,17 @@ class GraphAnalysisView(APIView):
         except Exception as e:
             return {'error': f'Centrality calculation failed: {str(e)}'}
     
+    @timed('dfs')
     def _run_dfs(self, graph):
         """Run depth-first search to find connected components"""
         try:
             # Convert to EdgeWeightedGraph for DFS
-            ewg = EdgeWeightedGraph(len(graph.vertices()))
+            ewg = algorithms.EdgeWeightedGraph(len(graph.vertices()))
             
             for edge in graph.edges():
                 ewg.add_edge(edge)
             
-            dfs = DepthFirstSearch(ewg)
+            dfs = algorithms.DepthFirstSearch(ewg)
             
             result = {
                 'connected_components': [list(group) for group in dfs.group_list],
@@ -363,7 +337,9 @@ class IntervalAnalysisView(APIView):
         
         try:
             serializer = IntervalAnalysisRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 return Response(
                     {'error': 'Invalid input', 'details': serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
@@ -377,7 +353,7 @@ class IntervalAnalysisView(APIView):
             intervals = []
             for interval_data in intervals_data:
                 try:
-                    interval = UInterval(interval_data['low'], interval_data['high'])
+                    interval = algorithms.UInterval(interval_data['low'], interval_data['high'])
                     intervals.append((interval, interval_data['id']))
                 except Exception as e:
                     return Response(
@@ -386,9 +362,10 @@ class IntervalAnalysisView(APIView):
                     )
             
             # Build interval tree
-            tree = IntervalTree()
-            for interval, interval_id in intervals:
-                tree.insert_interval(interval, interval_id)
+            with span('interval_tree'):
+                tree = algorithms.IntervalTree()
+                for interval, interval_id in intervals:
+                    tree.insert_interval(interval, interval_id)
             
             # Perform operation
             if operation == 'overlaps':
@@ -399,7 +376,7 @@ class IntervalAnalysisView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                query_interval = UInterval(query_data['low'], query_data['high'])
+                query_interval = algorithms.UInterval(query_data['low'], query_data['high'])
                 overlaps = tree.search_overlapping_interval(query_interval)
                 
                 result = {
@@ -438,7 +415,7 @@ class IntervalAnalysisView(APIView):
             
             elif operation == 'merge':
                 interval_objects = [interval for interval, _ in intervals]
-                merged = IntervalTreeOperations.merge_overlapping_intervals(interval_objects)
+                merged = algorithms.IntervalTreeOperations.merge_overlapping_intervals(interval_objects)
                 
                 result = {
                     'merged_intervals': [
@@ -455,9 +432,9 @@ class IntervalAnalysisView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                query_interval = UInterval(query_data['low'], query_data['high'])
+                query_interval = algorithms.UInterval(query_data['low'], query_data['high'])
                 interval_objects = [interval for interval, _ in intervals]
-                gaps = IntervalTreeOperations.find_gaps(interval_objects, query_interval)
+                gaps = algorithms.IntervalTreeOperations.find_gaps(interval_objects, query_interval)
                 
                 result = {
                     'search_range': query_data,
@@ -499,7 +476,9 @@ class MathematicsView(APIView):
         
         try:
             serializer = MathematicsRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 return Response(
                     {'error': 'Invalid input', 'details': serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
@@ -535,6 +514,7 @@ class MathematicsView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @timed('quadratic')
     def _solve_quadratic(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Solve quadratic equation"""
         a = data.get('a', 1.0)
@@ -542,7 +522,7 @@ class MathematicsView(APIView):
         c = data.get('c', 0.0)
         
         try:
-            root1, root2 = SolveQuadratic.solve(a, b, c)
+            root1, root2 = algorithms.SolveQuadratic.solve(a, b, c)
             
             if root1 is None and root2 is None:
                 roots = None
@@ -567,6 +547,7 @@ class MathematicsView(APIView):
                 'error': str(e)
             }
     
+    @timed('root_finding')
     def _find_roots(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Find roots using numerical methods"""
         left = data.get('left_bound', -10.0)
@@ -582,7 +563,7 @@ class MathematicsView(APIView):
             return result
         
         try:
-            root = RootFinding.bisection(polynomial, left, right, tolerance)
+            root = algorithms.RootFinding.bisection(polynomial, left, right, tolerance)
             
             return {
                 'polynomial_coefficients': coefficients,
@@ -600,6 +581,7 @@ class MathematicsView(APIView):
                 'success': False
             }
     
+    @timed('linear_regression')
     def _linear_regression(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform linear regression"""
         if not UTILITIES_AVAILABLE:
@@ -615,8 +597,8 @@ class MathematicsView(APIView):
             return {'error': 'At least 2 data points required for regression'}
         
         try:
-            r_squared, y_intercept, slope = Statistics.linear_regression(x_values, y_values)
-            correlation = Statistics.correlation_coefficient(x_values, y_values)
+            r_squared, y_intercept, slope = algorithms.Statistics.linear_regression(x_values, y_values)
+            correlation = algorithms.Statistics.correlation_coefficient(x_values, y_values)
             predictions = [slope * x + y_intercept for x in x_values]
             residuals = [y - pred for y, pred in zip(y_values, predictions)]
             
@@ -634,6 +616,7 @@ class MathematicsView(APIView):
         except Exception as e:
             return {'error': f'Linear regression failed: {str(e)}'}
     
+    @timed('geometry')
     def _geometry_calculations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform geometry calculations"""
         points_data = data.get('points', [])
@@ -645,12 +628,12 @@ class MathematicsView(APIView):
             # Convert to Point2D objects
             points = []
             for point_data in points_data:
-                point = Point2D(point_data['x'], point_data['y'])
+                point = algorithms.Point2D(point_data['x'], point_data['y'])
                 points.append(point)
             
             # Calculate polygon area and other properties
-            area = GeometryMath.polygon_area(points)
-            centroid = GeometryMath.polygon_centroid(points)
+            area = algorithms.GeometryMath.polygon_area(points)
+            centroid = algorithms.GeometryMath.polygon_centroid(points)
             
             # Calculate perimeter
             perimeter = 0.0
@@ -683,7 +666,9 @@ class UtilitiesView(APIView):
         
         try:
             serializer = UtilitiesRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 return Response(
                     {'error': 'Invalid input', 'details': serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
@@ -717,6 +702,7 @@ class UtilitiesView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @timed('statistics')
     def _statistical_analysis(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform statistical analysis"""
         values = data.get('values', [])
@@ -727,12 +713,12 @@ class UtilitiesView(APIView):
         
         try:
             if statistic_type == 'descriptive':
-                mean = Statistics.mean(values)
-                median = Statistics.median(values)
-                std_dev = Statistics.standard_deviation(values)
-                variance = Statistics.variance(values)
-                q1, q2, q3 = Statistics.quartiles(values)
-                iqr = Statistics.interquartile_range(values)
+                mean = algorithms.Statistics.mean(values)
+                median = algorithms.Statistics.median(values)
+                std_dev = algorithms.Statistics.standard_deviation(values)
+                variance = algorithms.Statistics.variance(values)
+                q1, q2, q3 = algorithms.Statistics.quartiles(values)
+                iqr = algorithms.Statistics.interquartile_range(values)
                 
                 return {
                     'descriptive_statistics': {
@@ -753,6 +739,7 @@ class UtilitiesView(APIView):
         except Exception as e:
             return {'error': f'Statistical analysis failed: {str(e)}'}
     
+    @timed('collection')
     def _collection_operations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform collection operations"""
         collection_data = data.get('data', [])
@@ -762,10 +749,10 @@ class UtilitiesView(APIView):
             return {'error': 'Data list cannot be empty'}
         
         try:
-            chunks = CollectionUtilities.chunk(collection_data, chunk_size)
-            unique_values = CollectionUtilities.unique(collection_data)
+            chunks = algorithms.CollectionUtilities.chunk(collection_data, chunk_size)
+            unique_values = algorithms.CollectionUtilities.unique(collection_data)
             
-            grouped = CollectionUtilities.group_by(
+            grouped = algorithms.CollectionUtilities.group_by(
                 collection_data, 
                 lambda x: type(x).__name__
             )
@@ -773,7 +760,7 @@ class UtilitiesView(APIView):
             def is_numeric(x):
                 return isinstance(x, (int, float))
             
-            numeric, non_numeric = CollectionUtilities.partition(collection_data, is_numeric)
+            numeric, non_numeric = algorithms.CollectionUtilities.partition(collection_data, is_numeric)
             
             return {
                 'collection_operations': {
@@ -789,6 +776,7 @@ class UtilitiesView(APIView):
         except Exception as e:
             return {'error': f'Collection operations failed: {str(e)}'}
     
+    @timed('validation')
     def _validation_operations(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform validation operations"""
         rules = data.get('validation_rules', {})
@@ -803,7 +791,7 @@ class UtilitiesView(APIView):
                 max_val = range_rule.get('max', 100)
                 name = range_rule.get('name', 'Value')
                 
-                validation_result = Validators.validate_range(value, min_val, max_val, name)
+                validation_result = algorithms.Validators.validate_range(value, min_val, max_val, name)
                 results.append({
                     'rule': 'range_check',
                     'valid': validation_result.is_valid,
@@ -816,7 +804,7 @@ class UtilitiesView(APIView):
                 value = positive_rule.get('value', 0)
                 name = positive_rule.get('name', 'Value')
                 
-                validation_result = Validators.validate_positive(value, name)
+                validation_result = algorithms.Validators.validate_positive(value, name)
                 results.append({
                     'rule': 'positive_check',
                     'valid': validation_result.is_valid,
@@ -898,7 +886,7 @@ class AlgorithmTestView(APIView):
         if UTILITIES_AVAILABLE:
             try:
                 values = [1, 2, 3, 4, 5]
-                mean = Statistics.mean(values)
+                mean = algorithms.Statistics.mean(values)
                 results['utilities'] = abs(mean - 3.0) < 0.001
             except Exception as e:
                 logger.warning(f"Utilities test failed: {e}")
@@ -906,7 +894,7 @@ class AlgorithmTestView(APIView):
         # Test mathematics
         if MATH_ALGORITHMS_AVAILABLE:
             try:
-                root1, root2 = SolveQuadratic.solve(1, -5, 6)  # Should give roots 2, 3
+                root1, root2 = algorithms.SolveQuadratic.solve(1, -5, 6)  # Should give roots 2, 3
                 results['math_algorithms'] = (root1 is not None and root2 is not None)
             except Exception as e:
                 logger.warning(f"Mathematics test failed: {e}")
@@ -914,8 +902,8 @@ class AlgorithmTestView(APIView):
         # Test tree algorithms  
         if TREE_ALGORITHMS_AVAILABLE:
             try:
-                tree = IntervalTree()
-                interval = UInterval(1, 3)
+                tree = algorithms.IntervalTree()
+                interval = algorithms.UInterval(1, 3)
                 success = tree.insert_interval(interval, 1)
                 results['tree_algorithms'] = success and tree.count == 1
             except Exception as e:
@@ -925,8 +913,8 @@ class AlgorithmTestView(APIView):
         if GRAPH_ALGORITHMS_AVAILABLE:
             try:
                 vertices = [0, 1, 2]
-                edges = [Edge(0, 1, 1.0), Edge(1, 2, 1.0)]
-                graph = GraphAdapter(vertices, edges)
+                edges = [algorithms.Edge(0, 1, 1.0), algorithms.Edge(1, 2, 1.0)]
+                graph = algorithms.GraphAdapter(vertices, edges)
                 results['graph_algorithms'] = len(graph.vertices()) == 3
             except Exception as e:
                 logger.warning(f"Graph algorithms test failed: {e}")
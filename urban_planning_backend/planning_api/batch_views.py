@@ -0,0 +1,160 @@
+# planning_api/batch_views.py - Batch plan generation across a process pool
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from .serializers import GeneratePlanRequestSerializer, BatchGeneratePlanRequestSerializer
+from .plan_cache import cached_design
+from . import views, enhanced_views
+
+logger = logging.getLogger(__name__)
+
+PROCESSORS = {
+    'standard': (views.EnhancedGeometryProcessor, views.GeneratePlanView, '_fill_plan_parameters', 'generateplan'),
+    'enhanced': (enhanced_views.EnhancedGeometryProcessor, enhanced_views.EnhancedGeneratePlanView,
+                 '_apply_enhanced_parameters', 'enhanced_generateplan'),
+}
+
+
+def generate_site_plan(processor, flattened_vertices, plan_parameters):
+    """Generate one site's plan exactly as the single-site endpoint would"""
+    geometry_processor, view_class, apply_parameters, namespace = PROCESSORS[processor]
+
+    site_parameters_list = geometry_processor.compute_parameters(flattened_vertices)
+    site_parameters = site_parameters_list[0]
+    getattr(view_class(), apply_parameters)(plan_parameters, site_parameters)
+
+    return cached_design(
+        namespace, flattened_vertices, plan_parameters, site_parameters,
+        lambda: geometry_processor.compute_design(site_parameters_list),
+        lambda: geometry_processor.compute_site_layers(site_parameters),
+        geometry_processor._get_default_response
+    )
+
+
+def _init_worker():
+    """Make sure Django is set up in spawned worker processes"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = getattr(settings, 'PLANNING_BATCH_WORKERS', None) or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        return _executor
+
+
+def reset_executor():
+    """Discard a broken process pool so the next batch starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class BatchGeneratePlanView(APIView):
+    """Generate plans for many sites in parallel, one result per site in input order"""
+
+    def post(self, request):
+        try:
+            serializer = BatchGeneratePlanRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {'error': 'Invalid input data', 'details': serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            validated_data = serializer.validated_data
+            processor = validated_data['processor']
+            sites = validated_data['sites']
+
+            logger.info(f"Batch plan generation request: {len(sites)} sites, processor={processor}")
+
+            results = [None] * len(sites)
+            pending = []
+
+            # Validate each site separately so one bad parcel does not fail the batch
+            for index, site_data in enumerate(sites):
+                site_serializer = GeneratePlanRequestSerializer(data=site_data)
+                if not site_serializer.is_valid():
+                    results[index] = {
+                        'index': index,
+                        'success': False,
+                        'error': 'Invalid input data',
+                        'details': site_serializer.errors
+                    }
+                    continue
+
+                site = site_serializer.validated_data
+                pending.append((index, site['plan_flattened_vertices'], site.get('plan_parameters', {})))
+
+            if len(pending) <= 1:
+                # Not worth the inter-process round trip for a single site
+                for index, vertices, plan_parameters in pending:
+                    results[index] = self._run_inline(index, processor, vertices, plan_parameters)
+            else:
+                self._run_parallel(pending, processor, results)
+
+            failed = sum(1 for result in results if not result['success'])
+            logger.info(f"Batch plan generation finished - {len(results) - failed} succeeded, {failed} failed")
+
+            return Response({
+                'results': results,
+                'succeeded': len(results) - failed,
+                'failed': failed
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Batch plan generation error: {str(e)}", exc_info=True)
+            return Response(
+                {'error': f'Batch plan generation failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _run_inline(self, index, processor, vertices, plan_parameters):
+        """Generate a single site in the request process"""
+        try:
+            return {'index': index, 'success': True,
+                    'result': generate_site_plan(processor, vertices, plan_parameters)}
+        except Exception as e:
+            logger.error(f"Batch site {index} failed: {str(e)}")
+            return {'index': index, 'success': False, 'error': str(e)}
+
+    def _run_parallel(self, pending, processor, results):
+        """Fan sites out over the process pool and collect results in input order"""
+        executor = get_executor()
+        futures = [
+            (index, executor.submit(generate_site_plan, processor, vertices, plan_parameters))
+            for index, vertices, plan_parameters in pending
+        ]
+
+        pool_broken = False
+        for index, future in futures:
+            try:
+                results[index] = {'index': index, 'success': True, 'result': future.result()}
+            except BrokenProcessPool as e:
+                pool_broken = True
+                logger.error(f"Batch site {index} failed: worker pool crashed")
+                results[index] = {'index': index, 'success': False, 'error': f'Worker process failed: {str(e)}'}
+            except Exception as e:
+                logger.error(f"Batch site {index} failed: {str(e)}")
+                results[index] = {'index': index, 'success': False, 'error': str(e)}
+
+        if pool_broken:
+            reset_executor()
@@ -0,0 +1,189 @@
+# planning_api/binary_transport.py - Packed binary vertex transport for plan generation
+import json
+import logging
+import struct
+import numpy as np
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+# Packed frame layout (all little-endian):
+#   0   4s   magic b'UGAI'
+#   4   B    format version
+#   5   B    float item size (4 = float32, 8 = float64)
+#   6   H    reserved
+#   8   I    manifest length in bytes
+#   12  ...  UTF-8 JSON manifest, space padded so the payload starts 8-byte aligned
+#   ..  ...  contiguous float payload
+#
+# Requests carry {"plan_parameters": {...}} in the manifest and the flattened
+# site vertices as the payload. Responses describe every nested list field in
+# manifest["arrays"] (element offset, count and per-level lengths) and keep any
+# scalar fields in manifest["meta"].
+
+BINARY_MEDIA_TYPE = 'application/octet-stream'
+FRAME_MAGIC = b'UGAI'
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('<4sBBHI')
+FRAME_ALIGNMENT = 8
+
+DTYPES = {
+    4: np.dtype('<f4'),
+    8: np.dtype('<f8'),
+}
+DTYPE_NAMES = {
+    'float32': 4,
+    'float64': 8,
+}
+
+
+def _frame(manifest, payload, itemsize):
+    """Build a packed frame from a manifest dict and a float payload"""
+    manifest_bytes = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+    padding = -(FRAME_HEADER.size + len(manifest_bytes)) % FRAME_ALIGNMENT
+    manifest_bytes += b' ' * padding
+
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, itemsize, 0, len(manifest_bytes))
+    payload = np.ascontiguousarray(payload, dtype=DTYPES[itemsize])
+    return b''.join((header, manifest_bytes, payload.tobytes()))
+
+
+def _unframe(data):
+    """Split a packed frame into (manifest, payload array) without copying the payload"""
+    if len(data) < FRAME_HEADER.size:
+        raise ValueError("Frame is shorter than its header")
+
+    magic, version, itemsize, _, manifest_length = FRAME_HEADER.unpack_from(data, 0)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Invalid frame magic")
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version {version}")
+    if itemsize not in DTYPES:
+        raise ValueError(f"Unsupported float item size {itemsize}")
+
+    payload_offset = FRAME_HEADER.size + manifest_length
+    if payload_offset > len(data):
+        raise ValueError("Manifest length exceeds frame size")
+    if (len(data) - payload_offset) % itemsize != 0:
+        raise ValueError("Payload size is not a multiple of the float item size")
+
+    manifest_bytes = bytes(data[FRAME_HEADER.size:payload_offset]).strip()
+    manifest = json.loads(manifest_bytes.decode('utf-8')) if manifest_bytes else {}
+    if not isinstance(manifest, dict):
+        raise ValueError("Frame manifest must be a JSON object")
+
+    payload = np.frombuffer(data, dtype=DTYPES[itemsize], offset=payload_offset)
+    return manifest, payload
+
+
+def _flatten_nested(value):
+    """Flatten a nested list of floats, returning (flat values, lengths per nesting level)"""
+    levels = []
+    current = [value]
+    while current and isinstance(current[0], (list, tuple)):
+        levels.append([len(item) for item in current])
+        current = [child for item in current for child in item]
+    # The outermost level is always [len(value)], which the decoder does not need
+    return current, levels[1:]
+
+
+def unflatten_nested(flat, levels):
+    """Rebuild nested lists from a flat list and its per-level lengths"""
+    groups = flat
+    for lengths in reversed(levels):
+        rebuilt = []
+        position = 0
+        for length in lengths:
+            rebuilt.append(groups[position:position + length])
+            position += length
+        groups = rebuilt
+    return groups
+
+
+def encode_vertices(flattened_vertices, plan_parameters=None, dtype='float64'):
+    """Pack flattened site vertices and plan parameters into a request frame"""
+    itemsize = DTYPE_NAMES[dtype]
+    manifest = {'plan_parameters': plan_parameters or {}}
+    return _frame(manifest, flattened_vertices, itemsize)
+
+
+def decode_vertices(data):
+    """Unpack a request frame into a dict shaped like the JSON request body"""
+    manifest, vertices = _unframe(data)
+
+    # Shape and finiteness are checked by the serializer's VertexArrayField
+    request_data = {'plan_flattened_vertices': vertices}
+    if manifest.get('plan_parameters') is not None:
+        request_data['plan_parameters'] = manifest['plan_parameters']
+    return request_data
+
+
+def encode_plan(data, dtype='float64'):
+    """Pack a plan response dict into a response frame"""
+    itemsize = DTYPE_NAMES[dtype]
+    arrays = {}
+    meta = {}
+    chunks = []
+    offset = 0
+
+    for key, value in data.items():
+        if isinstance(value, (list, tuple)):
+            flat, levels = _flatten_nested(value)
+            arrays[key] = {
+                'offset': offset,
+                'count': len(flat),
+                'levels': levels,
+            }
+            chunks.append(np.asarray(flat, dtype=DTYPES[itemsize]))
+            offset += len(flat)
+        else:
+            meta[key] = value
+
+    payload = np.concatenate(chunks) if chunks else np.empty(0, dtype=DTYPES[itemsize])
+    return _frame({'arrays': arrays, 'meta': meta}, payload, itemsize)
+
+
+def decode_plan(data):
+    """Unpack a response frame back into nested lists (client-side helper)"""
+    manifest, payload = _unframe(data)
+    result = dict(manifest.get('meta', {}))
+
+    for key, spec in manifest.get('arrays', {}).items():
+        flat = payload[spec['offset']:spec['offset'] + spec['count']].tolist()
+        result[key] = unflatten_nested(flat, spec['levels'])
+
+    return result
+
+
+class BinaryVertexParser(BaseParser):
+    """Parse packed little-endian float vertex frames"""
+    media_type = BINARY_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return decode_vertices(stream.read())
+        except (ValueError, struct.error) as e:
+            raise ParseError(f'Binary parse error - {str(e)}')
+
+
+class BinaryPlanRenderer(BaseRenderer):
+    """Render plan responses as packed little-endian float frames"""
+    media_type = BINARY_MEDIA_TYPE
+    format = 'bin'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        dtype = 'float64'
+        if accepted_media_type:
+            for param in accepted_media_type.split(';')[1:]:
+                name, _, value = param.strip().partition('=')
+                if name == 'dtype' and value in DTYPE_NAMES:
+                    dtype = value
+
+        return encode_plan(data, dtype)
@@ -4,9 +4,14 @@ import numpy as np
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .geometry.clustering import AgglomerativeClustering, Point3D, Cluster
+from .geometry.clustering import AgglomerativeClustering, Cluster
 from .geometry.geometry3d import UPoint, UPolyline, PolylineSnapper3D
+from .geometry.quantize import dequantize_coords, quantize_coords, round_coords
 from .geometry.voronoi import Voronoi, FortuneSite, VPoint
+from .geometry.utils import PolylineArray, PreparedPolygon, UniformSampler, pairwise_distances
+from .primitives import points_from_flattened
+from .timing import span, timed
+from . import metrics
 from .serializers import (
     GeometryValidationSerializer, 
     OffsetOperationSerializer,
@@ -15,6 +20,9 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Random positions drawn and containment-tested per batch by the distribution view
+DISTRIBUTION_BATCH_SIZE = 64
+
 
 class ClusteringAnalysisView(APIView):
     """Analyze building positions using hierarchical clustering"""
@@ -31,28 +39,20 @@ class ClusteringAnalysisView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Convert vertices to points
-            points = []
-            coordinates = np.zeros((len(vertices) // 3, 3))
-            
-            for i in range(0, len(vertices), 3):
-                point = Point3D(vertices[i], vertices[i + 1], vertices[i + 2])
-                points.append(point)
-                coordinates[i // 3] = [vertices[i], vertices[i + 1], vertices[i + 2]]
+            # Vertices go straight to a coordinate array, no per-point objects
+            coordinates = PolylineArray.from_flattened(vertices).coords
             
             # Create distance matrix
-            n = len(points)
-            distance_matrix = np.zeros((n, n))
-            
-            for i in range(n):
-                for j in range(n):
-                    if i != j:
-                        distance_matrix[i, j] = points[i].distance_to(points[j])
+            with span('distance_matrix'):
+                distance_matrix = pairwise_distances(coordinates)
             
             # Apply clustering
-            clusters = AgglomerativeClustering.run(
-                distance_matrix, cluster_diameter, coordinates
-            )
+            with span('clustering'):
+                clusters = AgglomerativeClustering.run(
+                    distance_matrix, cluster_diameter, coordinates
+                )
+            
+            metrics.CLUSTER_COUNT.observe(clusters.count, source='clustering_analysis')
             
             # Convert results
             cluster_results = []
@@ -73,7 +73,7 @@ class ClusteringAnalysisView(APIView):
                 'success': True,
                 'cluster_count': len(cluster_results),
                 'clusters': cluster_results,
-                'original_points': len(points),
+                'original_points': len(coordinates),
                 'cluster_diameter': cluster_diameter
             }, status=status.HTTP_200_OK)
             
@@ -124,7 +124,8 @@ class VoronoiGenerationView(APIView):
                     sites.append(FortuneSite(x, y, []))
             
             # Generate Voronoi diagram
-            voronoi = Voronoi(sites, min_x, min_y, max_x, max_y)
+            with span('voronoi'):
+                voronoi = Voronoi(sites, min_x, min_y, max_x, max_y)
             
             # Convert results
             voronoi_cells = []
@@ -236,6 +237,7 @@ class BuildingDistributionView(APIView):
         
         return abs(area) / 2
     
+    @timed('distribution_analysis')
     def _analyze_distribution(self, positions, site_area, min_spacing):
         """Analyze building position distribution"""
         if not positions or len(positions) < 3:
@@ -278,6 +280,7 @@ class BuildingDistributionView(APIView):
             )
         }
     
+    @timed('distribution_placement')
     def _generate_optimized_distribution(self, site_vertices, site_area, density, min_spacing):
         """Generate optimized building positions"""
         import random
@@ -297,13 +300,20 @@ class BuildingDistributionView(APIView):
         positions = []
         max_attempts = target_buildings * 50
         attempts = 0
+        boundary = PreparedPolygon(PolylineArray.from_flattened(site_vertices).coords)
+        sampler = UniformSampler(random, [(min_x + 10, max_x - 10), (min_y + 10, max_y - 10)])
         
         while len(positions) < target_buildings * 3 and attempts < max_attempts:
-            x = random.uniform(min_x + 10, max_x - 10)
-            y = random.uniform(min_y + 10, max_y - 10)
+            block = sampler.draw(min(DISTRIBUTION_BATCH_SIZE, max_attempts - attempts))
             
-            # Check if point is inside polygon
-            if self._point_in_polygon([x, y], site_vertices):
+            # Check which points are inside polygon, for the whole batch at once
+            inside = boundary.contains_points(block)
+            used = len(block)
+            
+            for index, (x, y) in enumerate(block.tolist()):
+                if not inside[index]:
+                    continue
+                
                 # Check minimum distance constraint
                 valid = True
                 for i in range(0, len(positions), 3):
@@ -317,27 +327,15 @@ class BuildingDistributionView(APIView):
                 
                 if valid:
                     positions.extend([x, y, 0])
+                    if len(positions) >= target_buildings * 3:
+                        used = index + 1
+                        break
             
-            attempts += 1
+            attempts += used
+            sampler.rewind(used)
         
         return positions
     
-    def _point_in_polygon(self, point, polygon_vertices):
-        """Check if point is inside polygon using ray casting"""
-        x, y = point
-        inside = False
-        
-        for i in range(0, len(polygon_vertices), 3):
-            j = (i + 3) % len(polygon_vertices)
-            if j + 1 < len(polygon_vertices):
-                xi, yi = polygon_vertices[i], polygon_vertices[i + 1]
-                xj, yj = polygon_vertices[j], polygon_vertices[j + 1]
-                
-                if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi) + xi):
-                    inside = not inside
-        
-        return inside
-    
     def _calculate_distribution_quality(self, distances, min_spacing, coverage_ratio):
         """Calculate overall distribution quality score"""
         if not distances:
@@ -397,7 +395,11 @@ class GeometryProcessingView(APIView):
                 result = self._perform_intersection(vertices, vertices_b, tolerance)
             elif operation == 'reduce_precision':
                 decimal_places = data.get('decimal_places', 6)
-                result = self._reduce_precision(vertices, decimal_places)
+                resolution = data.get('resolution')
+                if resolution is not None:
+                    result = self._quantize(vertices, float(resolution))
+                else:
+                    result = self._reduce_precision(vertices, decimal_places)
             else:
                 return Response(
                     {'error': f'Unknown operation: {operation}'},
@@ -413,15 +415,11 @@ class GeometryProcessingView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @timed('snapping')
     def _perform_snapping(self, vertices, tolerance):
         """Perform endpoint snapping"""
-        # Convert to UPoint objects
-        points = []
-        for i in range(0, len(vertices), 3):
-            points.append(UPoint(vertices[i], vertices[i + 1], vertices[i + 2]))
-        
         # Create polyline
-        polyline = UPolyline(points)
+        polyline = UPolyline(points_from_flattened(vertices))
         
         # Apply snapping
         snapper = PolylineSnapper3D([polyline], tolerance)
@@ -440,6 +438,7 @@ class GeometryProcessingView(APIView):
             'tolerance': tolerance
         }
     
+    @timed('intersection')
     def _perform_intersection(self, vertices_a, vertices_b, tolerance):
         """Perform line intersection analysis"""
         from .geometry.geometry3d import LinesIntersection3D
@@ -477,11 +476,10 @@ class GeometryProcessingView(APIView):
         
         return result
     
+    @timed('reduce_precision')
     def _reduce_precision(self, vertices, decimal_places):
         """Reduce coordinate precision"""
-        reduced_vertices = []
-        for vertex in vertices:
-            reduced_vertices.append(round(vertex, decimal_places))
+        reduced_vertices = round_coords(vertices, decimal_places).tolist()
         
         return {
             'success': True,
@@ -489,4 +487,18 @@ class GeometryProcessingView(APIView):
             'original_vertices': vertices,
             'reduced_vertices': reduced_vertices,
             'decimal_places': decimal_places
+        }
+    
+    @timed('reduce_precision')
+    def _quantize(self, vertices, resolution):
+        """Snap coordinates to an integer grid of the given resolution"""
+        grid = quantize_coords(np.asarray(vertices, dtype=float).reshape(-1, 3), resolution)
+        
+        return {
+            'success': True,
+            'operation': 'reduce_precision',
+            'original_vertices': vertices,
+            'reduced_vertices': dequantize_coords(grid, resolution).ravel().tolist(),
+            'quantized_vertices': grid.ravel().tolist(),
+            'resolution': resolution
         }
\ No newline at end of file
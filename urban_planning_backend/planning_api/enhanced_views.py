@@ -1,23 +1,40 @@
 # planning_api/enhanced_views.py
+import copy
 import logging
 import math
 import random
 import numpy as np
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from .serializers import GeneratePlanRequestSerializer, GeneratePlanResponseSerializer
+from .binary_transport import BinaryVertexParser, BinaryPlanRenderer
+from .plan_cache import cached_design, get_plan_cache, is_cacheable, prepare_cache_key
+from .streaming import plan_records, building_record, ndjson_response
+from .timing import span, timed
+from . import metrics
 from .geometry.clustering import (
-    AgglomerativeClustering, Point3D, Vector3D, Cluster, MultiClusters
+    AgglomerativeClustering, Cluster, MultiClusters
 )
 from .geometry.geometry3d import (
     UPoint, UVector3, UPolyline, LinesIntersection3D, 
     PolylineSnapper3D, SegmentsIntersection3D
 )
 from .geometry.voronoi import Voronoi, FortuneSite, VPoint
+from .geometry.skeleton import StraightSkeleton
+from .geometry.utils import UniformSampler, as_coords, pairwise_distances
+from .geometry.distance_field import SiteDistanceField
+from .primitives import points_from_flattened
 
 logger = logging.getLogger(__name__)
 
+# Random candidate positions drawn and containment-tested per batch
+CANDIDATE_BATCH_SIZE = 64
+
 
 class EnhancedSiteParameters:
     """Enhanced site parameters with C# algorithm integration"""
@@ -30,7 +47,6 @@ class EnhancedSiteParameters:
         self.building_style = 0
         self.radiant = 0.0
         self.site_area = 0.0
-        self.site_curve = None
         self.site_polyline = None
         self.site_bounds = None
         
@@ -44,20 +60,14 @@ class EnhancedSiteParameters:
         self.cluster_diameter = 50.0
         self.use_voronoi = False
         self.building_variation = 0.3
+        self.seed = None
     
     def set_site_from_vertices(self, flattened_vertices):
         """Set site parameters from flattened vertices"""
         if len(flattened_vertices) < 9:
             raise ValueError("Insufficient vertices")
         
-        # Convert to UPoint objects
-        points = []
-        for i in range(0, len(flattened_vertices), 3):
-            points.append(UPoint(
-                flattened_vertices[i],
-                flattened_vertices[i + 1],
-                flattened_vertices[i + 2]
-            ))
+        points = points_from_flattened(flattened_vertices)
         
         self.site_polyline = UPolyline(points)
         self.site_area = self._calculate_area(points)
@@ -73,8 +83,13 @@ class EnhancedSiteParameters:
             'min_x': min_x, 'max_x': max_x,
             'min_y': min_y, 'max_y': max_y
         }
-        
-        self.site_curve = [{'x': p.x, 'y': p.y, 'z': p.z} for p in points]
+    
+    @property
+    def site_curve(self):
+        """Site boundary as {'x', 'y', 'z'} dicts, built on demand"""
+        if self.site_polyline is None:
+            return None
+        return [point.to_dict() for point in self.site_polyline.coordinates]
     
     def _calculate_area(self, points):
         """Calculate polygon area using shoelace formula"""
@@ -152,12 +167,19 @@ class EnhancedBuildingGenerator:
     
     def __init__(self, site_params: EnhancedSiteParameters):
         self.site_params = site_params
+        self.rng = random.Random(site_params.seed)
+        self._site_boundary_index = None
         self.building_positions = []
         self.building_dimensions = []
         self.building_heights = []
     
+    @timed('placement')
     def generate_buildings(self):
         """Generate buildings using advanced algorithms"""
+        return list(self.iter_buildings())
+    
+    def iter_buildings(self):
+        """Yield buildings one at a time as placement produces them"""
         if self.site_params.use_clustering:
             return self._generate_clustered_buildings()
         elif self.site_params.use_voronoi:
@@ -173,18 +195,12 @@ class EnhancedBuildingGenerator:
         candidate_positions = self._generate_candidate_positions()
         
         if len(candidate_positions) < 2:
-            return self._generate_grid_buildings()
+            yield from self._generate_grid_buildings()
+            return
         
         # Create distance matrix
-        n = len(candidate_positions)
-        distance_matrix = np.zeros((n, n))
-        coordinates = np.zeros((n, 3))
-        
-        for i, pos_i in enumerate(candidate_positions):
-            coordinates[i] = [pos_i.x, pos_i.y, pos_i.z]
-            for j, pos_j in enumerate(candidate_positions):
-                if i != j:
-                    distance_matrix[i, j] = pos_i.distance_to(pos_j)
+        coordinates = as_coords(candidate_positions)
+        distance_matrix = pairwise_distances(coordinates)
         
         # Apply clustering
         clusters = AgglomerativeClustering.run(
@@ -194,7 +210,7 @@ class EnhancedBuildingGenerator:
         )
         
         # Generate buildings from clusters
-        building_data = []
+        buildings = []
         for cluster in clusters:
             centroid = cluster.centroid
             cluster_size = cluster.count
@@ -204,16 +220,15 @@ class EnhancedBuildingGenerator:
             floors = self._get_cluster_floors(cluster_size)
             floor_height = self._get_floor_height()
             
-            if self._is_position_valid(centroid, building_width, building_depth):
-                building_data.append({
-                    'position': centroid,
-                    'width': building_width,
-                    'depth': building_depth,
-                    'floors': floors,
-                    'floor_height': floor_height
-                })
-        
-        return building_data
+            buildings.append({
+                'position': centroid,
+                'width': building_width,
+                'depth': building_depth,
+                'floors': floors,
+                'floor_height': floor_height
+            })
+        
+        yield from self._valid_buildings(buildings)
     
     def _generate_voronoi_buildings(self):
         """Generate buildings using Voronoi diagrams"""
@@ -226,15 +241,17 @@ class EnhancedBuildingGenerator:
         bounds = self.site_params.site_bounds
         margin = 10.0
         
-        for _ in range(seed_count):
-            x = random.uniform(bounds['min_x'] + margin, bounds['max_x'] - margin)
-            y = random.uniform(bounds['min_y'] + margin, bounds['max_y'] - margin)
-            
-            if self._is_point_in_site(UPoint(x, y, 0)):
-                sites.append(FortuneSite(x, y, []))
+        seeds = UniformSampler(self.rng, [
+            (bounds['min_x'] + margin, bounds['max_x'] - margin),
+            (bounds['min_y'] + margin, bounds['max_y'] - margin)
+        ]).draw(seed_count)
+        
+        for x, y in seeds[self._points_in_site(seeds)].tolist():
+            sites.append(FortuneSite(x, y, []))
         
         if len(sites) < 3:
-            return self._generate_grid_buildings()
+            yield from self._generate_grid_buildings()
+            return
         
         # Generate Voronoi diagram
         voronoi = Voronoi(
@@ -244,7 +261,7 @@ class EnhancedBuildingGenerator:
         )
         
         # Generate buildings from Voronoi cells
-        building_data = []
+        buildings = []
         for site in voronoi.sites:
             if len(site.cell) >= 6:  # At least 3 points (2 coordinates each)
                 # Calculate cell centroid
@@ -262,23 +279,21 @@ class EnhancedBuildingGenerator:
                     floors = self._get_voronoi_floors(cell_area)
                     floor_height = self._get_floor_height()
                     
-                    if self._is_position_valid(centroid, building_width, building_depth):
-                        building_data.append({
-                            'position': centroid,
-                            'width': building_width,
-                            'depth': building_depth,
-                            'floors': floors,
-                            'floor_height': floor_height
-                        })
+                    buildings.append({
+                        'position': centroid,
+                        'width': building_width,
+                        'depth': building_depth,
+                        'floors': floors,
+                        'floor_height': floor_height
+                    })
         
-        return building_data
+        yield from self._valid_buildings(buildings)
     
     def _generate_grid_buildings(self):
         """Generate buildings using enhanced grid with variations"""
         logger.info("Generating buildings using enhanced grid layout")
         
         bounds = self.site_params.site_bounds
-        building_data = []
         
         # Calculate optimal grid spacing
         base_width, base_depth = self._get_base_building_dimensions()
@@ -297,16 +312,32 @@ class EnhancedBuildingGenerator:
         building_count = 0
         max_buildings = min(self.site_params.max_buildings, 50)
         
+        # Column positions, accumulated as a scan across the row would
+        columns = []
+        x = start_x
+        while x < end_x:
+            columns.append(x)
+            x += spacing_x
+        
+        # Position and size variations for a whole row are drawn together,
+        # in the order the cells would draw them one by one
+        sampler = UniformSampler(self.rng, [
+            (-spacing_x * 0.2, spacing_x * 0.2),
+            (-spacing_y * 0.2, spacing_y * 0.2),
+            (-0.3, 0.3),
+            (-0.3, 0.3)
+        ])
+        
         y = start_y
         row = 0
-        while y < end_y and building_count < max_buildings:
-            x = start_x
-            col = 0
-            
-            while x < end_x and building_count < max_buildings:
+        while columns and y < end_y and building_count < max_buildings:
+            cells = []
+            for x, (offset_x, offset_y, offset_width, offset_depth) in zip(
+                columns, sampler.draw(len(columns)).tolist()
+            ):
                 # Add variation to position
-                variation_x = random.uniform(-spacing_x * 0.2, spacing_x * 0.2) * self.site_params.building_variation
-                variation_y = random.uniform(-spacing_y * 0.2, spacing_y * 0.2) * self.site_params.building_variation
+                variation_x = offset_x * self.site_params.building_variation
+                variation_y = offset_y * self.site_params.building_variation
                 
                 pos_x = x + variation_x
                 pos_y = y + variation_y
@@ -326,8 +357,8 @@ class EnhancedBuildingGenerator:
                 position = UPoint(pos_x, pos_y, 0)
                 
                 # Vary building dimensions
-                width_variation = 1.0 + random.uniform(-0.3, 0.3) * self.site_params.building_variation
-                depth_variation = 1.0 + random.uniform(-0.3, 0.3) * self.site_params.building_variation
+                width_variation = 1.0 + offset_width * self.site_params.building_variation
+                depth_variation = 1.0 + offset_depth * self.site_params.building_variation
                 
                 building_width = base_width * width_variation
                 building_depth = base_depth * depth_variation
@@ -336,28 +367,38 @@ class EnhancedBuildingGenerator:
                 building_width = max(8.0, min(40.0, building_width))
                 building_depth = max(6.0, min(30.0, building_depth))
                 
-                if self._is_position_valid(position, building_width, building_depth):
-                    floors = self._get_adaptive_floors(row, col, building_width * building_depth)
-                    floor_height = self._get_floor_height()
-                    
-                    building_data.append({
-                        'position': position,
-                        'width': building_width,
-                        'depth': building_depth,
-                        'floors': floors,
-                        'floor_height': floor_height
-                    })
-                    
-                    building_count += 1
+                cells.append((position, building_width, building_depth))
+            
+            valid = self._positions_valid(
+                [cell[0] for cell in cells], [cell[1] for cell in cells], [cell[2] for cell in cells]
+            )
+            used = len(cells)
+            
+            for col, (position, building_width, building_depth) in enumerate(cells):
+                if not valid[col]:
+                    continue
                 
-                x += spacing_x
-                col += 1
+                floors = self._get_adaptive_floors(row, col, building_width * building_depth)
+                floor_height = self._get_floor_height()
+                
+                yield {
+                    'position': position,
+                    'width': building_width,
+                    'depth': building_depth,
+                    'floors': floors,
+                    'floor_height': floor_height
+                }
+                
+                building_count += 1
+                if building_count >= max_buildings:
+                    used = col + 1
+                    break
             
+            sampler.rewind(used)
             y += spacing_y
             row += 1
         
-        logger.info(f"Generated {len(building_data)} buildings using grid layout")
-        return building_data
+        logger.info(f"Generated {building_count} buildings using grid layout")
     
     def _generate_candidate_positions(self):
         """Generate candidate positions for clustering"""
@@ -369,19 +410,24 @@ class EnhancedBuildingGenerator:
         attempts = 0
         max_attempts = target_candidates * 10
         
+        sampler = UniformSampler(self.rng, [
+            (bounds['min_x'] + self.site_params.setback_distance,
+             bounds['max_x'] - self.site_params.setback_distance),
+            (bounds['min_y'] + self.site_params.setback_distance,
+             bounds['max_y'] - self.site_params.setback_distance)
+        ])
+        
         while len(candidates) < target_candidates and attempts < max_attempts:
-            x = random.uniform(
-                bounds['min_x'] + self.site_params.setback_distance,
-                bounds['max_x'] - self.site_params.setback_distance
-            )
-            y = random.uniform(
-                bounds['min_y'] + self.site_params.setback_distance,
-                bounds['max_y'] - self.site_params.setback_distance
-            )
+            block = sampler.draw(min(CANDIDATE_BATCH_SIZE, max_attempts - attempts))
+            inside = self._points_in_site(block)
+            used = len(block)
             
-            position = UPoint(x, y, 0)
-            
-            if self._is_point_in_site(position):
+            for index, (x, y) in enumerate(block.tolist()):
+                if not inside[index]:
+                    continue
+                
+                position = UPoint(x, y, 0)
+                
                 # Check minimum distance from existing candidates
                 too_close = False
                 min_distance = self.site_params.min_building_spacing * 0.5
@@ -393,8 +439,12 @@ class EnhancedBuildingGenerator:
                 
                 if not too_close:
                     candidates.append(position)
+                    if len(candidates) >= target_candidates:
+                        used = index + 1
+                        break
             
-            attempts += 1
+            attempts += used
+            sampler.rewind(used)
         
         return candidates
     
@@ -517,42 +567,42 @@ class EnhancedBuildingGenerator:
     
     def _is_position_valid(self, position, width, depth):
         """Check if building position is valid"""
-        # Check if all corners are within site
-        half_width = width / 2
-        half_depth = depth / 2
-        
-        corners = [
-            UPoint(position.x - half_width, position.y - half_depth, 0),
-            UPoint(position.x + half_width, position.y - half_depth, 0),
-            UPoint(position.x + half_width, position.y + half_depth, 0),
-            UPoint(position.x - half_width, position.y + half_depth, 0)
-        ]
-        
-        return all(self._is_point_in_site(corner) for corner in corners)
+        return bool(self._positions_valid([position], width, depth)[0])
     
     def _is_point_in_site(self, point):
         """Check if point is inside site boundary using ray casting"""
-        if not self.site_params.site_polyline or len(self.site_params.site_polyline.coordinates) < 3:
-            return False
-        
-        x, y = point.x, point.y
-        coordinates = self.site_params.site_polyline.coordinates
-        n = len(coordinates)
-        inside = False
-        
-        p1x, p1y = coordinates[0].x, coordinates[0].y
-        for i in range(1, n + 1):
-            p2x, p2y = coordinates[i % n].x, coordinates[i % n].y
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        
-        return inside
+        boundary = self._site_boundary()
+        return boundary is not None and boundary.polygon.contains(point)
+    
+    def _site_boundary(self):
+        """Distance field of the site boundary, built once per generator, or None when there is no usable site"""
+        if self._site_boundary_index is None:
+            polyline = self.site_params.site_polyline
+            if not polyline or len(polyline.coordinates) < 3:
+                return None
+            self._site_boundary_index = SiteDistanceField(polyline.coordinates)
+        return self._site_boundary_index
+    
+    def _points_in_site(self, points):
+        """Boolean mask of which points lie inside the site boundary"""
+        boundary = self._site_boundary()
+        if boundary is None:
+            return np.zeros(len(points), dtype=bool)
+        return boundary.within(points)
+    
+    def _positions_valid(self, positions, widths, depths):
+        """Boolean mask of which buildings have all four corners within the site"""
+        boundary = self._site_boundary()
+        if boundary is None or len(positions) == 0:
+            return np.zeros(len(positions), dtype=bool)
+        return boundary.rectangles_within(positions, widths, depths)
+    
+    def _valid_buildings(self, buildings):
+        """Buildings whose footprint lies within the site, tested in one call"""
+        valid = self._positions_valid(
+            [b['position'] for b in buildings], [b['width'] for b in buildings], [b['depth'] for b in buildings]
+        )
+        return [building for building, keep in zip(buildings, valid) if keep]
     
     def _calculate_centroid(self, points):
         """Calculate centroid of points"""
@@ -583,6 +633,7 @@ class EnhancedGeometryProcessor:
     """Enhanced geometry processor with C# algorithm integration"""
     
     @staticmethod
+    @timed('site_parameters')
     def compute_parameters(flattened_vertices):
         """Create enhanced site parameters"""
         site_params = EnhancedSiteParameters()
@@ -617,39 +668,11 @@ class EnhancedGeometryProcessor:
             
             # Process building data
             for building in building_data:
-                position = building['position']
-                width = building['width']
-                depth = building['depth']
-                floors = building['floors']
-                floor_height = building['floor_height']
-                
-                # Create building layers
-                building_vertices = []
-                heights = []
-                
-                for floor in range(floors):
-                    z = floor * floor_height
-                    layer_vertices = EnhancedGeometryProcessor._create_building_floor_vertices(
-                        position, width, depth, z
-                    )
-                    building_vertices.append(layer_vertices)
-                    heights.append(floor_height)
-                
+                heights, building_vertices = EnhancedGeometryProcessor.compute_building_layers(building)
                 response['buildingLayersHeights'].append(heights)
                 response['buildingLayersVertices'].append(building_vertices)
             
-            # Generate site boundary
-            site_vertices = []
-            for point in site_params.site_polyline.coordinates:
-                site_vertices.extend([point.x, point.y, point.z])
-            response['subSiteVertices'].append(site_vertices)
-            
-            # Generate setback using polygon offsetting
-            setback_vertices = EnhancedGeometryProcessor._create_setback_polygon(
-                site_params.site_polyline.coordinates, site_params.setback_distance
-            )
-            if setback_vertices:
-                response['subSiteSetbackVertices'].append(setback_vertices)
+            response.update(EnhancedGeometryProcessor.compute_site_layers(site_params))
             
             return response
             
@@ -657,6 +680,71 @@ class EnhancedGeometryProcessor:
             logger.error(f"Error in enhanced design generation: {str(e)}")
             return EnhancedGeometryProcessor._get_default_response()
     
+    @staticmethod
+    def stream_design(site_parameters_list):
+        """Yield the site layers, then one record per building as it is placed"""
+        if not site_parameters_list:
+            yield from plan_records(EnhancedGeometryProcessor._get_default_response())
+            return
+        
+        site_params = site_parameters_list[0]
+        
+        if not site_params.site_polyline or len(site_params.site_polyline.coordinates) < 3:
+            yield from plan_records(EnhancedGeometryProcessor._get_default_response())
+            return
+        
+        yield {'type': 'site', **EnhancedGeometryProcessor.compute_site_layers(site_params)}
+        
+        building_count = 0
+        for building in EnhancedBuildingGenerator(site_params).iter_buildings():
+            heights, building_vertices = EnhancedGeometryProcessor.compute_building_layers(building)
+            yield building_record(building_count, heights, building_vertices)
+            building_count += 1
+        
+        logger.info(f"Streamed {building_count} buildings using enhanced algorithms")
+        yield {'type': 'end', 'buildingCount': building_count}
+    
+    @staticmethod
+    @timed('building_vertices')
+    def compute_building_layers(building):
+        """Create the per-floor heights and vertices for one placed building"""
+        building_vertices = []
+        heights = []
+        
+        for floor in range(building['floors']):
+            z = floor * building['floor_height']
+            layer_vertices = EnhancedGeometryProcessor._create_building_floor_vertices(
+                building['position'], building['width'], building['depth'], z
+            )
+            building_vertices.append(layer_vertices)
+            heights.append(building['floor_height'])
+        
+        return heights, building_vertices
+    
+    @staticmethod
+    @timed('site_layers')
+    def compute_site_layers(site_params):
+        """Create the site boundary and setback layers for a site"""
+        response = {
+            'subSiteVertices': [],
+            'subSiteSetbackVertices': []
+        }
+        
+        # Generate site boundary
+        site_vertices = []
+        for point in site_params.site_polyline.coordinates:
+            site_vertices.extend([point.x, point.y, point.z])
+        response['subSiteVertices'].append(site_vertices)
+        
+        # Generate setback using polygon offsetting
+        setback_vertices = EnhancedGeometryProcessor._create_setback_polygon(
+            site_params.site_polyline.coordinates, site_params.setback_distance
+        )
+        if setback_vertices:
+            response['subSiteSetbackVertices'].append(setback_vertices)
+        
+        return response
+    
     @staticmethod
     def _create_building_floor_vertices(position, width, depth, z):
         """Create vertices for a building floor"""
@@ -672,34 +760,20 @@ class EnhancedGeometryProcessor:
     
     @staticmethod
     def _create_setback_polygon(coordinates, setback_distance):
-        """Create setback polygon using simple inward offsetting"""
+        """Create setback polygon by offsetting the site inward along its cached straight skeleton"""
         if len(coordinates) < 3:
             return []
         
-        # Calculate centroid
-        centroid_x = sum(p.x for p in coordinates) / len(coordinates)
-        centroid_y = sum(p.y for p in coordinates) / len(coordinates)
+        ring = StraightSkeleton.of(coordinates).largest_ring(setback_distance)
+        if ring is None:
+            return []
         
-        # Create inset polygon by moving vertices toward centroid
-        setback_vertices = []
+        # Repeat the closing vertex when the site boundary does
+        if coordinates[0].distance_to(coordinates[-1]) <= 1e-6:
+            ring = np.vstack([ring, ring[:1]])
         
-        for point in coordinates:
-            # Vector from centroid to point
-            to_point_x = point.x - centroid_x
-            to_point_y = point.y - centroid_y
-            
-            # Distance from centroid
-            distance = math.sqrt(to_point_x**2 + to_point_y**2)
-            
-            if distance > setback_distance:
-                # Normalize and scale
-                scale = (distance - setback_distance) / distance
-                new_x = centroid_x + to_point_x * scale
-                new_y = centroid_y + to_point_y * scale
-                
-                setback_vertices.extend([new_x, new_y, point.z + 0.2])
-        
-        return setback_vertices if len(setback_vertices) >= 9 else []
+        ring[:, 2] += 0.2
+        return ring.ravel().tolist()
     
     @staticmethod
     def _get_default_response():
@@ -748,12 +822,21 @@ class EnhancedGeometryProcessor:
 
 class EnhancedGeneratePlanView(APIView):
     """Enhanced plan generation with C# algorithms"""
+    parser_classes = [JSONParser, BinaryVertexParser]
+    renderer_classes = [JSONRenderer, BinaryPlanRenderer]
+
+    @property
+    def validate_response(self):
+        """Re-validate generated plans, read per request so settings overrides apply"""
+        return getattr(settings, 'PLANNING_VALIDATE_RESPONSES', False)
     
     def post(self, request):
         try:
             # Validate input
             serializer = GeneratePlanRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 logger.error(f"Validation failed: {serializer.errors}")
                 return Response(
                     {'error': 'Invalid input data', 'details': serializer.errors},
@@ -778,12 +861,25 @@ class EnhancedGeneratePlanView(APIView):
                        f"clustering={site_parameters.use_clustering}, "
                        f"voronoi={site_parameters.use_voronoi}")
             
-            # Generate enhanced design
-            design_result = EnhancedGeometryProcessor.compute_design(site_parameters_list)
+            # Generate enhanced design, reusing cached layouts for repeated sites
+            design_result = cached_design(
+                'enhanced_generateplan', flattened_vertices, plan_parameters_data, site_parameters,
+                lambda: EnhancedGeometryProcessor.compute_design(site_parameters_list),
+                lambda: EnhancedGeometryProcessor.compute_site_layers(site_parameters),
+                EnhancedGeometryProcessor._get_default_response
+            )
+            
+            # Internal results are trusted unless response validation is enabled
+            if not self.validate_response:
+                logger.info(f"Enhanced plan generation successful - "
+                           f"{len(design_result['buildingLayersVertices'])} buildings generated")
+                return Response(design_result, status=status.HTTP_200_OK)
             
             # Validate and serialize response
             response_serializer = GeneratePlanResponseSerializer(data=design_result)
-            if response_serializer.is_valid():
+            with span('validate_response'):
+                is_valid = response_serializer.is_valid()
+            if is_valid:
                 logger.info(f"Enhanced plan generation successful - "
                            f"{len(design_result['buildingLayersVertices'])} buildings generated")
                 return Response(response_serializer.validated_data, status=status.HTTP_200_OK)
@@ -794,6 +890,13 @@ class EnhancedGeneratePlanView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             
+        except ParseError as e:
+            logger.error(f"Request parsing failed: {str(e)}")
+            return Response(
+                {'error': 'Invalid input data', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+            
         except Exception as e:
             logger.error(f"Enhanced plan generation error: {str(e)}", exc_info=True)
             return Response(
@@ -848,4 +951,77 @@ class EnhancedGeneratePlanView(APIView):
         
         logger.info(f"Applied enhanced parameters: clustering={site_parameters.use_clustering}, "
                    f"voronoi={site_parameters.use_voronoi}, "
-                   f"variation={site_parameters.building_variation}")
\ No newline at end of file
+                   f"variation={site_parameters.building_variation}")
+
+
+class EnhancedGeneratePlanStreamView(EnhancedGeneratePlanView):
+    """Enhanced plan generation streamed as NDJSON, one record per building"""
+    
+    def post(self, request):
+        try:
+            serializer = GeneratePlanRequestSerializer(data=request.data)
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
+                logger.error(f"Validation failed: {serializer.errors}")
+                return Response(
+                    {'error': 'Invalid input data', 'details': serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            validated_data = serializer.validated_data
+            flattened_vertices = validated_data['plan_flattened_vertices']
+            plan_parameters_data = validated_data.get('plan_parameters', {})
+            
+            logger.info(f"Streaming enhanced plan generation request: {len(flattened_vertices)} vertices")
+            
+            site_parameters_list = EnhancedGeometryProcessor.compute_parameters(flattened_vertices)
+            site_parameters = site_parameters_list[0] if site_parameters_list else EnhancedSiteParameters()
+            self._apply_enhanced_parameters(plan_parameters_data, site_parameters)
+            
+            # Seed exactly like the buffered endpoint so both return the same layout
+            cache_key = prepare_cache_key(
+                'enhanced_generateplan', flattened_vertices, plan_parameters_data, site_parameters
+            )
+            
+            return ndjson_response(self._stream_records(cache_key, site_parameters_list, site_parameters))
+            
+        except ParseError as e:
+            logger.error(f"Request parsing failed: {str(e)}")
+            return Response(
+                {'error': 'Invalid input data', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+            
+        except Exception as e:
+            logger.error(f"Streaming plan generation error: {str(e)}", exc_info=True)
+            return Response(
+                {'error': f'Enhanced plan generation failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    def _stream_records(self, cache_key, site_parameters_list, site_parameters):
+        """Replay a cached layout, or stream a fresh one and cache it once complete"""
+        cache = get_plan_cache()
+        buildings = cache.get(cache_key)
+        if buildings is not None:
+            response = copy.deepcopy(buildings)
+            response.update(EnhancedGeometryProcessor.compute_site_layers(site_parameters))
+            metrics.BUILDINGS_GENERATED.observe(
+                len(response['buildingLayersVertices']), processor='enhanced_generateplan_stream'
+            )
+            yield from plan_records(response)
+            return
+        
+        collected = {'buildingLayersHeights': [], 'buildingLayersVertices': []}
+        for record in EnhancedGeometryProcessor.stream_design(site_parameters_list):
+            if record['type'] == 'building':
+                collected['buildingLayersHeights'].append(record['layerHeights'])
+                collected['buildingLayersVertices'].append(record['layerVertices'])
+            yield record
+        
+        if is_cacheable(collected, EnhancedGeometryProcessor._get_default_response):
+            cache.set(cache_key, collected)
+        metrics.BUILDINGS_GENERATED.observe(
+            len(collected['buildingLayersVertices']), processor='enhanced_generateplan_stream'
+        )
@@ -11,7 +11,45 @@ from .utils import (
     Line,
     Plane,
     Polyline,
-    GeometryUtils
+    PolylineArray,
+    PolylinePoints,
+    ArcLengthTable,
+    GeometryUtils,
+    PreparedPolygon,
+    UniformSampler,
+    as_coords,
+    pairwise_distances,
+    points_in_polygon,
+    rectangle_corners,
+    rectangles_in_polygon,
+    segment_distances
+)
+from ..primitives import points_from_flattened, flatten_points
+from .sweep import sweep_intersections, self_intersections, has_self_intersection
+from .skeleton import StraightSkeleton
+from .boolean import polygon_boolean, clip_polygons, clipped_areas
+from .triangulate import triangulate_polygon
+from .bvh import SegmentBoxTree
+from .snapping import snap_vertices, snap_polylines
+from .segments import (
+    SegmentApproaches,
+    closest_approaches,
+    intersect_lines,
+    intersect_segments_2d,
+    pair_segments
+)
+from .quantize import QUANTIZE_RESOLUTION, quantize_coords, dequantize_coords, round_coords, geometry_keys
+from .distance_field import SiteDistanceField
+from .transforms import (
+    PreparedPlanarCurve,
+    fit_plane,
+    plane_to_plane_matrix,
+    project_onto_plane,
+    rotate_vectors,
+    rotation_matrix,
+    transform_coords,
+    transform_vectors,
+    translation_matrix
 )
 
 from .advanced import (
@@ -56,7 +94,51 @@ __all__ = [
     'Line',
     'Plane',
     'Polyline',
+    'PolylineArray',
+    'PolylinePoints',
+    'ArcLengthTable',
     'GeometryUtils',
+    'PreparedPolygon',
+    'UniformSampler',
+    'as_coords',
+    'pairwise_distances',
+    'points_in_polygon',
+    'rectangle_corners',
+    'rectangles_in_polygon',
+    'segment_distances',
+    'points_from_flattened',
+    'flatten_points',
+    'sweep_intersections',
+    'self_intersections',
+    'has_self_intersection',
+    'StraightSkeleton',
+    'polygon_boolean',
+    'clip_polygons',
+    'clipped_areas',
+    'triangulate_polygon',
+    'SegmentBoxTree',
+    'snap_vertices',
+    'snap_polylines',
+    'SegmentApproaches',
+    'closest_approaches',
+    'intersect_lines',
+    'intersect_segments_2d',
+    'pair_segments',
+    'QUANTIZE_RESOLUTION',
+    'quantize_coords',
+    'dequantize_coords',
+    'round_coords',
+    'geometry_keys',
+    'SiteDistanceField',
+    'PreparedPlanarCurve',
+    'fit_plane',
+    'plane_to_plane_matrix',
+    'project_onto_plane',
+    'rotate_vectors',
+    'rotation_matrix',
+    'transform_coords',
+    'transform_vectors',
+    'translation_matrix',
     
     # Advanced operations
     'CurveOperations',
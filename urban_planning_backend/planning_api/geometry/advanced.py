@@ -2,7 +2,20 @@
 import math
 import random
 from typing import List, Tuple, Optional, Dict, Any
-from .utils import Point3D, Vector3D, Line, Plane, Polyline, GeometryUtils
+import numpy as np
+from .utils import (
+    Point3D, Vector3D, Line, Plane, Polyline, PolylineArray, GeometryUtils, UniformSampler,
+    PreparedPolygon, as_coords, rectangles_in_polygon, segment_distances
+)
+from .boolean import polygon_boolean
+from .skeleton import StraightSkeleton
+from .triangulate import triangulate_polygon
+from .sweep import has_self_intersection
+from .segments import intersect_segments_2d
+from .distance_field import SiteDistanceField
+
+# Random candidates drawn and containment-tested per batch by the placement loops
+PLACEMENT_BATCH_SIZE = 64
 
 
 class CurveOperations:
@@ -10,60 +23,41 @@ class CurveOperations:
     
     @staticmethod
     def polyline_from_vertices(flattened_vertices: List[float]) -> Polyline:
-        """Convert flattened vertices to polyline"""
-        points = []
-        for i in range(0, len(flattened_vertices), 3):
-            if i + 2 < len(flattened_vertices):
-                points.append(Point3D(
-                    flattened_vertices[i],
-                    flattened_vertices[i + 1],
-                    flattened_vertices[i + 2]
-                ))
-        return Polyline(points)
+        """Convert flattened vertices to an array-backed polyline"""
+        return PolylineArray.from_flattened(flattened_vertices)
     
     @staticmethod
     def get_curve_plane(polyline: Polyline) -> Optional[Plane]:
         """Get the best-fit plane for a polyline"""
-        if len(polyline.points) < 3:
+        coords = as_coords(polyline)
+        if len(coords) < 3:
             return None
         
-        # Use first three non-collinear points to define plane
-        p0 = polyline.points[0]
-        p1 = polyline.points[1]
-        
-        for i in range(2, len(polyline.points)):
-            p2 = polyline.points[i]
-            
-            v1 = Vector3D(p1.x - p0.x, p1.y - p0.y, p1.z - p0.z)
-            v2 = Vector3D(p2.x - p0.x, p2.y - p0.y, p2.z - p0.z)
-            
-            normal = v1.cross(v2)
-            if normal.length() > 1e-6:  # Found non-collinear points
-                return Plane(p0, normal.normalize())
+        # Use the first two points and the first point not collinear with them
+        normals = np.cross(coords[1] - coords[0], coords[2:] - coords[0])
+        lengths = np.linalg.norm(normals, axis=1)
+        candidates = np.flatnonzero(lengths > 1e-6)
+        if not len(candidates):
+            return None
         
-        return None
+        normal = normals[candidates[0]] / lengths[candidates[0]]
+        return Plane(Point3D(*coords[0].tolist()), Vector3D(*normal.tolist()))
     
     @staticmethod
     def calculate_main_orientation(polyline: Polyline) -> float:
         """Calculate main orientation of the polygon (angle of longest edge)"""
-        if len(polyline.points) < 2:
+        coords = as_coords(polyline)
+        if len(coords) < 2:
             return 0.0
         
-        max_length = 0.0
-        main_angle = 0.0
-        
-        for i in range(len(polyline.points)):
-            j = (i + 1) % len(polyline.points)
-            if j < len(polyline.points):
-                dx = polyline.points[j].x - polyline.points[i].x
-                dy = polyline.points[j].y - polyline.points[i].y
-                length = math.sqrt(dx*dx + dy*dy)
-                
-                if length > max_length:
-                    max_length = length
-                    main_angle = math.atan2(dy, dx)
+        # Edges including the wrap-around edge from the last point to the first
+        edges = np.roll(coords[:, :2], -1, axis=0) - coords[:, :2]
+        lengths = np.hypot(edges[:, 0], edges[:, 1])
+        longest = int(np.argmax(lengths))
+        if lengths[longest] <= 0:
+            return 0.0
         
-        return main_angle
+        return math.atan2(edges[longest, 1], edges[longest, 0])
     
     @staticmethod
     def point_containment(polyline: Polyline, point: Point3D) -> str:
@@ -73,14 +67,11 @@ class CurveOperations:
         
         # Check if point is on boundary first
         tolerance = 1e-6
-        for i in range(len(polyline.points) - 1):
-            line = Line(polyline.points[i], polyline.points[i + 1])
-            closest = line.closest_point(point, limit_to_segment=True)
-            if point.distance_to(closest) <= tolerance:
-                return 'coincident'
+        if np.any(segment_distances(as_coords(polyline), point) <= tolerance):
+            return 'coincident'
         
         # Use ray casting for inside/outside test
-        if GeometryUtils.point_in_polygon_2d(point, polyline.points):
+        if PreparedPolygon.of(polyline).contains(point):
             return 'inside'
         else:
             return 'outside'
@@ -91,39 +82,16 @@ class OffsetOperations:
     
     @staticmethod
     def offset_polygon(polyline: Polyline, distance: float, tolerance: float = 1e-6) -> Optional[Polyline]:
-        """Create offset polygon (simplified version)"""
+        """Offset a closed polygon inward by distance, or outward when it is negative
+
+        Uses the straight skeleton, cached on PolylineArray sites so repeated
+        setbacks on one site share it. Returns the largest remaining ring, or
+        None once the polygon has collapsed.
+        """
         if not polyline.is_closed or len(polyline.points) < 4:
             return None
         
-        # Simple inward offset by moving each vertex toward centroid
-        centroid = polyline.get_centroid()
-        offset_points = []
-        
-        for point in polyline.points[:-1]:  # Exclude duplicate closing point
-            # Vector from centroid to point
-            to_point = Vector3D(
-                point.x - centroid.x,
-                point.y - centroid.y,
-                point.z - centroid.z
-            )
-            
-            length = to_point.length()
-            if length > distance:
-                # Move point toward centroid
-                direction = to_point.normalize()
-                new_point = Point3D(
-                    point.x - direction.x * distance,
-                    point.y - direction.y * distance,
-                    point.z - direction.z * distance
-                )
-                offset_points.append(new_point)
-        
-        if len(offset_points) >= 3:
-            # Close the polygon
-            offset_points.append(offset_points[0])
-            return Polyline(offset_points)
-        
-        return None
+        return StraightSkeleton.of(polyline, outward=distance < 0).offset_polyline(abs(distance))
 
 
 class BuildingPlacement:
@@ -136,9 +104,13 @@ class BuildingPlacement:
         building_width: float,
         building_depth: float,
         min_spacing: float = 5.0,
-        max_attempts: int = 1000
+        max_attempts: int = 1000,
+        setback: float = 0.0
     ) -> List[Point3D]:
-        """Generate valid building positions within polygon boundary"""
+        """Generate valid building positions within polygon boundary
+        
+        With a setback, footprints also keep that distance from the boundary.
+        """
         
         if len(site_polygon) < 3:
             return []
@@ -152,38 +124,40 @@ class BuildingPlacement:
         positions = []
         attempts = 0
         
+        # Random positions within bounds, drawn and tested against the site's distance field a batch at a time
+        site = SiteDistanceField.of(site_polygon)
+        sampler = UniformSampler(random, [
+            (min_x + building_width/2, max_x - building_width/2),
+            (min_y + building_depth/2, max_y - building_depth/2)
+        ])
+        
         while len(positions) < num_buildings and attempts < max_attempts:
-            attempts += 1
+            block = sampler.draw(min(PLACEMENT_BATCH_SIZE, max_attempts - attempts))
+            all_inside = site.rectangles_within(block, building_width, building_depth, setback)
+            used = len(block)
             
-            # Generate random position within bounds
-            x = random.uniform(min_x + building_width/2, max_x - building_width/2)
-            y = random.uniform(min_y + building_depth/2, max_y - building_depth/2)
-            
-            candidate = Point3D(x, y, 0)
-            
-            # Check if all corners of building are inside polygon
-            corners = [
-                Point3D(x - building_width/2, y - building_depth/2, 0),
-                Point3D(x + building_width/2, y - building_depth/2, 0),
-                Point3D(x + building_width/2, y + building_depth/2, 0),
-                Point3D(x - building_width/2, y + building_depth/2, 0)
-            ]
-            
-            all_inside = all(GeometryUtils.point_in_polygon_2d(corner, site_polygon) for corner in corners)
-            
-            if not all_inside:
-                continue
-            
-            # Check minimum distance from existing buildings
-            too_close = False
-            for existing in positions:
-                distance = candidate.distance_to(existing)
-                if distance < (max(building_width, building_depth) + min_spacing):
-                    too_close = True
-                    break
+            for index, (x, y) in enumerate(block.tolist()):
+                if not all_inside[index]:
+                    continue
+                
+                candidate = Point3D(x, y, 0)
+                
+                # Check minimum distance from existing buildings
+                too_close = False
+                for existing in positions:
+                    distance = candidate.distance_to(existing)
+                    if distance < (max(building_width, building_depth) + min_spacing):
+                        too_close = True
+                        break
+                
+                if not too_close:
+                    positions.append(candidate)
+                    if len(positions) >= num_buildings:
+                        used = index + 1
+                        break
             
-            if not too_close:
-                positions.append(candidate)
+            attempts += used
+            sampler.rewind(used)
         
         return positions
     
@@ -192,9 +166,13 @@ class BuildingPlacement:
         site_polygon: List[Point3D],
         building_width: float,
         building_depth: float,
-        spacing: float = 10.0
+        spacing: float = 10.0,
+        setback: float = 0.0
     ) -> List[Point3D]:
-        """Generate buildings in a grid pattern within the polygon"""
+        """Generate buildings in a grid pattern within the polygon
+        
+        With a setback, footprints also keep that distance from the boundary.
+        """
         
         if len(site_polygon) < 3:
             return []
@@ -205,35 +183,34 @@ class BuildingPlacement:
         min_y = min(p.y for p in site_polygon)
         max_y = max(p.y for p in site_polygon)
         
-        positions = []
-        
         # Grid spacing
         step_x = building_width + spacing
         step_y = building_depth + spacing
         
+        grid_x = []
         current_x = min_x + building_width/2
         while current_x + building_width/2 <= max_x:
-            current_y = min_y + building_depth/2
-            while current_y + building_depth/2 <= max_y:
-                candidate = Point3D(current_x, current_y, 0)
-                
-                # Check if building center is inside polygon
-                if GeometryUtils.point_in_polygon_2d(candidate, site_polygon):
-                    # Check if all corners are inside
-                    corners = [
-                        Point3D(current_x - building_width/2, current_y - building_depth/2, 0),
-                        Point3D(current_x + building_width/2, current_y - building_depth/2, 0),
-                        Point3D(current_x + building_width/2, current_y + building_depth/2, 0),
-                        Point3D(current_x - building_width/2, current_y + building_depth/2, 0)
-                    ]
-                    
-                    if all(GeometryUtils.point_in_polygon_2d(corner, site_polygon) for corner in corners):
-                        positions.append(candidate)
-                
-                current_y += step_y
+            grid_x.append(current_x)
             current_x += step_x
         
-        return positions
+        grid_y = []
+        current_y = min_y + building_depth/2
+        while current_y + building_depth/2 <= max_y:
+            grid_y.append(current_y)
+            current_y += step_y
+        
+        if not grid_x or not grid_y:
+            return []
+        
+        # Column-major, like the scan it replaces
+        candidates = np.column_stack([np.repeat(grid_x, len(grid_y)), np.tile(grid_y, len(grid_x))])
+        
+        # Building center and all four corners must be inside the polygon, the whole grid in one mask
+        site = SiteDistanceField.of(site_polygon)
+        inside = site.within(candidates)
+        inside &= site.rectangles_within(candidates, building_width, building_depth, setback)
+        
+        return [Point3D(x, y, 0) for x, y in candidates[inside].tolist()]
 
 
 class TriangulationOperations:
@@ -241,7 +218,7 @@ class TriangulationOperations:
     
     @staticmethod
     def simple_triangulation(polygon: List[Point3D]) -> List[List[Point3D]]:
-        """Simple ear clipping triangulation for polygon"""
+        """Ear clipping triangulation for polygon"""
         if len(polygon) < 3:
             return []
         
@@ -251,86 +228,34 @@ class TriangulationOperations:
         if len(points) < 3:
             return []
         
-        triangles = []
-        remaining = points[:]
-        
-        while len(remaining) > 3:
-            # Find an ear (a vertex that can be removed)
-            ear_found = False
-            
-            for i in range(len(remaining)):
-                prev_i = (i - 1) % len(remaining)
-                next_i = (i + 1) % len(remaining)
-                
-                triangle = [remaining[prev_i], remaining[i], remaining[next_i]]
-                
-                # Check if this is a valid ear (no other vertices inside)
-                is_ear = True
-                for j, point in enumerate(remaining):
-                    if j != prev_i and j != i and j != next_i:
-                        if GeometryUtils.point_in_polygon_2d(point, triangle):
-                            is_ear = False
-                            break
-                
-                if is_ear:
-                    triangles.append(triangle)
-                    remaining.pop(i)
-                    ear_found = True
-                    break
-            
-            if not ear_found:
-                # Fallback: just take the first triangle
-                if len(remaining) >= 3:
-                    triangles.append(remaining[:3])
-                    remaining.pop(1)
-                else:
-                    break
-        
-        # Add the final triangle
-        if len(remaining) == 3:
-            triangles.append(remaining)
-        
-        return triangles
+        return [[points[i] for i in triangle] for triangle in triangulate_polygon(points).tolist()]
 
 
 class BooleanOperations:
-    """Boolean operations on polygons (simplified)"""
+    """Boolean operations on simple polygons
+
+    Results are lists of rings; outer rings run counter-clockwise and holes
+    clockwise. clip_polygons in boolean.py clips many polygons at once.
+    """
+    
+    @staticmethod
+    def _rings_to_points(rings: List[np.ndarray]) -> List[List[Point3D]]:
+        return [[Point3D(x, y, z) for x, y, z in ring.tolist()] for ring in rings]
     
     @staticmethod
     def polygon_difference(poly_a: List[Point3D], poly_b: List[Point3D]) -> List[List[Point3D]]:
-        """Simplified polygon difference operation"""
-        # This is a very simplified version - for production use, consider using a library like Shapely
-        
-        # Check if poly_b is completely inside poly_a
-        b_inside_a = all(GeometryUtils.point_in_polygon_2d(p, poly_a) for p in poly_b)
-        
-        if not b_inside_a:
-            return [poly_a]  # No intersection, return original
-        
-        # For simplicity, if poly_b is inside poly_a, return empty or approximation
-        # In a real implementation, you'd need proper polygon clipping algorithms
-        return []
+        """Parts of poly_a outside poly_b"""
+        return BooleanOperations._rings_to_points(polygon_boolean(poly_a, poly_b, 'difference'))
     
     @staticmethod
     def polygon_intersection(poly_a: List[Point3D], poly_b: List[Point3D]) -> List[List[Point3D]]:
-        """Simplified polygon intersection operation"""
-        # This is a placeholder - real polygon intersection is complex
-        
-        # Check for vertex intersections
-        intersecting_points = []
-        
-        for point in poly_a:
-            if GeometryUtils.point_in_polygon_2d(point, poly_b):
-                intersecting_points.append(point)
-        
-        for point in poly_b:
-            if GeometryUtils.point_in_polygon_2d(point, poly_a):
-                intersecting_points.append(point)
-        
-        if len(intersecting_points) >= 3:
-            return [intersecting_points]
-        
-        return []
+        """Parts of poly_a inside poly_b"""
+        return BooleanOperations._rings_to_points(polygon_boolean(poly_a, poly_b, 'intersection'))
+    
+    @staticmethod
+    def polygon_union(poly_a: List[Point3D], poly_b: List[Point3D]) -> List[List[Point3D]]:
+        """Area covered by either polygon"""
+        return BooleanOperations._rings_to_points(polygon_boolean(poly_a, poly_b, 'union'))
 
 
 class IntersectionOperations:
@@ -354,40 +279,28 @@ class IntersectionOperations:
     @staticmethod
     def line_polyline_intersections(line: Line, polyline: Polyline, tolerance: float = 1e-6) -> List[Tuple[Point3D, float, float]]:
         """Find all intersections between a line and polyline"""
-        intersections = []
-        
-        for i in range(len(polyline.points) - 1):
-            segment = Line(polyline.points[i], polyline.points[i + 1])
-            intersection = IntersectionOperations.line_line_intersection(line, segment, tolerance)
-            
-            if intersection is not None:
-                point, t, u = intersection
-                # Check if intersection is within both line segments
-                if 0 <= t <= 1 and 0 <= u <= 1:
-                    intersections.append((point, t, u))
+        coords = as_coords(polyline.points)
+        if len(coords) < 2:
+            return []
         
-        return intersections
+        # Every segment against the line in one batch; hits lie within both segments
+        count = len(coords) - 1
+        hits, t, u = intersect_segments_2d(
+            np.repeat(as_coords([line.start]), count, axis=0), np.repeat(as_coords([line.end]), count, axis=0),
+            coords[:-1], coords[1:], tolerance
+        )
+        return [(line.point_at(t_hit), t_hit, u_hit) for t_hit, u_hit in zip(t[hits].tolist(), u[hits].tolist())]
     
     @staticmethod
     def polyline_self_intersection_check(polyline: Polyline, tolerance: float = 1e-6) -> bool:
-        """Check if polyline self-intersects"""
-        points = polyline.points
-        n = len(points)
-        
-        for i in range(n - 1):
-            line1 = Line(points[i], points[i + 1])
-            
-            # Check against non-adjacent segments
-            start_j = i + 2
-            end_j = n - 1 if i > 0 else n - 2  # Avoid checking last segment against first
-            
-            for j in range(start_j, end_j):
-                line2 = Line(points[j], points[j + 1])
-                
-                if GeometryUtils.lines_intersect_2d(line1, line2, tolerance, True):
-                    return True
-        
-        return False
+        """Check if polyline self-intersects
+
+        Consecutive segments, and the first and last segment, are not tested
+        against each other.
+        """
+        if len(polyline.points) < 4:
+            return False
+        return has_self_intersection(as_coords(polyline.points), closed=False, tolerance=tolerance)
 
 
 class SurfaceOperations:
@@ -468,7 +381,8 @@ class ParametricDesign:
         mix_ratio: float = 0.0,
         building_style: int = 0,
         orientation: float = 0.0,
-        max_buildings: int = 50  # Added max_buildings parameter
+        max_buildings: int = 50,  # Added max_buildings parameter
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Apply parametric design rules to generate building layout - IMPROVED VERSION"""
         
@@ -497,7 +411,7 @@ class ParametricDesign:
         # Enhanced building placement strategy
         building_positions = ParametricDesign._generate_building_positions(
             site_polygon, num_buildings, building_width, building_depth, 
-            density, orientation, max_buildings
+            density, orientation, max_buildings, rng or random
         )
         
         logger.info(f"Generated {len(building_positions)} building positions")
@@ -508,10 +422,28 @@ class ParametricDesign:
             'building_depth': building_depth,
             'floors_per_building': floors_per_building,
             'floor_height': floor_height,
+            'planned_buildings': num_buildings,
             'num_buildings': len(building_positions),
             'total_floor_area': len(building_positions) * floors_per_building * (building_width * building_depth)
         }
     
+    @staticmethod
+    def with_far(design_result: Dict[str, Any], site_area: float, far: float, building_style: int) -> Dict[str, Any]:
+        """Re-derive floors for a different FAR, keeping the placed buildings"""
+        building_width = design_result['building_width']
+        building_depth = design_result['building_depth']
+        
+        # FAR only feeds the floor calculation, so positions and footprints stay valid
+        floors_per_building, floor_height = ParametricDesign._calculate_floors(
+            site_area, far, design_result['planned_buildings'], building_width, building_depth, building_style
+        )
+        
+        result = dict(design_result)
+        result['floors_per_building'] = floors_per_building
+        result['floor_height'] = floor_height
+        result['total_floor_area'] = result['num_buildings'] * floors_per_building * (building_width * building_depth)
+        return result
+    
     @staticmethod
     def _calculate_building_dimensions(density: float, building_style: int, site_area: float) -> Tuple[float, float]:
         """Calculate building dimensions based on parameters"""
@@ -626,34 +558,39 @@ class ParametricDesign:
     @staticmethod
     def _generate_building_positions(
         site_polygon: List[Point3D], num_buildings: int, building_width: float, 
-        building_depth: float, density: float, orientation: float, max_buildings: int
+        building_depth: float, density: float, orientation: float, max_buildings: int,
+        rng=random
     ) -> List[Point3D]:
         """Generate building positions using improved placement strategies"""
         
         if len(site_polygon) < 3:
             return []
         
+        # One distance field per site, shared by every placement strategy
+        site = SiteDistanceField.of(site_polygon)
+        
         # Choose placement strategy based on density and number of buildings
         if density < 0.3 or num_buildings <= 5:
             # Low density: scattered placement
             return ParametricDesign._generate_scattered_positions(
-                site_polygon, num_buildings, building_width, building_depth
+                site_polygon, num_buildings, building_width, building_depth, rng, site
             )
         elif density > 0.7 or num_buildings > 15:
             # High density: grid-based placement
             return ParametricDesign._generate_grid_positions(
-                site_polygon, num_buildings, building_width, building_depth, orientation
+                site_polygon, num_buildings, building_width, building_depth, orientation, site
             )
         else:
             # Medium density: organic placement
             return ParametricDesign._generate_organic_positions(
-                site_polygon, num_buildings, building_width, building_depth, orientation
+                site_polygon, num_buildings, building_width, building_depth, orientation, rng, site
             )
     
     @staticmethod
     def _generate_scattered_positions(
         site_polygon: List[Point3D], num_buildings: int, 
-        building_width: float, building_depth: float
+        building_width: float, building_depth: float, rng=random,
+        site: Optional[SiteDistanceField] = None
     ) -> List[Point3D]:
         """Generate scattered building positions"""
         
@@ -668,32 +605,46 @@ class ParametricDesign:
         max_attempts = num_buildings * 50  # More attempts for better placement
         min_distance = max(building_width, building_depth) + 8.0  # Larger spacing for scattered
         
+        # Generate random positions within bounds
+        if site is None:
+            site = SiteDistanceField.of(site_polygon)
+        margin_x = building_width / 2
+        margin_y = building_depth / 2
+        sampler = UniformSampler(rng, [
+            (min_x + margin_x, max_x - margin_x),
+            (min_y + margin_y, max_y - margin_y)
+        ])
+        
         while len(positions) < num_buildings and attempts < max_attempts:
-            attempts += 1
+            block = sampler.draw(min(PLACEMENT_BATCH_SIZE, max_attempts - attempts))
             
-            # Generate random position within bounds
-            margin_x = building_width / 2
-            margin_y = building_depth / 2
+            # Check if building corners are inside polygon, for the whole batch at once
+            inside = site.rectangles_within(block, building_width, building_depth)
+            used = len(block)
             
-            x = random.uniform(min_x + margin_x, max_x - margin_x)
-            y = random.uniform(min_y + margin_y, max_y - margin_y)
-            
-            candidate = Point3D(x, y, 0)
-            
-            # Check if building corners are inside polygon
-            if ParametricDesign._is_building_inside_polygon(
-                candidate, building_width, building_depth, site_polygon
-            ):
+            for index, (x, y) in enumerate(block.tolist()):
+                if not inside[index]:
+                    continue
+                
+                candidate = Point3D(x, y, 0)
+                
                 # Check minimum distance from existing buildings
                 if ParametricDesign._check_minimum_distance(candidate, positions, min_distance):
                     positions.append(candidate)
+                    if len(positions) >= num_buildings:
+                        used = index + 1
+                        break
+            
+            attempts += used
+            sampler.rewind(used)
         
         return positions
     
     @staticmethod
     def _generate_grid_positions(
         site_polygon: List[Point3D], num_buildings: int, 
-        building_width: float, building_depth: float, orientation: float
+        building_width: float, building_depth: float, orientation: float,
+        site: Optional[SiteDistanceField] = None
     ) -> List[Point3D]:
         """Generate grid-based building positions"""
         
@@ -715,45 +666,57 @@ class ParametricDesign:
         rows = max(1, int(grid_height / spacing_y))
         
         positions = []
-        
-        # Generate grid positions
+        if num_buildings <= 0:
+            return positions
+        
+        col_offsets = (np.arange(cols) + 0.5) * spacing_x
+        
+        # Orientation rotation is about the polygon centroid
+        rotate = abs(orientation) > 0.01
+        if rotate:
+            centroid_x = sum(p.x for p in site_polygon) / len(site_polygon)
+            centroid_y = sum(p.y for p in site_polygon) / len(site_polygon)
+            cos_angle = math.cos(orientation)
+            sin_angle = math.sin(orientation)
+        
+        # Generate grid positions a row at a time, testing each row in one call
+        if site is None:
+            site = SiteDistanceField.of(site_polygon)
         for row in range(rows):
-            for col in range(cols):
-                if len(positions) >= num_buildings:
-                    break
-                
-                x = min_x + (col + 0.5) * spacing_x
-                y = min_y + (row + 0.5) * spacing_y
-                
-                candidate = Point3D(x, y, 0)
-                
-                # Apply orientation rotation
-                if abs(orientation) > 0.01:
-                    candidate = ParametricDesign._rotate_point_around_center(
-                        candidate, site_polygon, orientation
-                    )
-                
-                # Check if building is inside polygon
-                if ParametricDesign._is_building_inside_polygon(
-                    candidate, building_width, building_depth, site_polygon
-                ):
-                    positions.append(candidate)
+            xs = min_x + col_offsets
+            ys = np.full(cols, min_y + (row + 0.5) * spacing_y)
+            
+            if rotate:
+                rel_x = xs - centroid_x
+                rel_y = ys - centroid_y
+                xs = (rel_x * cos_angle - rel_y * sin_angle) + centroid_x
+                ys = (rel_x * sin_angle + rel_y * cos_angle) + centroid_y
+            
+            candidates = np.column_stack([xs, ys])
             
-            if len(positions) >= num_buildings:
-                break
+            # Check if buildings are inside polygon
+            inside = site.rectangles_within(candidates, building_width, building_depth)
+            for x, y in candidates[inside].tolist():
+                positions.append(Point3D(x, y, 0))
+                if len(positions) >= num_buildings:
+                    return positions
         
-        return positions[:num_buildings]
+        return positions
     
     @staticmethod
     def _generate_organic_positions(
         site_polygon: List[Point3D], num_buildings: int, 
-        building_width: float, building_depth: float, orientation: float
+        building_width: float, building_depth: float, orientation: float, rng=random,
+        site: Optional[SiteDistanceField] = None
     ) -> List[Point3D]:
         """Generate organic building positions with some regularity"""
         
+        if site is None:
+            site = SiteDistanceField.of(site_polygon)
+        
         # Start with a loose grid
         grid_positions = ParametricDesign._generate_grid_positions(
-            site_polygon, num_buildings * 2, building_width, building_depth, orientation
+            site_polygon, num_buildings * 2, building_width, building_depth, orientation, site
         )
         
         # Add randomization to grid positions
@@ -761,22 +724,27 @@ class ParametricDesign:
         variation = min(building_width, building_depth) * 0.3  # 30% variation
         min_distance = max(building_width, building_depth) + 5.0
         
-        for pos in grid_positions:
-            if len(positions) >= num_buildings:
-                break
-            
-            # Add random offset
-            offset_x = random.uniform(-variation, variation)
-            offset_y = random.uniform(-variation, variation)
-            
-            new_pos = Point3D(pos.x + offset_x, pos.y + offset_y, pos.z)
+        if not grid_positions or num_buildings <= 0:
+            return positions
+        
+        # Add random offset to every grid position, then test them in one call
+        sampler = UniformSampler(rng, [(-variation, variation), (-variation, variation)])
+        offsets = sampler.draw(len(grid_positions))
+        moved = as_coords(grid_positions)[:, :2] + offsets
+        inside = site.rectangles_within(moved, building_width, building_depth)
+        used = len(grid_positions)
+        
+        for index, (x, y) in enumerate(moved.tolist()):
+            new_pos = Point3D(x, y, grid_positions[index].z)
             
             # Check if still inside polygon and maintains minimum distance
-            if (ParametricDesign._is_building_inside_polygon(
-                new_pos, building_width, building_depth, site_polygon
-            ) and ParametricDesign._check_minimum_distance(new_pos, positions, min_distance)):
+            if inside[index] and ParametricDesign._check_minimum_distance(new_pos, positions, min_distance):
                 positions.append(new_pos)
+                if len(positions) >= num_buildings:
+                    used = index + 1
+                    break
         
+        sampler.rewind(used)
         return positions
     
     @staticmethod
@@ -785,17 +753,7 @@ class ParametricDesign:
     ) -> bool:
         """Check if all corners of a building are inside the polygon"""
         
-        half_width = width / 2
-        half_depth = depth / 2
-        
-        corners = [
-            Point3D(center.x - half_width, center.y - half_depth, center.z),
-            Point3D(center.x + half_width, center.y - half_depth, center.z),
-            Point3D(center.x + half_width, center.y + half_depth, center.z),
-            Point3D(center.x - half_width, center.y + half_depth, center.z)
-        ]
-        
-        return all(GeometryUtils.point_in_polygon_2d(corner, polygon) for corner in corners)
+        return bool(rectangles_in_polygon([center], width, depth, polygon)[0])
     
     @staticmethod
     def _check_minimum_distance(
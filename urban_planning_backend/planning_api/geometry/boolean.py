@@ -0,0 +1,406 @@
+# planning_api/geometry/boolean.py - Polygon intersection, union and difference
+"""
+Boolean operations on simple polygons by edge subdivision, Martinez style.
+
+Edges of both polygons are swept together to find where they cross, in
+O((n + k) log n). Every edge is split at its crossings, each piece is
+classified as inside, outside or shared with the other polygon from the
+containment of its midpoint, and the operation keeps the pieces its rule
+selects. The kept pieces are chained back into rings. Results use the
+usual convention: outer rings counter-clockwise, holes clockwise.
+
+clip_polygons runs the same steps for many subjects against one clip
+polygon. A single sweep finds every subject/clip crossing, and subjects
+that cross nothing are settled by one containment test each.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .sweep import sweep_intersections
+from .utils import PreparedPolygon, as_coords, points_in_polygon, signed_area
+
+BOOLEAN_OPERATIONS = ('intersection', 'union', 'difference')
+
+# Polygons with more vertices than this get a PreparedPolygon for classification
+BOOLEAN_PREPARE_MIN_VERTICES = 32
+
+# Pieces kept from the subject and from the clip polygon for each operation;
+# the clip polygon's pieces are reversed for a difference
+_KEEP = {
+    'intersection': ({'inside', 'same'}, {'inside'}, False),
+    'union': ({'outside', 'same'}, {'outside'}, False),
+    'difference': ({'outside', 'opposite'}, {'inside'}, True),
+}
+
+
+def _ring(polygon) -> Tuple[np.ndarray, float]:
+    """Counter-clockwise (n, 2) ring without closing or repeated vertices, and its mean z"""
+    coords = as_coords(polygon)
+    z = float(coords[:, 2].mean()) if len(coords) else 0.0
+    xy = coords[:, :2]
+    if len(xy) > 1 and np.array_equal(xy[0], xy[-1]):
+        xy = xy[:-1]
+    if len(xy):
+        xy = xy[np.any(xy != np.roll(xy, 1, axis=0), axis=1)]
+    if len(xy) >= 3 and signed_area(xy) < 0:
+        xy = xy[::-1]
+    return np.ascontiguousarray(xy), z
+
+
+def _contains(polygon: np.ndarray, points: np.ndarray, prepared=None) -> np.ndarray:
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    if prepared is None and len(polygon) > BOOLEAN_PREPARE_MIN_VERTICES:
+        prepared = PreparedPolygon(polygon)
+    if prepared is not None:
+        return prepared.contains_points(points)
+    return points_in_polygon(points, polygon)
+
+
+def _touching(rows: List[List[float]], tolerance: float):
+    """Pair predicate accepting crossing, touching and collinear overlapping segments"""
+    def predicate(i: int, j: int) -> bool:
+        ax, ay, bx, by = rows[i]
+        cx, cy, dx, dy = rows[j]
+        ux, uy, vx, vy = bx - ax, by - ay, dx - cx, dy - cy
+        length_u, length_v = math.hypot(ux, uy), math.hypot(vx, vy)
+        if length_u == 0 or length_v == 0:
+            return False
+        denom = ux * vy - uy * vx
+        wx, wy = cx - ax, cy - ay
+        if abs(denom) <= 1e-12 * length_u * length_v:
+            if abs(wx * uy - wy * ux) > tolerance * length_u:
+                return False
+            low = min(wx * ux + wy * uy, (dx - ax) * ux + (dy - ay) * uy)
+            high = max(wx * ux + wy * uy, (dx - ax) * ux + (dy - ay) * uy)
+            return low <= length_u * (length_u + tolerance) and high >= -tolerance * length_u
+        t = (wx * vy - wy * vx) / denom
+        u = (wx * uy - wy * ux) / denom
+        slack_u, slack_v = tolerance / length_u, tolerance / length_v
+        return -slack_u <= t <= 1 + slack_u and -slack_v <= u <= 1 + slack_v
+    return predicate
+
+
+class _Nodes:
+    """Vertex identities shared by both polygons, merged when closer than tolerance"""
+
+    def __init__(self):
+        self.parent: Dict[Tuple[float, float], Tuple[float, float]] = {}
+
+    def find(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        parent = self.parent.setdefault(point, point)
+        while parent != point:
+            grandparent = self.parent[parent]
+            self.parent[point] = grandparent
+            point, parent = parent, grandparent
+        return point
+
+    def merge(self, point: Tuple[float, float], keep: Tuple[float, float]):
+        root, target = self.find(point), self.find(keep)
+        if root != target:
+            self.parent[root] = target
+
+
+class _Overlay:
+    """Subject and clip rings split at their crossings"""
+
+    def __init__(self, subject: np.ndarray, clip: np.ndarray, tolerance: float):
+        self.rings = (subject, clip)
+        self.tolerance = tolerance
+        self.nodes = _Nodes()
+        # Split points per (ring, edge), as (distance along the edge, point)
+        self.splits: Dict[Tuple[int, int], List[Tuple[float, Tuple[float, float]]]] = {}
+
+    def _vertex(self, ring: int, index: int) -> Tuple[float, float]:
+        xy = self.rings[ring]
+        x, y = xy[index % len(xy)]
+        return float(x), float(y)
+
+    def _add_split(self, ring: int, edge: int, point: Tuple[float, float]):
+        """Split edge at point; points within tolerance of an end merge into that vertex"""
+        start, end = self._vertex(ring, edge), self._vertex(ring, edge + 1)
+        ux, uy = end[0] - start[0], end[1] - start[1]
+        length = math.hypot(ux, uy)
+        along = ((point[0] - start[0]) * ux + (point[1] - start[1]) * uy) / length
+        if along <= self.tolerance:
+            self.nodes.merge(point, start)
+        elif along >= length - self.tolerance:
+            self.nodes.merge(point, end)
+        else:
+            self.splits.setdefault((ring, edge), []).append((along, point))
+
+    def add_crossing(self, i: int, j: int):
+        """Record where subject edge i meets clip edge j"""
+        a, b = self._vertex(0, i), self._vertex(0, i + 1)
+        c, d = self._vertex(1, j), self._vertex(1, j + 1)
+        ux, uy, vx, vy = b[0] - a[0], b[1] - a[1], d[0] - c[0], d[1] - c[1]
+        length_u, length_v = math.hypot(ux, uy), math.hypot(vx, vy)
+        denom = ux * vy - uy * vx
+
+        if abs(denom) <= 1e-12 * length_u * length_v:
+            # Collinear overlap: each edge is split at the other's ends
+            for point in (c, d):
+                along = ((point[0] - a[0]) * ux + (point[1] - a[1]) * uy) / length_u
+                if -self.tolerance <= along <= length_u + self.tolerance:
+                    self._add_split(0, i, point)
+            for point in (a, b):
+                along = ((point[0] - c[0]) * vx + (point[1] - c[1]) * vy) / length_v
+                if -self.tolerance <= along <= length_v + self.tolerance:
+                    self._add_split(1, j, point)
+            return
+
+        wx, wy = c[0] - a[0], c[1] - a[1]
+        t = min(max((wx * vy - wy * vx) / denom, 0.0), 1.0)
+        u = min(max((wx * uy - wy * ux) / denom, 0.0), 1.0)
+        # Crossings at a vertex reuse the vertex so both rings share it exactly
+        if t * length_u <= self.tolerance:
+            point = a
+        elif (1 - t) * length_u <= self.tolerance:
+            point = b
+        elif u * length_v <= self.tolerance:
+            point = c
+        elif (1 - u) * length_v <= self.tolerance:
+            point = d
+        else:
+            point = (a[0] + t * ux, a[1] + t * uy)
+        self._add_split(0, i, point)
+        self._add_split(1, j, point)
+
+    def pieces(self, ring: int, edges=None) -> List[Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """(start node, end node) of every piece of the ring's edges, in ring order"""
+        xy = self.rings[ring]
+        if edges is None:
+            edges = range(len(xy))
+        find = self.nodes.find
+        result = []
+        for edge in edges:
+            points = [self._vertex(ring, edge)]
+            points.extend(point for _, point in sorted(self.splits.get((ring, edge), ())))
+            points.append(self._vertex(ring, edge + 1))
+            previous = find(points[0])
+            for point in points[1:]:
+                node = find(point)
+                if node != previous:
+                    result.append((previous, node))
+                    previous = node
+        return result
+
+
+def _classify(pieces, other: np.ndarray, other_pieces, prepared=None) -> List[str]:
+    """'same' or 'opposite' for pieces shared with other_pieces, else 'inside' or 'outside' other"""
+    shared = {}
+    for start, end in other_pieces:
+        shared[(start, end)] = 'same'
+        shared[(end, start)] = 'opposite'
+
+    labels = [shared.get(piece) for piece in pieces]
+    open_pieces = [k for k, label in enumerate(labels) if label is None]
+    if open_pieces:
+        midpoints = np.array([
+            ((pieces[k][0][0] + pieces[k][1][0]) / 2, (pieces[k][0][1] + pieces[k][1][1]) / 2)
+            for k in open_pieces
+        ])
+        inside = _contains(other, midpoints, prepared)
+        for k, hit in zip(open_pieces, inside.tolist()):
+            labels[k] = 'inside' if hit else 'outside'
+    return labels
+
+
+def _chain(pieces, z: float, tolerance: float) -> List[np.ndarray]:
+    """Link directed pieces into closed (k, 3) rings
+
+    Where several pieces leave one node the walk takes the sharpest left
+    turn, hugging the area on its left, so rings touching at a vertex come
+    out separately.
+    """
+    outgoing: Dict[Tuple[float, float], List[int]] = {}
+    for index, (start, _) in enumerate(pieces):
+        outgoing.setdefault(start, []).append(index)
+
+    used = [False] * len(pieces)
+    rings = []
+    for first in range(len(pieces)):
+        if used[first]:
+            continue
+        origin = pieces[first][0]
+        ring = []
+        current = first
+        while True:
+            used[current] = True
+            start, end = pieces[current]
+            ring.append(start)
+            if end == origin:
+                break
+            choices = [k for k in outgoing.get(end, ()) if not used[k]]
+            if not choices:
+                ring = None
+                break
+            if len(choices) > 1:
+                dx, dy = end[0] - start[0], end[1] - start[1]
+
+                def turn(k):
+                    ex, ey = pieces[k][1][0] - end[0], pieces[k][1][1] - end[1]
+                    return math.atan2(dx * ey - dy * ex, dx * ex + dy * ey)
+                choices.sort(key=turn, reverse=True)
+            current = choices[0]
+
+        if ring is None or len(ring) < 3:
+            continue
+        xy = np.array(ring, dtype=float)
+
+        # Vertices left in the middle of straight runs by the splitting go
+        incoming = xy - np.roll(xy, 1, axis=0)
+        leaving = np.roll(xy, -1, axis=0) - xy
+        cross = incoming[:, 0] * leaving[:, 1] - incoming[:, 1] * leaving[:, 0]
+        lengths = np.linalg.norm(incoming, axis=1) * np.linalg.norm(leaving, axis=1)
+        straight = (np.abs(cross) <= 1e-12 * lengths) & (np.einsum('ij,ij->i', incoming, leaving) > 0)
+        xy = xy[~straight]
+
+        if len(xy) < 3:
+            continue
+        extent = float(np.linalg.norm(xy.max(axis=0) - xy.min(axis=0)))
+        if abs(signed_area(xy)) <= tolerance * extent:
+            continue
+        rings.append(np.column_stack([xy, np.full(len(xy), z)]))
+    return rings
+
+
+def _as_rings(xy: np.ndarray, z: float, reverse: bool = False) -> List[np.ndarray]:
+    if reverse:
+        xy = xy[::-1]
+    return [np.column_stack([xy, np.full(len(xy), z)])]
+
+
+def _disjoint_result(subject, clip, z, operation, subject_in_clip, clip_in_subject) -> List[np.ndarray]:
+    """Result when the boundaries never meet"""
+    if subject_in_clip:
+        if operation == 'intersection':
+            return _as_rings(subject, z)
+        if operation == 'union':
+            return _as_rings(clip, z)
+        return []
+    if clip_in_subject:
+        if operation == 'intersection':
+            return _as_rings(clip, z)
+        if operation == 'union':
+            return _as_rings(subject, z)
+        return _as_rings(subject, z) + _as_rings(clip, z, reverse=True)
+    if operation == 'intersection':
+        return []
+    if operation == 'union':
+        return _as_rings(subject, z) + _as_rings(clip, z)
+    return _as_rings(subject, z)
+
+
+def _overlay_result(overlay: _Overlay, clip_edges, operation: str, z: float,
+                    clip_prepared=None) -> List[np.ndarray]:
+    subject, clip = overlay.rings
+    keep_subject, keep_clip, reverse_clip = _KEEP[operation]
+
+    subject_pieces = overlay.pieces(0)
+    clip_pieces = overlay.pieces(1, clip_edges)
+    subject_labels = _classify(subject_pieces, clip, clip_pieces, clip_prepared)
+    clip_labels = _classify(clip_pieces, subject, subject_pieces)
+
+    kept = [piece for piece, label in zip(subject_pieces, subject_labels) if label in keep_subject]
+    for (start, end), label in zip(clip_pieces, clip_labels):
+        if label in keep_clip:
+            kept.append((end, start) if reverse_clip else (start, end))
+    return _chain(kept, z, overlay.tolerance)
+
+
+def _check_operation(operation: str):
+    if operation not in BOOLEAN_OPERATIONS:
+        raise ValueError(f"Unknown boolean operation {operation!r}, expected one of {BOOLEAN_OPERATIONS}")
+
+
+def polygon_boolean(subject, clip, operation: str = 'intersection',
+                    tolerance: float = 1e-6) -> List[np.ndarray]:
+    """Rings of subject combined with clip, as (k, 3) arrays
+
+    operation is 'intersection', 'union' or 'difference' (subject minus
+    clip). Both inputs are simple polygons in any form as_coords accepts.
+    """
+    return clip_polygons([subject], clip, operation, tolerance)[0]
+
+
+def clip_polygons(subjects, clip, operation: str = 'intersection',
+                  tolerance: float = 1e-6) -> List[List[np.ndarray]]:
+    """polygon_boolean of each subject with one clip polygon, sharing one sweep
+
+    subjects is a sequence of polygons or a (K, V, 2)/(K, V, 3) array such
+    as rectangle_corners output. Returns the rings for each subject.
+    """
+    _check_operation(operation)
+    clip_xy, clip_z = _ring(clip)
+    rings = [_ring(subject) for subject in subjects]
+    results: List[List[np.ndarray]] = [[] for _ in rings]
+    if not rings:
+        return results
+
+    if len(clip_xy) < 3:
+        for k, (xy, z) in enumerate(rings):
+            if len(xy) >= 3 and operation != 'intersection':
+                results[k] = _as_rings(xy, z)
+        return results
+
+    # One sweep over every subject edge plus the clip edges; only subject/clip pairs count
+    valid = [k for k, (xy, _) in enumerate(rings) if len(xy) >= 3]
+    owners = np.concatenate([np.full(len(rings[k][0]), k) for k in valid] + [np.full(len(clip_xy), -1)])
+    starts = np.concatenate([[0], np.cumsum([len(rings[k][0]) for k in valid])]).astype(int)
+    first_edge = dict(zip(valid, starts[:-1].tolist()))
+    xy_all = [rings[k][0] for k in valid] + [clip_xy]
+    segments = np.vstack([np.hstack([xy, np.roll(xy, -1, axis=0)]) for xy in xy_all])
+    rows = segments.tolist()
+    owner = owners.tolist()
+    clip_start = int(starts[-1])
+
+    def excluded(i: int, j: int) -> bool:
+        return (owner[i] < 0) == (owner[j] < 0)
+
+    crossings: Dict[int, List[Tuple[int, int]]] = {}
+    for i, j in sweep_intersections(segments, predicate=_touching(rows, tolerance),
+                                    excluded=excluded, tolerance=tolerance):
+        k = owner[i]
+        crossings.setdefault(k, []).append((i - first_edge[k], j - clip_start))
+
+    prepared = PreparedPolygon.of(clip) if len(clip_xy) > BOOLEAN_PREPARE_MIN_VERTICES else None
+    apart = [k for k in valid if k not in crossings]
+    if apart:
+        probes = np.array([rings[k][0][0] for k in apart])
+        inside = _contains(clip_xy, probes, prepared).tolist()
+        for k, subject_in_clip in zip(apart, inside):
+            xy, z = rings[k]
+            clip_in_subject = not subject_in_clip and bool(points_in_polygon(clip_xy[:1], xy)[0])
+            results[k] = _disjoint_result(xy, clip_xy, z, operation, subject_in_clip, clip_in_subject)
+
+    # Clip edges not crossed by a subject can only be inside it if they start within its bounds
+    order = np.argsort(clip_xy[:, 0], kind='stable')
+    sorted_x = clip_xy[order, 0]
+    for k, pairs in crossings.items():
+        xy, z = rings[k]
+        overlay = _Overlay(xy, clip_xy, tolerance)
+        for i, j in pairs:
+            overlay.add_crossing(i, j)
+
+        if operation == 'union':
+            clip_edges = range(len(clip_xy))
+        else:
+            low, high = xy.min(axis=0) - tolerance, xy.max(axis=0) + tolerance
+            window = order[np.searchsorted(sorted_x, low[0], 'left'):np.searchsorted(sorted_x, high[0], 'right')]
+            window = window[(clip_xy[window, 1] >= low[1]) & (clip_xy[window, 1] <= high[1])]
+            clip_edges = sorted(set(window.tolist()) | {j for _, j in pairs})
+        results[k] = _overlay_result(overlay, clip_edges, operation, z, prepared)
+
+    return results
+
+
+def clipped_areas(subjects, clip, tolerance: float = 1e-6) -> np.ndarray:
+    """(K,) area of each subject lying inside clip, e.g. footprint area within a setback"""
+    return np.array([
+        sum(signed_area(ring[:, :2]) for ring in rings)
+        for rings in clip_polygons(subjects, clip, 'intersection', tolerance)
+    ], dtype=float)
@@ -162,7 +162,7 @@ class BrepFaceAddOn:
             raise ValueError("Face loop is not representable as a polyline")
         
         # Check for self-intersection
-        if IntersectionAddOn.check_polyline_self(face_polyline, tolerance, True):
+        if IntersectionAddOn.check_polyline_self(face_polyline, True):
             raise ValueError("Face loop self intersects")
         
         # Get curve plane
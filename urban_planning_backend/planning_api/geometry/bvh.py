@@ -0,0 +1,270 @@
+# planning_api/geometry/bvh.py - Bounding box hierarchy over polyline segments
+"""
+Axis-aligned bounding box tree over the segments of a polyline.
+
+Built once per curve (cached on PolylineArray) by splitting the segments at
+the median of their box centers along the widest axis. Box, closest-point
+and pair queries descend only into boxes that can matter, so a query costs
+roughly O(log n + hits) and a curve-curve check between two trees tests the
+segment pairs whose boxes overlap instead of all n * m pairs.
+
+A single box or closest-point query on a polyline without a cached tree is
+cheaper as one vectorized scan than as a tree build; segments_near_box and
+closest_parameter pick between the two.
+"""
+
+import heapq
+from typing import List, Tuple
+
+import numpy as np
+
+from .utils import ArcLengthTable, PolylineArray, as_coords
+
+# Segments per leaf; leaves are tested with one vectorized comparison
+BVH_LEAF_SIZE = 8
+
+
+class SegmentBoxTree:
+    """AABB tree over the segments coords[i] -> coords[i + 1] of a polyline
+
+    Nodes are stored flat: node_low/node_high are the (M, 3) boxes, leaves
+    have left == -1 and cover order[first:first + count].
+    """
+
+    def __init__(self, polyline, leaf_size: int = BVH_LEAF_SIZE):
+        coords = as_coords(polyline)
+        self.coords = coords
+        self.table = ArcLengthTable(coords)
+        if len(coords) >= 2:
+            self.starts = coords[:-1]
+            self.directions = np.diff(coords, axis=0)
+        else:
+            self.starts = self.directions = np.empty((0, 3))
+        self._build(max(1, leaf_size))
+
+    @classmethod
+    def from_segments(cls, starts, ends, leaf_size: int = BVH_LEAF_SIZE) -> 'SegmentBoxTree':
+        """Tree over unconnected segments starts[i] -> ends[i]; zero-length segments index points
+
+        Segment indices follow the input order. There is no arc-length table,
+        so closest_parameter is unavailable.
+        """
+        tree = cls.__new__(cls)
+        tree.starts = as_coords(starts)
+        tree.directions = as_coords(ends) - tree.starts
+        tree.coords = tree.table = None
+        tree._build(max(1, leaf_size))
+        return tree
+
+    @classmethod
+    def of(cls, polyline) -> 'SegmentBoxTree':
+        """Tree for a polyline or point list, cached on PolylineArray instances"""
+        if isinstance(polyline, cls):
+            return polyline
+        if isinstance(polyline, PolylineArray):
+            return polyline._cached('segment_tree', cls)
+        return cls(polyline)
+
+    def _build(self, leaf_size: int):
+        self.low = np.minimum(self.starts, self.starts + self.directions)
+        self.high = np.maximum(self.starts, self.starts + self.directions)
+        count = len(self.starts)
+        self.order = np.arange(count)
+        centers = (self.low + self.high) / 2
+        lows, highs, firsts, counts, lefts, rights = [], [], [], [], [], []
+
+        if count:
+            pending = [(0, count, -1, False)]
+            while pending:
+                first, last, parent, is_right = pending.pop()
+                node = len(lows)
+                if parent >= 0:
+                    (rights if is_right else lefts)[parent] = node
+
+                members = self.order[first:last]
+                lows.append(self.low[members].min(axis=0))
+                highs.append(self.high[members].max(axis=0))
+                firsts.append(first)
+                counts.append(last - first)
+                lefts.append(-1)
+                rights.append(-1)
+                if last - first <= leaf_size:
+                    continue
+
+                # Median split along the widest spread of segment centers
+                spread = centers[members]
+                axis = int(np.argmax(spread.max(axis=0) - spread.min(axis=0)))
+                middle = (last - first) // 2
+                self.order[first:last] = members[np.argpartition(spread[:, axis], middle)]
+                pending.append((first + middle, last, node, True))
+                pending.append((first, first + middle, node, False))
+
+        self.node_low = np.array(lows).reshape(-1, 3)
+        self.node_high = np.array(highs).reshape(-1, 3)
+        self._nodes = (self.node_low.tolist(), self.node_high.tolist(), firsts, counts, lefts, rights)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_low)
+
+    def query_box(self, low, high, tolerance: float = 0.0) -> np.ndarray:
+        """Sorted indices of segments whose boxes overlap [low, high] grown by tolerance"""
+        if self.node_count == 0:
+            return np.empty(0, dtype=np.intp)
+        low = np.asarray(low, dtype=float) - tolerance
+        high = np.asarray(high, dtype=float) + tolerance
+        lx, ly, lz = low.tolist()
+        hx, hy, hz = high.tolist()
+        node_low, node_high, firsts, counts, lefts, rights = self._nodes
+
+        found = []
+        pending = [0]
+        while pending:
+            node = pending.pop()
+            a, b = node_low[node], node_high[node]
+            if a[0] > hx or b[0] < lx or a[1] > hy or b[1] < ly or a[2] > hz or b[2] < lz:
+                continue
+            if lefts[node] < 0:
+                members = self.order[firsts[node]:firsts[node] + counts[node]]
+                hits = np.all((self.low[members] <= high) & (self.high[members] >= low), axis=1)
+                found.append(members[hits])
+            else:
+                pending.append(rights[node])
+                pending.append(lefts[node])
+
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.intp)
+
+    def overlapping_pairs(self, other: 'SegmentBoxTree', tolerance: float = 0.0) -> List[Tuple[int, int]]:
+        """Sorted (i, j) of segments of this tree and other whose boxes are within tolerance
+
+        Dual-tree traversal: node pairs whose boxes are apart are dropped
+        together with everything below them.
+        """
+        if self.node_count == 0 or other.node_count == 0:
+            return []
+        a_low, a_high, a_first, a_count, a_left, a_right = self._nodes
+        b_low, b_high, b_first, b_count, b_left, b_right = other._nodes
+
+        found = []
+        pending = [(0, 0)]
+        while pending:
+            a, b = pending.pop()
+            la, ha, lb, hb = a_low[a], a_high[a], b_low[b], b_high[b]
+            if (la[0] > hb[0] + tolerance or lb[0] > ha[0] + tolerance or
+                    la[1] > hb[1] + tolerance or lb[1] > ha[1] + tolerance or
+                    la[2] > hb[2] + tolerance or lb[2] > ha[2] + tolerance):
+                continue
+
+            a_leaf, b_leaf = a_left[a] < 0, b_left[b] < 0
+            if a_leaf and b_leaf:
+                members_a = self.order[a_first[a]:a_first[a] + a_count[a]]
+                members_b = other.order[b_first[b]:b_first[b] + b_count[b]]
+                hits = np.all(
+                    (self.low[members_a, None, :] <= other.high[None, members_b, :] + tolerance) &
+                    (other.low[None, members_b, :] <= self.high[members_a, None, :] + tolerance),
+                    axis=2
+                )
+                rows, columns = np.nonzero(hits)
+                found.extend(zip(members_a[rows].tolist(), members_b[columns].tolist()))
+            elif b_leaf or (not a_leaf and a_count[a] >= b_count[b]):
+                pending.append((a_right[a], b))
+                pending.append((a_left[a], b))
+            else:
+                pending.append((a, b_right[b]))
+                pending.append((a, b_left[b]))
+
+        found.sort()
+        return found
+
+    def closest_segment(self, point) -> Tuple[float, int, float]:
+        """(distance, segment, t) of the closest point on the polyline, t in [0, 1] along the segment
+
+        Boxes are visited nearest first and skipped once they are farther than
+        the best hit; ties go to the lowest segment index like a linear scan.
+        """
+        target = as_coords([point])[0]
+        if self.node_count == 0:
+            return float('inf'), -1, 0.0
+        node_low, node_high, firsts, counts, lefts, rights = self._nodes
+        tx, ty, tz = target.tolist()
+
+        def box_distance(node):
+            a, b = node_low[node], node_high[node]
+            dx = max(a[0] - tx, 0.0, tx - b[0])
+            dy = max(a[1] - ty, 0.0, ty - b[1])
+            dz = max(a[2] - tz, 0.0, tz - b[2])
+            return (dx * dx + dy * dy + dz * dz) ** 0.5
+
+        best = (float('inf'), -1, 0.0)
+        queue = [(box_distance(0), 0)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > best[0]:
+                break
+            if lefts[node] >= 0:
+                for child in (lefts[node], rights[node]):
+                    child_distance = box_distance(child)
+                    if child_distance <= best[0]:
+                        heapq.heappush(queue, (child_distance, child))
+                continue
+
+            # Same arithmetic as ArcLengthTable.closest_parameters
+            members = self.order[firsts[node]:firsts[node] + counts[node]]
+            starts, directions = self.starts[members], self.directions[members]
+            length_squared = np.einsum('ij,ij->i', directions, directions)
+            projection = np.einsum('ij,ij->i', target - starts, directions)
+            t = np.clip(np.divide(projection, length_squared, out=np.zeros_like(projection),
+                                  where=length_squared > 0), 0.0, 1.0)
+            gaps = np.linalg.norm(starts + t[:, None] * directions - target, axis=1)
+            for gap, segment, segment_t in zip(gaps.tolist(), members.tolist(), t.tolist()):
+                if gap < best[0] or (gap == best[0] and segment < best[1]):
+                    best = (gap, segment, segment_t)
+
+        return best
+
+    def closest_parameter(self, point) -> Tuple[float, float]:
+        """(distance, normalized parameter) of the closest point on the polyline"""
+        distance, segment, t = self.closest_segment(point)
+        total = self.table.total
+        if segment < 0 or total <= 0:
+            return distance, 0.0
+        parameter = (self.table.cumulative[segment] + t * self.table.segment_lengths[segment]) / total
+        return distance, float(parameter)
+
+    def __repr__(self) -> str:
+        return f'SegmentBoxTree(segments={len(self.starts)}, nodes={self.node_count})'
+
+
+def _has_tree(polyline) -> bool:
+    return isinstance(polyline, (SegmentBoxTree, PolylineArray))
+
+
+def segments_near_box(polyline, low, high, tolerance: float = 0.0) -> np.ndarray:
+    """Sorted indices of segments whose boxes overlap [low, high] grown by tolerance
+
+    Uses the cached tree of a PolylineArray, or scans the segments of any
+    other polyline once.
+    """
+    if _has_tree(polyline):
+        return SegmentBoxTree.of(polyline).query_box(low, high, tolerance)
+    coords = as_coords(polyline)
+    if len(coords) < 2:
+        return np.empty(0, dtype=np.intp)
+    low = np.asarray(low, dtype=float) - tolerance
+    high = np.asarray(high, dtype=float) + tolerance
+    starts, ends = coords[:-1], coords[1:]
+    hits = np.all((np.minimum(starts, ends) <= high) & (np.maximum(starts, ends) >= low), axis=1)
+    return np.flatnonzero(hits)
+
+
+def closest_parameter(polyline, point) -> Tuple[float, float]:
+    """(distance, normalized parameter) of the closest point on the polyline
+
+    Uses the cached tree of a PolylineArray, or one vectorized scan over
+    the segments of any other polyline; both pick the lowest segment on ties.
+    """
+    if _has_tree(polyline):
+        return SegmentBoxTree.of(polyline).closest_parameter(point)
+    distances, parameters = ArcLengthTable.of(polyline).closest_parameters([point])
+    return float(distances[0]), float(parameters[0])
+
@@ -1,73 +1,7 @@
 # planning_api/geometry/clustering.py
-import math
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any
-from dataclasses import dataclass
-
-
-@dataclass
-class Point3D:
-    """3D Point representation"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def distance_to(self, other: 'Point3D') -> float:
-        """Calculate distance to another point"""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
-    
-    def translate(self, vector: 'Vector3D') -> 'Point3D':
-        """Translate point by vector"""
-        return Point3D(self.x + vector.x, self.y + vector.y, self.z + vector.z)
-
-
-@dataclass
-class Vector3D:
-    """3D Vector representation"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def length(self) -> float:
-        """Calculate vector length"""
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
-    
-    def normalize(self) -> 'Vector3D':
-        """Return normalized vector"""
-        length = self.length()
-        if length == 0:
-            return Vector3D(0, 0, 0)
-        return Vector3D(self.x / length, self.y / length, self.z / length)
-    
-    def dot(self, other: 'Vector3D') -> float:
-        """Dot product with another vector"""
-        return self.x * other.x + self.y * other.y + self.z * other.z
-    
-    def cross(self, other: 'Vector3D') -> 'Vector3D':
-        """Cross product with another vector"""
-        return Vector3D(
-            self.y * other.z - self.z * other.y,
-            self.z * other.x - self.x * other.z,
-            self.x * other.y - self.y * other.x
-        )
-    
-    def angle_between(self, other: 'Vector3D') -> float:
-        """Calculate angle to another vector in radians"""
-        dot_product = self.dot(other)
-        lengths = self.length() * other.length()
-        if lengths == 0:
-            return 0
-        cos_angle = max(-1, min(1, dot_product / lengths))
-        return math.acos(cos_angle)
-    
-    def __mul__(self, scalar: float) -> 'Vector3D':
-        return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
-    
-    def __add__(self, other: 'Vector3D') -> 'Vector3D':
-        return Vector3D(self.x + other.x, self.y + other.y, self.z + other.z)
-    
-    def __sub__(self, other: 'Vector3D') -> 'Vector3D':
-        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
+from ..primitives import Point3D
 
 
 class Cluster:
@@ -128,17 +62,18 @@ class MultiClusters:
     """Collection of clusters"""
     
     def __init__(self, clusters: List[Cluster] = None):
-        self._clusters = set(clusters or [])
+        # Insertion-ordered so iteration matches singleton indices in the distance matrix
+        self._clusters = dict.fromkeys(clusters or [])
     
     @property
     def count(self) -> int:
         return len(self._clusters)
     
     def add(self, cluster: Cluster):
-        self._clusters.add(cluster)
+        self._clusters[cluster] = None
     
     def remove(self, cluster: Cluster):
-        self._clusters.discard(cluster)
+        self._clusters.pop(cluster, None)
     
     def __iter__(self):
         return iter(self._clusters)
@@ -291,17 +226,19 @@ class AgglomerativeClustering:
 
 
 # planning_api/geometry/voronoi.py
-import math
 import heapq
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
 
-@dataclass
-class VPoint:
+class VPoint(Point3D):
     """Voronoi point"""
-    x: float
-    y: float
+    
+    # Empty slots keep Point3D's x, y, z slots and add no instance __dict__
+    __slots__ = ()
+    
+    def __repr__(self):
+        return f'VPoint(x={self.x!r}, y={self.y!r})'
 
 
 @dataclass
@@ -1,14 +1,16 @@
 # planning_api/geometry/curve_addon.py
 import math
 from typing import List, Tuple, Optional, Union
-from .utils import Point3D, Vector3D, Line, Plane, Polyline, GeometryUtils
+import numpy as np
+from .utils import Point3D, Vector3D, Plane, Polyline, GeometryUtils
 from .constants import Constants
 from .plane_addon import PlaneAddOn
-from .point3d_addon import Point3DAddOn
 from .vector3d_addon import Vector3DAddOn
 from .line_addon import LineAddOn
 from .polyline_addon import PolylineAddOn
 from .intersection_addon import IntersectionAddOn
+from .bvh import closest_parameter
+from .transforms import planar_contains
 
 
 class PointContainment:
@@ -158,47 +160,11 @@ class CurveAddOn:
         
         if not polyline.is_closed:
             return PointContainment.UNSET
+        if not plane.is_valid:
+            raise ValueError("Plane is not valid")
         
-        # Project polyline onto plane
-        projected_polyline = PolylineAddOn.project_onto_plane(polyline, plane)
-        if projected_polyline is None:
-            return PointContainment.UNSET
-        
-        # Project point onto plane
-        projected_point = Point3DAddOn.project_onto_plane(point, plane)
-        if projected_point is None:
-            return PointContainment.UNSET
-        
-        # Transform to XY plane for easier computation
-        transform_to_xy = GeometryUtils.plane_to_plane_transform(plane, Plane.world_xy())
-        
-        # Transform polyline and point
-        transformed_polyline = GeometryUtils.transform_polyline(projected_polyline, transform_to_xy)
-        transformed_point = GeometryUtils.transform_point(projected_point, transform_to_xy)
-        
-        # Get bounding box and create test ray
-        bbox = transformed_polyline.get_bounding_box()
-        max_point = Point3D(bbox[1].x + tolerance * 3, bbox[1].y + tolerance * 3, bbox[1].z)
-        
-        if max_point.distance_to(transformed_point) <= tolerance:
-            return PointContainment.OUTSIDE
-        
-        intersecting_line = Line(max_point, transformed_point)
-        intersections = 0
-        
-        for i in range(len(transformed_polyline.points) - 1):
-            start = transformed_polyline.points[i]
-            end = transformed_polyline.points[i + 1]
-            line = Line(start, end)
-            
-            if IntersectionAddOn.line_line(line, intersecting_line, tolerance, True)[0]:
-                closest_point = line.closest_point(transformed_point, True)
-                if closest_point.distance_to(transformed_point) <= tolerance:
-                    return PointContainment.COINCIDENT
-                
-                intersections += 1
-        
-        return PointContainment.INSIDE if intersections % 2 == 1 else PointContainment.OUTSIDE
+        # Plane frame and projected polyline are cached per PolylineArray and plane
+        return planar_contains(polyline, point, plane, tolerance)
     
     @staticmethod
     def closest_point(curve: Union[Polyline, List[Point3D]], point: Point3D, 
@@ -214,29 +180,12 @@ class CurveAddOn:
         if not success or polyline is None:
             raise ValueError("Curve is not representable as a polyline")
         
-        closest_distance, closest_parameter = polyline.closest_parameter(point)
+        # Nearest segment as a normalized (arc length) parameter
+        closest_distance, curve_parameter = closest_parameter(polyline, point)
         
-        if (closest_parameter < 0.0 or closest_parameter > (len(polyline.points) - 1) or
-            closest_distance > maximum_distance):
+        if closest_distance > maximum_distance:
             return False, 0.0
         
-        # Convert polyline parameter to curve parameter
-        point_index = 0
-        length = 0.0
-        t = closest_parameter
-        
-        while t >= 1:
-            length += polyline.points[point_index].distance_to(polyline.points[point_index + 1])
-            point_index += 1
-            t -= 1
-        
-        if point_index == (len(polyline.points) - 1):
-            # At end of curve
-            curve_parameter = 1.0
-        else:
-            length += (polyline.points[point_index].distance_to(polyline.points[point_index + 1]) * t)
-            curve_parameter = length / polyline.length
-        
         return True, curve_parameter
     
     @staticmethod
@@ -384,4 +333,23 @@ class CurveAddOn:
         if not success or polyline is None:
             raise ValueError("Curve is not representable as a polyline")
         
-        return polyline.point_at_parameter(length)
\ No newline at end of file
+        return polyline.point_at_parameter(length)
+    
+    @staticmethod
+    def points_at_normalized_lengths(curve: Union[Polyline, List[Point3D]], lengths,
+                                     approx: bool = True) -> List[Point3D]:
+        """
+        Get points at many normalized length parameters (0-1) with one arc-length table lookup
+        """
+        if curve is None:
+            raise ValueError("Curve is null")
+        
+        lengths = np.asarray(lengths, dtype=float)
+        if np.any((lengths < 0) | (lengths > 1)):
+            raise ValueError("Length parameter must be between 0 and 1")
+        
+        success, polyline = CurveAddOn.try_get_polyline(curve, approx)
+        if not success or polyline is None:
+            raise ValueError("Curve is not representable as a polyline")
+        
+        return [Point3D(*point) for point in polyline.points_at_parameters(lengths).tolist()]
\ No newline at end of file
@@ -0,0 +1,211 @@
+# planning_api/geometry/distance_field.py - Raster signed-distance field of a site boundary
+"""
+Signed distance to a site boundary, sampled once on a regular raster.
+
+Each raster node stores the exact distance to the boundary, positive inside
+the site and negative outside. The signed distance changes by at most the
+distance moved, so the node nearest a query point bounds the point's value
+to within their separation. Points and footprints whose bounds settle a
+test are answered by the lookup alone; only those close to the threshold
+fall back to the exact test: PreparedPolygon crossing numbers, plus segment
+distances when a clearance is asked for.
+
+With clearance 0 the answers are exactly those of points_in_polygon and
+rectangles_in_polygon, so callers can switch without changing results.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .bvh import SegmentBoxTree
+from .segments import intersect_segments_2d
+from .utils import (
+    POINT_IN_POLYGON_CHUNK, PolylineArray, PolylinePoints, PreparedPolygon, as_coords, rectangle_corners,
+)
+
+# Default raster size; sites are small, so a coarse raster already settles most queries
+SDF_MAX_NODES = 1 << 12
+
+
+def _segment_distances_2d(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                          chunk_size: int = POINT_IN_POLYGON_CHUNK) -> np.ndarray:
+    """Distance from each (M, 2) point to the nearest of the segments starts[i] -> ends[i]"""
+    result = np.full(len(points), np.inf)
+    if len(starts) == 0:
+        return result
+    (sx, sy), (ux, uy) = starts.T, (ends - starts).T
+    length_squared = ux * ux + uy * uy
+    inverse = np.divide(1.0, length_squared, out=np.zeros_like(length_squared), where=length_squared > 0)
+    rows = max(1, chunk_size // len(starts))
+
+    for first in range(0, len(points), rows):
+        dx = points[first:first + rows, 0:1] - sx
+        dy = points[first:first + rows, 1:2] - sy
+        t = np.clip((dx * ux + dy * uy) * inverse, 0.0, 1.0)
+        dx -= t * ux
+        dy -= t * uy
+        result[first:first + rows] = np.sqrt((dx * dx + dy * dy).min(axis=1))
+    return result
+
+
+class SiteDistanceField:
+    """Signed distance to a closed 2D polygon on a raster, with exact fallback
+
+    Values are positive inside. resolution is the node spacing; by default
+    it is chosen so the raster has about SDF_MAX_NODES nodes.
+    """
+
+    def __init__(self, polygon, resolution: Optional[float] = None):
+        vertices = as_coords(polygon)[:, :2]
+        if len(vertices) > 1 and np.array_equal(vertices[0], vertices[-1]):
+            vertices = vertices[:-1]
+        if len(vertices) < 3:
+            raise ValueError("Site polygon needs at least 3 vertices")
+
+        self.polygon = PreparedPolygon(vertices)
+        self.starts, self.ends = vertices, np.roll(vertices, -1, axis=0)
+        self.low, self.high = vertices.min(axis=0), vertices.max(axis=0)
+        extent = self.high - self.low
+        if resolution is None:
+            resolution = max(float(np.sqrt(extent[0] * extent[1] / SDF_MAX_NODES)),
+                             float(extent.max()) / SDF_MAX_NODES, 1e-9)
+        if not resolution > 0:
+            raise ValueError("Distance field resolution must be positive")
+        self.resolution = float(resolution)
+
+        # Nodes cover the bounding box with one cell of padding
+        self.origin = self.low - self.resolution
+        self.shape = tuple((np.ceil(extent / self.resolution).astype(int) + 3).tolist())
+        xs = self.origin[0] + np.arange(self.shape[0]) * self.resolution
+        ys = self.origin[1] + np.arange(self.shape[1]) * self.resolution
+        nodes = np.column_stack([np.repeat(xs, len(ys)), np.tile(ys, len(xs))])
+
+        distances = _segment_distances_2d(nodes, self.starts, self.ends)
+        inside = self.polygon.contains_points(nodes)
+        self.values = np.where(inside, distances, -distances).reshape(self.shape)
+
+        # A point is at most half a cell diagonal from its nearest node; add a rounding allowance
+        reach = self.resolution * np.sqrt(0.5) + 1e-9 * (float(extent.max()) + 1.0)
+        self._low = self.values.ravel() - reach
+        self._high = self.values.ravel() + reach
+        self._tree = None
+
+    @classmethod
+    def of(cls, polygon, resolution: Optional[float] = None) -> 'SiteDistanceField':
+        """Field for polygon, cached on PolylineArray instances (or their points views) per resolution"""
+        if isinstance(polygon, cls) and (resolution is None or resolution == polygon.resolution):
+            return polygon
+        if isinstance(polygon, PolylinePoints):
+            polygon = polygon._owner
+        if isinstance(polygon, PolylineArray):
+            return polygon._cached(('distance_field', resolution), lambda coords: cls(coords, resolution))
+        return cls(polygon, resolution)
+
+    def _nodes(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(flat index of the nearest node, whether that node exists) for (M, 2) points"""
+        scaled = (xy - self.origin) * (1.0 / self.resolution) + 0.5
+        in_grid = (scaled[:, 0] >= 0) & (scaled[:, 0] < self.shape[0]) & \
+            (scaled[:, 1] >= 0) & (scaled[:, 1] < self.shape[1])
+        cells = scaled.astype(np.int64)
+        return np.where(in_grid, cells[:, 0] * self.shape[1] + cells[:, 1], 0), in_grid
+
+    def _lower(self, xy: np.ndarray) -> np.ndarray:
+        flat, in_grid = self._nodes(xy)
+        return np.where(in_grid, self._low[flat], -np.inf)
+
+    def _upper(self, xy: np.ndarray) -> np.ndarray:
+        # Past the last node a point is over a cell outside the bounding box
+        flat, in_grid = self._nodes(xy)
+        return np.where(in_grid, self._high[flat], -self.resolution)
+
+    def bounds(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """(low, high) bounds on the signed distance of each (M, 2)/(M, 3) point"""
+        xy = as_coords(points)[:, :2]
+        return self._lower(xy), self._upper(xy)
+
+    def _exact_within(self, xy: np.ndarray, clearance: float) -> np.ndarray:
+        inside = self.polygon.contains_points(xy)
+        if clearance == 0:
+            return inside
+        distances = _segment_distances_2d(xy, self.starts, self.ends)
+        return np.where(inside, distances >= clearance, -distances > clearance)
+
+    def distances(self, points) -> np.ndarray:
+        """Exact signed distance of each point, positive inside"""
+        xy = as_coords(points)[:, :2]
+        distances = _segment_distances_2d(xy, self.starts, self.ends)
+        return np.where(self.polygon.contains_points(xy), distances, -distances)
+
+    def within(self, points, clearance: float = 0.0) -> np.ndarray:
+        """Boolean mask of points inside the site at least clearance from the boundary
+
+        A negative clearance also admits outside points closer than it.
+        With clearance 0 this is points_in_polygon.
+        """
+        xy = as_coords(points)[:, :2]
+        flat, in_grid = self._nodes(xy)
+        result = in_grid & (self._low[flat] > clearance)
+        unsure = ~result & ~(np.where(in_grid, self._high[flat], -self.resolution) < clearance)
+        if unsure.any():
+            result[unsure] = self._exact_within(xy[unsure], clearance)
+        return result
+
+    def rectangles_within(self, centers, width, depth, clearance: float = 0.0) -> np.ndarray:
+        """Boolean mask of axis-aligned footprints inside the site, clearance from the boundary
+
+        With clearance 0 only the four corners are tested, as in
+        rectangles_in_polygon. A positive clearance holds for the whole
+        footprint: its corners are inside and none of its edges comes closer
+        than clearance to the boundary.
+        """
+        corners = rectangle_corners(centers, width, depth)
+        count = len(corners)
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+        half_diagonal = np.broadcast_to(
+            np.hypot(np.asarray(width, dtype=float), np.asarray(depth, dtype=float)) / 2, (count,)
+        )
+
+        # Settled: the whole footprint is deep inside, or some corner is short of the clearance
+        center_low = self._lower(corners.mean(axis=1))
+        corner_high = self._upper(corners.reshape(-1, 2))
+        result = center_low - half_diagonal > clearance
+        unsure = np.flatnonzero(~result & ~(corner_high.reshape(-1, 4) < clearance).any(axis=1))
+        if len(unsure) == 0:
+            return result
+
+        corners_ok = self._exact_within(corners[unsure].reshape(-1, 2), max(clearance, 0.0))
+        corners_ok = corners_ok.reshape(-1, 4).all(axis=1)
+        if clearance > 0:
+            for index in np.flatnonzero(corners_ok).tolist():
+                corners_ok[index] = self._edges_clear(corners[unsure[index]], clearance)
+        result[unsure] = corners_ok
+        return result
+
+    def _edges_clear(self, corners: np.ndarray, clearance: float) -> bool:
+        """True if no footprint edge comes within clearance of a boundary edge"""
+        if self._tree is None:
+            zeros = np.zeros((len(self.starts), 1))
+            self._tree = SegmentBoxTree.from_segments(np.hstack([self.starts, zeros]),
+                                                      np.hstack([self.ends, zeros]))
+        low, high = corners.min(axis=0), corners.max(axis=0)
+        near = self._tree.query_box([low[0], low[1], 0.0], [high[0], high[1], 0.0], clearance)
+        if len(near) == 0:
+            return True
+
+        # Apart segments are closest at an end point of one of them
+        starts, ends = self.starts[near], self.ends[near]
+        following = np.roll(corners, -1, axis=0)
+        if _segment_distances_2d(corners, starts, ends).min() < clearance:
+            return False
+        if _segment_distances_2d(np.vstack([starts, ends]), corners, following).min() < clearance:
+            return False
+
+        edges = np.repeat(np.arange(4), len(near))
+        crossing, _, _ = intersect_segments_2d(corners[edges], following[edges],
+                                               np.tile(starts, (4, 1)), np.tile(ends, (4, 1)))
+        return not crossing.any()
+
+    def __repr__(self) -> str:
+        return f'SiteDistanceField(shape={self.shape}, resolution={self.resolution:.3g})'
@@ -2,80 +2,18 @@
 import math
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any, Union
-from dataclasses import dataclass
+from ..primitives import Point3D, Vector3D
+from .quantize import (
+    QUANTIZE_RESOLUTION, dequantize_coords, geometry_keys, key_hash, quantize_coords, ring_order, round_coords
+)
+from .segments import SegmentApproaches, closest_approaches
+from .snapping import snap_polylines
+from .utils import as_coords
 
 
-@dataclass
-class UPoint:
-    """3D Point for urban geometry operations"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def distance_to(self, other: 'UPoint') -> float:
-        """Calculate distance to another point"""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
-    
-    def translate(self, vector: 'UVector3') -> 'UPoint':
-        """Translate point by vector"""
-        return UPoint(self.x + vector.x, self.y + vector.y, self.z + vector.z)
-    
-    def get_envelope(self):
-        """Get bounding envelope for spatial indexing"""
-        return {
-            'min_x': self.x - 0.1, 'max_x': self.x + 0.1,
-            'min_y': self.y - 0.1, 'max_y': self.y + 0.1,
-            'min_z': self.z - 0.1, 'max_z': self.z + 0.1
-        }
-
-
-@dataclass
-class UVector3:
-    """3D Vector for urban geometry operations"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def length(self) -> float:
-        """Calculate vector length"""
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
-    
-    def normalize(self) -> 'UVector3':
-        """Return normalized vector"""
-        length = self.length()
-        if length == 0:
-            return UVector3(0, 0, 0)
-        return UVector3(self.x / length, self.y / length, self.z / length)
-    
-    def dot(self, other: 'UVector3') -> float:
-        """Dot product with another vector"""
-        return self.x * other.x + self.y * other.y + self.z * other.z
-    
-    def cross(self, other: 'UVector3') -> 'UVector3':
-        """Cross product with another vector"""
-        return UVector3(
-            self.y * other.z - self.z * other.y,
-            self.z * other.x - self.x * other.z,
-            self.x * other.y - self.y * other.x
-        )
-    
-    def angle_between(self, other: 'UVector3') -> float:
-        """Calculate angle to another vector in radians"""
-        dot_product = self.dot(other)
-        lengths = self.length() * other.length()
-        if lengths == 0:
-            return 0
-        cos_angle = max(-1, min(1, dot_product / lengths))
-        return math.acos(cos_angle)
-    
-    def __mul__(self, scalar: float) -> 'UVector3':
-        return UVector3(self.x * scalar, self.y * scalar, self.z * scalar)
-    
-    def __add__(self, other: 'UVector3') -> 'UVector3':
-        return UVector3(self.x + other.x, self.y + other.y, self.z + other.z)
-    
-    def __sub__(self, other: 'UVector3') -> 'UVector3':
-        return UVector3(self.x - other.x, self.y - other.y, self.z - other.z)
+# Point and vector types are shared with the rest of the geometry package
+UPoint = Point3D
+UVector3 = Vector3D
 
 
 class UPolyline:
@@ -156,9 +94,11 @@ class LinesIntersection3D:
         
         D = a * c - b * b
         
-        # Check if lines are parallel using angle
-        radian = u.angle_between(v)
-        gap = math.sin(radian) * min(u.length(), v.length())
+        # Check if lines are parallel using angle; lengths come from the dot products above
+        length_u, length_v = math.sqrt(a), math.sqrt(c)
+        lengths = length_u * length_v
+        radian = math.acos(max(-1, min(1, b / lengths))) if lengths != 0 else 0
+        gap = math.sin(radian) * min(length_u, length_v)
         
         if gap < self.tolerance:
             self.is_parallel = True
@@ -266,82 +206,44 @@ class LinesIntersection3D:
             return True
         
         return False
+    
+    def compute_many(self, p1, p2, q1, q2) -> SegmentApproaches:
+        """Classify many segment pairs at once; p1, p2, q1, q2 are (N, 3) arrays or point lists"""
+        return closest_approaches(p1, p2, q1, q2, self.tolerance)
 
 
 class LineStringSnapper3D:
-    """3D LineString snapping operations"""
+    """3D LineString snapping operations
+    
+    Every vertex within tolerance of another is moved onto one shared
+    representative; see geometry.snapping.
+    """
     
-    def __init__(self, polylines: List[UPolyline], tolerance: float = 1e-6):
+    def __init__(self, polylines: List[UPolyline], tolerance: float = 1e-6, to_segments: bool = False):
         self.tolerance = tolerance
-        self.polylines = list(set(polylines))  # Remove duplicates
-        self.end_points_position = {}
-        self.end_points = {}
-        self.visited = set()
-        
-        self._build_dict()
-        self._build_tree()
-    
-    def _build_dict(self):
-        """Build dictionary of endpoint positions"""
-        for i, polyline in enumerate(self.polylines):
-            endpoints = [polyline.first, polyline.last]
-            
-            for j, point in enumerate(endpoints):
-                if point not in self.end_points_position:
-                    self.end_points_position[point] = []
-                
-                position = 'start' if j == 0 else 'end'
-                self.end_points_position[point].append({
-                    'line_id': i,
-                    'position': position
-                })
-    
-    def _build_tree(self):
-        """Build spatial index for endpoints"""
-        for point in self.end_points_position.keys():
-            envelope = point.get_envelope()
-            # Expand by tolerance
-            for key in envelope:
-                if 'min' in key:
-                    envelope[key] -= self.tolerance * 0.5
-                else:
-                    envelope[key] += self.tolerance * 0.5
-            self.end_points[point] = envelope
+        self.to_segments = to_segments
+        self.polylines = list(dict.fromkeys(polylines))  # Remove duplicates, keeping order
     
     def snap(self):
         """Perform snapping operation"""
-        for point, envelope in self.end_points.items():
-            if point in self.visited:
-                continue
-            
-            self.visited.add(point)
-            
-            # Find nearby points
-            candidates = []
-            for other_point in self.end_points.keys():
-                if other_point != point and other_point not in self.visited:
-                    if point.distance_to(other_point) < self.tolerance:
-                        candidates.append(other_point)
-                        self.visited.add(other_point)
-            
-            # Snap candidates to current point
-            for candidate in candidates:
-                positions = self.end_points_position[candidate]
-                for pos_info in positions:
-                    line_id = pos_info['line_id']
-                    position = pos_info['position']
-                    
-                    if position == 'start':
-                        self.polylines[line_id].coordinates[0] = point
-                    else:
-                        self.polylines[line_id].coordinates[-1] = point
+        snapped = snap_polylines(
+            [polyline.coordinates for polyline in self.polylines], self.tolerance, self.to_segments
+        )
+        for polyline, coords in zip(self.polylines, snapped):
+            polyline.coordinates = [UPoint(x, y, z) for x, y, z in coords.tolist()]
+            polyline.num_points = len(polyline.coordinates)
 
 
 class GeometryComparer3D:
-    """3D geometry comparer for deduplication"""
+    """3D geometry comparer for deduplication
+    
+    Hash codes come from coordinates quantized to an int64 grid of the given
+    resolution (see geometry.quantize), so they are stable across processes.
+    """
     
-    def __init__(self, normalize: bool = True):
+    def __init__(self, normalize: bool = True, resolution: float = QUANTIZE_RESOLUTION):
         self.normalize = normalize
+        self.resolution = resolution
     
     def equals(self, geom1, geom2) -> bool:
         """Check if two geometries are equal"""
@@ -351,71 +253,90 @@ class GeometryComparer3D:
         if len(geom1.coordinates) != len(geom2.coordinates):
             return False
         
-        # Normalize geometries if needed
-        coords1 = geom1.coordinates
-        coords2 = geom2.coordinates
+        coords1 = as_coords(geom1.coordinates)
+        coords2 = as_coords(geom2.coordinates)
         
+        # Normalize geometries if needed
         if self.normalize:
-            coords1 = self._normalize_coordinates(coords1)
-            coords2 = self._normalize_coordinates(coords2)
+            coords1 = coords1[ring_order(coords1)]
+            coords2 = coords2[ring_order(coords2)]
         
         # Check coordinate equality
-        for i in range(len(coords1)):
-            if not self._points_equal(coords1[i], coords2[i]):
-                return False
-        
-        return True
+        return bool(np.all(np.abs(coords1 - coords2) < 1e-9))
     
     def _normalize_coordinates(self, coordinates: List[UPoint]) -> List[UPoint]:
         """Normalize coordinate order"""
         if len(coordinates) < 2:
             return coordinates
         
-        # Find minimum point as starting point
-        min_idx = 0
-        min_point = coordinates[0]
-        
-        for i, point in enumerate(coordinates):
-            if (point.x < min_point.x or 
-                (point.x == min_point.x and point.y < min_point.y) or
-                (point.x == min_point.x and point.y == min_point.y and point.z < min_point.z)):
-                min_point = point
-                min_idx = i
-        
-        # Reorder starting from minimum point
-        return coordinates[min_idx:] + coordinates[:min_idx]
+        # Start from the minimum point
+        return [coordinates[i] for i in ring_order(as_coords(coordinates)).tolist()]
     
-    def _points_equal(self, p1: UPoint, p2: UPoint, tolerance: float = 1e-9) -> bool:
-        """Check if two points are equal within tolerance"""
-        return (abs(p1.x - p2.x) < tolerance and 
-                abs(p1.y - p2.y) < tolerance and 
-                abs(p1.z - p2.z) < tolerance)
+    def get_key(self, geometry) -> bytes:
+        """Integer key of the geometry's quantized coordinates; equal keys mean equal geometries"""
+        if not hasattr(geometry, 'coordinates'):
+            return b''
+        return geometry_keys([geometry.coordinates], self.resolution, self.normalize)[0]
     
     def get_hash_code(self, geometry) -> int:
         """Get hash code for geometry"""
         if not hasattr(geometry, 'coordinates'):
             return 0
-        
-        coordinates = geometry.coordinates
-        if self.normalize:
-            coordinates = self._normalize_coordinates(coordinates)
-        
-        hash_code = 0
-        for i, point in enumerate(coordinates):
-            point_hash = self._get_coordinate_hash(point)
-            if i == 0:
-                hash_code = point_hash
-            else:
-                hash_code ^= point_hash * (i * 3 + 31)
-        
-        return hash_code
+        return key_hash(self.get_key(geometry))
+
+
+class GeometryIndex3D:
+    """Hash-bucket index of geometries by their quantized, normalized coordinates
+    
+    Keys for a batch of geometries are computed together, so adding or
+    deduplicating n geometries takes near-linear time instead of pairwise
+    equals calls.
+    """
+    
+    def __init__(self, normalize: bool = True, resolution: float = QUANTIZE_RESOLUTION):
+        self.comparer = GeometryComparer3D(normalize, resolution)
+        self.geometries = []
+        self.buckets: Dict[bytes, int] = {}
+    
+    def _keys(self, geometries: List[Any]) -> List[bytes]:
+        if any(not hasattr(geometry, 'coordinates') for geometry in geometries):
+            raise ValueError("Geometries must have coordinates")
+        return geometry_keys([geometry.coordinates for geometry in geometries],
+                             self.comparer.resolution, self.comparer.normalize)
+    
+    def add_all(self, geometries: List[Any]) -> List[int]:
+        """Add geometries; returns the index of each one or of the equal geometry already stored"""
+        geometries = list(geometries)
+        indices = []
+        for geometry, key in zip(geometries, self._keys(geometries)):
+            index = self.buckets.setdefault(key, len(self.geometries))
+            if index == len(self.geometries):
+                self.geometries.append(geometry)
+            indices.append(index)
+        return indices
+    
+    def add(self, geometry) -> bool:
+        """Add geometry; returns False if an equal geometry is already stored"""
+        count = len(self.geometries)
+        return self.add_all([geometry])[0] == count
+    
+    def index_of(self, geometry) -> int:
+        """Index of the stored geometry equal to geometry, or -1"""
+        return self.buckets.get(self._keys([geometry])[0], -1)
+    
+    def __contains__(self, geometry) -> bool:
+        return self.index_of(geometry) >= 0
+    
+    def __len__(self) -> int:
+        return len(self.geometries)
     
-    def _get_coordinate_hash(self, point: UPoint) -> int:
-        """Get hash code for a coordinate"""
-        x_hash = hash(round(point.x, 9))
-        y_hash = hash(round(point.y, 9))  
-        z_hash = hash(round(point.z, 9))
-        return (x_hash * 31) ^ (y_hash * 37) ^ (z_hash * 41)
+    @staticmethod
+    def deduplicate(geometries: List[Any], normalize: bool = True,
+                    resolution: float = QUANTIZE_RESOLUTION) -> List[Any]:
+        """First occurrence of each distinct geometry, in input order"""
+        index = GeometryIndex3D(normalize, resolution)
+        index.add_all(geometries)
+        return index.geometries
 
 
 # planning_api/geometry/advanced_operations.py
@@ -434,104 +355,38 @@ class Extension3D:
     @staticmethod
     def reduce_3d_precision(coordinates: List[UPoint], decimal_places: int) -> List[UPoint]:
         """Reduce 3D coordinate precision"""
-        result = []
-        for coord in coordinates:
-            result.append(UPoint(
-                round(coord.x, decimal_places),
-                round(coord.y, decimal_places),
-                round(coord.z, decimal_places)
-            ))
-        return result
+        rounded = round_coords(as_coords(coordinates), decimal_places)
+        return [UPoint(x, y, z) for x, y, z in rounded.tolist()]
+    
+    @staticmethod
+    def quantize_3d(coordinates: List[UPoint], resolution: float = QUANTIZE_RESOLUTION) -> np.ndarray:
+        """(N, 3) int64 coordinates on a grid of the given resolution"""
+        return quantize_coords(coordinates, resolution)
+    
+    @staticmethod
+    def reduce_3d_to_grid(coordinates: List[UPoint], resolution: float) -> List[UPoint]:
+        """Snap 3D coordinates to the nearest multiple of resolution"""
+        snapped = dequantize_coords(quantize_coords(coordinates, resolution), resolution)
+        return [UPoint(x, y, z) for x, y, z in snapped.tolist()]
     
     @staticmethod
     def reduce_geometry_precision(geometries: List[Any], decimal_places: int):
         """Reduce precision for multiple geometries"""
-        for geometry in geometries:
-            if hasattr(geometry, 'coordinates'):
-                geometry.coordinates = Extension3D.reduce_3d_precision(
-                    geometry.coordinates, decimal_places
-                )
+        geometries = [geometry for geometry in geometries if hasattr(geometry, 'coordinates')]
+        if not geometries:
+            return
+        
+        # Round every coordinate in one pass, then hand the rows back per geometry
+        parts = [as_coords(geometry.coordinates) for geometry in geometries]
+        rounded = round_coords(np.vstack(parts), decimal_places).tolist()
+        start = 0
+        for geometry, part in zip(geometries, parts):
+            geometry.coordinates = [UPoint(x, y, z) for x, y, z in rounded[start:start + len(part)]]
+            start += len(part)
 
 
-class PolylineSnapper3D:
-    """Enhanced polyline snapping with spatial indexing"""
-    
-    def __init__(self, polylines: List[UPolyline], tolerance: float = 1e-6):
-        self.tolerance = tolerance
-        self.polylines = list(set(polylines))
-        self.end_points_position = {}
-        self.spatial_index = {}
-        self.visited = set()
-        
-        self._build_spatial_structures()
-    
-    def _build_spatial_structures(self):
-        """Build spatial data structures for efficient snapping"""
-        # Grid-based spatial index
-        grid_size = self.tolerance * 10
-        
-        for i, polyline in enumerate(self.polylines):
-            endpoints = [polyline.first, polyline.last]
-            
-            for j, point in enumerate(endpoints):
-                # Add to position tracking
-                if point not in self.end_points_position:
-                    self.end_points_position[point] = []
-                
-                position = 'start' if j == 0 else 'end'
-                self.end_points_position[point].append({
-                    'line_id': i,
-                    'position': position
-                })
-                
-                # Add to spatial grid
-                grid_x = int(point.x / grid_size)
-                grid_y = int(point.y / grid_size)
-                grid_key = (grid_x, grid_y)
-                
-                if grid_key not in self.spatial_index:
-                    self.spatial_index[grid_key] = []
-                self.spatial_index[grid_key].append(point)
-    
-    def snap(self):
-        """Perform optimized snapping using spatial index"""
-        grid_size = self.tolerance * 10
-        
-        for point in list(self.end_points_position.keys()):
-            if point in self.visited:
-                continue
-            
-            self.visited.add(point)
-            
-            # Get candidates from nearby grid cells
-            grid_x = int(point.x / grid_size)
-            grid_y = int(point.y / grid_size)
-            
-            candidates = []
-            
-            # Check 3x3 grid around point
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    check_key = (grid_x + dx, grid_y + dy)
-                    if check_key in self.spatial_index:
-                        for candidate in self.spatial_index[check_key]:
-                            if (candidate != point and 
-                                candidate not in self.visited and
-                                point.distance_to(candidate) < self.tolerance):
-                                candidates.append(candidate)
-                                self.visited.add(candidate)
-            
-            # Snap all candidates to current point
-            for candidate in candidates:
-                positions = self.end_points_position[candidate]
-                for pos_info in positions:
-                    line_id = pos_info['line_id']
-                    position = pos_info['position']
-                    
-                    if position == 'start':
-                        self.polylines[line_id].coordinates[0] = point
-                    else:
-                        self.polylines[line_id].coordinates[-1] = point
+class PolylineSnapper3D(LineStringSnapper3D):
+    """Polyline snapping over a tolerance grid"""
     
     def get_snapped_polylines(self) -> List[UPolyline]:
         """Get the snapped polylines"""
@@ -575,10 +430,11 @@ class SegmentsIntersection3D:
         
         # Check parallelism using angle calculation
         try:
-            cos_angle = b / (u.length() * v.length()) if u.length() * v.length() > 0 else 0
+            length_u, length_v = u.length(), v.length()
+            cos_angle = b / (length_u * length_v) if length_u * length_v > 0 else 0
             cos_angle = max(-1, min(1, cos_angle))
             radiant = math.acos(abs(cos_angle))
-            gap = math.sin(radiant) * min(u.length(), v.length())
+            gap = math.sin(radiant) * min(length_u, length_v)
         except (ValueError, ZeroDivisionError):
             gap = float('inf')
         
@@ -1,8 +1,11 @@
 # planning_api/geometry/intersection_addon.py
-import math
 from typing import List, Tuple, Optional, Union
-from .utils import Point3D, Vector3D, Line, Plane, Polyline
+import numpy as np
+from .utils import Point3D, Vector3D, Line, Plane, Polyline, ArcLengthTable, as_coords
 from .constants import Constants
+from .sweep import polyline_segments, ring_neighbours, sweep_intersections
+from .bvh import SegmentBoxTree, closest_parameter, segments_near_box
+from .segments import intersect_lines, pair_segments
 from .line_addon import Interval
 from .vector3d_addon import Vector3DAddOn
 
@@ -133,6 +136,30 @@ class IntersectionAddOn:
         
         return True, sc, tc
     
+    @staticmethod
+    def _line_box(line: Line) -> Tuple[List[float], List[float]]:
+        """Bounding box of a line segment as (low, high)"""
+        start, end = line.start, line.end
+        return ([min(start.x, end.x), min(start.y, end.y), min(start.z, end.z)],
+                [max(start.x, end.x), max(start.y, end.y), max(start.z, end.z)])
+    
+    @staticmethod
+    def _intersecting_pairs(coords_a, coords_b, pairs,
+                            tolerance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(pairs, parameters_a, parameters_b) of the candidate segment pairs that meet
+        
+        One batch line_line test with finite segments over all candidates.
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        a_starts, a_ends, b_starts, b_ends = pair_segments(coords_a, coords_b, pairs)
+        if np.all(a_starts == a_ends, axis=1).any():
+            raise ValueError("First line is not valid")
+        if np.all(b_starts == b_ends, axis=1).any():
+            raise ValueError("Second line is not valid")
+        
+        hits, parameters_a, parameters_b = intersect_lines(a_starts, a_ends, b_starts, b_ends, tolerance, True)
+        return pairs[hits], parameters_a[hits], parameters_b[hits]
+    
     @staticmethod
     def line_polyline(line: Line, polyline: Polyline) -> List[Tuple[float, float]]:
         """
@@ -148,16 +175,15 @@ class IntersectionAddOn:
         if not polyline.is_valid:
             raise ValueError("Polyline is not valid")
         
-        result = []
-        
-        for i in range(len(polyline.points) - 1):
-            polyline_line = Line(polyline.points[i], polyline.points[i + 1])
-            intersects, t0, t1 = IntersectionAddOn.line_line(line, polyline_line, Constants.TOLERANCE, True)
-            
-            if intersects:
-                result.append((t0, t1))
+        # Only segments whose boxes come within tolerance of the line can meet it
+        low, high = IntersectionAddOn._line_box(line)
+        candidates = segments_near_box(polyline, low, high, Constants.TOLERANCE)
+        _, t0, t1 = IntersectionAddOn._intersecting_pairs(
+            as_coords([line.start, line.end]), as_coords(polyline),
+            np.column_stack([np.zeros_like(candidates), candidates]), Constants.TOLERANCE
+        )
         
-        return result
+        return list(zip(t0.tolist(), t1.tolist()))
     
     @staticmethod
     def check_polyline_self(polyline: Polyline, finite_segments: bool = True) -> bool:
@@ -172,23 +198,27 @@ class IntersectionAddOn:
         for i in range(len(polyline.points) - 1):
             lines.append(Line(polyline.points[i], polyline.points[i + 1]))
         
-        for i in range(len(lines)):
-            k = i - 1
-            if k < 0:
-                k = len(lines) - 1
-            
-            for j in range((i + 2) % len(lines), k, 1):
-                if j >= len(lines):
-                    j = j % len(lines)
-                if j == k:
-                    break
-                
-                intersects, _, _ = IntersectionAddOn.line_line(lines[i], lines[j], Constants.TOLERANCE, finite_segments)
-                
-                if intersects:
-                    return True
-        
-        return False
+        def intersects(i: int, j: int) -> bool:
+            # Zero-length segments from repeated vertices cannot be tested; skip them
+            if not (lines[i].is_valid and lines[j].is_valid):
+                return False
+            return IntersectionAddOn.line_line(lines[i], lines[j], Constants.TOLERANCE, finite_segments)[0]
+        
+        excluded = ring_neighbours(len(lines))
+        
+        if not finite_segments:
+            # Unbounded lines can meet anywhere, so every pair has to be tested
+            return any(
+                intersects(i, j)
+                for i in range(len(lines)) for j in range(i + 1, len(lines))
+                if not excluded(i, j)
+            )
+        
+        # Segments that meet in 3D also meet in the XY projection, so a sweep
+        # over the projected segments finds every candidate pair
+        segments = polyline_segments(as_coords(polyline.points))
+        return bool(sweep_intersections(segments, intersects, excluded, first_only=True,
+                                        tolerance=Constants.TOLERANCE))
     
     @staticmethod
     def check_curve_curve(curve_a: Union[Polyline, List[Point3D]], 
@@ -214,33 +244,18 @@ class IntersectionAddOn:
             return polyline_a.points[0].distance_to(polyline_b.points[0]) <= tolerance
         
         if len(polyline_a.points) == 1:
-            for i in range(len(polyline_b.points) - 1):
-                line_b = Line(polyline_b.points[i], polyline_b.points[i + 1])
-                closest = line_b.closest_point(polyline_a.points[0], True)
-                if closest.distance_to(polyline_a.points[0]) <= tolerance:
-                    return True
-            return False
+            return closest_parameter(polyline_b, polyline_a.points[0])[0] <= tolerance
         
         if len(polyline_b.points) == 1:
-            for i in range(len(polyline_a.points) - 1):
-                line_a = Line(polyline_a.points[i], polyline_a.points[i + 1])
-                closest = line_a.closest_point(polyline_b.points[0], True)
-                if closest.distance_to(polyline_b.points[0]) <= tolerance:
-                    return True
-            return False
-        
-        # Check line-line intersections
-        for i in range(len(polyline_a.points) - 1):
-            line_a = Line(polyline_a.points[i], polyline_a.points[i + 1])
-            
-            for j in range(len(polyline_b.points) - 1):
-                line_b = Line(polyline_b.points[j], polyline_b.points[j + 1])
-                intersects, _, _ = IntersectionAddOn.line_line(line_a, line_b, tolerance, True)
-                
-                if intersects:
-                    return True
+            return closest_parameter(polyline_a, polyline_b.points[0])[0] <= tolerance
         
-        return False
+        # Check line-line intersections for segment pairs whose boxes are within tolerance
+        pairs = SegmentBoxTree.of(polyline_a).overlapping_pairs(SegmentBoxTree.of(polyline_b), tolerance)
+        hits, _, _ = IntersectionAddOn._intersecting_pairs(
+            as_coords(polyline_a), as_coords(polyline_b), pairs, tolerance
+        )
+        
+        return len(hits) > 0
     
     @staticmethod
     def line_overlap(line: Line, overlap_line: Line, tolerance: float) -> Optional[Interval]:
@@ -355,9 +370,17 @@ class IntersectionAddOn:
             raise ValueError("Polyline is not valid")
         
         overlaps = []
-        
-        for i in range(len(polyline.points) - 1):
-            polyline_line = Line(polyline.points[i], polyline.points[i + 1])
+        points = polyline.points
+        
+        # Overlaps need line_line to succeed, so candidates are filtered in one batch first
+        low, high = IntersectionAddOn._line_box(line)
+        candidates = segments_near_box(polyline, low, high, tolerance)
+        hits, _, _ = IntersectionAddOn._intersecting_pairs(
+            as_coords([line.start, line.end]), as_coords(polyline),
+            np.column_stack([np.zeros_like(candidates), candidates]), tolerance
+        )
+        for i in hits[:, 1].tolist():
+            polyline_line = Line(points[i], points[i + 1])
             overlap = IntersectionAddOn.line_line_overlap(line, polyline_line, tolerance)
             
             if overlap is not None:
@@ -390,64 +413,82 @@ class IntersectionAddOn:
             raise ValueError("Curves are not representable as polylines")
         
         intersections = []
+        points_a, points_b = polyline_a.points, polyline_b.points
         
-        for i in range(len(polyline_a.points) - 1):
-            line = Line(polyline_a.points[i], polyline_a.points[i + 1])
-            overlaps = IntersectionAddOn.line_polyline_overlaps(line, polyline_b, tolerance)
+        # Same events as line_polyline_overlaps per segment of A, for near segment pairs that
+        # pass the batch line_line test
+        pairs = SegmentBoxTree.of(polyline_a).overlapping_pairs(SegmentBoxTree.of(polyline_b), tolerance)
+        hits, _, _ = IntersectionAddOn._intersecting_pairs(
+            as_coords(polyline_a), as_coords(polyline_b), pairs, tolerance
+        )
+        for i, j in hits.tolist():
+            line_a = Line(points_a[i], points_a[i + 1])
+            overlap = IntersectionAddOn.line_line_overlap(line_a, Line(points_b[j], points_b[j + 1]), tolerance)
             
-            for overlap in overlaps:
-                # Adjust curve A parameter
+            if overlap is not None:
+                # Adjust both parameters to global polyline coordinates
                 overlap.overlap_a = Interval(
                     i + overlap.overlap_a.t0,
                     i + overlap.overlap_a.t1
                 )
+                overlap.overlap_b = Interval(
+                    j + overlap.overlap_b.t0,
+                    j + overlap.overlap_b.t1
+                )
                 intersections.append(overlap)
         
         # Combine overlaps if needed (simplified version)
         final_intersections = []
-        
-        for intersection in intersections:
-            # Convert polyline parameters to curve parameters
-            if polyline_a.length > 0:
-                from .polyline_addon import PolylineAddOn
-                
-                length_at_param1 = PolylineAddOn.length_at_param(polyline_a, intersection.overlap_a.t0)
-                length_at_param2 = PolylineAddOn.length_at_param(polyline_a, intersection.overlap_a.t1)
-                
-                if not (math.isnan(length_at_param1) or math.isnan(length_at_param2)):
-                    # Check if it's a point intersection
-                    if abs(length_at_param2 - length_at_param1) <= overlap_tolerance:
-                        intersection.type = 1  # Point
-                    
-                    # Convert to normalized curve parameters (0-1)
-                    intersection.overlap_a = Interval(
-                        length_at_param1 / polyline_a.length,
-                        length_at_param2 / polyline_a.length
-                    )
-                    
-                    # Update points
-                    intersection.point_a = polyline_a.point_at_parameter(intersection.overlap_a.t0)
-                    intersection.point_a2 = polyline_a.point_at_parameter(intersection.overlap_a.t1)
-                    
-                    # Similar for curve B
-                    length_at_param1_b = PolylineAddOn.length_at_param(polyline_b, intersection.overlap_b.t0)
-                    length_at_param2_b = PolylineAddOn.length_at_param(polyline_b, intersection.overlap_b.t1)
-                    
-                    if not (math.isnan(length_at_param1_b) or math.isnan(length_at_param2_b)):
-                        intersection.overlap_b = Interval(
-                            length_at_param1_b / polyline_b.length,
-                            length_at_param2_b / polyline_b.length
-                        )
-                        
-                        intersection.point_b = polyline_b.point_at_parameter(intersection.overlap_b.t0)
-                        intersection.point_b2 = polyline_b.point_at_parameter(intersection.overlap_b.t1)
-                        
-                        if intersection.is_point:
-                            intersection.point_a2 = intersection.point_a
-                            intersection.point_b2 = intersection.point_b
-                            intersection.overlap_a = Interval(intersection.overlap_a.t0, intersection.overlap_a.t0)
-                            intersection.overlap_b = Interval(intersection.overlap_b.t0, intersection.overlap_b.t0)
-                        
-                        final_intersections.append(intersection)
+        if not intersections:
+            return final_intersections
+        
+        # Convert polyline parameters to curve parameters for every event at once,
+        # using one cumulative-length table per curve
+        table_a = ArcLengthTable.of(polyline_a)
+        table_b = ArcLengthTable.of(polyline_b)
+        length_a = table_a.total
+        length_b = table_b.total
+        if length_a <= 0:
+            return final_intersections
+        
+        lengths_a = table_a.lengths_at([[i.overlap_a.t0, i.overlap_a.t1] for i in intersections])
+        lengths_b = table_b.lengths_at([[i.overlap_b.t0, i.overlap_b.t1] for i in intersections])
+        valid_a = ~np.isnan(lengths_a).any(axis=1)
+        valid_b = ~np.isnan(lengths_b).any(axis=1) if length_b > 0 else np.zeros(len(intersections), dtype=bool)
+        
+        # Normalized (0-1) parameters and the points there
+        normalized_a = np.where(valid_a[:, None], lengths_a, 0.0) / length_a
+        normalized_b = np.where(valid_b[:, None], lengths_b, 0.0) / (length_b if length_b > 0 else 1.0)
+        points_a = table_a.points_at(normalized_a).reshape(-1, 2, 3).tolist()
+        points_b = table_b.points_at(normalized_b).reshape(-1, 2, 3).tolist()
+        
+        for index, intersection in enumerate(intersections):
+            if not valid_a[index]:
+                continue
+            
+            # Check if it's a point intersection
+            length_at_param1, length_at_param2 = lengths_a[index]
+            if abs(length_at_param2 - length_at_param1) <= overlap_tolerance:
+                intersection.type = 1  # Point
+            
+            intersection.overlap_a = Interval(float(normalized_a[index, 0]), float(normalized_a[index, 1]))
+            intersection.point_a = Point3D(*points_a[index][0])
+            intersection.point_a2 = Point3D(*points_a[index][1])
+            
+            # Similar for curve B
+            if not valid_b[index]:
+                continue
+            
+            intersection.overlap_b = Interval(float(normalized_b[index, 0]), float(normalized_b[index, 1]))
+            intersection.point_b = Point3D(*points_b[index][0])
+            intersection.point_b2 = Point3D(*points_b[index][1])
+            
+            if intersection.is_point:
+                intersection.point_a2 = intersection.point_a
+                intersection.point_b2 = intersection.point_b
+                intersection.overlap_a = Interval(intersection.overlap_a.t0, intersection.overlap_a.t0)
+                intersection.overlap_b = Interval(intersection.overlap_b.t0, intersection.overlap_b.t0)
+            
+            final_intersections.append(intersection)
         
         return final_intersections
\ No newline at end of file
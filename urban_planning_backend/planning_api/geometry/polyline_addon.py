@@ -1,12 +1,14 @@
 # planning_api/geometry/polyline_addon.py
 import math
 from typing import List, Tuple, Optional
-from .utils import Point3D, Vector3D, Line, Plane, Polyline, GeometryUtils
+import numpy as np
+from .utils import Point3D, Vector3D, Line, Plane, Polyline, PolylineArray, GeometryUtils, ArcLengthTable, as_coords
 from .constants import Constants
-from .plane_addon import PlaneAddOn
 from .point3d_addon import Point3DAddOn
 from .vector3d_addon import Vector3DAddOn
 from .line_addon import LineAddOn
+from .triangulate import triangulate_polygon
+from .transforms import planar_contains, project_onto_plane
 
 
 class PointContainment:
@@ -66,15 +68,7 @@ class PolylineAddOn:
         if not target_plane.is_valid:
             raise ValueError("Plane is not valid")
         
-        output_points = []
-        
-        for vertex in polyline.points:
-            projected_point = PlaneAddOn.project_point(target_plane, vertex)
-            if projected_point is None:
-                return None
-            output_points.append(projected_point)
-        
-        return Polyline(output_points)
+        return PolylineArray(project_onto_plane(as_coords(polyline), target_plane))
     
     @staticmethod
     def length_at_param(polyline: Polyline, parameter: float) -> float:
@@ -87,21 +81,18 @@ class PolylineAddOn:
         if parameter < 0.0 or parameter > (len(polyline.points) - 1):
             return float('nan')
         
-        point_index = 0
-        length = 0.0
-        t = parameter
-        
-        while t >= 1:
-            length += polyline.points[point_index].distance_to(polyline.points[point_index + 1])
-            point_index += 1
-            t -= 1
-        
-        if point_index == (len(polyline.points) - 1):
-            length = polyline.length
-        else:
-            length += (polyline.points[point_index].distance_to(polyline.points[point_index + 1]) * t)
+        # Cumulative segment lengths, cached on array-backed polylines
+        return float(ArcLengthTable.of(polyline).lengths_at(parameter))
+    
+    @staticmethod
+    def lengths_at_params(polyline: Polyline, parameters) -> np.ndarray:
+        """Length at many parameters along polyline in one call; NaN where out of range"""
+        if polyline is None:
+            raise ValueError("Polyline is null")
+        if not polyline.is_valid:
+            raise ValueError("Polyline is not valid")
         
-        return length
+        return ArcLengthTable.of(polyline).lengths_at(parameters)
     
     @staticmethod
     def remove_repeating_points(polyline: Polyline) -> Polyline:
@@ -112,6 +103,11 @@ class PolylineAddOn:
         if len(polyline.points) == 0:
             return Polyline([])
         
+        if isinstance(polyline, PolylineArray):
+            coords = polyline.coords
+            keep = np.concatenate([[True], polyline.segment_lengths > Constants.TOLERANCE])
+            return PolylineArray(coords[keep])
+        
         result_points = [polyline.points[0]]
         
         for i in range(1, len(polyline.points)):
@@ -202,62 +198,11 @@ class PolylineAddOn:
             raise ValueError("Polyline is not valid")
         if not polyline.is_closed:
             return PointContainment.UNSET
+        if plane is None or not plane.is_valid:
+            raise ValueError("Plane is not valid")
         
-        # Project polyline onto plane
-        projected_polyline = PolylineAddOn.project_onto_plane(polyline, plane)
-        if projected_polyline is None:
-            return PointContainment.UNSET
-        
-        # Project point onto plane
-        projected_point = Point3DAddOn.project_onto_plane(point, plane)
-        if projected_point is None:
-            return PointContainment.UNSET
-        
-        # Transform to XY plane for easier computation
-        transform_to_xy = GeometryUtils.plane_to_plane_transform(plane, Plane.world_xy())
-        
-        # Apply transformation
-        transformed_polyline = GeometryUtils.transform_polyline(projected_polyline, transform_to_xy)
-        transformed_point = GeometryUtils.transform_point(projected_point, transform_to_xy)
-        
-        # Get bounding box
-        bbox = transformed_polyline.get_bounding_box()
-        max_point = Point3D(bbox[1].x + 1, bbox[1].y + 1, bbox[1].z)
-        
-        intersecting_line = Line(transformed_point, max_point)
-        intersections = 0
-        skip = False
-        
-        for i in range(len(transformed_polyline.points) - 1):
-            if skip:
-                skip = False
-                continue
-            
-            start = transformed_polyline.points[i]
-            end = transformed_polyline.points[i + 1]
-            line = Line(start, end)
-            
-            # Import here to avoid circular import
-            from .intersection_addon import IntersectionAddOn
-            
-            if IntersectionAddOn.line_line(line, intersecting_line, Constants.TOLERANCE, True)[0]:
-                closest_point = line.closest_point(transformed_point, True)
-                if closest_point.distance_to(transformed_point) <= Constants.TOLERANCE:
-                    return PointContainment.COINCIDENT
-                
-                intersections += 1
-                
-                # Check if intersection is at vertex to avoid double counting
-                line_to_point = Vector3D(
-                    line.end.x - transformed_point.x,
-                    line.end.y - transformed_point.y,
-                    line.end.z - transformed_point.z
-                )
-                
-                if Vector3DAddOn.is_parallel_to(line_to_point, intersecting_line.direction) == 1:
-                    skip = True
-        
-        return PointContainment.INSIDE if intersections % 2 == 1 else PointContainment.OUTSIDE
+        # Plane frame and projected polyline are cached per PolylineArray and plane
+        return planar_contains(polyline, point, plane, Constants.TOLERANCE)
     
     @staticmethod
     def cut_by_planes(polyline: Polyline, tolerance: float) -> List[Polyline]:
@@ -352,7 +297,11 @@ class PolylineAddOn:
             raise ValueError("Polyline self-intersects")
         
         result = []
-        polylines = PolylineAddOn.cut_by_planes(polyline, tolerance)
+        if GeometryUtils.get_polyline_plane(polyline, tolerance) is not None:
+            # Planar outlines are triangulated whole
+            polylines = [polyline]
+        else:
+            polylines = PolylineAddOn.cut_by_planes(polyline, tolerance)
         
         for poly in polylines:
             points = poly.points[:-1]  # Remove closing point
@@ -360,57 +309,8 @@ class PolylineAddOn:
             if len(points) < 3:
                 continue
             
-            i = 0
-            
-            while len(points) > 3:
-                j = (i - 1) % len(points)
-                start_point = points[j]
-                mid_point = points[i]
-                end_point = points[(i + 1) % len(points)]
-                
-                s_to_m = Vector3D(mid_point.x - start_point.x, mid_point.y - start_point.y, mid_point.z - start_point.z)
-                s_to_e = Vector3D(end_point.x - start_point.x, end_point.y - start_point.y, end_point.z - start_point.z)
-                
-                # Check for degenerate triangle
-                if (s_to_m.length() == 0 or s_to_e.length() == 0 or 
-                    Vector3DAddOn.is_parallel_to(s_to_m, s_to_e) != 0):
-                    points.pop(i)
-                    i = i % len(points)
-                    continue
-                
-                # Check if triangle is an "ear"
-                check_point = Point3D(
-                    (start_point.x + end_point.x) / 2,
-                    (start_point.y + end_point.y) / 2,
-                    (start_point.z + end_point.z) / 2
-                )
-                
-                # Create current polyline for containment test
-                current_poly = Polyline(points + [points[0]])
-                triangle_plane = Plane.from_three_points(start_point, mid_point, end_point)
-                
-                if triangle_plane is not None:
-                    contained = PolylineAddOn.contains(current_poly, check_point, triangle_plane)
-                    
-                    # Count intersections with triangle edge
-                    edge_line = Line(end_point, start_point)
-                    intersections = IntersectionAddOn.line_polyline(edge_line, current_poly)
-                    
-                    if len(intersections) <= 4 and (contained == PointContainment.INSIDE or contained == PointContainment.COINCIDENT):
-                        # Valid ear - create triangle
-                        triangle_points = [start_point, mid_point, end_point, start_point]
-                        result.append(Polyline(triangle_points))
-                        points.pop(i)
-                        i = i % len(points)
-                    else:
-                        i = (i + 1) % len(points)
-                else:
-                    i = (i + 1) % len(points)
-            
-            # Add final triangle
-            if len(points) == 3:
-                final_triangle = Polyline(points + [points[0]])
-                result.append(final_triangle)
+            for a, b, c in triangulate_polygon(points).tolist():
+                result.append(Polyline([points[a], points[b], points[c], points[a]]))
         
         return result
     
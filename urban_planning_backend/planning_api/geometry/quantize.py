@@ -0,0 +1,126 @@
+# planning_api/geometry/quantize.py - Fixed-point coordinates and integer geometry keys
+"""
+Coordinates snapped to an integer grid of a given resolution.
+
+Quantized coordinates are int64 multiples of the resolution, so equality,
+hashing and ordering are exact integer operations instead of tolerance
+comparisons between floats. A geometry's key is the raw bytes of its
+quantized, normalized coordinates: equal keys mean equal geometries at that
+resolution, and keys work directly as dict keys for hash-bucket dedup.
+"""
+
+import hashlib
+from typing import List, Sequence
+
+import numpy as np
+
+from .utils import as_coords
+
+# Default grid step, matching the 1e-9 tolerance of GeometryComparer3D
+QUANTIZE_RESOLUTION = 1e-9
+
+# Largest grid coordinate; leaves headroom so differences of two keys cannot overflow int64
+_MAX_GRID = 2.0 ** 62
+
+
+def round_coords(values, decimal_places: int) -> np.ndarray:
+    """Float values rounded to decimal_places exactly as Python's round()
+
+    np.round scales by 10 ** decimal_places before rounding, and the
+    scaling can push a value across a half: 2.675 becomes 2.68, where
+    round() gives 2.67. Values whose scaled fraction is within two ulps of
+    a half, or too large to scale exactly, are rounded with round(); the
+    rest agree with round() and stay vectorized.
+    """
+    values = np.asarray(values, dtype=float)
+    if not 0 <= decimal_places <= 22:
+        return np.array([round(value, decimal_places) for value in values.ravel().tolist()]).reshape(values.shape)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = values * 10.0 ** decimal_places
+        rounded = np.rint(scaled) / 10.0 ** decimal_places
+        magnitude = np.abs(scaled)
+        near_half = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) <= 2 * np.spacing(magnitude)
+        unsure = np.flatnonzero(near_half | ~(magnitude < 2.0 ** 52))
+    if len(unsure):
+        rounded.flat[unsure] = [round(value, decimal_places) for value in values.flat[unsure].tolist()]
+    return rounded
+
+
+def quantize_coords(coords, resolution: float = QUANTIZE_RESOLUTION) -> np.ndarray:
+    """(N, 3) int64 grid coordinates: each value rounded to the nearest multiple of resolution"""
+    if not resolution > 0:
+        raise ValueError("Quantization resolution must be positive")
+    scaled = as_coords(coords) / resolution
+    if scaled.size and not np.all(np.abs(scaled) < _MAX_GRID):
+        raise ValueError("Coordinates are not finite or too large for the quantization resolution")
+    return np.rint(scaled).astype(np.int64)
+
+
+def dequantize_coords(keys, resolution: float = QUANTIZE_RESOLUTION) -> np.ndarray:
+    """Float coordinates of int64 grid coordinates"""
+    keys = np.asarray(keys, dtype=np.int64)
+    scale = 1.0 / resolution
+    if scale >= 1 and scale == round(scale):
+        # Dividing by an exact integer gives the closest float to e.g. 1234 / 10**3
+        return keys / round(scale)
+    return keys * resolution
+
+
+def ring_order(coords) -> np.ndarray:
+    """Index order starting a geometry at its lexicographically smallest (x, y, z) vertex
+
+    Open geometries are rotated as a whole. A closed ring (first vertex
+    repeated at the end) is rotated without its closing vertex and closed
+    again, so the same ring gives the same order whatever vertex it started at.
+    """
+    coords = np.asarray(coords)
+    count = len(coords)
+    if count < 2:
+        return np.arange(count)
+    closed = count >= 4 and np.array_equal(coords[0], coords[-1])
+    ring = count - 1 if closed else count
+    start = int(np.lexsort(coords[:ring, ::-1].T)[0])
+    order = (np.arange(ring) + start) % ring
+    return np.append(order, order[0]) if closed else order
+
+
+def geometry_keys(geometries: Sequence, resolution: float = QUANTIZE_RESOLUTION,
+                  normalize: bool = True) -> List[bytes]:
+    """Integer key of each geometry's quantized (and optionally normalized) coordinates
+
+    All geometries are quantized together; with normalize the starting
+    vertex of every geometry is found in one lexsort over all vertices.
+    """
+    parts = [as_coords(geometry) for geometry in geometries]
+    if not parts:
+        return []
+    lengths = np.array([len(part) for part in parts], dtype=np.intp)
+    starts = np.concatenate([[0], np.cumsum(lengths)]).astype(np.intp)
+    grid = quantize_coords(np.vstack(parts), resolution)
+
+    if normalize and len(grid):
+        firsts, lasts = starts[:-1], starts[1:] - 1
+        closed = (lengths >= 4) & np.all(grid[firsts.clip(max=len(grid) - 1)] == grid[lasts.clip(min=0)], axis=1)
+        rings = np.where(lengths < 2, lengths, lengths - closed)
+
+        # Smallest vertex of each ring: lexsort by (group, x, y, z); ties keep the first occurrence
+        owner = np.repeat(np.arange(len(parts)), lengths)
+        position = np.arange(len(grid)) - starts[owner]
+        in_ring = np.flatnonzero(position < rings[owner])
+        ranked = in_ring[np.lexsort((grid[in_ring, 2], grid[in_ring, 1], grid[in_ring, 0], owner[in_ring]))]
+        leaders = np.concatenate([[True], owner[ranked][1:] != owner[ranked][:-1]])
+        offsets = np.zeros(len(parts), dtype=np.intp)
+        offsets[owner[ranked[leaders]]] = position[ranked[leaders]]
+
+        # Rotate each ring; a closing vertex repeats the new first vertex
+        ring_size = np.maximum(rings[owner], 1)
+        rotated = np.where(position < rings[owner], (position + offsets[owner]) % ring_size, offsets[owner])
+        grid = grid[starts[owner] + rotated]
+
+    return [grid[start:end].tobytes() for start, end in zip(starts[:-1], starts[1:])]
+
+
+def key_hash(key: bytes) -> int:
+    """Stable 64-bit hash of a geometry key, the same in every process"""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little', signed=True)
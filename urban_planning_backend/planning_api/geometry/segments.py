@@ -0,0 +1,209 @@
+# planning_api/geometry/segments.py - Batch intersection kernels for segment pairs
+"""
+Intersection tests for many segment pairs in one NumPy pass.
+
+Each kernel takes the end points of the P and Q segments of every pair as
+(N, 3) arrays (pair_segments gathers them from a candidate pair list) and
+repeats the arithmetic of a scalar test, branch for branch, with np.where:
+
+- intersect_segments_2d: GeometryUtils.line_intersection_2d in the XY plane
+- intersect_lines: IntersectionAddOn.line_line
+- closest_approaches: LinesIntersection3D.compute
+
+Products are written out component by component in the scalar order, so the
+results match the scalar tests exactly rather than to a rounding error.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .constants import Constants
+from .utils import as_coords
+
+
+def _dot(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[:, 0] * v[:, 0] + u[:, 1] * v[:, 1] + u[:, 2] * v[:, 2]
+
+
+def _distance(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    return np.sqrt(_dot(p - q, p - q))
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray, where: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=where)
+
+
+def pair_segments(coords_a, coords_b, pairs) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(p_starts, p_ends, q_starts, q_ends) of candidate pairs (i, j) of segments of two polylines"""
+    coords_a, coords_b = as_coords(coords_a), as_coords(coords_b)
+    pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+    i, j = pairs[:, 0], pairs[:, 1]
+    return coords_a[i], coords_a[i + 1], coords_b[j], coords_b[j + 1]
+
+
+def intersect_segments_2d(p_starts, p_ends, q_starts, q_ends, tolerance: float = 1e-6,
+                          finite_segments: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(hits, t, u) for each pair of segments projected onto XY
+
+    t and u are the line parameters of the crossing on P and Q, NaN where
+    the pair is parallel within tolerance; parallel pairs never hit.
+    """
+    (x1, y1), (x2, y2) = as_coords(p_starts)[:, :2].T, as_coords(p_ends)[:, :2].T
+    (x3, y3), (x4, y4) = as_coords(q_starts)[:, :2].T, as_coords(q_ends)[:, :2].T
+
+    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    crossing = np.abs(denom) >= tolerance
+    t = np.where(crossing, _divide((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4), denom, crossing), np.nan)
+    u = np.where(crossing, -_divide((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3), denom, crossing), np.nan)
+
+    hits = crossing
+    if finite_segments:
+        hits = crossing & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    return hits, t, u
+
+
+def intersect_lines(a_starts, a_ends, b_starts, b_ends, tolerance: float = Constants.TOLERANCE,
+                    finite_segments: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(intersects, parameter_a, parameter_b) for each pair, as IntersectionAddOn.line_line
+
+    Zero-length segments are not rejected; they behave as points.
+    """
+    a_starts, a_ends = as_coords(a_starts), as_coords(a_ends)
+    b_starts, b_ends = as_coords(b_starts), as_coords(b_ends)
+    u, v = a_ends - a_starts, b_ends - b_starts
+    uu, vv = _dot(u, u), _dot(v, v)
+
+    def closest_parameters(starts, directions, length_squared, points):
+        valid = length_squared != 0
+        return _divide(_dot(points - starts, directions), length_squared, valid)
+
+    def end_distance(starts, directions, length_squared, points):
+        t = np.clip(closest_parameters(starts, directions, length_squared, points), 0, 1)
+        return _distance(starts + t[:, None] * directions, points)
+
+    # Clamped distances from each end point to the other segment
+    l1 = end_distance(b_starts, v, vv, a_starts)
+    l2 = end_distance(b_starts, v, vv, a_ends)
+    l3 = end_distance(a_starts, u, uu, b_starts)
+    l4 = end_distance(a_starts, u, uu, b_ends)
+
+    # Closest approach of the two infinite lines
+    w = a_starts - b_starts
+    b, d, e = _dot(u, v), _dot(u, w), _dot(v, w)
+    denominator = uu * vv - b * b
+    success = np.abs(denominator) >= Constants.TOLERANCE
+    a = _divide(b * e - vv * d, denominator, success)
+    c = _divide(uu * e - b * d, denominator, success)
+
+    # Parallel pairs: nearest end point, preferring l1, l3, l2, l4 on ties
+    nearest = np.minimum(np.minimum(l1, l2), np.minimum(l3, l4))
+    fallback_a = np.select(
+        [l1 == nearest, l3 == nearest, l2 == nearest],
+        [np.zeros_like(l1), closest_parameters(a_starts, u, uu, b_starts), np.ones_like(l1)],
+        closest_parameters(a_starts, u, uu, b_ends)
+    )
+    fallback_b = np.select(
+        [l1 == nearest, l3 == nearest, l2 == nearest],
+        [closest_parameters(b_starts, v, vv, a_starts), np.zeros_like(l1),
+         closest_parameters(b_starts, v, vv, a_ends)],
+        np.ones_like(l1)
+    )
+    near = nearest <= tolerance
+    if finite_segments:
+        fallback_a, fallback_b = np.clip(fallback_a, 0, 1), np.clip(fallback_b, 0, 1)
+    fallback_a, fallback_b = np.where(near, fallback_a, 0.0), np.where(near, fallback_b, 0.0)
+
+    intersects = success.copy()
+    if finite_segments:
+        inside = (a >= 0) & (a <= 1) & (c >= 0) & (c <= 1)
+        gap = _distance(a_starts + a[:, None] * u, b_starts + c[:, None] * v)
+        intersects &= inside & ~(gap > tolerance)
+
+    return (np.where(success, intersects, near),
+            np.where(success, a, fallback_a),
+            np.where(success, c, fallback_b))
+
+
+class SegmentApproaches:
+    """Closest approach of many segment pairs, as arrays
+
+    s and t are the clamped parameters on P and Q after snapping to nearby
+    end points; p_points and q_points are the closest points themselves.
+    Collinear overlaps are only flagged; LinesIntersection3D lists their
+    end points.
+    """
+
+    def __init__(self, has_intersection, is_parallel, is_proper, s, t, p_points, q_points):
+        self.has_intersection = has_intersection
+        self.is_parallel = is_parallel
+        self.is_collinear = has_intersection & is_parallel
+        self.is_proper = is_proper
+        self.s = s
+        self.t = t
+        self.p_points = p_points
+        self.q_points = q_points
+
+    @property
+    def points(self) -> np.ndarray:
+        """Midpoints between the closest points, the intersection point of proper crossings"""
+        return 0.5 * (self.p_points + self.q_points)
+
+    def __len__(self) -> int:
+        return len(self.s)
+
+    def __repr__(self) -> str:
+        return f'SegmentApproaches(pairs={len(self)}, intersections={int(self.has_intersection.sum())})'
+
+
+def closest_approaches(p1, p2, q1, q2, tolerance: float = 1e-6) -> SegmentApproaches:
+    """Closest approach and intersection classification of segment pairs P = p1 p2, Q = q1 q2
+
+    Same clamping, end point snapping and parallel test as
+    LinesIntersection3D.compute.
+    """
+    p1, p2, q1, q2 = as_coords(p1), as_coords(p2), as_coords(q1), as_coords(q2)
+    small_num = tolerance * tolerance
+    u, v, w = p2 - p1, q2 - q1, p1 - q1
+    a, b, c = _dot(u, u), _dot(u, v), _dot(v, v)
+    d, e = _dot(u, w), _dot(v, w)
+    D = a * c - b * b
+
+    # Parallel when the shorter segment's sideways extent is below tolerance
+    length_u, length_v = np.sqrt(a), np.sqrt(c)
+    lengths = length_u * length_v
+    cosine = np.clip(_divide(b, lengths, lengths != 0), -1, 1)
+    radian = np.where(lengths == 0, 0.0, np.arccos(cosine))
+    parallel = np.sin(radian) * np.minimum(length_u, length_v) < tolerance
+
+    # Line parameters, clamped to the P segment first
+    sN = np.where(parallel, 0.0, b * e - c * d)
+    sD = np.where(parallel, 1.0, D)
+    tN = np.where(parallel, e, a * e - b * d)
+    tD = np.where(parallel, c, D)
+    before, after = ~parallel & (sN < 0.0), ~parallel & ~(sN < 0.0) & (sN > sD)
+    tN = np.where(before, e, np.where(after, e + b, tN))
+    tD = np.where(before | after, c, tD)
+    sN = np.where(before, 0.0, np.where(after, sD, sN))
+
+    # Then to the Q segment, recomputing s where t was clamped
+    for clamped, reach, t_value in ((tN < 0.0, -d, 0.0), (~(tN < 0.0) & (tN > tD), -d + b, None)):
+        sN = np.where(clamped, np.where(reach < 0.0, 0.0, np.where(reach > a, sD, reach)), sN)
+        sD = np.where(clamped & ~(reach < 0.0) & ~(reach > a), a, sD)
+        tN = np.where(clamped, tD if t_value is None else t_value, tN)
+
+    sc = np.where(np.abs(sN) < small_num, 0.0, _divide(sN, sD, np.abs(sN) >= small_num))
+    tc = np.where(np.abs(tN) < small_num, 0.0, _divide(tN, tD, np.abs(tN) >= small_num))
+    s, t = np.clip(sc, 0, 1), np.clip(tc, 0, 1)
+    p, q = p1 + s[:, None] * u, q1 + t[:, None] * v
+
+    # Snap to end points within tolerance
+    for start, end, parameter, point in ((p1, p2, s, p), (q1, q2, t, q)):
+        to_end = (parameter > 0.9) & (_distance(point, end) < tolerance)
+        to_start = ~to_end & (parameter < 0.1) & (_distance(point, start) < tolerance)
+        point[to_end], point[to_start] = end[to_end], start[to_start]
+        parameter[to_end], parameter[to_start] = 1.0, 0.0
+
+    has_intersection = _distance(p, q) < tolerance
+    proper = has_intersection & ~parallel & (s > 0) & (s < 1) & (t > 0) & (t < 1)
+    return SegmentApproaches(has_intersection, parallel, proper, s, t, p, q)
@@ -0,0 +1,491 @@
+# planning_api/geometry/skeleton.py - Straight skeleton of a polygon for multi-distance offsets
+"""
+Polygon offsetting through the straight skeleton.
+
+Every edge of the polygon moves inward at unit speed. Each wavefront vertex
+moves in a straight line from the distance where an event creates it to the
+distance where another event retires it, so the skeleton is stored as those
+vertex trajectories plus the history of which vertex follows which. An
+offset at distance d is then one array expression over the vertices alive
+at d, so setbacks for any number of building types cost a single skeleton.
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from .utils import PolylineArray, as_coords, signed_area
+
+# Events simulated per input vertex before the input is rejected as degenerate
+SKELETON_MAX_EVENTS_PER_VERTEX = 4
+
+# Skeletons kept by StraightSkeleton.of for sites passed as plain coordinates
+SKELETON_CACHE_SIZE = 32
+
+_EDGE_EVENT, _SPLIT_EVENT = 0, 1
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class _Wavefront:
+    """Wavefront vertices in linked rings, advanced one event at a time
+
+    A vertex never moves in memory: it keeps the position and distance it was
+    created at and its velocity, and an event retires the vertices it touches
+    and links in new ones. Edge events (a segment shrinking to nothing) and
+    split events (a reflex vertex reaching another segment of its ring) share
+    one priority queue. Queued events are checked when they come up and
+    dropped if a vertex they name has retired; a split whose segment is gone
+    is searched again from that distance. Coincident vertices and zero-width
+    spikes left by simultaneous events are collapsed before the next event is
+    taken, so no event is ever replayed with a zero step.
+    """
+
+    _FIELDS = (
+        ('x', float), ('y', float), ('vx', float), ('vy', float), ('birth', float), ('death', float),
+        ('split_at', float), ('incoming', np.intp), ('outgoing', np.intp), ('prev', np.intp),
+        ('next', np.intp), ('ring', np.intp), ('alive', bool), ('reflex', bool)
+    )
+
+    def __init__(self, tangents, normals, offsets, eps):
+        self.tangents, self.normals, self.offsets = tangents, normals, offsets
+        self.tangent_rows, self.normal_rows = tangents.tolist(), normals.tolist()
+        self.eps = eps
+        self.count = 0
+        self.rings = 1
+        self.queue = []
+        self.links = []  # (distance, vertex, next vertex) each time a successor is set
+        for name, dtype in self._FIELDS:
+            setattr(self, name, np.zeros(2 * len(tangents) + 16, dtype=dtype))
+
+    def _add(self, x: float, y: float, distance: float, incoming: int, outgoing: int, ring: int) -> int:
+        """Create a vertex between two edges, moving at unit distance from both edge lines"""
+        v = self.count
+        if v == len(self.x):
+            for name, dtype in self._FIELDS:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros(len(array), dtype=dtype)]))
+        self.count += 1
+
+        (ax, ay), (bx, by) = self.normal_rows[incoming], self.normal_rows[outgoing]
+        turn = ax * by - ay * bx
+        if abs(turn) <= 1e-12:
+            vx, vy = ax, ay
+        else:
+            vx, vy = (by - ay) / turn, (ax - bx) / turn
+        self.x[v], self.y[v], self.vx[v], self.vy[v] = x, y, vx, vy
+        self.birth[v], self.death[v], self.split_at[v] = distance, np.inf, np.inf
+        self.incoming[v], self.outgoing[v], self.ring[v] = incoming, outgoing, ring
+        self.alive[v], self.reflex[v] = True, turn < -1e-12
+        return v
+
+    def _position(self, v: int, distance: float):
+        elapsed = distance - self.birth[v]
+        return self.x[v] + elapsed * self.vx[v], self.y[v] + elapsed * self.vy[v]
+
+    def _link(self, a: int, b: int, distance: float):
+        self.next[a], self.prev[b] = b, a
+        self.links.append((distance, a, b))
+
+    def _kill(self, v: int, distance: float):
+        self.alive[v], self.death[v] = False, distance
+
+    def simulate(self, xy: np.ndarray, limit: int):
+        count = len(xy)
+        for index, (x, y) in enumerate(xy.tolist()):
+            self._add(x, y, 0.0, (index - 1) % count, index, 0)
+        for index in range(count):
+            self._link(index, (index + 1) % count, 0.0)
+        for v in range(count):
+            self._schedule_edge(v, 0.0)
+        for v in np.flatnonzero(self.reflex[:count]).tolist():
+            self._schedule_split(v, 0.0)
+
+        events = 0
+        while self.queue:
+            distance, kind, *ids = heapq.heappop(self.queue)
+            if kind == _EDGE_EVENT:
+                a, b = ids
+                if not (self.alive[a] and self.alive[b] and self.next[a] == b):
+                    continue
+            else:
+                r, a, b = ids
+                if not self.alive[r]:
+                    continue
+                if not (self.alive[a] and self.alive[b] and self.next[a] == b and self.ring[a] == self.ring[r]):
+                    # Later entries for r are stale once its earliest target has gone
+                    if distance >= self.split_at[r]:
+                        self._schedule_split(r, distance)
+                    continue
+
+            events += 1
+            if events > limit:
+                raise ValueError(f'Straight skeleton did not finish within {limit} events')
+            if kind == _EDGE_EVENT:
+                u = self._merge(a, b, distance)
+                if u >= 0:
+                    self._settle(u, distance)
+            else:
+                self._split(r, a, b, distance)
+
+    def finish(self, outward: bool):
+        """Close rings the simulation left running; only a growing wavefront runs forever"""
+        if outward:
+            return
+        for start in np.flatnonzero(self.alive[:self.count]).tolist():
+            if not self.alive[start]:
+                continue
+            ring = [start]
+            v = self.next[start]
+            while v != start:
+                ring.append(v)
+                v = self.next[v]
+            # An inward ring without events is degenerate; it ends where it began
+            self.death[ring] = self.birth[ring].max()
+            self.alive[ring] = False
+
+    def _schedule_edge(self, a: int, distance: float):
+        """Queue the collapse of the segment leaving a, if it shrinks"""
+        b = self.next[a]
+        tx, ty = self.tangent_rows[self.outgoing[a]]
+        ax, ay = self._position(a, distance)
+        bx, by = self._position(b, distance)
+        length = (bx - ax) * tx + (by - ay) * ty
+        closing = (self.vx[b] - self.vx[a]) * tx + (self.vy[b] - self.vy[a]) * ty
+        if closing < -1e-12:
+            heapq.heappush(self.queue, (distance + max(length, 0.0) / -closing, _EDGE_EVENT, a, b))
+
+    def _hits(self, reflex: np.ndarray, starts: np.ndarray, distance: float, before) -> np.ndarray:
+        """Distance at which each reflex vertex lands on the segment leaving the paired start
+
+        Pairs that never land there, or only at or after before, get inf.
+        """
+        edges = self.outgoing[starts]
+        nx, ny = self.normals[edges].T
+        vx, vy = self.vx[reflex], self.vy[reflex]
+        elapsed = distance - self.birth[reflex]
+        gap = ((self.x[reflex] + elapsed * vx) * nx + (self.y[reflex] + elapsed * vy) * ny
+               - (self.offsets[edges] + distance))
+        approach = 1.0 - (vx * nx + vy * ny)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hits = distance + np.maximum(gap, 0.0) / approach
+        result = np.full(len(reflex), np.inf)
+        candidates = np.flatnonzero((approach > 1e-12) & (gap >= -self.eps) & (hits < before))
+        if len(candidates) == 0:
+            return result
+        hits, reflex, starts = hits[candidates], reflex[candidates], starts[candidates]
+
+        # The hit has to land within the segment as it is at that distance
+        def at(vertices):
+            elapsed = hits - self.birth[vertices]
+            return self.x[vertices] + elapsed * self.vx[vertices], self.y[vertices] + elapsed * self.vy[vertices]
+
+        (hx, hy), (sx, sy), (ex, ey) = at(reflex), at(starts), at(self.next[starts])
+        span_x, span_y = ex - sx, ey - sy
+        span_squared = span_x * span_x + span_y * span_y
+        with np.errstate(divide='ignore', invalid='ignore'):
+            along = ((hx - sx) * span_x + (hy - sy) * span_y) / span_squared
+        inside = (span_squared > 0) & (along >= -1e-9) & (along <= 1 + 1e-9)
+        result[candidates[inside]] = hits[inside]
+        return result
+
+    def _schedule_split(self, r: int, distance: float):
+        """Queue the first segment of its ring that reflex vertex r lands on"""
+        self.split_at[r] = np.inf
+        count = self.count
+        starts = np.flatnonzero(self.alive[:count] & (self.ring[:count] == self.ring[r]))
+        starts = starts[(starts != r) & (self.next[starts] != r)]
+        if len(starts) == 0:
+            return
+        hits = self._hits(np.full(len(starts), r), starts, distance, np.inf)
+        first = int(np.argmin(hits))
+        if np.isfinite(hits[first]):
+            a = int(starts[first])
+            self.split_at[r] = float(hits[first])
+            heapq.heappush(self.queue, (self.split_at[r], _SPLIT_EVENT, r, a, int(self.next[a])))
+
+    def _offer(self, starts: List[int], distance: float):
+        """Queue splits onto new segments for reflex vertices that reach them before their current target"""
+        count = self.count
+        ring = self.ring[starts[0]]
+        reflex = np.flatnonzero(self.alive[:count] & self.reflex[:count] & (self.ring[:count] == ring))
+        if len(reflex) == 0:
+            return
+        for a in starts:
+            b = self.next[a]
+            candidates = reflex[(reflex != a) & (reflex != b)]
+            hits = self._hits(candidates, np.full(len(candidates), a), distance, self.split_at[candidates])
+            earlier = np.isfinite(hits)
+            for r, hit in zip(candidates[earlier].tolist(), hits[earlier].tolist()):
+                self.split_at[r] = hit
+                heapq.heappush(self.queue, (hit, _SPLIT_EVENT, r, a, int(b)))
+
+    def _merge(self, a: int, b: int, distance: float) -> int:
+        """Replace consecutive vertices a and b by one at their midpoint; -1 if the ring vanishes"""
+        p, n = self.prev[a], self.next[b]
+        (ax, ay), (bx, by) = self._position(a, distance), self._position(b, distance)
+        self._kill(a, distance)
+        self._kill(b, distance)
+        if n == a:
+            return -1
+        if n == p:
+            self._kill(p, distance)
+            return -1
+        u = self._add((ax + bx) / 2, (ay + by) / 2, distance, self.incoming[a], self.outgoing[b], self.ring[a])
+        self._link(p, u, distance)
+        self._link(u, n, distance)
+        return u
+
+    def _split(self, r: int, a: int, b: int, distance: float):
+        """Divide a ring where reflex vertex r lands on the segment from a to b"""
+        x, y = self._position(r, distance)
+        p, n = self.prev[r], self.next[r]
+        edge, ring = self.outgoing[a], self.ring[r]
+        self._kill(r, distance)
+        first = self._add(x, y, distance, self.incoming[r], edge, ring)
+        second = self._add(x, y, distance, edge, self.outgoing[r], ring)
+        self._link(p, first, distance)
+        self._link(first, b, distance)
+        self._link(a, second, distance)
+        self._link(second, n, distance)
+
+        # Walk both rings together and relabel the one that closes first
+        u, v = self.next[first], self.next[second]
+        while u != first and v != second:
+            u, v = self.next[u], self.next[v]
+        start = first if u == first else second
+        v = start
+        while True:
+            self.ring[v] = self.rings
+            v = self.next[v]
+            if v == start:
+                break
+        self.rings += 1
+
+        self._settle(first, distance)
+        self._settle(second, distance)
+
+    def _settle(self, u: int, distance: float):
+        """Collapse what coincides around a new vertex, then queue the events of its segments"""
+        while u >= 0 and self.alive[u]:
+            p, n = self.prev[u], self.next[u]
+            if self.next[n] == u:
+                self._kill(u, distance)
+                self._kill(n, distance)
+                return
+            x, y = self._position(u, distance)
+            nx, ny = self._position(n, distance)
+            px, py = self._position(p, distance)
+            if np.hypot(nx - x, ny - y) <= self.eps:
+                u = self._merge(u, n, distance)
+            elif np.hypot(px - x, py - y) <= self.eps:
+                u = self._merge(p, u, distance)
+            elif self._is_spike(u):
+                u = self._drop_spike(u, distance)
+            else:
+                break
+        if u < 0 or not self.alive[u]:
+            return
+
+        p = self.prev[u]
+        self._schedule_edge(p, distance)
+        self._schedule_edge(u, distance)
+        if self.reflex[u]:
+            self._schedule_split(u, distance)
+        self._offer([p, u], distance)
+
+    def _is_spike(self, v: int) -> bool:
+        (ax, ay), (bx, by) = self.normal_rows[self.incoming[v]], self.normal_rows[self.outgoing[v]]
+        return abs(ax * by - ay * bx) <= 1e-12 and ax * bx + ay * by < 0
+
+    def _drop_spike(self, u: int, distance: float) -> int:
+        """Remove the tip of a zero-width spike; returns the vertex that replaces a neighbour, -1 if none"""
+        p, n = self.prev[u], self.next[u]
+        self._kill(u, distance)
+        if self.next[n] == p:
+            self._kill(p, distance)
+            self._kill(n, distance)
+            return -1
+        px, py = self._position(p, distance)
+        nx, ny = self._position(n, distance)
+        if np.hypot(nx - px, ny - py) <= self.eps:
+            self._link(p, n, distance)
+            return self._merge(p, n, distance)
+
+        # The side left standing runs along whichever spike edge points from p to n
+        tx, ty = self.tangent_rows[self.incoming[u]]
+        if (nx - px) * tx + (ny - py) * ty > 0:
+            m = self._add(nx, ny, distance, self.incoming[u], self.outgoing[n], self.ring[n])
+            self._kill(n, distance)
+            self._link(p, m, distance)
+            self._link(m, self.next[n], distance)
+        else:
+            m = self._add(px, py, distance, self.incoming[p], self.outgoing[u], self.ring[p])
+            self._kill(p, distance)
+            self._link(self.prev[p], m, distance)
+            self._link(m, n, distance)
+        return m
+
+
+class StraightSkeleton:
+    """Straight skeleton of a simple polygon, stored as wavefront vertex trajectories
+
+    An edge event retires the two ends of a segment that shrank to nothing
+    and a split event divides a ring where a reflex vertex reaches another
+    segment. The inward wavefront vanishes at end_distance. With outward the
+    polygon is traversed the other way, the wavefront grows instead, and its
+    outer ring never ends. Offset rings keep the orientation of the input.
+    """
+
+    def __init__(self, polygon, outward: bool = False):
+        coords = as_coords(polygon)
+        self.outward = outward
+        self.z = float(coords[:, 2].mean()) if len(coords) else 0.0
+
+        xy = coords[:, :2]
+        if len(xy) > 1 and np.allclose(xy[0], xy[-1]):
+            xy = xy[:-1]
+        if len(xy):
+            xy = xy[np.any(xy != np.roll(xy, 1, axis=0), axis=1)]
+
+        self.end_distance = 0.0
+        self._births = np.empty(0)
+        self._deaths = np.empty(0)
+        self._origins = np.empty((0, 2))
+        self._velocities = np.empty((0, 2))
+        self._link_times = np.empty(0)
+        self._link_owners = np.empty(0, dtype=np.intp)
+        self._link_targets = np.empty(0, dtype=np.intp)
+
+        area = signed_area(xy) if len(xy) >= 3 else 0.0
+        self._flip = (area < 0) != outward
+        if len(xy) < 3 or area == 0:
+            return
+
+        # Simulated rings run counter-clockwise, so left normals point into the wavefront
+        if (area < 0) != outward:
+            xy = xy[::-1]
+        self.scale = float(np.linalg.norm(xy.max(axis=0) - xy.min(axis=0)))
+        self._eps = 1e-9 * self.scale
+
+        directions = np.roll(xy, -1, axis=0) - xy
+        self._tangents = directions / np.linalg.norm(directions, axis=1)[:, None]
+        self._normals = np.column_stack([-self._tangents[:, 1], self._tangents[:, 0]])
+        self._offsets = np.einsum('ij,ij->i', self._normals, xy)
+
+        wavefront = _Wavefront(self._tangents, self._normals, self._offsets, self._eps)
+        wavefront.simulate(xy, SKELETON_MAX_EVENTS_PER_VERTEX * len(xy) + 16)
+        wavefront.finish(outward)
+
+        count = wavefront.count
+        self._births = wavefront.birth[:count].copy()
+        self._deaths = wavefront.death[:count].copy()
+        self._origins = np.column_stack([wavefront.x[:count], wavefront.y[:count]])
+        self._velocities = np.column_stack([wavefront.vx[:count], wavefront.vy[:count]])
+        times, owners, targets = (np.array(column) for column in zip(*wavefront.links))
+        order = np.lexsort((np.arange(len(times)), times, owners))
+        self._link_times, self._link_owners, self._link_targets = times[order], owners[order], targets[order]
+        self.end_distance = float(self._deaths.max())
+
+    @classmethod
+    def of(cls, polygon, outward: bool = False) -> 'StraightSkeleton':
+        """Skeleton of polygon, shared by every caller offsetting the same site
+
+        Cached on PolylineArray instances; other inputs go through a small LRU
+        keyed by their exact coordinates, so per-request callers rebuild a
+        site's skeleton only when the site changes.
+        """
+        if isinstance(polygon, cls) and polygon.outward == outward:
+            return polygon
+        if isinstance(polygon, PolylineArray):
+            key = 'skeleton_outward' if outward else 'skeleton'
+            return polygon._cached(key, lambda coords: cls(coords, outward))
+
+        coords = np.ascontiguousarray(as_coords(polygon))
+        key = (coords.tobytes(), outward)
+        with _cache_lock:
+            skeleton = _cache.get(key)
+            if skeleton is not None:
+                _cache.move_to_end(key)
+                return skeleton
+        skeleton = cls(coords, outward)
+        with _cache_lock:
+            _cache[key] = skeleton
+            while len(_cache) > SKELETON_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return skeleton
+
+    @property
+    def arcs(self) -> np.ndarray:
+        """(M, 2, 2) skeleton arcs traced by the wavefront vertices"""
+        moved = np.isfinite(self._deaths) & (self._deaths > self._births)
+        ends = self._origins[moved] + (self._deaths[moved] - self._births[moved])[:, None] * self._velocities[moved]
+        return np.stack([self._origins[moved], ends], axis=1)
+
+    def _successors(self, distance: float) -> np.ndarray:
+        """Next vertex of every vertex as linked at distance, -1 where none"""
+        linked = np.flatnonzero(self._link_times <= distance)
+        owners = self._link_owners[linked]
+        last = linked[np.append(owners[1:] != owners[:-1], True)] if len(linked) else linked
+        successors = np.full(len(self._births), -1, dtype=np.intp)
+        successors[self._link_owners[last]] = self._link_targets[last]
+        return successors
+
+    def offsets(self, distances) -> List[List[np.ndarray]]:
+        """Offset rings for each distance, as lists of (k, 3) vertex arrays
+
+        Distances at or beyond end_distance give no rings.
+        """
+        results = []
+        for distance in np.asarray(distances, dtype=float).reshape(-1).tolist():
+            rings = []
+            alive = np.flatnonzero((self._births <= distance) & (distance < self._deaths)).tolist()
+            if alive:
+                successors = self._successors(distance).tolist()
+                seen = set()
+                for start in alive:
+                    if start in seen:
+                        continue
+                    ids = [start]
+                    v = successors[start]
+                    while v != start:
+                        ids.append(v)
+                        v = successors[v]
+                    seen.update(ids)
+                    elapsed = distance - self._births[ids]
+                    ring = self._origins[ids] + elapsed[:, None] * self._velocities[ids]
+                    if self._flip:
+                        ring = ring[::-1]
+                    rings.append(np.column_stack([ring, np.full(len(ring), self.z)]))
+            results.append(rings)
+        return results
+
+    def offset(self, distance: float) -> List[np.ndarray]:
+        """Offset rings at one distance"""
+        return self.offsets([distance])[0]
+
+    def largest_ring(self, distance: float) -> Optional[np.ndarray]:
+        """Offset ring with the largest area at distance, or None if nothing is left
+
+        Concave sites can fall apart into several rings; callers that expect a
+        single setback polygon keep the main one.
+        """
+        rings = self.offset(distance)
+        if not rings:
+            return None
+        return max(rings, key=lambda ring: abs(signed_area(ring[:, :2])))
+
+    def offset_polyline(self, distance: float) -> Optional[PolylineArray]:
+        """largest_ring as a closed polyline"""
+        ring = self.largest_ring(distance)
+        if ring is None:
+            return None
+        return PolylineArray(np.vstack([ring, ring[:1]]))
+
+    def __repr__(self) -> str:
+        return (f'StraightSkeleton(vertices={len(self._births)}, end_distance={self.end_distance:g}, '
+                f'outward={self.outward})')
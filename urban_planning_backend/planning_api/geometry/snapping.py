@@ -0,0 +1,203 @@
+# planning_api/geometry/snapping.py - Vertex snapping with a tolerance grid and union-find
+"""
+Snapping of polyline vertices that lie within a tolerance of each other.
+
+Every vertex is hashed into a grid of tolerance-sized cells, so near pairs
+are only looked for in the same and neighbouring cells. When the grid is
+too large for one int64 cell index, only occupied cells get a code, from
+the ranks of their occupied values on each axis, so the extent of the
+coordinates never limits the tolerance. Near pairs are merged with a vectorized
+union-find (hooking plus pointer jumping), and every vertex is written back
+as its group's representative, the group's first vertex, in one indexing
+pass. Optionally vertices are also moved onto segments of other polylines
+within tolerance, with candidate pairs from a SegmentBoxTree dual traversal.
+"""
+
+import itertools
+from typing import List, Tuple
+
+import numpy as np
+
+from .bvh import SegmentBoxTree
+from .utils import as_coords
+
+# Neighbour cell offsets; together with the same-cell pairs every adjacent cell pair is visited once
+_FORWARD_OFFSETS = [
+    offset for offset in itertools.product((-1, 0, 1), repeat=3) if offset > (0, 0, 0)
+]
+
+# Largest cell index; cells are widened beyond tolerance for extents that would exceed it
+_MAX_CELL = 2.0 ** 60
+
+
+def _cell_coder(cells: np.ndarray):
+    """Function giving the code of every vertex's cell, or of its neighbour at an offset
+
+    Small grids use mixed-radix cell indices directly. Larger ones use the
+    ranks of the occupied values on each axis, so codes stay below N ** 2
+    whatever the extent; there a neighbour cell that holds no vertex gets
+    code -1.
+    """
+    cells = cells - (cells.min(axis=0) - 1)
+    sizes = cells.max(axis=0) + 2
+    if float(np.prod(sizes.astype(float))) < 2.0 ** 62:
+        # Padding keeps neighbour offsets from wrapping
+        dense = (cells[:, 0] * sizes[1] + cells[:, 1]) * sizes[2] + cells[:, 2]
+        return lambda offset=(0, 0, 0): dense + (offset[0] * sizes[1] + offset[1]) * sizes[2] + offset[2]
+
+    axes = [np.unique(cells[:, axis]) for axis in range(3)]
+    # Rank of each vertex's cell value shifted by -1, 0 and +1 on each axis, -1 where unoccupied
+    ranks = []
+    for axis, values in enumerate(axes):
+        shifted_ranks = {}
+        for shift in (-1, 0, 1):
+            targets = cells[:, axis] + shift
+            rank = np.searchsorted(values, targets).clip(max=len(values) - 1)
+            shifted_ranks[shift] = np.where(values[rank] == targets, rank, -1)
+        ranks.append(shifted_ranks)
+
+    plane_codes = ranks[0][0] * len(axes[1]) + ranks[1][0]
+    planes = np.unique(plane_codes)
+
+    def codes(offset=(0, 0, 0)):
+        rx, ry, rz = (ranks[axis][offset[axis]] for axis in range(3))
+        plane = rx * len(axes[1]) + ry
+        plane_rank = np.searchsorted(planes, plane).clip(max=len(planes) - 1)
+        occupied = (rx >= 0) & (ry >= 0) & (rz >= 0) & (planes[plane_rank] == plane)
+        return np.where(occupied, plane_rank * len(axes[2]) + rz, -1)
+
+    return codes
+
+
+def _near_pairs(coords: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(first, second) index arrays of vertex pairs closer than tolerance"""
+    shifted = coords - coords.min(axis=0)
+    # Any cell at least tolerance wide finds every near pair in the neighbouring cells
+    cell_size = max(tolerance, float(shifted.max()) / _MAX_CELL)
+    cell_codes = _cell_coder(np.floor(shifted / cell_size).astype(np.int64))
+
+    codes = cell_codes()
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    firsts, seconds = [], []
+    for offset in [(0, 0, 0)] + _FORWARD_OFFSETS:
+        targets = sorted_codes if offset == (0, 0, 0) else cell_codes(offset)[order]
+        high = np.searchsorted(sorted_codes, targets, side='right')
+        if offset == (0, 0, 0):
+            # Same cell: only later vertices in the sorted run
+            low = np.arange(len(sorted_codes)) + 1
+        else:
+            low = np.searchsorted(sorted_codes, targets, side='left')
+        counts = np.maximum(high - low, 0)
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        owners = np.repeat(np.arange(len(sorted_codes)), counts)
+        positions = np.repeat(low - np.cumsum(counts) + counts, counts) + np.arange(total)
+        first, second = order[owners], order[positions]
+        close = np.linalg.norm(coords[first] - coords[second], axis=1) < tolerance
+        firsts.append(first[close])
+        seconds.append(second[close])
+
+    if not firsts:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def _components(count: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Smallest vertex index of each vertex's connected component"""
+    parent = np.arange(count)
+    while True:
+        roots_a, roots_b = parent[first], parent[second]
+        changed = roots_a != roots_b
+        if not changed.any():
+            return parent
+        roots_a, roots_b = roots_a[changed], roots_b[changed]
+        # Hook the larger root under the smaller one, then jump pointers to the roots
+        np.minimum.at(parent, np.maximum(roots_a, roots_b), np.minimum(roots_a, roots_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def snap_vertices(coords, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(snapped (N, 3) coordinates, representative index per vertex)
+
+    Vertices closer than tolerance end up in one group, transitively, and
+    take the coordinates of the group's first vertex.
+    """
+    coords = as_coords(coords)
+    representatives = np.arange(len(coords))
+    if len(coords) < 2 or tolerance <= 0:
+        return coords.copy(), representatives
+    first, second = _near_pairs(coords, tolerance)
+    representatives = _components(len(coords), first, second)
+    return coords[representatives], representatives
+
+
+def _snap_to_segments(coords, representatives, starts, tolerance: float) -> np.ndarray:
+    """Move vertices onto the nearest segment within tolerance that does not touch their group"""
+    segment_starts = np.concatenate([np.arange(start, end - 1) for start, end in zip(starts[:-1], starts[1:])
+                                     if end - start >= 2] or [np.empty(0, dtype=np.intp)])
+    if len(segment_starts) == 0:
+        return coords
+    segment_tree = SegmentBoxTree.from_segments(coords[segment_starts], coords[segment_starts + 1])
+    vertex_tree = SegmentBoxTree.from_segments(coords, coords)
+    pairs = vertex_tree.overlapping_pairs(segment_tree, tolerance)
+    if not pairs:
+        return coords
+
+    vertices, segments = np.array(pairs, dtype=np.intp).T
+    a, b = segment_starts[segments], segment_starts[segments] + 1
+    # A vertex never snaps to a segment ending in its own group
+    own = (representatives[a] == representatives[vertices]) | (representatives[b] == representatives[vertices])
+    vertices, a, b = vertices[~own], a[~own], b[~own]
+
+    directions = coords[b] - coords[a]
+    length_squared = np.einsum('ij,ij->i', directions, directions)
+    projection = np.einsum('ij,ij->i', coords[vertices] - coords[a], directions)
+    t = np.clip(np.divide(projection, length_squared, out=np.zeros_like(projection),
+                          where=length_squared > 0), 0.0, 1.0)
+    targets = coords[a] + t[:, None] * directions
+    gaps = np.linalg.norm(targets - coords[vertices], axis=1)
+    near = gaps < tolerance
+    vertices, targets, gaps = vertices[near], targets[near], gaps[near]
+    if len(vertices) == 0:
+        return coords
+
+    # Closest segment per vertex, then the whole group follows its representative
+    order = np.lexsort((gaps, vertices))
+    vertices, targets = vertices[order], targets[order]
+    first = np.concatenate([[True], vertices[1:] != vertices[:-1]])
+    moved = coords.copy()
+    moved[vertices[first]] = targets[first]
+    return moved[representatives]
+
+
+def _drop_repeats(coords: np.ndarray) -> np.ndarray:
+    """coords without vertices equal to the one before them"""
+    if len(coords) < 2:
+        return coords
+    keep = np.concatenate([[True], np.any(coords[1:] != coords[:-1], axis=1)])
+    return coords[keep]
+
+
+def snap_polylines(polylines, tolerance: float, to_segments: bool = False) -> List[np.ndarray]:
+    """Snap the vertices of several polylines together; returns (N_i, 3) arrays in input order
+
+    With to_segments, vertices that are within tolerance of another part of
+    the linework (and not already snapped to a vertex there) are moved onto
+    the nearest segment. Vertices of a polyline that snap onto the vertex
+    before them are dropped, so no zero-length segments are left.
+    """
+    parts = [as_coords(polyline) for polyline in polylines]
+    if not parts:
+        return []
+    starts = np.concatenate([[0], np.cumsum([len(part) for part in parts])]).astype(np.intp)
+    coords, representatives = snap_vertices(np.vstack(parts), tolerance)
+    if to_segments and tolerance > 0:
+        coords = _snap_to_segments(coords, representatives, starts, tolerance)
+    return [_drop_repeats(coords[start:end]) for start, end in zip(starts[:-1], starts[1:])]
@@ -0,0 +1,276 @@
+# planning_api/geometry/sweep.py - Sweep-line search for intersecting segments
+"""
+Bentley-Ottmann style plane sweep over 2D segments.
+
+Segments are swept left to right while a status list keeps the ones crossing
+the sweep line ordered by y. Only segments that become neighbours in that
+order are tested, so a search costs O((n + k) log n) instead of testing all
+n^2 pairs. With first_only the sweep stops at the first hit, which is the
+Shamos-Hoey "any intersection" test.
+
+Callers supply the pair predicate, so the sweep reports exactly the pairs
+their existing pairwise test would accept. It only decides which pairs need
+testing. Vertical segments and several segments meeting at one point are
+handled explicitly rather than assuming general position.
+"""
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Event kinds, in processing order at equal x
+_INSERT, _VERTICAL, _CROSS, _REMOVE = 0, 1, 2, 3
+
+
+def segment_parameters_2d(a, b, tolerance: float = 1e-6) -> Optional[Tuple[float, float]]:
+    """(t, u) where segments a and b, given as (x1, y1, x2, y2), meet as lines
+
+    None when they are parallel within tolerance. Same arithmetic as
+    GeometryUtils.line_intersection_2d.
+    """
+    x1, y1, x2, y2 = a
+    x3, y3, x4, y4 = b
+
+    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    if abs(denom) < tolerance:
+        return None
+
+    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
+    u = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / denom
+    return t, u
+
+
+def segments_intersect_2d(a, b, tolerance: float = 1e-6) -> bool:
+    """True if the segments touch or cross; parallel segments never intersect"""
+    parameters = segment_parameters_2d(a, b, tolerance)
+    if parameters is None:
+        return False
+    t, u = parameters
+    return 0 <= t <= 1 and 0 <= u <= 1
+
+
+def polyline_segments(coords, closed: bool = False) -> np.ndarray:
+    """(S, 4) segments x1, y1, x2, y2 between consecutive (N, 2)/(N, 3) vertices
+
+    closed adds the edge from the last vertex back to the first.
+    """
+    xy = np.asarray(coords, dtype=float).reshape(len(coords), -1)[:, :2]
+    if len(xy) < 2:
+        return np.empty((0, 4))
+    if closed:
+        return np.hstack([xy, np.roll(xy, -1, axis=0)])
+    return np.hstack([xy[:-1], xy[1:]])
+
+
+def ring_neighbours(count: int) -> Callable[[int, int], bool]:
+    """Excludes consecutive segments of a ring of count segments, first and last included"""
+    def excluded(i: int, j: int) -> bool:
+        gap = abs(i - j)
+        return gap <= 1 or gap == count - 1
+    return excluded
+
+
+def sweep_intersections(
+    segments,
+    predicate: Optional[Callable[[int, int], bool]] = None,
+    excluded: Optional[Callable[[int, int], bool]] = None,
+    first_only: bool = False,
+    tolerance: float = 1e-6
+) -> List[Tuple[int, int]]:
+    """Index pairs (i < j) of intersecting segments, found with a plane sweep
+
+    segments is an (S, 4) array of x1, y1, x2, y2. predicate(i, j) decides
+    whether a candidate pair intersects (segments_intersect_2d by default),
+    and pairs for which excluded(i, j) is true are never reported. With
+    first_only the sweep returns as soon as one pair is found.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    rows = segments.tolist()
+    if predicate is None:
+        def predicate(i, j):
+            return segments_intersect_2d(rows[i], rows[j], tolerance)
+
+    # Orient every segment left to right (bottom to top when vertical)
+    x1, y1, x2, y2 = segments.T
+    forward = (x1 < x2) | ((x1 == x2) & (y1 <= y2))
+    left_x = np.where(forward, x1, x2).tolist()
+    left_y = np.where(forward, y1, y2).tolist()
+    right_x = np.where(forward, x2, x1).tolist()
+    right_y = np.where(forward, y2, y1).tolist()
+
+    slopes = []
+    for s in range(len(rows)):
+        run = right_x[s] - left_x[s]
+        slopes.append((right_y[s] - left_y[s]) / run if run != 0 else math.inf)
+
+    events = []
+    for s in range(len(rows)):
+        if not all(map(math.isfinite, rows[s])):
+            continue
+        if left_x[s] == right_x[s]:
+            events.append((left_x[s], _VERTICAL, left_y[s], s))
+        else:
+            events.append((left_x[s], _INSERT, left_y[s], s))
+            events.append((right_x[s], _REMOVE, right_y[s], s))
+    heapq.heapify(events)
+
+    found = []
+    tested = set()
+    scheduled = set()
+    status = []
+    sweep = {'x': -math.inf}
+
+    def y_at(s, x):
+        if x == left_x[s]:
+            return left_y[s]
+        if x == right_x[s]:
+            return right_y[s]
+        return left_y[s] + (x - left_x[s]) * (right_y[s] - left_y[s]) / (right_x[s] - left_x[s])
+
+    def height(s):
+        return y_at(s, sweep['x'])
+
+    def test(a, b):
+        """Test a candidate pair once; returns True when the sweep should stop"""
+        pair = (a, b) if a < b else (b, a)
+        if pair in tested:
+            return False
+        tested.add(pair)
+        if excluded is not None and excluded(*pair):
+            return False
+        if predicate(*pair):
+            found.append(pair)
+            return first_only
+        return False
+
+    def schedule(a, b):
+        """Queue the point where neighbours a and b properly cross, if it is ahead of the sweep"""
+        pair = (a, b) if a < b else (b, a)
+        if pair in scheduled or slopes[a] == slopes[b]:
+            return
+        ax, ay = left_x[a], left_y[a]
+        adx, ady = right_x[a] - ax, right_y[a] - ay
+        bx, by = left_x[b], left_y[b]
+        bdx, bdy = right_x[b] - bx, right_y[b] - by
+        denom = adx * bdy - ady * bdx
+        if denom == 0:
+            return
+        t = ((bx - ax) * bdy - (by - ay) * bdx) / denom
+        u = ((bx - ax) * ady - (by - ay) * adx) / denom
+        if 0 < t < 1 and 0 < u < 1:
+            cross_x = ax + t * adx
+            if cross_x >= sweep['x']:
+                scheduled.add(pair)
+                heapq.heappush(events, (cross_x, _CROSS, ay + t * ady, pair))
+
+    def meet(a, b):
+        """a and b are now neighbours in the status"""
+        if test(a, b):
+            return True
+        schedule(a, b)
+        return False
+
+    def settle(y, added=None, removed=None):
+        """Handle an event at (sweep x, y)
+
+        Every segment through the point is tested against the others, then
+        they are reordered by slope, which is their order just right of the
+        point, and the segments bordering the group become neighbours.
+        """
+        low = bisect_left(status, y - tolerance, key=height)
+        high = bisect_right(status, y + tolerance, key=height)
+        group = status[low:high]
+        if removed is not None:
+            if removed in group:
+                group.remove(removed)
+            else:
+                status.remove(removed)
+                high -= 1
+        if added is not None:
+            group.append(added)
+
+        for index, s in enumerate(group):
+            for other in group[index + 1:]:
+                if test(s, other):
+                    return True
+        if removed is not None:
+            for s in group:
+                if test(s, removed):
+                    return True
+
+        group.sort(key=lambda s: slopes[s])
+        status[low:high] = group
+        high = low + len(group)
+        if 0 < low < len(status) and meet(status[low - 1], status[low]):
+            return True
+        if group and 0 < high < len(status) and meet(status[high - 1], status[high]):
+            return True
+        return False
+
+    verticals_here = []
+
+    while events:
+        x, kind, y, payload = heapq.heappop(events)
+        if x != sweep['x']:
+            verticals_here = []
+        sweep['x'] = x
+
+        if kind == _INSERT:
+            stop = settle(y, added=payload)
+
+        elif kind == _REMOVE:
+            stop = settle(y, removed=payload)
+
+        elif kind == _CROSS:
+            stop = settle(y)
+
+        else:
+            s = payload
+            stop = False
+            low, high = left_y[s], right_y[s]
+            first = bisect_left(status, low - tolerance, key=height)
+            last = bisect_right(status, high + tolerance, key=height)
+            for other in status[first:last] + [v for v in verticals_here if right_y[v] >= low - tolerance]:
+                if test(other, s):
+                    stop = True
+                    break
+            verticals_here.append(s)
+
+        if stop:
+            return found
+
+    found.sort()
+    return found
+
+
+def self_intersections(
+    coords,
+    closed: bool = True,
+    tolerance: float = 1e-6,
+    first_only: bool = False
+) -> List[Tuple[int, int, Tuple[float, float]]]:
+    """(i, j, (x, y)) for each pair of non-consecutive intersecting edges of a polyline
+
+    With closed the edge back to the first vertex is included. First and last
+    edges are treated as consecutive either way, matching the pairwise checks
+    this replaces.
+    """
+    segments = polyline_segments(coords, closed)
+    rows = segments.tolist()
+    pairs = sweep_intersections(segments, excluded=ring_neighbours(len(rows)),
+                                first_only=first_only, tolerance=tolerance)
+
+    results = []
+    for i, j in pairs:
+        t, _ = segment_parameters_2d(rows[i], rows[j], tolerance)
+        x1, y1, x2, y2 = rows[i]
+        results.append((i, j, (x1 + t * (x2 - x1), y1 + t * (y2 - y1))))
+    return results
+
+
+def has_self_intersection(coords, closed: bool = True, tolerance: float = 1e-6) -> bool:
+    """Early-exit form of self_intersections"""
+    return bool(self_intersections(coords, closed, tolerance, first_only=True))
@@ -0,0 +1,199 @@
+# planning_api/geometry/transforms.py - Affine transforms and plane projections over coordinate arrays
+"""
+4x4 affine matrices and plane projections applied to (N, 3) arrays.
+
+The AddOn classes transform one Point3D at a time; these kernels do the same
+arithmetic for a whole polyline in one matrix product. PreparedPlanarCurve
+keeps a curve's plane frame and its projection into that frame, so repeated
+containment and closest-point queries only transform the query points. A
+single containment query on a curve without a cache is cheaper as one
+projection and vectorized scan; planar_contains picks between the two.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .bvh import SegmentBoxTree
+from .utils import (
+    ArcLengthTable, Plane, Point3D, PolylineArray, PreparedPolygon, Vector3D, as_coords, points_in_polygon,
+)
+
+
+def transform_coords(coords, matrix) -> np.ndarray:
+    """(N, 3) points mapped by a 4x4 affine matrix"""
+    coords = as_coords(coords)
+    matrix = np.asarray(matrix, dtype=float)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def transform_vectors(vectors, matrix) -> np.ndarray:
+    """(N, 3) directions mapped by a 4x4 affine matrix, ignoring its translation"""
+    return as_coords(vectors) @ np.asarray(matrix, dtype=float)[:3, :3].T
+
+
+def translation_matrix(vector) -> np.ndarray:
+    """4x4 matrix moving points by vector"""
+    matrix = np.eye(4)
+    matrix[:3, 3] = as_coords([vector])[0]
+    return matrix
+
+
+def rotation_matrix(angle: float, axis, center=None) -> np.ndarray:
+    """4x4 rotation by angle (radians) about axis through center, as in Vector3DAddOn.rotate"""
+    axis = as_coords([axis])[0]
+    matrix = np.eye(4)
+    length = float(np.linalg.norm(axis))
+    if length == 0:
+        return matrix
+
+    # Rodrigues: R = cos I + sin [k]x + (1 - cos) k k^T
+    k = axis / length
+    cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+    cross = np.array([[0.0, -k[2], k[1]], [k[2], 0.0, -k[0]], [-k[1], k[0], 0.0]])
+    matrix[:3, :3] = cos_angle * np.eye(3) + sin_angle * cross + (1 - cos_angle) * np.outer(k, k)
+    if center is not None:
+        center = as_coords([center])[0]
+        matrix[:3, 3] = center - matrix[:3, :3] @ center
+    return matrix
+
+
+def rotate_vectors(vectors, angle: float, axis) -> np.ndarray:
+    """Batch form of Vector3DAddOn.rotate for (N, 3) vectors"""
+    return transform_vectors(vectors, rotation_matrix(angle, axis))
+
+
+def plane_to_plane_matrix(source: Plane, target: Plane) -> np.ndarray:
+    """4x4 matrix taking source's origin and axes onto target's"""
+    source_origin, *source_axes = source.frame()
+    target_origin, *target_axes = target.frame()
+    rotation = np.column_stack(target_axes) @ np.column_stack(source_axes).T
+
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation
+    matrix[:3, 3] = target_origin - rotation @ source_origin
+    return matrix
+
+
+def project_onto_plane(coords, plane: Plane) -> np.ndarray:
+    """(N, 3) closest points on plane, as Plane.closest_point for each point"""
+    coords = as_coords(coords)
+    origin, _, _, normal = plane.frame()
+    return coords - np.outer((coords - origin) @ normal, normal)
+
+
+def fit_plane(coords) -> Optional[Plane]:
+    """Plane through the vertex mean with the Newell normal of a polygon, None if degenerate"""
+    coords = as_coords(coords)
+    if len(coords) < 3:
+        return None
+    following = np.roll(coords, -1, axis=0)
+    normal = np.array([
+        np.sum((coords[:, 1] - following[:, 1]) * (coords[:, 2] + following[:, 2])),
+        np.sum((coords[:, 2] - following[:, 2]) * (coords[:, 0] + following[:, 0])),
+        np.sum((coords[:, 0] - following[:, 0]) * (coords[:, 1] + following[:, 1])),
+    ])
+    if not np.linalg.norm(normal) > 0:
+        return None
+    return Plane(Point3D(*coords.mean(axis=0).tolist()), Vector3D(*normal.tolist()))
+
+
+class PreparedPlanarCurve:
+    """Curve projected once into the frame of a plane, for repeated queries
+
+    Query points are mapped into the same frame, where x, y lie in the plane
+    and z is the height above it. Containment then runs against a
+    PreparedPolygon of the projected curve, and closest points against a
+    SegmentBoxTree of it. Without a plane the curve's own best-fit plane is
+    used.
+    """
+
+    def __init__(self, curve, plane: Optional[Plane] = None):
+        coords = as_coords(curve)
+        if plane is None:
+            plane = fit_plane(coords) or Plane.world_xy()
+        self.plane = plane
+        self.matrix = plane_to_plane_matrix(plane, Plane.world_xy())
+
+        local = transform_coords(coords, self.matrix)
+        self.xy = local[:, :2]
+        self.is_closed = len(coords) >= 4 and float(np.linalg.norm(coords[0] - coords[-1])) < 1e-6
+        self.tree = SegmentBoxTree(np.column_stack([self.xy, np.zeros(len(self.xy))]))
+        self.polygon = PreparedPolygon(self.xy) if self.is_closed else None
+
+    @classmethod
+    def of(cls, curve, plane: Optional[Plane] = None) -> 'PreparedPlanarCurve':
+        """Prepared form of curve, cached on PolylineArray instances per plane"""
+        if isinstance(curve, cls) and (plane is None or plane == curve.plane):
+            return curve
+        if isinstance(curve, PolylineArray):
+            key = ('planar', None) if plane is None else (
+                'planar', plane.origin.as_tuple(), (plane.normal.x, plane.normal.y, plane.normal.z)
+            )
+            return curve._cached(key, lambda coords: cls(coords, plane))
+        return cls(curve, plane)
+
+    def to_plane(self, points) -> np.ndarray:
+        """(M, 3) points in the plane frame: in-plane x, y and height z"""
+        return transform_coords(points, self.matrix)
+
+    def contains_points(self, points, tolerance: float) -> np.ndarray:
+        """PointContainment value for each point projected onto the plane"""
+        from .polyline_addon import PointContainment
+
+        local = self.to_plane(points)
+        result = np.full(len(local), PointContainment.UNSET, dtype=int)
+        if not self.is_closed or len(local) == 0:
+            return result
+
+        flat = np.column_stack([local[:, :2], np.zeros(len(local))])
+        distances, _ = self.tree.table.closest_parameters(flat)
+        inside = self.polygon.contains_points(local[:, :2])
+        result[:] = np.where(inside, PointContainment.INSIDE, PointContainment.OUTSIDE)
+        result[distances <= tolerance] = PointContainment.COINCIDENT
+        return result
+
+    def contains(self, point: Point3D, tolerance: float) -> int:
+        """PointContainment of point projected onto the plane; edges within tolerance are coincident"""
+        from .polyline_addon import PointContainment
+
+        if not self.is_closed:
+            return PointContainment.UNSET
+        x, y, _ = self.to_plane([point])[0].tolist()
+        if self.tree.closest_segment((x, y, 0.0))[0] <= tolerance:
+            return PointContainment.COINCIDENT
+        inside = self.polygon.contains(Point3D(x, y, 0.0))
+        return PointContainment.INSIDE if inside else PointContainment.OUTSIDE
+
+    def closest_parameter(self, point: Point3D) -> Tuple[float, float]:
+        """(distance, normalized parameter) of the closest point on the projected curve"""
+        return self.tree.closest_parameter(self.to_plane([point])[0])
+
+    def __repr__(self) -> str:
+        return f'PreparedPlanarCurve(vertices={len(self.xy)}, closed={self.is_closed})'
+
+
+def planar_contains(curve, point: Point3D, plane: Optional[Plane], tolerance: float) -> int:
+    """PointContainment of point projected onto plane, as PreparedPlanarCurve.contains
+
+    Uses the cached prepared curve of a PolylineArray. Any other curve is
+    projected once and scanned, since building the segment tree and slab
+    index for one query costs more than it saves.
+    """
+    if isinstance(curve, (PreparedPlanarCurve, PolylineArray)):
+        return PreparedPlanarCurve.of(curve, plane).contains(point, tolerance)
+
+    from .polyline_addon import PointContainment
+
+    coords = as_coords(curve)
+    if not (len(coords) >= 4 and float(np.linalg.norm(coords[0] - coords[-1])) < 1e-6):
+        return PointContainment.UNSET
+    if plane is None:
+        plane = fit_plane(coords) or Plane.world_xy()
+
+    local = transform_coords(np.vstack([coords, as_coords([point])]), plane_to_plane_matrix(plane, Plane.world_xy()))
+    local[:, 2] = 0.0
+    ring, query = local[:-1], local[-1:]
+    if ArcLengthTable(ring).closest_parameters(query)[0][0] <= tolerance:
+        return PointContainment.COINCIDENT
+    return PointContainment.INSIDE if points_in_polygon(query, ring)[0] else PointContainment.OUTSIDE
@@ -0,0 +1,153 @@
+# planning_api/geometry/triangulate.py - Ear clipping triangulation of simple polygons
+"""
+Ear clipping over an array-based circular ring.
+
+The ring is kept as prev/next index arrays, so removing an ear is O(1). A
+vertex can only stop an ear if it is reflex, and clipping never turns a
+convex vertex reflex, so only the reflex vertices are stored, bucketed in a
+uniform grid. An ear test looks at the grid cells under the candidate
+triangle instead of every remaining vertex. Triangles come back as a
+compact (T, 3) array of vertex indices.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .utils import as_coords, signed_area
+
+
+def _projected(coords: np.ndarray) -> np.ndarray:
+    """(N, 2) coordinates of a planar polygon with its dominant normal axis dropped"""
+    shifted = np.roll(coords, -1, axis=0)
+    normal = np.array([
+        np.sum((coords[:, 1] - shifted[:, 1]) * (coords[:, 2] + shifted[:, 2])),
+        np.sum((coords[:, 2] - shifted[:, 2]) * (coords[:, 0] + shifted[:, 0])),
+        np.sum((coords[:, 0] - shifted[:, 0]) * (coords[:, 1] + shifted[:, 1])),
+    ])
+    axis = int(np.argmax(np.abs(normal)))
+    return np.delete(coords, axis, axis=1) if axis != 2 else coords[:, :2]
+
+
+class _ReflexGrid:
+    """Uniform grid of the reflex vertices still in the ring"""
+
+    def __init__(self, xy: np.ndarray, reflex: List[int]):
+        self.xy = xy
+        low = xy.min(axis=0)
+        extent = float(max(np.ptp(xy[:, 0]), np.ptp(xy[:, 1]), 1e-12))
+        self.origin = (float(low[0]), float(low[1]))
+        self.size = extent / max(1.0, math.sqrt(len(reflex)))
+        self.cells: Dict[Tuple[int, int], set] = {}
+        for index in reflex:
+            self.cells.setdefault(self._cell(*xy[index]), set()).add(index)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int((x - self.origin[0]) // self.size), int((y - self.origin[1]) // self.size)
+
+    def discard(self, index: int):
+        cell = self.cells.get(self._cell(*self.xy[index]))
+        if cell is not None:
+            cell.discard(index)
+
+    def within(self, x_low: float, y_low: float, x_high: float, y_high: float):
+        first_x, first_y = self._cell(x_low, y_low)
+        last_x, last_y = self._cell(x_high, y_high)
+        for cx in range(first_x, last_x + 1):
+            for cy in range(first_y, last_y + 1):
+                yield from self.cells.get((cx, cy), ())
+
+
+def triangulate_polygon(polygon, tolerance: float = 1e-12) -> np.ndarray:
+    """(T, 3) vertex indices triangulating a simple planar polygon
+
+    Indices refer to the polygon's vertices with a repeated closing vertex
+    dropped. Triangles keep the polygon's orientation; consecutive repeated
+    vertices are dropped up front and collinear vertices are clipped
+    without emitting a triangle.
+    """
+    coords = as_coords(polygon)
+    if len(coords) > 1 and np.allclose(coords[0], coords[-1]):
+        coords = coords[:-1]
+    # A repeated reflex vertex turns by zero at each copy and would never be indexed as reflex
+    keep = np.flatnonzero(np.any(coords != np.roll(coords, 1, axis=0), axis=1))
+    coords = coords[keep]
+    count = len(coords)
+    if count < 3:
+        return np.empty((0, 3), dtype=np.intp)
+
+    xy = _projected(coords)
+    x, y = xy[:, 0].tolist(), xy[:, 1].tolist()
+    area = signed_area(xy)
+    sign = 1.0 if area >= 0 else -1.0
+    extent = float(max(np.ptp(xy[:, 0]), np.ptp(xy[:, 1])))
+    eps = tolerance * max(extent * extent, 1e-300)
+
+    def turn(a: int, b: int, c: int) -> float:
+        """Twice the signed area of a, b, c, positive when it turns with the polygon"""
+        return sign * ((x[b] - x[a]) * (y[c] - y[a]) - (y[b] - y[a]) * (x[c] - x[a]))
+
+    previous = [(i - 1) % count for i in range(count)]
+    following = [(i + 1) % count for i in range(count)]
+    reflex = [i for i in range(count) if turn(previous[i], i, following[i]) < -eps]
+    grid = _ReflexGrid(xy, reflex)
+    is_reflex = [False] * count
+    for index in reflex:
+        is_reflex[index] = True
+
+    def is_ear(a: int, b: int, c: int) -> bool:
+        if turn(a, b, c) <= eps:
+            return False
+        for p in grid.within(min(x[a], x[b], x[c]), min(y[a], y[b], y[c]),
+                             max(x[a], x[b], x[c]), max(y[a], y[b], y[c])):
+            if p in (a, b, c) or (x[p], y[p]) in ((x[a], y[a]), (x[b], y[b]), (x[c], y[c])):
+                continue
+            if turn(a, b, p) >= -eps and turn(b, c, p) >= -eps and turn(c, a, p) >= -eps:
+                return False
+        return True
+
+    def update(index: int):
+        """A neighbour of a clipped ear may have turned convex"""
+        if is_reflex[index] and turn(previous[index], index, following[index]) >= -eps:
+            is_reflex[index] = False
+            grid.discard(index)
+
+    def remove(index: int):
+        a, c = previous[index], following[index]
+        following[a], previous[c] = c, a
+        if is_reflex[index]:
+            is_reflex[index] = False
+            grid.discard(index)
+        update(a)
+        update(c)
+        return c
+
+    triangles = []
+    remaining = count
+    current = 0
+    stop = current
+    forced = False
+    while remaining > 2:
+        a, c = previous[current], following[current]
+        if abs(turn(a, current, c)) <= eps:
+            # Collinear or repeated vertex: nothing to emit
+            current = stop = remove(current)
+            remaining -= 1
+            continue
+
+        if forced or is_ear(a, current, c):
+            triangles.append((a, current, c))
+            current = stop = remove(current)
+            remaining -= 1
+            forced = False
+            continue
+
+        current = c
+        if current == stop:
+            # A full pass found no ear, which only happens on invalid input; clip a convex vertex anyway
+            while turn(previous[current], current, following[current]) <= eps and following[current] != stop:
+                current = following[current]
+            forced = True
+
+    return keep[np.array(triangles, dtype=np.intp).reshape(-1, 3)]
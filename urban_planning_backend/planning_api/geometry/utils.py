@@ -1,101 +1,12 @@
 # planning_api/geometry/utils.py
+import bisect
 import math
 from typing import List, Tuple, Optional, Dict, Any
+from collections.abc import MutableSequence
 from dataclasses import dataclass
 import numpy as np
-
-
-@dataclass
-class Point3D:
-    """3D Point representation"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def distance_to(self, other: 'Point3D') -> float:
-        """Calculate distance to another point"""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
-    
-    def __add__(self, other: 'Point3D') -> 'Point3D':
-        return Point3D(self.x + other.x, self.y + other.y, self.z + other.z)
-    
-    def __sub__(self, other: 'Point3D') -> 'Point3D':
-        return Point3D(self.x - other.x, self.y - other.y, self.z - other.z)
-    
-    def __mul__(self, scalar: float) -> 'Point3D':
-        return Point3D(self.x * scalar, self.y * scalar, self.z * scalar)
-    
-    def __truediv__(self, scalar: float) -> 'Point3D':
-        return Point3D(self.x / scalar, self.y / scalar, self.z / scalar)
-
-
-@dataclass
-class Vector3D:
-    """3D Vector representation"""
-    x: float
-    y: float
-    z: float = 0.0
-    
-    def length(self) -> float:
-        """Calculate vector length"""
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
-    
-    def normalize(self) -> 'Vector3D':
-        """Return normalized vector"""
-        length = self.length()
-        if length == 0:
-            return Vector3D(0, 0, 0)
-        return Vector3D(self.x / length, self.y / length, self.z / length)
-    
-    def dot(self, other: 'Vector3D') -> float:
-        """Dot product with another vector"""
-        return self.x * other.x + self.y * other.y + self.z * other.z
-    
-    def cross(self, other: 'Vector3D') -> 'Vector3D':
-        """Cross product with another vector"""
-        return Vector3D(
-            self.y * other.z - self.z * other.y,
-            self.z * other.x - self.x * other.z,
-            self.x * other.y - self.y * other.x
-        )
-    
-    def angle_to(self, other: 'Vector3D') -> float:
-        """Calculate angle to another vector in radians"""
-        dot_product = self.dot(other)
-        lengths = self.length() * other.length()
-        if lengths == 0:
-            return 0
-        cos_angle = max(-1, min(1, dot_product / lengths))
-        return math.acos(cos_angle)
-    
-    def is_parallel_to(self, other: 'Vector3D', tolerance: float = 1e-6) -> int:
-        """Check if parallel to another vector. Returns 1 (same), -1 (opposite), 0 (not parallel)"""
-        if self.length() == 0 or other.length() == 0:
-            return 0
-        
-        normalized_self = self.normalize()
-        normalized_other = other.normalize()
-        
-        # Check if same direction
-        diff = normalized_self - normalized_other
-        if abs(diff.x) <= tolerance and abs(diff.y) <= tolerance and abs(diff.z) <= tolerance:
-            return 1
-        
-        # Check if opposite direction
-        sum_vec = normalized_self + normalized_other
-        if abs(sum_vec.x) <= tolerance and abs(sum_vec.y) <= tolerance and abs(sum_vec.z) <= tolerance:
-            return -1
-        
-        return 0
-    
-    def __add__(self, other: 'Vector3D') -> 'Vector3D':
-        return Vector3D(self.x + other.x, self.y + other.y, self.z + other.z)
-    
-    def __sub__(self, other: 'Vector3D') -> 'Vector3D':
-        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
-    
-    def __mul__(self, scalar: float) -> 'Vector3D':
-        return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
+from ..primitives import Point3D, Vector3D
+from .sweep import self_intersections, has_self_intersection
 
 
 @dataclass
@@ -118,6 +29,12 @@ class Line:
         """Get line length"""
         return self.start.distance_to(self.end)
     
+    @property
+    def is_valid(self) -> bool:
+        """Check if line has finite, distinct end points"""
+        length = self.length
+        return 0 < length < math.inf
+    
     def point_at(self, t: float) -> Point3D:
         """Get point at parameter t (0 = start, 1 = end)"""
         return Point3D(
@@ -172,6 +89,36 @@ class Plane:
         """Ensure normal is normalized"""
         self.normal = self.normal.normalize()
     
+    @classmethod
+    def world_xy(cls) -> 'Plane':
+        """Plane through the origin with +Z normal"""
+        return cls(Point3D(0, 0, 0), Vector3D(0, 0, 1))
+    
+    @classmethod
+    def from_three_points(cls, a: Point3D, b: Point3D, c: Point3D) -> Optional['Plane']:
+        """Plane through a, b and c, or None when they are collinear"""
+        normal = Vector3D(b.x - a.x, b.y - a.y, b.z - a.z).cross(Vector3D(c.x - a.x, c.y - a.y, c.z - a.z))
+        if normal.length() <= 1e-12:
+            return None
+        return cls(Point3D(a.x, a.y, a.z), normal)
+    
+    @property
+    def is_valid(self) -> bool:
+        return self.normal.length() > 0
+    
+    def frame(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(origin, x_axis, y_axis, normal) as arrays; world_xy gives the world axes
+        
+        The x axis is the world X axis (Y when the normal is close to X)
+        with its normal component removed.
+        """
+        origin = np.array([self.origin.x, self.origin.y, self.origin.z], dtype=float)
+        normal = np.array([self.normal.x, self.normal.y, self.normal.z], dtype=float)
+        reference = np.array([1.0, 0.0, 0.0]) if abs(normal[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+        x_axis = reference - reference.dot(normal) * normal
+        x_axis /= np.linalg.norm(x_axis)
+        return origin, x_axis, np.cross(normal, x_axis), normal
+    
     def closest_point(self, point: Point3D) -> Point3D:
         """Project point onto plane"""
         to_point = Vector3D(
@@ -314,25 +261,18 @@ class Polyline:
         return self.points[-1]
     
     def closest_parameter(self, point: Point3D) -> float:
-        """Find parameter of closest point on polyline"""
-        min_distance = float('inf')
-        best_param = 0.0
-        current_length = 0.0
-        
-        for i in range(len(self.points) - 1):
-            line = Line(self.points[i], self.points[i + 1])
-            closest = line.closest_point(point, limit_to_segment=True)
-            distance = point.distance_to(closest)
-            
-            if distance < min_distance:
-                min_distance = distance
-                line_param = line.closest_parameter(point)
-                line_param = max(0, min(1, line_param))  # Clamp to segment
-                best_param = (current_length + line_param * line.length) / self.length
-            
-            current_length += line.length
-        
-        return min_distance, best_param
+        """Find (distance, normalized parameter) of the closest point on the polyline"""
+        # One vectorized scan; building a segment tree for a single query costs more
+        distances, parameters = ArcLengthTable(as_coords(self)).closest_parameters([point])
+        return float(distances[0]), float(parameters[0])
+    
+    def points_at_parameters(self, parameters) -> np.ndarray:
+        """(K, 3) points at many normalized parameters, looked up in one vectorized call"""
+        return ArcLengthTable.of(self).points_at(parameters)
+    
+    def resample(self, spacing: Optional[float] = None, count: Optional[int] = None) -> 'PolylineArray':
+        """Polyline through points at uniform arc-length spacing (or `count` evenly spaced points)"""
+        return PolylineArray(ArcLengthTable.of(self).resample(spacing, count))
     
     def make_closed(self, tolerance: float = 1e-6) -> bool:
         """Make polyline closed if endpoints are close enough"""
@@ -363,6 +303,642 @@ class Polyline:
         return Point3D(min_x, min_y, min_z), Point3D(max_x, max_y, max_z)
 
 
+def as_coords(points) -> np.ndarray:
+    """Convert Point3D objects, (N, 2)/(N, 3) arrays or polylines to an (N, 3) float array"""
+    if isinstance(points, PolylineArray):
+        return points._coords.copy()
+    if isinstance(points, Polyline):
+        points = points.points
+
+    if isinstance(points, np.ndarray):
+        coords = np.array(points, dtype=float)
+    else:
+        points = list(points)
+        if points and hasattr(points[0], 'x'):
+            coords = np.array([(p.x, p.y, p.z) for p in points], dtype=float)
+        else:
+            coords = np.array(points, dtype=float)
+
+    if coords.size == 0:
+        return np.empty((0, 3), dtype=float)
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError(f"Expected (N, 2) or (N, 3) coordinates, got shape {coords.shape}")
+    if coords.shape[1] == 2:
+        coords = np.column_stack([coords, np.zeros(len(coords))])
+    return coords
+
+
+def pairwise_distances(coords: np.ndarray) -> np.ndarray:
+    """(N, N) Euclidean distance matrix for (N, 3) coordinates"""
+    differences = coords[:, None, :] - coords[None, :, :]
+    return np.sqrt((differences ** 2).sum(axis=2))
+
+
+def segment_distances(coords: np.ndarray, point) -> np.ndarray:
+    """Distance from point to each segment coords[i] -> coords[i + 1] of an (N, 3) array"""
+    starts = coords[:-1]
+    directions = np.diff(coords, axis=0)
+    target = np.array([point.x, point.y, point.z], dtype=float)
+    length_squared = np.einsum('ij,ij->i', directions, directions)
+    projection = np.einsum('ij,ij->i', target - starts, directions)
+    t = np.clip(np.divide(projection, length_squared, out=np.zeros_like(projection),
+                          where=length_squared > 0), 0.0, 1.0)
+    return np.linalg.norm(starts + t[:, None] * directions - target, axis=1)
+
+
+def signed_area(xy: np.ndarray) -> float:
+    """Shoelace area of an (N, 2) ring, positive when counter-clockwise"""
+    x, y = xy[:, 0], xy[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+# Upper bound on (query point, edge) pairs evaluated at once by points_in_polygon
+POINT_IN_POLYGON_CHUNK = 1 << 18
+
+
+def _as_xy(points) -> np.ndarray:
+    """(M, 2) float array of x, y for query points in any form as_coords accepts"""
+    if isinstance(points, np.ndarray) and points.ndim == 2 and points.shape[1] in (2, 3):
+        return np.asarray(points[:, :2], dtype=float)
+    return as_coords(points)[:, :2]
+
+
+class _PolygonEdges:
+    """Arrays describing the non-horizontal edges of a closed 2D polygon"""
+
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'dx', 'dy', 'y_low', 'y_high', 'x_high', 'vertical')
+
+    def __init__(self, vertices: np.ndarray):
+        x1, y1 = vertices[:, 0], vertices[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+        # Horizontal edges never toggle the crossing count
+        sloped = y1 != y2
+        x1, y1, x2, y2 = x1[sloped], y1[sloped], x2[sloped], y2[sloped]
+
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.dx, self.dy = x2 - x1, y2 - y1
+        self.y_low, self.y_high = np.minimum(y1, y2), np.maximum(y1, y2)
+        self.x_high = np.maximum(x1, x2)
+        self.vertical = self.dx == 0
+
+    def __len__(self):
+        return len(self.x1)
+
+    def crossings(self, x, y, edges=slice(None)):
+        """Whether a ray from (x, y) towards +x crosses each selected edge
+
+        x and y broadcast against the selected edges. Same expressions as
+        GeometryUtils.point_in_polygon_2d, so results match it bit for bit.
+        """
+        x1, y1, dx, dy = self.x1[edges], self.y1[edges], self.dx[edges], self.dy[edges]
+        crossing = (y > self.y_low[edges]) & (y <= self.y_high[edges]) & (x <= self.x_high[edges])
+        crossing &= self.vertical[edges] | (x <= (y - y1) * dx / dy + x1)
+        return crossing
+
+
+def points_in_polygon(points, polygon, chunk_size: int = POINT_IN_POLYGON_CHUNK) -> np.ndarray:
+    """Boolean mask of which (M, 2)/(M, 3) query points lie inside a 2D polygon
+
+    Vectorized crossing-number test following the same rule (and the same
+    floating point expressions) as GeometryUtils.point_in_polygon_2d, so both
+    agree on every point including those on the boundary. Points are processed
+    in chunks so at most chunk_size point/edge pairs are held in memory.
+    polygon may be a PreparedPolygon, which only tests the edges near each point.
+    """
+    if isinstance(polygon, PreparedPolygon):
+        return polygon.contains_points(points, chunk_size)
+
+    query = _as_xy(points)
+    inside = np.zeros(len(query), dtype=bool)
+
+    vertices = _as_xy(polygon)
+    if len(query) == 0 or len(vertices) == 0:
+        return inside
+
+    edges = _PolygonEdges(vertices)
+    if len(edges) == 0:
+        return inside
+
+    rows = max(1, chunk_size // len(edges))
+    for start in range(0, len(query), rows):
+        crossings = edges.crossings(query[start:start + rows, 0:1], query[start:start + rows, 1:2])
+        inside[start:start + rows] = np.count_nonzero(crossings, axis=1) % 2 == 1
+
+    return inside
+
+
+class PreparedPolygon:
+    """2D polygon indexed for repeated point containment queries
+
+    Built once per site. The y-range of the polygon is cut into horizontal
+    slabs at the vertex y values and each slab lists the edges spanning it, so
+    a query locates its slab by binary search and only evaluates those edges
+    instead of all n. Slabs are merged when the index would exceed
+    max_index_size edge entries. Uses the same crossing rule as
+    GeometryUtils.point_in_polygon_2d and points_in_polygon.
+    """
+
+    def __init__(self, polygon, max_index_size: Optional[int] = None):
+        self.vertices = _as_xy(polygon).copy()
+        self._edges = _PolygonEdges(self.vertices)
+        self._scalar_index = None
+
+        if max_index_size is None:
+            max_index_size = max(1 << 16, 8 * len(self._edges))
+        self._build_index(max_index_size)
+
+    @classmethod
+    def of(cls, polygon) -> 'PreparedPolygon':
+        """Prepared form of polygon, cached on PolylineArray instances"""
+        if isinstance(polygon, cls):
+            return polygon
+        if isinstance(polygon, PolylineArray):
+            return polygon._cached('prepared', cls)
+        return cls(polygon)
+
+    def _build_index(self, max_index_size: int):
+        edges = self._edges
+        if len(edges) == 0:
+            self.slab_y = np.empty(0)
+            self.slab_offsets = np.zeros(1, dtype=np.intp)
+            self.slab_edges = np.empty(0, dtype=np.intp)
+            return
+
+        # Slab k covers y in (slab_y[k], slab_y[k + 1]]
+        boundaries = np.unique(np.concatenate([edges.y_low, edges.y_high]))
+        while True:
+            first = np.maximum(np.searchsorted(boundaries, edges.y_low, side='right') - 1, 0)
+            last = np.searchsorted(boundaries, edges.y_high, side='left') - 1
+            counts = last - first + 1
+            if counts.sum() <= max_index_size or len(boundaries) <= 2:
+                break
+            # Merge neighbouring slabs, keeping the outer bounds
+            boundaries = np.concatenate([boundaries[:-1:2], boundaries[-1:]])
+
+        # Edge ids grouped by slab (CSR layout)
+        edge_ids = np.repeat(np.arange(len(edges)), counts)
+        starts = np.repeat(first - np.cumsum(counts) + counts, counts)
+        slabs = starts + np.arange(len(edge_ids))
+        order = np.argsort(slabs, kind='stable')
+
+        self.slab_y = boundaries
+        self.slab_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(slabs, minlength=len(boundaries) - 1))]
+        ).astype(np.intp)
+        self.slab_edges = edge_ids[order]
+
+    @property
+    def slab_count(self) -> int:
+        return max(len(self.slab_y) - 1, 0)
+
+    def _slabs_of(self, y: np.ndarray) -> np.ndarray:
+        """Slab index for each y, or -1 outside the polygon's y-range"""
+        slabs = np.searchsorted(self.slab_y, y, side='left') - 1
+        slabs[(slabs < 0) | (slabs >= self.slab_count)] = -1
+        return slabs
+
+    def contains_points(self, points, chunk_size: int = POINT_IN_POLYGON_CHUNK) -> np.ndarray:
+        """Boolean mask of which (M, 2)/(M, 3) points lie inside the polygon"""
+        query = _as_xy(points)
+        inside = np.zeros(len(query), dtype=bool)
+        if len(query) == 0 or self.slab_count == 0:
+            return inside
+
+        slabs = self._slabs_of(query[:, 1])
+        offsets = self.slab_offsets
+        widest = int(np.diff(offsets).max())
+        rows = max(1, chunk_size // max(widest, 1))
+
+        for start in range(0, len(query), rows):
+            candidates = np.flatnonzero(slabs[start:start + rows] >= 0) + start
+            first = offsets[slabs[candidates]]
+            counts = offsets[slabs[candidates] + 1] - first
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # One entry per (point, edge in the point's slab) pair
+            owners = np.repeat(candidates, counts)
+            positions = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(total)
+            crossings = self._edges.crossings(
+                query[owners, 0], query[owners, 1], self.slab_edges[positions]
+            )
+            hits = np.bincount(owners[crossings] - start, minlength=min(rows, len(query) - start))
+            inside[start:start + len(hits)] = hits % 2 == 1
+
+        return inside
+
+    def contains(self, point) -> bool:
+        """Single point containment without NumPy overhead"""
+        if self._scalar_index is None:
+            edges = self._edges
+            segments = list(zip(edges.x1.tolist(), edges.y1.tolist(), edges.x2.tolist(), edges.y2.tolist()))
+            self._scalar_index = (
+                self.slab_y.tolist(), self.slab_offsets.tolist(),
+                [segments[e] for e in self.slab_edges.tolist()]
+            )
+
+        slab_y, offsets, slab_segments = self._scalar_index
+        x, y = point.x, point.y
+        slab = bisect.bisect_left(slab_y, y) - 1
+        if slab < 0 or slab >= len(slab_y) - 1:
+            return False
+
+        inside = False
+        for p1x, p1y, p2x, p2y in slab_segments[offsets[slab]:offsets[slab + 1]]:
+            if y > min(p1y, p2y) and y <= max(p1y, p2y) and x <= max(p1x, p2x):
+                if p1x == p2x or x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                    inside = not inside
+        return inside
+
+    def __repr__(self) -> str:
+        return f'PreparedPolygon(vertices={len(self.vertices)}, slabs={self.slab_count})'
+
+
+def rectangle_corners(centers, width, depth) -> np.ndarray:
+    """(K, 4, 2) corners of axis-aligned rectangles around (K, 2)/(K, 3) centers
+
+    width and depth may be scalars or per-rectangle arrays. Corners are ordered
+    (-w, -d), (+w, -d), (+w, +d), (-w, +d) from the center.
+    """
+    xy = _as_xy(centers)
+    half_width = np.asarray(width, dtype=float) / 2
+    half_depth = np.asarray(depth, dtype=float) / 2
+
+    corners = np.empty((len(xy), 4, 2), dtype=float)
+    corners[:, 0, 0] = corners[:, 3, 0] = xy[:, 0] - half_width
+    corners[:, 1, 0] = corners[:, 2, 0] = xy[:, 0] + half_width
+    corners[:, 0, 1] = corners[:, 1, 1] = xy[:, 1] - half_depth
+    corners[:, 2, 1] = corners[:, 3, 1] = xy[:, 1] + half_depth
+    return corners
+
+
+def rectangles_in_polygon(centers, width, depth, polygon) -> np.ndarray:
+    """Boolean mask of which axis-aligned rectangles have all four corners inside polygon"""
+    corners = rectangle_corners(centers, width, depth)
+    if len(corners) == 0:
+        return np.zeros(0, dtype=bool)
+    return points_in_polygon(corners.reshape(-1, 2), polygon).reshape(-1, 4).all(axis=1)
+
+
+class UniformSampler:
+    """Draws blocks of uniform samples while keeping a random source's sequence
+
+    Each row holds one value per (low, high) range, drawn in the order a scalar
+    loop would call rng.uniform, so candidates can be generated and tested in
+    batches. After a batch, rewind(used) returns the source to the state it
+    would have after drawing only the first `used` rows, leaving seeded results
+    unchanged. rng is the random module or a random.Random instance.
+    """
+
+    def __init__(self, rng, ranges):
+        self.rng = rng
+        self.ranges = list(ranges)
+        self._state = None
+        self._drawn = 0
+
+    def draw(self, count: int) -> np.ndarray:
+        """(count, len(ranges)) array of samples"""
+        self._state = self.rng.getstate()
+        self._drawn = count
+        uniform = self.rng.uniform
+        values = [uniform(low, high) for _ in range(count) for low, high in self.ranges]
+        return np.array(values, dtype=float).reshape(count, len(self.ranges))
+
+    def rewind(self, used: int):
+        """Give back the rows of the last draw after the first `used`"""
+        if self._state is None or used >= self._drawn:
+            return
+        self.rng.setstate(self._state)
+        draw = self.rng.random
+        for _ in range(used * len(self.ranges)):
+            draw()
+        self._drawn = used
+
+
+class ArcLengthTable:
+    """Cumulative arc length along a polyline, for binary-search parameter lookups
+
+    Built once per polyline (cached on PolylineArray). Vertex parameters run
+    from 0 to N - 1 with the integer part selecting the segment; normalized
+    parameters run from 0 to 1 by arc length. Lookups reproduce the scalar
+    Polyline and PolylineAddOn arithmetic exactly.
+    """
+
+    def __init__(self, coords: np.ndarray):
+        self.coords = coords
+        if len(coords):
+            self.segment_lengths = np.linalg.norm(np.diff(coords, axis=0), axis=1)
+            self.cumulative = np.concatenate([[0.0], np.cumsum(self.segment_lengths)])
+        else:
+            self.segment_lengths = np.zeros(0)
+            self.cumulative = np.zeros(0)
+
+    @classmethod
+    def of(cls, polyline) -> 'ArcLengthTable':
+        """Table for a polyline or point list, cached on PolylineArray instances"""
+        if isinstance(polyline, cls):
+            return polyline
+        if isinstance(polyline, PolylineArray):
+            return polyline._cached('arc_length', cls)
+        return cls(as_coords(polyline))
+
+    @property
+    def total(self) -> float:
+        return float(self.cumulative[-1]) if len(self.cumulative) else 0.0
+
+    def lengths_at(self, parameters) -> np.ndarray:
+        """Arc length at each vertex parameter; NaN outside [0, N - 1]"""
+        parameters = np.asarray(parameters, dtype=float)
+        lengths = np.full(parameters.shape, np.nan)
+        if len(self.segment_lengths) == 0:
+            return lengths
+
+        valid = (parameters >= 0.0) & (parameters <= len(self.segment_lengths))
+        valid_parameters = parameters[valid]
+        segment = np.minimum(valid_parameters.astype(np.intp), len(self.segment_lengths) - 1)
+        lengths[valid] = self.cumulative[segment] + self.segment_lengths[segment] * (valid_parameters - segment)
+        return lengths
+
+    def points_at_lengths(self, lengths) -> np.ndarray:
+        """(K, 3) points at the given arc lengths from the start, clamped to the ends"""
+        lengths = np.asarray(lengths, dtype=float).ravel()
+        coords = self.coords
+        if len(coords) < 2:
+            return np.repeat(coords[:1], len(lengths), axis=0)
+
+        # Segment i holds lengths in (cumulative[i], cumulative[i + 1]]
+        segment = np.searchsorted(self.cumulative, lengths, side='left') - 1
+        before = segment < 0
+        after = segment >= len(self.segment_lengths)
+        inner = ~(before | after)
+        segment = np.clip(segment, 0, len(self.segment_lengths) - 1)
+
+        segment_lengths = self.segment_lengths[segment]
+        segment_t = np.divide(lengths - self.cumulative[segment], segment_lengths,
+                              out=np.zeros_like(lengths), where=inner & (segment_lengths > 0))
+        start = coords[segment]
+        points = start + segment_t[:, None] * (coords[segment + 1] - start)
+
+        points[before] = coords[0]
+        points[after] = coords[-1]
+        return points
+
+    def points_at(self, parameters) -> np.ndarray:
+        """(K, 3) points at normalized parameters (0 to 1)"""
+        parameters = np.asarray(parameters, dtype=float).ravel()
+        points = self.points_at_lengths(parameters * self.total)
+        if len(self.coords):
+            points[parameters <= 0] = self.coords[0]
+            points[parameters >= 1] = self.coords[-1]
+        return points
+
+    def resample(self, spacing: Optional[float] = None, count: Optional[int] = None) -> np.ndarray:
+        """Points at uniform arc-length spacing, or `count` evenly spaced points, ends included"""
+        if count is not None:
+            lengths = np.linspace(0.0, self.total, count)
+        elif spacing is not None and spacing > 0:
+            lengths = np.append(np.arange(0.0, self.total, spacing), self.total)
+        else:
+            raise ValueError("Either spacing or count is required")
+        return self.points_at_lengths(lengths)
+
+    def closest_parameters(self, points, chunk_size: int = POINT_IN_POLYGON_CHUNK) -> Tuple[np.ndarray, np.ndarray]:
+        """(distances, normalized parameters) of the closest polyline point to each query point"""
+        query = as_coords(points)
+        distances = np.full(len(query), np.inf)
+        parameters = np.zeros(len(query))
+        coords = self.coords
+        if len(coords) < 2 or len(query) == 0:
+            return distances, parameters
+
+        starts = coords[:-1]
+        directions = np.diff(coords, axis=0)
+        length_squared = np.einsum('ij,ij->i', directions, directions)
+        total = self.total
+
+        rows = max(1, chunk_size // len(starts))
+        for first in range(0, len(query), rows):
+            targets = query[first:first + rows, None, :]
+            projection = np.einsum('kij,ij->ki', targets - starts, directions)
+            t = np.clip(np.divide(projection, length_squared, out=np.zeros_like(projection),
+                                  where=length_squared > 0), 0.0, 1.0)
+            gaps = np.linalg.norm(starts + t[:, :, None] * directions - targets, axis=2)
+
+            segment = np.argmin(gaps, axis=1)
+            rows_index = np.arange(len(segment))
+            distances[first:first + rows] = gaps[rows_index, segment]
+            if total > 0:
+                parameters[first:first + rows] = (
+                    self.cumulative[segment] + t[rows_index, segment] * self.segment_lengths[segment]
+                ) / total
+
+        return distances, parameters
+
+
+class PolylinePoints(MutableSequence):
+    """List-like Point3D view over a PolylineArray
+
+    Writes go to the backing array and invalidate the cached metrics. The
+    Point3D objects handed out are snapshots, so replace points through the
+    sequence rather than setting attributes on them.
+    """
+
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: 'PolylineArray'):
+        self._owner = owner
+
+    def _items(self) -> List[Point3D]:
+        return self._owner._cached('points', lambda coords: [Point3D(x, y, z) for x, y, z in coords.tolist()])
+
+    def __len__(self) -> int:
+        return len(self._owner._coords)
+
+    def __getitem__(self, index):
+        return self._items()[index]
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __setitem__(self, index, value):
+        coords = self._owner._coords.copy()
+        if isinstance(index, slice):
+            items = list(self._items())
+            items[index] = value
+            coords = as_coords(items)
+        else:
+            coords[index] = (value.x, value.y, value.z)
+        self._owner._set_coords(coords)
+
+    def __delitem__(self, index):
+        positions = np.arange(len(self))[index]
+        self._owner._set_coords(np.delete(self._owner._coords, positions, axis=0))
+
+    def insert(self, index, value):
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._owner._set_coords(np.insert(self._owner._coords, index, (value.x, value.y, value.z), axis=0))
+
+    def extend(self, values):
+        added = as_coords(values)
+        if len(added):
+            self._owner._set_coords(np.concatenate([self._owner._coords, added]))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, PolylinePoints)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._items())
+
+
+class PolylineArray(Polyline):
+    """Polyline backed by an (N, 3) float array
+
+    Drop-in replacement for Polyline: `points` is a list-like view, and
+    length, area, centroid, bounding box and segment lengths are computed
+    with NumPy and cached until the points change.
+    """
+
+    def __init__(self, points=()):
+        self._coords = as_coords(points)
+        self._cache = {}
+
+    @classmethod
+    def from_flattened(cls, flattened_vertices) -> 'PolylineArray':
+        """Build from [x0, y0, z0, x1, ...], ignoring an incomplete trailing vertex"""
+        values = np.asarray(flattened_vertices, dtype=float).ravel()
+        return cls(values[:len(values) - len(values) % 3].reshape(-1, 3))
+
+    @property
+    def coords(self) -> np.ndarray:
+        """Read-only (N, 3) view of the vertices"""
+        view = self._coords.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def points(self) -> PolylinePoints:
+        return PolylinePoints(self)
+
+    @points.setter
+    def points(self, points):
+        self._set_coords(as_coords(points))
+
+    def _set_coords(self, coords: np.ndarray):
+        self._coords = coords
+        self._cache.clear()
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute(self._coords)
+        return self._cache[key]
+
+    def copy(self) -> 'PolylineArray':
+        return PolylineArray(self._coords)
+
+    @property
+    def is_closed(self) -> bool:
+        """Check if polyline is closed"""
+        coords = self._coords
+        if len(coords) < 4:
+            return False
+        return float(np.linalg.norm(coords[0] - coords[-1])) < 1e-6
+
+    @property
+    def is_valid(self) -> bool:
+        """Check if polyline is valid"""
+        return len(self._coords) >= 2
+
+    @property
+    def arc_length_table(self) -> ArcLengthTable:
+        return self._cached('arc_length', ArcLengthTable)
+
+    @property
+    def segment_lengths(self) -> np.ndarray:
+        """Length of each segment, shape (N - 1,)"""
+        return self.arc_length_table.segment_lengths
+
+    @property
+    def cumulative_lengths(self) -> np.ndarray:
+        """Length from the start to each vertex, shape (N,)"""
+        return self.arc_length_table.cumulative
+
+    @property
+    def length(self) -> float:
+        """Calculate total polyline length"""
+        return self.arc_length_table.total
+
+    def get_area(self) -> float:
+        """Calculate area of a closed planar polyline from the summed fan cross products"""
+        if not self.is_closed:
+            return 0.0
+
+        def area(coords):
+            edges = coords[1:] - coords[0]
+            return float(np.linalg.norm(np.cross(edges[:-1], edges[1:]).sum(axis=0)) / 2)
+
+        return self._cached('area', area)
+
+    def get_centroid(self) -> Point3D:
+        """Calculate centroid of closed polyline (vertex average when open or degenerate)"""
+        def centroid(coords):
+            mean = coords.mean(axis=0)
+            if not self.is_closed:
+                return tuple(mean.tolist())
+
+            x0, y0 = coords[:-1, 0], coords[:-1, 1]
+            x1, y1 = coords[1:, 0], coords[1:, 1]
+            cross = x0 * y1 - x1 * y0
+            area = cross.sum() * 0.5
+            if area == 0:
+                return tuple(mean.tolist())
+
+            cx = float(((x0 + x1) * cross).sum() / (6.0 * area))
+            cy = float(((y0 + y1) * cross).sum() / (6.0 * area))
+            return cx, cy, float(mean[2])
+
+        return Point3D(*self._cached('centroid', centroid))
+
+    def point_at_parameter(self, t: float) -> Point3D:
+        """Get point at normalized parameter (0 to 1) along polyline"""
+        return Point3D(*self.arc_length_table.points_at([t])[0].tolist())
+
+    def closest_parameter(self, point: Point3D) -> float:
+        """Find (distance, normalized parameter) of the closest point on the polyline"""
+        from .bvh import SegmentBoxTree
+        return SegmentBoxTree.of(self).closest_parameter(point)
+
+    def make_closed(self, tolerance: float = 1e-6) -> bool:
+        """Make polyline closed if endpoints are close enough"""
+        if self.is_closed:
+            return True
+
+        coords = self._coords
+        if len(coords) < 3:
+            return False
+
+        if float(np.linalg.norm(coords[0] - coords[-1])) <= tolerance:
+            coords = coords.copy()
+            coords[-1] = coords[0]
+            self._set_coords(coords)
+            return True
+
+        return False
+
+    def get_bounding_box(self) -> Tuple[Point3D, Point3D]:
+        """Get bounding box as (min_point, max_point)"""
+        if not len(self._coords):
+            return Point3D(0, 0, 0), Point3D(0, 0, 0)
+
+        low, high = self._cached(
+            'bounding_box', lambda coords: (coords.min(axis=0).tolist(), coords.max(axis=0).tolist())
+        )
+        return Point3D(*low), Point3D(*high)
+
+
 class GeometryUtils:
     """Utility functions for geometry operations"""
     
@@ -387,6 +963,49 @@ class GeometryUtils:
         
         return inside
     
+    @staticmethod
+    def points_in_polygon_2d(points, polygon: List[Point3D]) -> np.ndarray:
+        """Batch form of point_in_polygon_2d for an (M, 2) array of points; returns a mask"""
+        return points_in_polygon(points, polygon)
+    
+    @staticmethod
+    def plane_to_plane_transform(source: Plane, target: Plane) -> np.ndarray:
+        """4x4 matrix taking source plane's origin and axes onto target's"""
+        # Import here to avoid circular import
+        from .transforms import plane_to_plane_matrix
+        return plane_to_plane_matrix(source, target)
+    
+    @staticmethod
+    def get_polyline_plane(polyline: Polyline, tolerance: float = 1e-6) -> Optional[Plane]:
+        """Best-fit plane of a polyline, or None if it is degenerate or not planar within tolerance"""
+        from .transforms import fit_plane
+        coords = as_coords(polyline)
+        if len(coords) > 1 and np.allclose(coords[0], coords[-1]):
+            coords = coords[:-1]
+        plane = fit_plane(coords)
+        if plane is None:
+            return None
+        origin, _, _, normal = plane.frame()
+        if np.any(np.abs((coords - origin) @ normal) > tolerance):
+            return None
+        return plane
+    
+    @staticmethod
+    def transform_point(point: Point3D, matrix: np.ndarray) -> Point3D:
+        """Point mapped by a 4x4 affine matrix"""
+        m = np.asarray(matrix, dtype=float).tolist()
+        return Point3D(
+            m[0][0] * point.x + m[0][1] * point.y + m[0][2] * point.z + m[0][3],
+            m[1][0] * point.x + m[1][1] * point.y + m[1][2] * point.z + m[1][3],
+            m[2][0] * point.x + m[2][1] * point.y + m[2][2] * point.z + m[2][3]
+        )
+    
+    @staticmethod
+    def transform_polyline(polyline: Polyline, matrix: np.ndarray) -> 'PolylineArray':
+        """Polyline with every vertex mapped by a 4x4 affine matrix in one call"""
+        from .transforms import transform_coords
+        return PolylineArray(transform_coords(as_coords(polyline), matrix))
+    
     @staticmethod
     def line_intersection_2d(line1: Line, line2: Line, tolerance: float = 1e-6) -> Optional[Tuple[float, float]]:
         """Find intersection parameters for two 2D lines"""
@@ -422,57 +1041,44 @@ class GeometryUtils:
     
     @staticmethod
     def polygon_self_intersects(polygon: List[Point3D], tolerance: float = 1e-6) -> bool:
-        """Check if polygon self-intersects"""
-        n = len(polygon)
-        
-        for i in range(n):
-            line1 = Line(polygon[i], polygon[(i + 1) % n])
-            
-            # Check against non-adjacent edges
-            for j in range(i + 2, n):
-                if i == 0 and j == n - 1:
-                    continue  # Skip last edge when starting from first
-                
-                line2 = Line(polygon[j], polygon[(j + 1) % n])
-                
-                if GeometryUtils.lines_intersect_2d(line1, line2, tolerance, True):
-                    return True
-        
-        return False
+        """Check if polygon self-intersects
+
+        Non-adjacent edges are found with a sweep line (see geometry.sweep)
+        rather than testing every pair; the pair test is lines_intersect_2d.
+        """
+        if len(polygon) < 4:
+            return False
+        return has_self_intersection(as_coords(polygon), closed=True, tolerance=tolerance)
+    
+    @staticmethod
+    def polygon_self_intersections(polygon: List[Point3D], tolerance: float = 1e-6) -> List[Tuple[int, int, Point3D]]:
+        """Every pair of intersecting non-adjacent edges (i, j) with the intersection point"""
+        if len(polygon) < 4:
+            return []
+        return [
+            (i, j, Point3D(x, y, 0.0))
+            for i, j, (x, y) in self_intersections(as_coords(polygon), closed=True, tolerance=tolerance)
+        ]
     
     @staticmethod
     def create_inset_polygon(polygon: List[Point3D], inset_distance: float) -> List[Point3D]:
-        """Create an inset polygon (simplified approach moving vertices toward centroid)"""
+        """Create an inset polygon from the straight skeleton; negative distances grow it
+
+        Returns the original polygon when the inset leaves nothing.
+        """
         if len(polygon) < 3:
             return polygon
         
-        # Calculate centroid
-        cx = sum(p.x for p in polygon) / len(polygon)
-        cy = sum(p.y for p in polygon) / len(polygon)
-        cz = sum(p.z for p in polygon) / len(polygon)
-        centroid = Point3D(cx, cy, cz)
-        
-        inset_polygon = []
-        for point in polygon:
-            # Vector from point to centroid
-            to_centroid = Vector3D(
-                centroid.x - point.x,
-                centroid.y - point.y,
-                centroid.z - point.z
-            )
-            
-            length = to_centroid.length()
-            if length > inset_distance:
-                # Move point toward centroid by inset_distance
-                normalized = to_centroid.normalize()
-                new_point = Point3D(
-                    point.x + normalized.x * inset_distance,
-                    point.y + normalized.y * inset_distance,
-                    point.z + normalized.z * inset_distance
-                )
-                inset_polygon.append(new_point)
+        from .skeleton import StraightSkeleton
+        ring = StraightSkeleton.of(polygon, outward=inset_distance < 0).largest_ring(abs(inset_distance))
+        if ring is None:
+            return polygon
+        
+        # Repeat the closing vertex when the input does
+        if polygon[0].distance_to(polygon[-1]) <= 1e-6:
+            ring = np.vstack([ring, ring[:1]])
         
-        return inset_polygon if len(inset_polygon) >= 3 else polygon
+        return [Point3D(x, y, z) for x, y, z in ring.tolist()]
     
     @staticmethod
     def offset_line(line: Line, direction_point: Point3D, distance: float, plane_normal: Vector3D = None) -> Line:
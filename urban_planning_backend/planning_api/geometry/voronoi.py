@@ -7,13 +7,17 @@ import math
 import heapq
 from typing import List, Tuple, Optional, Set
 from dataclasses import dataclass
+from ..primitives import Point3D
 
 
-@dataclass
-class VPoint:
-    """Point class for Voronoi calculations"""
-    x: float
-    y: float
+class VPoint(Point3D):
+    """Point class for Voronoi calculations (z stays 0)"""
+    
+    # Empty slots keep Point3D's x, y, z slots and add no instance __dict__
+    __slots__ = ()
+    
+    def __repr__(self):
+        return f'VPoint(x={self.x!r}, y={self.y!r})'
     
     def __eq__(self, other):
         if not isinstance(other, VPoint):
@@ -0,0 +1,123 @@
+# planning_api/job_views.py - Submit, poll, cancel and fetch asynchronous jobs
+import logging
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from .models import PlanningJob, PlanningJobChunk
+from .serializers import JobSubmitSerializer, PlanningJobSerializer
+from .jobs import submit_job, cancel_job, validate_job_parameters
+
+logger = logging.getLogger(__name__)
+
+
+def _get_job(job_id):
+    """Return the job or None"""
+    return PlanningJob.objects.filter(pk=job_id).first()
+
+
+def _not_found(job_id):
+    return Response({'error': f'Job {job_id} not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class JobSubmitView(APIView):
+    """Queue a long-running planning or analysis job"""
+
+    def get(self, request):
+        """List recent jobs, optionally filtered by ?status= and ?kind="""
+        jobs = PlanningJob.objects.all()
+        if request.query_params.get('status'):
+            jobs = jobs.filter(status=request.query_params['status'])
+        if request.query_params.get('kind'):
+            jobs = jobs.filter(kind=request.query_params['kind'])
+        return Response({'jobs': PlanningJobSerializer(jobs[:50], many=True).data}, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        try:
+            serializer = JobSubmitSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {'error': 'Invalid input data', 'details': serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            kind = serializer.validated_data['kind']
+            parameters = request.data.get('parameters')
+
+            # Reject bad parameters now rather than after the job was queued
+            _, errors = validate_job_parameters(kind, parameters)
+            if errors:
+                return Response(
+                    {'error': 'Invalid input data', 'details': {'parameters': errors}},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            job = submit_job(kind, parameters)
+            logger.info(f"Queued job {job.pk} ({kind})")
+
+            return Response(PlanningJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            logger.error(f"Job submission error: {str(e)}", exc_info=True)
+            return Response(
+                {'error': f'Job submission failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class JobDetailView(APIView):
+    """Poll job status, progress and timing"""
+
+    def get(self, request, job_id):
+        job = _get_job(job_id)
+        if job is None:
+            return _not_found(job_id)
+        return Response(PlanningJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class JobCancelView(APIView):
+    """Request cancellation of a queued or running job"""
+
+    def post(self, request, job_id):
+        job = _get_job(job_id)
+        if job is None:
+            return _not_found(job_id)
+        return Response(PlanningJobSerializer(cancel_job(job)).data, status=status.HTTP_200_OK)
+
+
+class JobResultView(APIView):
+    """Fetch one chunk of a finished job's result items (?chunk=N, default 0)"""
+
+    def get(self, request, job_id):
+        job = _get_job(job_id)
+        if job is None:
+            return _not_found(job_id)
+
+        if job.status != PlanningJob.SUCCEEDED:
+            return Response(
+                {'error': f'Job is {job.status}, results are not available', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        try:
+            chunk_index = int(request.query_params.get('chunk', 0))
+        except ValueError:
+            return Response({'error': 'chunk must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if job.chunk_count and not 0 <= chunk_index < job.chunk_count:
+            return Response(
+                {'error': f'chunk must be between 0 and {job.chunk_count - 1}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        chunk = PlanningJobChunk.objects.filter(job=job, index=chunk_index).first()
+        next_chunk = chunk_index + 1 if chunk_index + 1 < job.chunk_count else None
+
+        return Response({
+            'job_id': str(job.pk),
+            'summary': job.summary,
+            'chunk': chunk_index,
+            'chunk_count': job.chunk_count,
+            'item_count': job.item_count,
+            'next_chunk': next_chunk,
+            'items': chunk.items if chunk else []
+        }, status=status.HTTP_200_OK)
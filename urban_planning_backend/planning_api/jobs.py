@@ -0,0 +1,366 @@
+# planning_api/jobs.py - Asynchronous job execution on a local worker pool
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from .models import PlanningJob, PlanningJobChunk
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to the database
+PROGRESS_INTERVAL = 0.5
+
+# Seconds between heartbeat writes while a job runs; see PLANNING_JOB_HEARTBEAT_TIMEOUT
+HEARTBEAT_INTERVAL = 10.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler when cancellation was requested"""
+    pass
+
+
+def worker_id() -> str:
+    """host:pid identifying the current process as a job owner"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class JobHeartbeat:
+    """Refreshes a running job's heartbeat from a background thread"""
+
+    def __init__(self, job_id, interval: float = HEARTBEAT_INTERVAL):
+        self.job_id = job_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'job-heartbeat-{job_id}', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                PlanningJob.objects.filter(pk=self.job_id, status=PlanningJob.RUNNING).update(
+                    heartbeat_at=timezone.now()
+                )
+        finally:
+            connection.close()
+
+
+class JobReporter:
+    """Progress callback handed to job handlers; also polls for cancellation"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def __call__(self, progress: float, message: str = ''):
+        now = time.monotonic()
+        if progress < 1.0 and now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+
+        PlanningJob.objects.filter(pk=self.job_id).update(
+            progress=max(0.0, min(1.0, progress)), message=message[:255]
+        )
+        if PlanningJob.objects.filter(pk=self.job_id, cancel_requested=True).exists():
+            raise JobCancelled()
+
+
+# Job handlers take (validated parameters, reporter) and return (items, summary).
+# items is a list stored in chunks; summary is a small dict returned with the job.
+
+def run_plan_batch(parameters, report):
+    """Generate plans for many sites, one result item per site"""
+    from .batch_views import generate_site_plan
+    from .serializers import GeneratePlanRequestSerializer
+
+    sites = parameters['sites']
+    processor = parameters['processor']
+    items = []
+
+    for index, site_data in enumerate(sites):
+        report(index / len(sites), f'Site {index + 1} of {len(sites)}')
+
+        site_serializer = GeneratePlanRequestSerializer(data=site_data)
+        if not site_serializer.is_valid():
+            items.append({'index': index, 'success': False, 'error': 'Invalid input data',
+                          'details': site_serializer.errors})
+            continue
+
+        site = site_serializer.validated_data
+        try:
+            result = generate_site_plan(processor, site['plan_flattened_vertices'], site.get('plan_parameters', {}))
+            items.append({'index': index, 'success': True, 'result': result})
+        except Exception as e:
+            logger.error(f"Job site {index} failed: {str(e)}")
+            items.append({'index': index, 'success': False, 'error': str(e)})
+
+    failed = sum(1 for item in items if not item['success'])
+    return items, {'succeeded': len(items) - failed, 'failed': failed, 'processor': processor}
+
+
+def run_centrality(parameters, report):
+    """Compute betweenness/depth centrality, one result item per vertex"""
+    from .algorithms.graph_algorithms import CalculateCentrality, Edge, GraphAdapter
+
+    vertices = parameters['vertices']
+    edges = [Edge(edge['from'], edge['to'], edge['weight']) for edge in parameters['edges']]
+    radius = parameters['radius']
+
+    centrality = CalculateCentrality(
+        GraphAdapter(vertices, edges), radius,
+        progress=lambda done, total: report(done / total, f'Vertex {done} of {total}')
+    )
+
+    items = [{
+        'vertex': vertex,
+        'betweenness': centrality.betweenness.get(vertex, 0.0),
+        'total_depth': centrality.total_depths.get(vertex),
+        'node_count': centrality.node_counts.get(vertex),
+    } for vertex in vertices]
+    return items, {'vertex_count': len(vertices), 'edge_count': len(edges),
+                   'radius': radius if radius != float('inf') else None}
+
+
+def run_clustering(parameters, report):
+    """Run agglomerative clustering on points, one result item per cluster"""
+    # Imported here so loading the app at startup does not pull in NumPy
+    import numpy as np
+    from .geometry.clustering import AgglomerativeClustering
+
+    coordinates = np.asarray(parameters['vertices'], dtype=np.float64).reshape(-1, 3)
+    cluster_diameter = parameters['cluster_diameter']
+
+    report(0.0, 'Building distance matrix')
+    distance_matrix = np.linalg.norm(coordinates[:, None, :] - coordinates[None, :, :], axis=-1)
+
+    report(0.1, 'Clustering')
+    clusters = AgglomerativeClustering.run(distance_matrix, cluster_diameter, coordinates)
+    metrics.CLUSTER_COUNT.observe(clusters.count, source='clustering_job')
+
+    items = [{
+        'id': cluster.id,
+        'centroid': {'x': cluster.centroid.x, 'y': cluster.centroid.y, 'z': cluster.centroid.z},
+        'diameter': cluster.diameter,
+        'member_count': cluster.count,
+        'members': cluster.children,
+    } for cluster in clusters]
+    return items, {'cluster_count': len(items), 'original_points': len(coordinates),
+                   'cluster_diameter': cluster_diameter}
+
+
+def _job_types():
+    """Map job kind to (parameter serializer class, handler)"""
+    from .serializers import BatchGeneratePlanRequestSerializer, ClusteringJobParametersSerializer
+    from .algorithms_views import GraphAnalysisRequestSerializer
+    return {
+        'plan_batch': (BatchGeneratePlanRequestSerializer, run_plan_batch),
+        'centrality': (GraphAnalysisRequestSerializer, run_centrality),
+        'clustering': (ClusteringJobParametersSerializer, run_clustering),
+    }
+
+
+JOB_KINDS = ('plan_batch', 'centrality', 'clustering')
+
+
+def validate_job_parameters(kind, parameters):
+    """Validate job parameters, returning (validated data, errors)"""
+    serializer_class, _ = _job_types()[kind]
+    serializer = serializer_class(data=parameters)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    return serializer.validated_data, None
+
+
+def _store_items(job, items):
+    """Split result items into chunks"""
+    chunk_size = getattr(settings, 'PLANNING_JOB_CHUNK_SIZE', 100)
+    chunks = [
+        PlanningJobChunk(job=job, index=index, items=items[start:start + chunk_size])
+        for index, start in enumerate(range(0, len(items), chunk_size))
+    ]
+    PlanningJobChunk.objects.bulk_create(chunks)
+    return len(chunks)
+
+
+def run_job(job_id):
+    """Execute a queued job in the current (worker) process"""
+    close_old_connections()
+
+    # Claim the job atomically so it never runs twice
+    now = timezone.now()
+    claimed = PlanningJob.objects.filter(pk=job_id, status=PlanningJob.QUEUED, cancel_requested=False).update(
+        status=PlanningJob.RUNNING, started_at=now, message='Started', worker=worker_id(), heartbeat_at=now
+    )
+    if not claimed:
+        return
+
+    job = PlanningJob.objects.get(pk=job_id)
+    _, handler = _job_types()[job.kind]
+    final_status = PlanningJob.FAILED
+    started = time.monotonic()
+
+    try:
+        parameters, errors = validate_job_parameters(job.kind, job.parameters)
+        if errors:
+            raise ValueError(f'Invalid parameters: {errors}')
+
+        with JobHeartbeat(job_id):
+            items, summary = handler(parameters, JobReporter(job_id))
+
+        chunk_count = _store_items(job, items)
+        PlanningJob.objects.filter(pk=job_id).update(
+            status=PlanningJob.SUCCEEDED, progress=1.0, message='Finished', summary=summary,
+            item_count=len(items), chunk_count=chunk_count, finished_at=timezone.now()
+        )
+        final_status = PlanningJob.SUCCEEDED
+        logger.info(f"Job {job_id} ({job.kind}) finished with {len(items)} items")
+
+    except JobCancelled:
+        PlanningJob.objects.filter(pk=job_id).update(
+            status=PlanningJob.CANCELLED, message='Cancelled', finished_at=timezone.now()
+        )
+        final_status = PlanningJob.CANCELLED
+        logger.info(f"Job {job_id} ({job.kind}) cancelled")
+
+    except Exception as e:
+        logger.error(f"Job {job_id} ({job.kind}) failed: {str(e)}", exc_info=True)
+        PlanningJob.objects.filter(pk=job_id).update(
+            status=PlanningJob.FAILED, error=str(e), message='Failed', finished_at=timezone.now()
+        )
+
+    finally:
+        metrics.JOBS_FINISHED.inc(kind=job.kind, status=final_status)
+        metrics.JOB_DURATION.observe(time.monotonic() - started, kind=job.kind)
+        # Publish right away; pool workers can exit before the next periodic flush
+        metrics.REGISTRY.flush()
+        close_old_connections()
+
+
+def _init_worker():
+    """Set up Django in the worker and drop database connections inherited from the parent"""
+    import django
+    from django.apps import apps
+    from django.db import connections
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_job_executor() -> ProcessPoolExecutor:
+    """Return the job worker pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = getattr(settings, 'PLANNING_JOB_WORKERS', None) or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        return _executor
+
+
+def _owner_alive(job, stale_before) -> bool:
+    """Whether the process that claimed a running job may still be running it"""
+    host, _, pid = job.worker.rpartition(':')
+    if host == socket.gethostname() and pid.isdigit():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+    heartbeat = job.heartbeat_at or job.started_at
+    return heartbeat is not None and heartbeat >= stale_before
+
+
+def recover_jobs(executor=None, resubmit: bool = True):
+    """Fail running jobs whose worker is gone and resubmit jobs that never started
+
+    A running job is orphaned when its worker process on this host has
+    exited, or when its heartbeat is older than PLANNING_JOB_HEARTBEAT_TIMEOUT;
+    jobs of live workers, here or on other hosts, are left alone. Queued jobs
+    may also be resubmitted by other processes; the claim in run_job makes
+    sure each runs once; with resubmit=False they are left queued.
+    Returns (interrupted, resubmitted).
+    """
+    timeout = getattr(settings, 'PLANNING_JOB_HEARTBEAT_TIMEOUT', 60)
+    stale_before = timezone.now() - timedelta(seconds=timeout)
+
+    interrupted = 0
+    running = PlanningJob.objects.filter(status=PlanningJob.RUNNING).only('worker', 'heartbeat_at', 'started_at')
+    for job in running:
+        if _owner_alive(job, stale_before):
+            continue
+        # Unless the job finished or beat in the meantime
+        interrupted += PlanningJob.objects.filter(
+            pk=job.pk, status=PlanningJob.RUNNING, heartbeat_at=job.heartbeat_at
+        ).update(
+            status=PlanningJob.FAILED, error='Interrupted: worker process exited',
+            message='Failed', finished_at=timezone.now()
+        )
+
+    queued = []
+    if resubmit:
+        queued = list(PlanningJob.objects.filter(status=PlanningJob.QUEUED)
+                      .order_by('created_at').values_list('pk', flat=True))
+    if queued:
+        executor = executor or get_job_executor()
+        for job_id in queued:
+            executor.submit(run_job, job_id)
+
+    if interrupted or queued:
+        logger.info(f"Job recovery: {interrupted} interrupted, {len(queued)} resubmitted")
+    return interrupted, len(queued)
+
+
+def _recover_on_startup():
+    try:
+        recover_jobs()
+    except Exception as e:
+        logger.error(f"Job recovery failed: {str(e)}", exc_info=True)
+    finally:
+        connection.close()
+
+
+def start_recovery():
+    """Recover jobs in the background if PLANNING_JOB_RECOVER_ON_STARTUP is set
+
+    Called by the WSGI/ASGI entry points once the application is loaded, never
+    during app loading, so scripts, tests and other commands leave jobs alone.
+    """
+    if getattr(settings, 'PLANNING_JOB_RECOVER_ON_STARTUP', False):
+        threading.Thread(target=_recover_on_startup, name='job-recovery', daemon=True).start()
+
+
+def submit_job(kind, parameters) -> PlanningJob:
+    """Create a job record and queue it on the worker pool"""
+    job = PlanningJob.objects.create(kind=kind, parameters=parameters)
+    get_job_executor().submit(run_job, job.pk)
+    return job
+
+
+def cancel_job(job: PlanningJob) -> PlanningJob:
+    """Request cancellation; queued jobs are cancelled immediately"""
+    if job.is_finished:
+        return job
+
+    PlanningJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+    PlanningJob.objects.filter(pk=job.pk, status=PlanningJob.QUEUED).update(
+        status=PlanningJob.CANCELLED, message='Cancelled', finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
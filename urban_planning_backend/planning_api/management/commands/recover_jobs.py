@@ -0,0 +1,29 @@
+# planning_api/management/commands/recover_jobs.py
+from django.core.management.base import BaseCommand
+from planning_api.jobs import get_job_executor, recover_jobs
+
+
+class Command(BaseCommand):
+    """
+    Fail jobs whose worker process is gone and run jobs that never started.
+    For deployments that leave PLANNING_JOB_RECOVER_ON_STARTUP off.
+    """
+    help = 'Recover orphaned and queued planning jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-run',
+            action='store_true',
+            help='Only fail orphaned jobs; leave queued jobs for a serving process',
+        )
+
+    def handle(self, *args, **options):
+        if options['no_run']:
+            interrupted, resubmitted = recover_jobs(resubmit=False)
+        else:
+            executor = get_job_executor()
+            interrupted, resubmitted = recover_jobs(executor)
+            # Queued jobs run in this command's pool; wait for them before exiting
+            executor.shutdown(wait=True)
+
+        self.stdout.write(f'{interrupted} interrupted, {resubmitted} resubmitted')
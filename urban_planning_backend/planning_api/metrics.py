@@ -0,0 +1,428 @@
+# planning_api/metrics.py - In-process metrics registry with Prometheus text output
+import atexit
+import bisect
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+
+# Multi-process mode: every process writes its own snapshot file to a shared
+# directory and a scrape merges them. Files are named by pid plus a token drawn
+# at process start, so a reused pid never overwrites an exited process's file.
+# A scrape folds the counters and histograms of exited processes into the
+# scraping process's own snapshot and removes their files; gauges only count
+# for live processes. Empty the directory when the service is redeployed.
+SNAPSHOT_PATTERN = 'metrics_*.json'
+
+
+def _label_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {list(labelnames)}, got {sorted(labels)}")
+    return json.dumps([str(labels[name]) for name in labelnames])
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _update(self, labels, apply):
+        registry = self.registry
+        if not registry._configured:
+            registry._configure_from_settings()
+        if not registry.enabled:
+            return
+        key = _label_key(self.labelnames, labels)
+        with registry._lock:
+            self._values[key] = apply(self._values.get(key))
+            registry._dirty = True
+        registry._maybe_flush()
+
+    def _describe(self):
+        return {'type': self.kind, 'help': self.documentation, 'labelnames': list(self.labelnames)}
+
+    def _reset(self):
+        self._values = {}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._update(labels, lambda current: (current or 0.0) + amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        self._update(labels, lambda current: float(value))
+
+    def inc(self, amount=1.0, **labels):
+        self._update(labels, lambda current: (current or 0.0) + amount)
+
+    def dec(self, amount=1.0, **labels):
+        self._update(labels, lambda current: (current or 0.0) - amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, value, **labels):
+        # Stored per key as [count per bucket..., count above last bucket, sum]
+        position = bisect.bisect_left(self.buckets, value)
+
+        def apply(current):
+            if current is None:
+                current = [0] * (len(self.buckets) + 1) + [0.0]
+            current[position] += 1
+            current[-1] += value
+            return current
+
+        self._update(labels, apply)
+
+    def _describe(self):
+        description = super()._describe()
+        description['buckets'] = list(self.buckets)
+        return description
+
+
+class MetricsRegistry:
+    """Holds metrics for this process and merges snapshots from other processes"""
+
+    def __init__(self):
+        self._metrics = OrderedDict()
+        self._lock = threading.RLock()
+        self._configured = False
+        self.enabled = True
+        self.directory = None
+        self.flush_interval = 1.0
+        self._last_flush = 0.0
+        self._dirty = False
+        self._flusher = None
+        self._folded = {}  # counters and histograms taken over from exited processes
+        self._start_process()
+
+    def _start_process(self):
+        self._pid = os.getpid()
+        self._token = uuid.uuid4().hex[:12]
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, f'metrics_{self._pid}_{self._token}.json')
+
+    def configure(self, enabled=True, directory=None, flush_interval=1.0):
+        """Set the enabled flag and multi-process snapshot directory"""
+        self.enabled = enabled
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._configured = True
+
+    def _configure_from_settings(self):
+        from django.conf import settings
+        config = getattr(settings, 'PLANNING_METRICS', {})
+        self.configure(
+            enabled=config.get('ENABLED', False),
+            directory=config.get('MULTIPROCESS_DIR'),
+            flush_interval=config.get('FLUSH_INTERVAL', 1.0),
+        )
+
+    def _register(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(self, name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        """This process's metric values, plus those folded in from exited processes, as a JSON-serializable dict"""
+        with self._lock:
+            snapshot = {
+                name: dict(metric._describe(), samples={
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in metric._values.items()
+                })
+                for name, metric in self._metrics.items()
+            }
+            for name, metric in self._folded.items():
+                _merge_metric(snapshot, name, metric, True)
+            return snapshot
+
+    def _maybe_flush(self):
+        if not self.directory:
+            return
+        if self._flusher is None:
+            self._start_flusher()
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _start_flusher(self):
+        """Flush pending updates in the background so idle processes still publish them"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        pid = self._pid
+        while pid == os.getpid():
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def flush(self):
+        """Write this process's snapshot to the shared directory"""
+        if not self.directory:
+            return
+        self._last_flush = time.monotonic()
+        path = self.snapshot_path
+        temporary_path = f'{path}.tmp'
+        try:
+            with self._lock:
+                snapshot = self.snapshot()
+                self._dirty = False
+            with open(temporary_path, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot {path}: {e}")
+
+    def collect(self) -> dict:
+        """Merged metric values across all processes sharing the snapshot directory"""
+        if not self._configured:
+            self._configure_from_settings()
+        if not self.directory:
+            return self.snapshot()
+
+        self._fold_exited()
+        self.flush()
+        merged = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, SNAPSHOT_PATTERN))):
+            try:
+                with open(path) as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+                continue
+            alive = _process_alive(_snapshot_pid(path))
+            for name, metric in snapshot.items():
+                _merge_metric(merged, name, metric, alive)
+        return merged
+
+    def _fold_exited(self):
+        """Take over the snapshots of exited processes so their files can go
+
+        A snapshot is claimed by renaming it first, so when several processes
+        scrape at once each file is folded by exactly one of them.
+        """
+        for path in glob.glob(os.path.join(self.directory, SNAPSHOT_PATTERN)):
+            if _process_alive(_snapshot_pid(path)):
+                continue
+            claimed = f'{path}.{self._pid}_{self._token}.folding'
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            try:
+                with open(claimed) as snapshot_file:
+                    snapshot = json.load(snapshot_file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable metrics snapshot {path}: {e}")
+                snapshot = {}
+            with self._lock:
+                for name, metric in snapshot.items():
+                    _merge_metric(self._folded, name, metric, False)
+                self._dirty = True
+            try:
+                os.remove(claimed)
+            except OSError:
+                pass
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, metric in self.collect().items():
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric['labelnames']
+            for key, value in sorted(metric['samples'].items()):
+                labels = json.loads(key)
+                if metric['type'] == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric['buckets'] + [math.inf], value[:-1]):
+                        cumulative += count
+                        bucket_labels = _format_labels(labelnames, labels, [('le', _format_value(float(bound)))])
+                        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                    label_text = _format_labels(labelnames, labels)
+                    lines.append(f"{name}_sum{label_text} {_format_value(value[-1])}")
+                    lines.append(f"{name}_count{label_text} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def reset_after_fork(self):
+        """Start a forked child from zero so parent values are not counted twice"""
+        self._lock = threading.RLock()
+        self._start_process()
+        self._folded = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        self._flusher = None  # threads do not survive fork
+        for metric in self._metrics.values():
+            metric._reset()
+
+
+def _snapshot_pid(path):
+    try:
+        return int(os.path.basename(path)[len('metrics_'):-len('.json')].split('_')[0])
+    except ValueError:
+        return None
+
+
+def _process_alive(pid):
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_metric(merged, name, metric, alive):
+    if metric['type'] == 'gauge' and not alive:
+        return
+    target = merged.setdefault(name, dict(metric, samples={}))
+    samples = target['samples']
+    for key, value in metric['samples'].items():
+        current = samples.get(key)
+        if current is None:
+            samples[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            samples[key] = [a + b for a, b in zip(current, value)]
+        else:
+            samples[key] = current + value
+
+
+REGISTRY = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=REGISTRY.reset_after_fork)
+
+
+# Metrics recorded by the planning API
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'planning_request_duration_seconds', 'Request latency by view',
+    ['view', 'method', 'status']
+)
+REQUEST_SIZE = REGISTRY.histogram(
+    'planning_request_size_bytes', 'Request body size by view', ['view'], buckets=SIZE_BUCKETS
+)
+RESPONSE_SIZE = REGISTRY.histogram(
+    'planning_response_size_bytes', 'Response body size by view (streamed responses excluded)',
+    ['view'], buckets=SIZE_BUCKETS
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    'planning_stage_duration_seconds', 'Time spent in timed pipeline stages and algorithms',
+    ['view', 'stage']
+)
+BUILDINGS_GENERATED = REGISTRY.histogram(
+    'planning_buildings_generated', 'Buildings per generated plan', ['processor'], buckets=COUNT_BUCKETS
+)
+GRAPH_VERTICES = REGISTRY.histogram(
+    'planning_graph_vertices', 'Vertices per analysed graph', ['algorithm'], buckets=COUNT_BUCKETS
+)
+GRAPH_EDGES = REGISTRY.histogram(
+    'planning_graph_edges', 'Edges per analysed graph', ['algorithm'], buckets=COUNT_BUCKETS
+)
+CLUSTER_COUNT = REGISTRY.histogram(
+    'planning_clusters', 'Clusters per clustering run', ['source'], buckets=COUNT_BUCKETS
+)
+JOBS_FINISHED = REGISTRY.counter(
+    'planning_jobs_finished_total', 'Asynchronous jobs finished by kind and final status', ['kind', 'status']
+)
+JOB_DURATION = REGISTRY.histogram(
+    'planning_job_duration_seconds', 'Asynchronous job run time by kind', ['kind'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    'planning_result_cache_lookups_total', 'Plan result cache lookups by result', ['result']
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    'planning_result_cache_evictions_total', 'Plan result cache evictions'
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    'planning_result_cache_entries', 'Entries held in plan result caches'
+)
+CACHE_BYTES = REGISTRY.gauge(
+    'planning_result_cache_bytes', 'Approximate bytes held in plan result caches'
+)
@@ -0,0 +1,117 @@
+# planning_api/middleware.py - Request timing and metrics middleware
+import logging
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from .timing import current_recorder, record_stream, start_recording, stop_recording
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """Collect timing spans for each request and report them as Server-Timing and log fields
+
+    Enabled by settings.PLANNING_SERVER_TIMING; when disabled Django drops the
+    middleware entirely and span() calls fall through to a shared no-op.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PLANNING_SERVER_TIMING', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Share the recorder started by RequestMetricsMiddleware when it runs first
+        recorder = current_recorder()
+        token = None
+        if recorder is None:
+            recorder, token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                stop_recording(token)
+
+        if response.streaming:
+            # Headers go out before the body; log once the stream is done
+            response['Server-Timing'] = recorder.server_timing(final=False)
+            record_stream(response, recorder, lambda: self._log(request, response, recorder))
+        else:
+            response['Server-Timing'] = recorder.server_timing()
+            self._log(request, response, recorder)
+        return response
+
+    @staticmethod
+    def _log(request, response, recorder):
+        timings = recorder.as_dict()
+        total_ms = round(recorder.total() * 1000.0, 3)
+        logger.info(
+            f"Timing {request.method} {request.path} {response.status_code}: "
+            + ' '.join(f'{name}={ms:.2f}ms' for name, ms in timings.items())
+            + f' total={total_ms:.2f}ms',
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status_code': response.status_code,
+                'timings': timings,
+                'total_ms': total_ms,
+            }
+        )
+
+    def process_template_response(self, request, response):
+        """Time DRF response rendering, which happens after the view returns"""
+        recorder = current_recorder()
+        if recorder is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: recorder.add('render', time.perf_counter() - started)
+            )
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Record per-view latency, payload sizes and stage timings into the metrics registry
+
+    Enabled by settings.PLANNING_METRICS['ENABLED']. Place it before
+    ServerTimingMiddleware so both share one timing recorder; with both
+    disabled no recorder is installed and span() calls cost nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PLANNING_METRICS', {}).get('ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder, token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_recording(token)
+
+        if response.streaming:
+            # Latency and stage timings cover the whole stream, observed when it ends
+            record_stream(response, recorder, lambda: self._observe(request, response, recorder))
+        else:
+            self._observe(request, response, recorder)
+        return response
+
+    @staticmethod
+    def _observe(request, response, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unmatched'
+
+        metrics.REQUEST_LATENCY.observe(
+            recorder.total(), view=view, method=request.method, status=response.status_code
+        )
+        try:
+            request_size = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            request_size = 0
+        metrics.REQUEST_SIZE.observe(request_size, view=view)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), view=view)
+
+        for stage, (seconds, _) in recorder.durations.items():
+            metrics.STAGE_LATENCY.observe(seconds, view=view, stage=stage)
@@ -1,10 +1,12 @@
 # planning_api/urban_design/models.py
 import math
 import random
+import uuid
 from enum import Enum
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
-import numpy as np
+from django.db import models
+from .primitives import Point3D
 
 
 class SiteTypes(Enum):
@@ -39,14 +41,6 @@ class ResidentialStyles(Enum):
     DOT_COLUMN_MAJOR = 3    # Vertical parallel partitions with rotating building
 
 
-@dataclass
-class Point3D:
-    """3D Point representation"""
-    x: float
-    y: float
-    z: float
-
-
 @dataclass
 class BuildingParameters:
     """Building parameters structure"""
@@ -640,26 +634,35 @@ class DesignToolbox:
     
     @staticmethod
     def safe_offset_curve(curve, distance, tolerance):
-        """Safely offset a curve"""
-        # Simplified offset - in practice you'd implement proper curve offsetting
-        if isinstance(curve, list):
-            # Simple inward/outward scaling for polygon
-            center_x = sum(p['x'] for p in curve) / len(curve)
-            center_y = sum(p['y'] for p in curve) / len(curve)
-            
-            offset_curve = []
-            scale_factor = max(0.1, 1.0 - distance / 100.0)  # Simplified scaling
-            
-            for point in curve:
-                dx = point['x'] - center_x
-                dy = point['y'] - center_y
-                new_x = center_x + dx * scale_factor
-                new_y = center_y + dy * scale_factor
-                offset_curve.append({'x': new_x, 'y': new_y, 'z': point.get('z', 0)})
-            
-            return True, offset_curve
+        """Safely offset a curve inward by distance (outward when negative)"""
+        return DesignToolbox.safe_offset_curves(curve, [distance], tolerance)[0]
+    
+    @staticmethod
+    def safe_offset_curves(curve, distances, tolerance):
+        """Offset a curve at several distances, returning a (success, curve) pair for each
+
+        All distances are read off one straight skeleton of the curve, so the
+        setbacks for every building type on a site cost a single offset.
+        """
+        if not isinstance(curve, list) or len(curve) < 3:
+            return [(False, curve) for _ in distances]
+        
+        from .geometry.skeleton import StraightSkeleton
+        coordinates = [(point['x'], point['y'], point.get('z', 0)) for point in curve]
+        closed = math.dist(coordinates[0], coordinates[-1]) <= 1e-6
+        
+        results = []
+        for distance in distances:
+            ring = StraightSkeleton.of(coordinates, outward=distance < 0).largest_ring(abs(distance))
+            if ring is None:
+                results.append((False, curve))
+            else:
+                offset_curve = [{'x': x, 'y': y, 'z': z} for x, y, z in ring.tolist()]
+                if closed:
+                    offset_curve.append(dict(offset_curve[0]))
+                results.append((True, offset_curve))
         
-        return False, curve
+        return results
     
     @staticmethod
     def split_site_by_ratios(site, ratios, priorities, scores, radiant, renew_radiant, tolerance):
@@ -821,4 +824,70 @@ class DesignValidation:
         if building_type.area <= 0:
             errors.append("Building area must be positive")
         
-        return errors
\ No newline at end of file
+        return errors
+
+
+class PlanningJob(models.Model):
+    """Long-running planning or analysis job executed by the local job worker pool"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+        (CANCELLED, 'Cancelled'),
+    ]
+    FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=32)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    parameters = models.JSONField(default=dict)
+    progress = models.FloatField(default=0.0)
+    message = models.CharField(max_length=255, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    cancel_requested = models.BooleanField(default=False)
+    summary = models.JSONField(null=True, blank=True)
+    item_count = models.IntegerField(default=0)
+    chunk_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=128, blank=True, default='')  # host:pid running the job
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.created_at).total_seconds()
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+class PlanningJobChunk(models.Model):
+    """One slice of a finished job's result items"""
+    job = models.ForeignKey(PlanningJob, related_name='chunks', on_delete=models.CASCADE)
+    index = models.IntegerField()
+    items = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['index']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'index'], name='unique_planning_job_chunk'),
+        ]
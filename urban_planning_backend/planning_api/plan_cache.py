@@ -0,0 +1,214 @@
+# planning_api/plan_cache.py - Content-addressed cache for plan generation results
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from django.conf import settings
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Keys of a plan response that only depend on the site polygon; building
+# layers are cached without them and they are rebuilt on every hit
+SITE_LAYER_KEYS = ('subSiteVertices', 'subSiteSetbackVertices')
+
+# Keys compared to tell a fallback response from a generated one
+BUILDING_LAYER_KEYS = ('buildingLayersHeights', 'buildingLayersVertices')
+
+
+def polygon_hash(flattened_vertices) -> str:
+    """Hash a polygon's exact vertex sequence
+
+    Layouts depend on the start vertex, winding and exact coordinates of the
+    site, so only an identical vertex sequence may share a cached plan.
+    """
+    points = np.asarray(flattened_vertices, dtype=np.float64).reshape(-1, 3) + 0.0  # + 0.0 folds -0.0 into 0.0
+    return hashlib.sha256(np.ascontiguousarray(points).tobytes()).hexdigest()
+
+
+def make_cache_key(namespace: str, flattened_vertices, plan_parameters, seed=None) -> str:
+    """Build a cache key from the processor name, site polygon, parameters and RNG seed"""
+    parameters = {key: value for key, value in (plan_parameters or {}).items() if key != 'seed'}
+    payload = json.dumps(
+        [namespace, polygon_hash(flattened_vertices), parameters, seed],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def seed_from_key(key: str) -> int:
+    """Derive a deterministic RNG seed from a cache key"""
+    return int(key[:16], 16)
+
+
+def _estimate_size(value) -> int:
+    """Approximate payload size in bytes, counting 8 bytes per number"""
+    if isinstance(value, dict):
+        return sum(_estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value) + 8
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+class PlanResultCache:
+    """Thread-safe LRU cache bounded by entry count and bytes, with optional TTL"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                metrics.CACHE_LOOKUPS.inc(result='miss')
+                return None
+
+            expires_at, _, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                metrics.CACHE_LOOKUPS.inc(result='expired')
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.CACHE_LOOKUPS.inc(result='hit')
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting least recently used entries as needed"""
+        size = _estimate_size(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            self._report_size()
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+                metrics.CACHE_EVICTIONS.inc()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key or compute, store and return it"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._report_size()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        self._report_size()
+
+    def _report_size(self):
+        metrics.CACHE_ENTRIES.set(len(self._entries))
+        metrics.CACHE_BYTES.set(self._bytes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanResultCache:
+    """Return the process-wide plan result cache configured from settings"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = getattr(settings, 'PLANNING_RESULT_CACHE', {})
+                _cache = PlanResultCache(
+                    max_entries=config.get('MAX_ENTRIES', 256),
+                    max_bytes=config.get('MAX_BYTES', 64 * 1024 * 1024),
+                    ttl=config.get('TTL', 600.0),
+                )
+    return _cache
+
+
+def prepare_cache_key(namespace, flattened_vertices, plan_parameters, site_parameters) -> str:
+    """Return the cache key for a request and seed its site parameters to match"""
+    seed = (plan_parameters or {}).get('seed')
+    key = make_cache_key(namespace, flattened_vertices, plan_parameters, seed)
+    # Without an explicit seed the layout is still reproducible for identical inputs
+    site_parameters.seed = seed if seed is not None else seed_from_key(key)
+    return key
+
+
+def is_cacheable(response, default_response=None) -> bool:
+    """False for fallback responses, which stand in for a failed generation"""
+    if default_response is None:
+        return True
+    fallback = default_response()
+    return any(response.get(key) != fallback.get(key) for key in BUILDING_LAYER_KEYS)
+
+
+def cached_design(namespace, flattened_vertices, plan_parameters, site_parameters,
+                  compute_design, compute_site_layers, default_response=None):
+    """Return a plan response, reusing cached building layers for identical requests
+
+    Building layers are cached without the site layers, which are rebuilt on a
+    hit. Fallback responses (equal to default_response()) are not cached.
+    Cached layers are deep-copied in and out so callers never share them.
+    """
+    key = prepare_cache_key(namespace, flattened_vertices, plan_parameters, site_parameters)
+
+    cache = get_plan_cache()
+    buildings = cache.get(key)
+    if buildings is None:
+        response = compute_design()
+        if is_cacheable(response, default_response):
+            cache.set(key, copy.deepcopy({k: v for k, v in response.items() if k not in SITE_LAYER_KEYS}))
+    else:
+        response = copy.deepcopy(buildings)
+        response.update(compute_site_layers())
+
+    metrics.BUILDINGS_GENERATED.observe(len(response.get('buildingLayersVertices', [])), processor=namespace)
+    return response
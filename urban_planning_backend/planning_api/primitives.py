@@ -0,0 +1,182 @@
+# planning_api/primitives.py - Point and vector types shared by the geometry, clustering and design code
+import math
+from typing import Dict, Iterable, List
+
+
+class Point3D:
+    """3D Point representation
+
+    A single compact type used everywhere a point is needed (geometry,
+    clustering, geometry3d's UPoint, the design models and Voronoi). It keeps
+    the dataclass-style constructor, equality and repr of the classes it
+    replaced, but stores its coordinates in slots rather than a __dict__.
+    """
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x: float, y: float, z: float = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(x={self.x!r}, y={self.y!r}, z={self.z!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Point3D):
+            return NotImplemented
+        return (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    # Mutable, like the dataclasses it replaces
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.x, self.y, self.z
+
+    def __setstate__(self, state):
+        self.x, self.y, self.z = state
+
+    def distance_to(self, other: 'Point3D') -> float:
+        """Calculate distance to another point"""
+        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2 + (self.z - other.z)**2)
+
+    def translate(self, vector: 'Vector3D') -> 'Point3D':
+        """Translate point by vector"""
+        return Point3D(self.x + vector.x, self.y + vector.y, self.z + vector.z)
+
+    def get_envelope(self):
+        """Get bounding envelope for spatial indexing"""
+        return {
+            'min_x': self.x - 0.1, 'max_x': self.x + 0.1,
+            'min_y': self.y - 0.1, 'max_y': self.y + 0.1,
+            'min_z': self.z - 0.1, 'max_z': self.z + 0.1
+        }
+
+    def as_tuple(self):
+        return self.x, self.y, self.z
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'x': self.x, 'y': self.y, 'z': self.z}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> 'Point3D':
+        return cls(data['x'], data['y'], data.get('z', 0.0))
+
+    def __add__(self, other: 'Point3D') -> 'Point3D':
+        return Point3D(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: 'Point3D') -> 'Point3D':
+        return Point3D(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, scalar: float) -> 'Point3D':
+        return Point3D(self.x * scalar, self.y * scalar, self.z * scalar)
+
+    def __truediv__(self, scalar: float) -> 'Point3D':
+        return Point3D(self.x / scalar, self.y / scalar, self.z / scalar)
+
+
+class Vector3D:
+    """3D Vector representation"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x: float, y: float, z: float = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(x={self.x!r}, y={self.y!r}, z={self.z!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector3D):
+            return NotImplemented
+        return (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.x, self.y, self.z
+
+    def __setstate__(self, state):
+        self.x, self.y, self.z = state
+
+    def length(self) -> float:
+        """Calculate vector length"""
+        return math.sqrt(self.x**2 + self.y**2 + self.z**2)
+
+    def normalize(self) -> 'Vector3D':
+        """Return normalized vector"""
+        length = self.length()
+        if length == 0:
+            return Vector3D(0, 0, 0)
+        return Vector3D(self.x / length, self.y / length, self.z / length)
+
+    def dot(self, other: 'Vector3D') -> float:
+        """Dot product with another vector"""
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def cross(self, other: 'Vector3D') -> 'Vector3D':
+        """Cross product with another vector"""
+        return Vector3D(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x
+        )
+
+    def angle_to(self, other: 'Vector3D') -> float:
+        """Calculate angle to another vector in radians"""
+        dot_product = self.dot(other)
+        lengths = self.length() * other.length()
+        if lengths == 0:
+            return 0
+        cos_angle = max(-1, min(1, dot_product / lengths))
+        return math.acos(cos_angle)
+
+    angle_between = angle_to
+
+    def is_parallel_to(self, other: 'Vector3D', tolerance: float = 1e-6) -> int:
+        """Check if parallel to another vector. Returns 1 (same), -1 (opposite), 0 (not parallel)"""
+        if self.length() == 0 or other.length() == 0:
+            return 0
+
+        normalized_self = self.normalize()
+        normalized_other = other.normalize()
+
+        # Check if same direction
+        diff = normalized_self - normalized_other
+        if abs(diff.x) <= tolerance and abs(diff.y) <= tolerance and abs(diff.z) <= tolerance:
+            return 1
+
+        # Check if opposite direction
+        sum_vec = normalized_self + normalized_other
+        if abs(sum_vec.x) <= tolerance and abs(sum_vec.y) <= tolerance and abs(sum_vec.z) <= tolerance:
+            return -1
+
+        return 0
+
+    def as_tuple(self):
+        return self.x, self.y, self.z
+
+    def __add__(self, other: 'Vector3D') -> 'Vector3D':
+        return Vector3D(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: 'Vector3D') -> 'Vector3D':
+        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, scalar: float) -> 'Vector3D':
+        return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
+
+
+def points_from_flattened(flattened_vertices: Iterable[float]) -> List[Point3D]:
+    """Convert [x0, y0, z0, x1, ...] to points, ignoring an incomplete trailing vertex"""
+    values = list(flattened_vertices)
+    return [Point3D(*values[i:i + 3]) for i in range(0, len(values) - 2, 3)]
+
+
+def flatten_points(points: Iterable[Point3D]) -> List[float]:
+    """Convert points to [x0, y0, z0, x1, ...]"""
+    flattened = []
+    for point in points:
+        flattened.extend((point.x, point.y, point.z))
+    return flattened
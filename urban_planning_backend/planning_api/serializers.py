@@ -1,5 +1,160 @@
 # planning_api/serializers.py - Complete with all required serializers
+import numpy as np
 from rest_framework import serializers
+from .binary_transport import unflatten_nested
+from .models import PlanningJob
+from .jobs import JOB_KINDS
+
+
+class NumericArrayField(serializers.Field):
+    """Flat numeric array validated in one pass with NumPy instead of per-element FloatFields"""
+    default_error_messages = {
+        'not_a_list': 'Expected a list of numbers but got type "{input_type}".',
+        'invalid': 'All values must be numbers.',
+        'empty': 'This list may not be empty.',
+        'not_finite': 'All values must be finite numbers.',
+        'group_size': 'Values must be in groups of {group_size}.',
+        'length': 'Expected exactly {length} values.',
+        'min_length': 'Ensure this field has at least {min_length} values.',
+        'max_length': 'Ensure this field has no more than {max_length} values.',
+        'min_value': 'Ensure all values are greater than or equal to {min_value}.',
+        'max_value': 'Ensure all values are less than or equal to {max_value}.',
+    }
+
+    def __init__(self, dtype=np.float64, group_size=None, length=None, min_length=None,
+                 max_length=None, min_value=None, max_value=None, allow_empty=True,
+                 allow_non_finite=False, **kwargs):
+        self.dtype = np.dtype(dtype)
+        self.group_size = group_size
+        self.length = length
+        self.min_length = min_length
+        self.max_length = max_length
+        self.min_value = min_value
+        self.max_value = max_value
+        self.allow_empty = allow_empty
+        self.allow_non_finite = allow_non_finite
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, np.ndarray):
+            # Arrays from the binary parser are converted without copying when the dtype matches
+            array = data.astype(self.dtype, copy=False)
+        elif isinstance(data, (list, tuple)):
+            try:
+                array = np.asarray(data, dtype=self.dtype)
+            except (TypeError, ValueError):
+                self.fail('invalid')
+        else:
+            self.fail('not_a_list', input_type=type(data).__name__)
+
+        if array.ndim != 1:
+            self.fail('invalid')
+        self.validate_array(array)
+        return array
+
+    def validate_array(self, array):
+        """Run all shape and value checks on a flat array"""
+        size = array.shape[0]
+        if size == 0:
+            if not self.allow_empty:
+                self.fail('empty')
+            return
+
+        if self.group_size and size % self.group_size != 0:
+            self.fail('group_size', group_size=self.group_size)
+        if self.length is not None and size != self.length:
+            self.fail('length', length=self.length)
+        if self.min_length is not None and size < self.min_length:
+            self.fail('min_length', min_length=self.min_length)
+        if self.max_length is not None and size > self.max_length:
+            self.fail('max_length', max_length=self.max_length)
+
+        if array.dtype.kind == 'f' and not self.allow_non_finite and not np.isfinite(array).all():
+            self.fail('not_finite')
+        if self.min_value is not None and array.min() < self.min_value:
+            self.fail('min_value', min_value=self.min_value)
+        if self.max_value is not None and array.max() > self.max_value:
+            self.fail('max_value', max_value=self.max_value)
+
+    def to_representation(self, value):
+        return np.asarray(value, dtype=self.dtype).tolist()
+
+
+class VertexArrayField(NumericArrayField):
+    """Flattened [x1,y1,z1,x2,y2,z2,...] vertex array with at least 3 vertices"""
+    default_error_messages = {
+        'group_size': 'Vertices must be in groups of 3 (x, y, z)',
+        'min_length': 'At least 3 vertices (9 values) required',
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('group_size', 3)
+        kwargs.setdefault('min_length', 9)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(**kwargs)
+
+
+class RaggedArrayField(NumericArrayField):
+    """Nested numeric lists (e.g. buildings -> floors -> vertices) validated as one flat array"""
+    default_error_messages = {
+        'depth': 'Expected lists nested {depth} levels deep.',
+    }
+
+    def __init__(self, depth=2, **kwargs):
+        # depth counts list levels ([[x, y, z], ...] is 2); length checks apply to the innermost lists
+        self.depth = depth
+        super().__init__(**kwargs)
+
+    def _flatten(self, data):
+        """Flatten nested lists, returning (flat values, lengths per inner level)"""
+        levels = []
+        current = data
+        for _ in range(self.depth - 1):
+            if not all(isinstance(item, (list, tuple, np.ndarray)) for item in current):
+                self.fail('depth', depth=self.depth)
+            levels.append([len(item) for item in current])
+            current = [value for item in current for value in item]
+        return current, levels
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (list, tuple)):
+            self.fail('not_a_list', input_type=type(data).__name__)
+
+        flat, levels = self._flatten(data)
+        try:
+            array = np.asarray(flat, dtype=self.dtype)
+        except (TypeError, ValueError):
+            self.fail('invalid')
+        if array.ndim != 1:
+            self.fail('depth', depth=self.depth)
+
+        if not data and not self.allow_empty:
+            self.fail('empty')
+        if array.size:
+            if array.dtype.kind == 'f' and not self.allow_non_finite and not np.isfinite(array).all():
+                self.fail('not_finite')
+            if self.min_value is not None and array.min() < self.min_value:
+                self.fail('min_value', min_value=self.min_value)
+            if self.max_value is not None and array.max() > self.max_value:
+                self.fail('max_value', max_value=self.max_value)
+
+        if levels and levels[-1]:
+            inner_lengths = np.asarray(levels[-1])
+            if self.group_size and (inner_lengths % self.group_size).any():
+                self.fail('group_size', group_size=self.group_size)
+            if self.length is not None and (inner_lengths != self.length).any():
+                self.fail('length', length=self.length)
+            if self.min_length is not None and (inner_lengths < self.min_length).any():
+                self.fail('min_length', min_length=self.min_length)
+            if self.max_length is not None and (inner_lengths > self.max_length).any():
+                self.fail('max_length', max_length=self.max_length)
+
+        return unflatten_nested(array.tolist(), levels)
+
+    def to_representation(self, value):
+        flat, levels = self._flatten(value)
+        return unflatten_nested(np.asarray(flat, dtype=self.dtype).tolist(), levels)
+
 
 class PlanParametersSerializer(serializers.Serializer):
     site_type = serializers.IntegerField(required=False)
@@ -8,61 +163,91 @@ class PlanParametersSerializer(serializers.Serializer):
     mix_ratio = serializers.FloatField(required=False)
     building_style = serializers.IntegerField(required=False)
     orientation = serializers.FloatField(required=False)
+    seed = serializers.IntegerField(required=False, min_value=0)
 
 class GeneratePlanRequestSerializer(serializers.Serializer):
-    plan_flattened_vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False
-    )
+    plan_flattened_vertices = VertexArrayField()
     plan_parameters = PlanParametersSerializer(required=False)
-    
-    def validate_plan_flattened_vertices(self, value):
-        """Validate that vertices count is divisible by 3 and at least 9 elements"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
-class GeneratePlanResponseSerializer(serializers.Serializer):
-    buildingLayersHeights = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
-        default=list
+
+class BatchGeneratePlanRequestSerializer(serializers.Serializer):
+    """Serializer for batch plan generation requests"""
+    sites = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=1000,
+        help_text="List of generateplan request bodies, one per site"
     )
-    buildingLayersVertices = serializers.ListField(
-        child=serializers.ListField(
-            child=serializers.ListField(child=serializers.FloatField())
-        ),
-        default=list
+    processor = serializers.ChoiceField(
+        choices=['standard', 'enhanced'],
+        default='enhanced',
+        help_text="Geometry processor (generateplan or enhanced_generateplan)"
     )
-    subSiteVertices = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
-        default=list
+
+
+class PlanSweepRequestSerializer(serializers.Serializer):
+    """Serializer for parameter sweep requests over a single site"""
+    SWEEP_PARAMETERS = ('site_type', 'far', 'density', 'mix_ratio', 'building_style', 'orientation')
+    INTEGER_PARAMETERS = ('site_type', 'building_style')
+    MAX_COMBINATIONS = 1000
+
+    plan_flattened_vertices = VertexArrayField()
+    plan_parameters = PlanParametersSerializer(required=False, help_text="Values shared by every combination")
+    sweep = serializers.DictField(
+        child=serializers.ListField(child=serializers.FloatField(), allow_empty=False, max_length=100),
+        help_text="Values to combine per parameter, e.g. {'density': [0.3, 0.5], 'far': [1, 2, 3]}"
     )
-    subSiteSetbackVertices = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
-        default=list
+    processor = serializers.ChoiceField(
+        choices=['standard', 'enhanced'],
+        default='standard',
+        help_text="Geometry processor (generateplan or enhanced_generateplan)"
     )
+    include_geometry = serializers.ListField(
+        child=serializers.IntegerField(min_value=0),
+        default=list,
+        max_length=20,
+        help_text="Combination indices to return full plan geometry for"
+    )
+
+    def validate_sweep(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one parameter must be swept")
+
+        unknown = set(value) - set(self.SWEEP_PARAMETERS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown sweep parameters: {', '.join(sorted(unknown))}"
+            )
+
+        combinations = 1
+        for values in value.values():
+            combinations *= len(values)
+        if combinations > self.MAX_COMBINATIONS:
+            raise serializers.ValidationError(
+                f"Sweep has {combinations} combinations, at most {self.MAX_COMBINATIONS} are allowed"
+            )
+
+        return {
+            name: [int(v) for v in values] if name in self.INTEGER_PARAMETERS else values
+            for name, values in value.items()
+        }
+
+
+class GeneratePlanResponseSerializer(serializers.Serializer):
+    buildingLayersHeights = RaggedArrayField(depth=2, default=list)
+    buildingLayersVertices = RaggedArrayField(depth=3, group_size=3, default=list)
+    subSiteVertices = RaggedArrayField(depth=2, group_size=3, default=list)
+    subSiteSetbackVertices = RaggedArrayField(depth=2, group_size=3, default=list)
 
 # New serializers for geometry validation
 class GeometryValidationSerializer(serializers.Serializer):
-    vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    vertices = VertexArrayField(
         help_text="Flattened array of vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Validation tolerance")
     check_closure = serializers.BooleanField(default=True, help_text="Check if polygon is closed")
     check_self_intersection = serializers.BooleanField(default=True, help_text="Check for self-intersections")
     check_planarity = serializers.BooleanField(default=True, help_text="Check if polygon is planar")
-    
-    def validate_vertices(self, value):
-        """Validate vertices array"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
 
 class GeometryValidationResponseSerializer(serializers.Serializer):
@@ -79,9 +264,7 @@ class GeometryValidationResponseSerializer(serializers.Serializer):
 
 class OffsetOperationSerializer(serializers.Serializer):
     """Serializer for polygon offset requests"""
-    vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    vertices = VertexArrayField(
         help_text="Flattened array of vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     offset_distance = serializers.FloatField(help_text="Offset distance (positive for inward)")
@@ -91,21 +274,12 @@ class OffsetOperationSerializer(serializers.Serializer):
         help_text="Direction of offset"
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Operation tolerance")
-    
-    def validate_vertices(self, value):
-        """Validate vertices array"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
 
 class OffsetOperationResponseSerializer(serializers.Serializer):
     """Serializer for polygon offset responses"""
     success = serializers.BooleanField()
-    offset_vertices = serializers.ListField(
-        child=serializers.FloatField(),
+    offset_vertices = NumericArrayField(
         default=list,
         help_text="Flattened array of offset vertices"
     )
@@ -114,33 +288,13 @@ class OffsetOperationResponseSerializer(serializers.Serializer):
 
 class IntersectionTestSerializer(serializers.Serializer):
     """Serializer for polygon intersection test requests"""
-    polygon_a_vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    polygon_a_vertices = VertexArrayField(
         help_text="First polygon vertices [x1,y1,z1,x2,y2,z2,...]"
     )
-    polygon_b_vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    polygon_b_vertices = VertexArrayField(
         help_text="Second polygon vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Intersection tolerance")
-    
-    def validate_polygon_a_vertices(self, value):
-        """Validate first polygon vertices"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
-    
-    def validate_polygon_b_vertices(self, value):
-        """Validate second polygon vertices"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
 
 class IntersectionTestResponseSerializer(serializers.Serializer):
@@ -153,8 +307,8 @@ class IntersectionTestResponseSerializer(serializers.Serializer):
         ],
         default='separate'
     )
-    intersection_points = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
+    intersection_points = RaggedArrayField(
+        depth=2,
         default=list,
         help_text="List of intersection points [[x1,y1,z1], [x2,y2,z2], ...]"
     )
@@ -162,31 +316,20 @@ class IntersectionTestResponseSerializer(serializers.Serializer):
 
 class CurveAnalysisSerializer(serializers.Serializer):
     """Serializer for curve analysis requests"""
-    vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    vertices = VertexArrayField(
         help_text="Flattened array of vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     operation = serializers.ChoiceField(
         choices=['area', 'length', 'centroid', 'closest_point', 'contains'],
         help_text="Type of analysis to perform"
     )
-    test_point = serializers.ListField(
-        child=serializers.FloatField(),
+    test_point = NumericArrayField(
         required=False,
         help_text="Test point for closest_point or contains operations [x,y,z]"
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Operation tolerance")
     approx = serializers.BooleanField(default=True, help_text="Allow approximation")
     
-    def validate_vertices(self, value):
-        """Validate vertices array"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
-    
     def validate_test_point(self, value):
         """Validate test point"""
         if value is not None and len(value) != 3:
@@ -203,14 +346,10 @@ class CurveAnalysisResponseSerializer(serializers.Serializer):
 
 class BooleanOperationSerializer(serializers.Serializer):
     """Serializer for boolean operation requests"""
-    polygon_a_vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    polygon_a_vertices = VertexArrayField(
         help_text="First polygon vertices [x1,y1,z1,x2,y2,z2,...]"
     )
-    polygon_b_vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    polygon_b_vertices = VertexArrayField(
         help_text="Second polygon vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     operation = serializers.ChoiceField(
@@ -219,29 +358,13 @@ class BooleanOperationSerializer(serializers.Serializer):
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Operation tolerance")
     approx = serializers.BooleanField(default=True, help_text="Allow approximation")
-    
-    def validate_polygon_a_vertices(self, value):
-        """Validate first polygon vertices"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
-    
-    def validate_polygon_b_vertices(self, value):
-        """Validate second polygon vertices"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
 
 class BooleanOperationResponseSerializer(serializers.Serializer):
     """Serializer for boolean operation responses"""
     success = serializers.BooleanField()
-    result_polygons = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
+    result_polygons = RaggedArrayField(
+        depth=2,
         default=list,
         help_text="List of result polygons as flattened vertex arrays"
     )
@@ -250,27 +373,17 @@ class BooleanOperationResponseSerializer(serializers.Serializer):
 
 class TriangulationSerializer(serializers.Serializer):
     """Serializer for triangulation requests"""
-    vertices = serializers.ListField(
-        child=serializers.FloatField(),
-        allow_empty=False,
+    vertices = VertexArrayField(
         help_text="Flattened array of vertices [x1,y1,z1,x2,y2,z2,...]"
     )
     tolerance = serializers.FloatField(default=1e-6, help_text="Triangulation tolerance")
-    
-    def validate_vertices(self, value):
-        """Validate vertices array"""
-        if len(value) % 3 != 0:
-            raise serializers.ValidationError("Vertices must be in groups of 3 (x, y, z)")
-        if len(value) < 9:
-            raise serializers.ValidationError("At least 3 vertices (9 values) required")
-        return value
 
 
 class TriangulationResponseSerializer(serializers.Serializer):
     """Serializer for triangulation responses"""
     success = serializers.BooleanField()
-    triangles = serializers.ListField(
-        child=serializers.ListField(child=serializers.FloatField()),
+    triangles = RaggedArrayField(
+        depth=2,
         default=list,
         help_text="List of triangles as flattened vertex arrays [x1,y1,z1,x2,y2,z2,x3,y3,z3]"
     )
@@ -280,20 +393,17 @@ class TriangulationResponseSerializer(serializers.Serializer):
 
 class LineOperationSerializer(serializers.Serializer):
     """Serializer for line operation requests"""
-    line_start = serializers.ListField(
-        child=serializers.FloatField(),
+    line_start = NumericArrayField(
         help_text="Line start point [x,y,z]"
     )
-    line_end = serializers.ListField(
-        child=serializers.FloatField(),
+    line_end = NumericArrayField(
         help_text="Line end point [x,y,z]"
     )
     operation = serializers.ChoiceField(
         choices=['length', 'direction', 'midpoint', 'offset', 'project'],
         help_text="Type of line operation"
     )
-    direction_point = serializers.ListField(
-        child=serializers.FloatField(),
+    direction_point = NumericArrayField(
         required=False,
         help_text="Direction point for offset operation [x,y,z]"
     )
@@ -323,4 +433,34 @@ class LineOperationResponseSerializer(serializers.Serializer):
     """Serializer for line operation responses"""
     success = serializers.BooleanField()
     result = serializers.JSONField(help_text="Operation result (varies by operation type)")
-    error_message = serializers.CharField(required=False, allow_blank=True)
\ No newline at end of file
+    error_message = serializers.CharField(required=False, allow_blank=True)
+
+
+class ClusteringJobParametersSerializer(serializers.Serializer):
+    """Serializer for clustering job parameters"""
+    vertices = VertexArrayField(help_text="Flattened array of points [x1,y1,z1,x2,y2,z2,...]")
+    cluster_diameter = serializers.FloatField(default=50.0, min_value=0.0, help_text="Maximum cluster diameter")
+
+
+class JobSubmitSerializer(serializers.Serializer):
+    """Serializer for asynchronous job submissions"""
+    kind = serializers.ChoiceField(
+        choices=JOB_KINDS,
+        help_text="Job type"
+    )
+    parameters = serializers.DictField(help_text="Job parameters, same shape as the synchronous endpoint body")
+
+
+class PlanningJobSerializer(serializers.ModelSerializer):
+    """Serializer for job status responses"""
+    queue_seconds = serializers.FloatField(read_only=True)
+    run_seconds = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = PlanningJob
+        fields = [
+            'id', 'kind', 'status', 'progress', 'message', 'error', 'cancel_requested',
+            'summary', 'item_count', 'chunk_count', 'created_at', 'started_at',
+            'finished_at', 'queue_seconds', 'run_seconds'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,56 @@
+# planning_api/streaming.py - Newline-delimited JSON streaming of plan results
+import json
+import logging
+from django.http import StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# A streamed plan is a sequence of records, one JSON object per line:
+#   {"type": "site", "subSiteVertices": [...], "subSiteSetbackVertices": [...]}
+#   {"type": "building", "index": 0, "layerHeights": [...], "layerVertices": [[...], ...]}
+#   ...
+#   {"type": "end", "buildingCount": N}
+# A failure after the response has started is reported as a final
+# {"type": "error", "error": "..."} record instead of an "end" record.
+
+
+def plan_records(response):
+    """Split a complete plan response dict into stream records"""
+    yield {
+        'type': 'site',
+        'subSiteVertices': response.get('subSiteVertices', []),
+        'subSiteSetbackVertices': response.get('subSiteSetbackVertices', []),
+    }
+
+    buildings = zip(response.get('buildingLayersHeights', []), response.get('buildingLayersVertices', []))
+    count = 0
+    for count, (heights, vertices) in enumerate(buildings, start=1):
+        yield building_record(count - 1, heights, vertices)
+
+    yield {'type': 'end', 'buildingCount': count}
+
+
+def building_record(index, heights, vertices):
+    """Stream record for one building"""
+    return {'type': 'building', 'index': index, 'layerHeights': heights, 'layerVertices': vertices}
+
+
+def ndjson_lines(records):
+    """Encode records as NDJSON lines, turning a mid-stream failure into an error record"""
+    try:
+        for record in records:
+            yield json.dumps(record, separators=(',', ':')) + '\n'
+    except Exception as e:
+        logger.error(f"Plan stream failed: {str(e)}", exc_info=True)
+        yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+
+
+def ndjson_response(records, status=200):
+    """Wrap a record iterator in a streaming NDJSON response"""
+    response = StreamingHttpResponse(ndjson_lines(records), content_type=NDJSON_MEDIA_TYPE, status=status)
+    # Ask reverse proxies not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    response['Cache-Control'] = 'no-cache'
+    return response
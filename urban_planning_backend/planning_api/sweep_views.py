@@ -0,0 +1,258 @@
+# planning_api/sweep_views.py - Parameter sweeps over a single site
+import copy
+import itertools
+import logging
+from concurrent.futures.process import BrokenProcessPool
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from .serializers import PlanSweepRequestSerializer
+from .batch_views import PROCESSORS, get_executor, reset_executor
+from .plan_cache import make_cache_key, seed_from_key
+from .geometry import ParametricDesign
+from .geometry.distance_field import SiteDistanceField
+from .enhanced_views import EnhancedBuildingGenerator
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = ['index', 'building_count', 'floors', 'total_floor_area', 'achieved_far', 'coverage', 'seed']
+
+# Parameters that do not change where the standard processor places buildings.
+# Combinations differing only in these share one placement run.
+FLOOR_ONLY_PARAMETERS = {
+    'standard': ('far',),
+    'enhanced': (),
+}
+
+
+def _summary(site_area, building_count, floors, footprint_area, total_floor_area, seed):
+    """Summary values in SUMMARY_COLUMNS order (without the index)"""
+    return [
+        building_count,
+        floors,
+        round(total_floor_area, 2),
+        round(total_floor_area / site_area, 4) if site_area > 0 else 0.0,
+        round(footprint_area / site_area, 4) if site_area > 0 else 0.0,
+        seed,
+    ]
+
+
+def _prepare_site(site_parameters):
+    """Build the site's distance field once, so every group (and worker copy) reuses it"""
+    polyline = site_parameters.site_polyline
+    if polyline is None or len(polyline.points) < 3:
+        return
+    try:
+        SiteDistanceField.of(polyline)
+    except ValueError:
+        # Degenerate sites are reported by placement itself
+        pass
+
+
+def _sweep_standard(site_parameters, cells, geometry_indices):
+    """Place buildings once for the group, then derive each FAR's floors"""
+    geometry_processor, view_class, apply_parameters, _ = PROCESSORS['standard']
+    view = view_class()
+    layout = None
+    results = []
+
+    for index, parameters, seed in cells:
+        site_params = copy.copy(site_parameters)
+        getattr(view, apply_parameters)(parameters, site_params)
+        site_params.seed = seed
+
+        if layout is None:
+            layout = design = geometry_processor.compute_layout(site_params)
+        else:
+            site_params.update_dependent_parameters()
+            design = ParametricDesign.with_far(
+                layout, site_params.site_area, site_params.site_far, site_params.building_style
+            )
+
+        building_count = design['num_buildings']
+        footprint_area = building_count * design['building_width'] * design['building_depth']
+        summary = _summary(site_params.site_area, building_count, design['floors_per_building'],
+                           footprint_area, design['total_floor_area'], seed)
+
+        geometry = None
+        if index in geometry_indices:
+            geometry = geometry_processor.compute_buildings(design)
+            geometry.update(geometry_processor.compute_site_layers(site_params))
+
+        results.append((index, summary, geometry))
+
+    return results
+
+
+def _sweep_enhanced(site_parameters, cells, geometry_indices):
+    """Run the enhanced generator for each combination on the shared site"""
+    geometry_processor, view_class, apply_parameters, _ = PROCESSORS['enhanced']
+    view = view_class()
+    results = []
+
+    for index, parameters, seed in cells:
+        site_params = copy.copy(site_parameters)
+        getattr(view, apply_parameters)(parameters, site_params)
+        site_params.seed = seed
+
+        buildings = EnhancedBuildingGenerator(site_params).generate_buildings()
+        footprint_area = sum(b['width'] * b['depth'] for b in buildings)
+        total_floor_area = sum(b['width'] * b['depth'] * b['floors'] for b in buildings)
+        floors = round(sum(b['floors'] for b in buildings) / len(buildings), 2) if buildings else 0
+        summary = _summary(site_params.site_area, len(buildings), floors,
+                           footprint_area, total_floor_area, seed)
+
+        geometry = None
+        if index in geometry_indices:
+            geometry = {'buildingLayersHeights': [], 'buildingLayersVertices': []}
+            for building in buildings:
+                heights, building_vertices = geometry_processor.compute_building_layers(building)
+                geometry['buildingLayersHeights'].append(heights)
+                geometry['buildingLayersVertices'].append(building_vertices)
+            geometry.update(geometry_processor.compute_site_layers(site_params))
+
+        results.append((index, summary, geometry))
+
+    return results
+
+
+def sweep_group(processor, site_parameters, cells, geometry_indices):
+    """Evaluate one placement group; cells are (index, plan parameters, seed) tuples"""
+    if processor == 'standard':
+        return _sweep_standard(site_parameters, cells, geometry_indices)
+    return _sweep_enhanced(site_parameters, cells, geometry_indices)
+
+
+class PlanSweepView(APIView):
+    """Compare plan metrics across a grid of parameter values for one site"""
+
+    def post(self, request):
+        try:
+            serializer = PlanSweepRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {'error': 'Invalid input data', 'details': serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            validated_data = serializer.validated_data
+            flattened_vertices = validated_data['plan_flattened_vertices']
+            base_parameters = dict(validated_data.get('plan_parameters', {}))
+            sweep = validated_data['sweep']
+            processor = validated_data['processor']
+            geometry_indices = set(validated_data['include_geometry'])
+
+            geometry_processor, _, _, namespace = PROCESSORS[processor]
+
+            # Parse the site and compute area, orientation and bounds once for every combination
+            site_parameters = geometry_processor.compute_parameters(flattened_vertices)[0]
+            if processor == 'standard':
+                _prepare_site(site_parameters)
+
+            groups = self._group_combinations(
+                namespace, processor, flattened_vertices, base_parameters, sweep
+            )
+            combination_count = sum(len(cells) for cells in groups)
+
+            logger.info(f"Parameter sweep request: {combination_count} combinations, "
+                        f"{len(groups)} placement runs, processor={processor}")
+
+            results, failed = self._run_groups(processor, site_parameters, groups, geometry_indices)
+
+            rows = []
+            geometry = {}
+            for index, summary, plan in sorted(results, key=lambda result: result[0]):
+                cell_values = self._cell_values(index, sweep)
+                rows.append([cell_values[name] for name in sweep] + [index] + summary)
+                if plan is not None:
+                    geometry[str(index)] = plan
+
+            return Response({
+                'processor': processor,
+                'site_area': site_parameters.site_area,
+                'combinations': combination_count,
+                'placement_runs': len(groups),
+                'columns': list(sweep) + SUMMARY_COLUMNS,
+                'rows': rows,
+                'failed': failed,
+                'geometry': geometry
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Parameter sweep error: {str(e)}", exc_info=True)
+            return Response(
+                {'error': f'Parameter sweep failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def _cell_values(index, sweep):
+        """Swept parameter values for a combination index (row-major over the sweep)"""
+        values = {}
+        for name in reversed(list(sweep)):
+            options = sweep[name]
+            index, position = divmod(index, len(options))
+            values[name] = options[position]
+        return values
+
+    def _group_combinations(self, namespace, processor, flattened_vertices, base_parameters, sweep):
+        """Expand the sweep and group combinations that can share a placement run"""
+        floor_only = FLOOR_ONLY_PARAMETERS[processor]
+        explicit_seed = base_parameters.get('seed')
+        groups = {}
+
+        for index, values in enumerate(itertools.product(*sweep.values())):
+            parameters = dict(base_parameters)
+            parameters.update(zip(sweep, values))
+
+            placement_parameters = {k: v for k, v in parameters.items() if k not in floor_only}
+            group_key = tuple(sorted(placement_parameters.items()))
+
+            # One seed per placement group, so calling generateplan with the
+            # returned seed reproduces any cell
+            if explicit_seed is not None:
+                seed = explicit_seed
+            else:
+                seed = seed_from_key(make_cache_key(namespace, flattened_vertices, placement_parameters))
+
+            groups.setdefault(group_key, []).append((index, parameters, seed))
+
+        return list(groups.values())
+
+    def _run_groups(self, processor, site_parameters, groups, geometry_indices):
+        """Evaluate placement groups inline or across the batch process pool"""
+        results = []
+        failed = []
+
+        if len(groups) <= 1:
+            for cells in groups:
+                try:
+                    results.extend(sweep_group(processor, site_parameters, cells, geometry_indices))
+                except Exception as e:
+                    logger.error(f"Sweep group failed: {str(e)}")
+                    failed.extend({'index': index, 'error': str(e)} for index, _, _ in cells)
+            return results, failed
+
+        executor = get_executor()
+        futures = [
+            (cells, executor.submit(sweep_group, processor, site_parameters, cells, geometry_indices))
+            for cells in groups
+        ]
+
+        pool_broken = False
+        for cells, future in futures:
+            try:
+                results.extend(future.result())
+            except BrokenProcessPool as e:
+                pool_broken = True
+                logger.error("Sweep group failed: worker pool crashed")
+                failed.extend({'index': index, 'error': f'Worker process failed: {str(e)}'}
+                              for index, _, _ in cells)
+            except Exception as e:
+                logger.error(f"Sweep group failed: {str(e)}")
+                failed.extend({'index': index, 'error': str(e)} for index, _, _ in cells)
+
+        if pool_broken:
+            reset_executor()
+
+        return results, failed
@@ -0,0 +1,13 @@
+# planning_api/tests/shapes.py - Random polygon fixtures shared by the geometry tests
+import numpy as np
+
+
+def star(rng, count, radius=10.0, center=(0.0, 0.0), inner=0.3):
+    """Star-shaped simple polygon with count vertices around center
+
+    Vertices sit at sorted random angles with radii drawn from
+    [inner * radius, radius], so the polygon never crosses itself.
+    """
+    angles = np.sort(rng.uniform(0, 2 * np.pi, count))
+    radii = rng.uniform(inner * radius, radius, count)
+    return np.column_stack([center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)])
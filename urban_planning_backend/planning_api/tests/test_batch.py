@@ -0,0 +1,91 @@
+# planning_api/tests/test_batch.py - Batch generation against the single-site endpoints
+import json
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from planning_api import batch_views
+from planning_api.plan_cache import get_plan_cache
+
+SITES = [
+    [0, 0, 0, 200, 0, 0, 200, 150, 0, 0, 150, 0, 0, 0, 0],
+    [0, 0, 0, 120, 0, 0, 120, 60, 0, 60, 60, 0, 60, 120, 0, 0, 120, 0, 0, 0, 0],
+    [10, 10, 0, 90, 20, 0, 80, 100, 0, 5, 80, 0, 10, 10, 0],
+]
+
+
+class BrokenExecutor:
+    """Stands in for a worker pool whose processes have died"""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool('A child process terminated abruptly'))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class BatchGeneratePlanTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def post(self, name, payload):
+        response = self.client.post(reverse(name), json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def batch(self, sites, processor):
+        return self.post('batch_generate_plan', {'sites': sites, 'processor': processor})
+
+    def test_items_match_single_site_responses(self):
+        sites = [{'plan_flattened_vertices': vertices, 'plan_parameters': {'seed': seed, 'far': 2.5}}
+                 for seed, vertices in enumerate(SITES)]
+        for processor, single in (('standard', 'generate_plan'), ('enhanced', 'enhanced_generate_plan')):
+            result = self.batch(sites, processor)
+            self.assertEqual(result['succeeded'], len(sites))
+            for index, (site, item) in enumerate(zip(sites, result['results'])):
+                self.assertEqual(item['index'], index)
+                self.assertTrue(item['success'])
+                self.assertGreater(len(item['result']['buildingLayersVertices']), 0)
+                get_plan_cache().clear()
+                self.assertEqual(item['result'], self.post(single, site))
+
+    def test_invalid_site_fails_alone(self):
+        sites = [{'plan_flattened_vertices': SITES[0]}, {'plan_flattened_vertices': [0, 0]},
+                 {'plan_flattened_vertices': SITES[1]}]
+        result = self.batch(sites, 'standard')
+        self.assertEqual((result['succeeded'], result['failed']), (2, 1))
+        self.assertEqual([item['success'] for item in result['results']], [True, False, True])
+        self.assertIn('plan_flattened_vertices', result['results'][1]['details'])
+
+    def test_generation_error_is_reported_per_item(self):
+        with mock.patch.object(batch_views, 'generate_site_plan', side_effect=ValueError('bad site')):
+            result = self.batch([{'plan_flattened_vertices': SITES[0]}], 'enhanced')
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(result['results'][0], {'index': 0, 'success': False, 'error': 'bad site'})
+
+    def test_broken_pool_fails_items_and_resets_executor(self):
+        executor = BrokenExecutor()
+        batch_views.reset_executor()
+        batch_views._executor = executor
+        try:
+            result = self.batch([{'plan_flattened_vertices': vertices} for vertices in SITES], 'standard')
+        finally:
+            batch_views.reset_executor()
+
+        self.assertEqual(result['failed'], len(SITES))
+        for item in result['results']:
+            self.assertFalse(item['success'])
+            self.assertTrue(item['error'].startswith('Worker process failed'))
+        self.assertTrue(executor.shut_down)
+        self.assertIsNot(batch_views.get_executor(), executor)
+        batch_views.reset_executor()
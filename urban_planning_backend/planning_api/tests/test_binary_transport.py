@@ -0,0 +1,85 @@
+# planning_api/tests/test_binary_transport.py - Packed vertex frames and their negotiation on the plan views
+import json
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from planning_api.binary_transport import (
+    BINARY_MEDIA_TYPE, FRAME_ALIGNMENT, FRAME_HEADER, decode_plan, decode_vertices, encode_plan, encode_vertices
+)
+from planning_api.plan_cache import get_plan_cache
+
+SITE = [0, 0, 0, 60, 0, 0, 60, 40, 0, 0, 40, 0]
+PLAN = {
+    'buildingLayersHeights': [[3.0, 6.0], []],
+    'buildingLayersVertices': [[[0.0, 1.0, 2.0] * 4, [3.5] * 12], []],
+    'subSiteVertices': [[0.0, 0.0, 0.0, 1.0, 1.0, 1.0]],
+    'name': 'site',
+}
+
+
+def flatten(values):
+    if not isinstance(values, list):
+        return [values]
+    return [value for item in values for value in flatten(item)]
+
+
+class FrameTests(SimpleTestCase):
+
+    def test_vertices_round_trip(self):
+        for dtype in ('float32', 'float64'):
+            frame = encode_vertices(SITE, {'far': 1.5}, dtype)
+            decoded = decode_vertices(frame)
+            self.assertEqual(decoded['plan_parameters'], {'far': 1.5})
+            self.assertEqual(decoded['plan_flattened_vertices'].dtype.itemsize, 4 if dtype == 'float32' else 8)
+            np.testing.assert_array_equal(decoded['plan_flattened_vertices'], SITE)
+
+    def test_plan_round_trip_keeps_nesting(self):
+        frame = encode_plan(PLAN)
+        _, _, _, _, manifest_length = FRAME_HEADER.unpack_from(frame, 0)
+        self.assertEqual((FRAME_HEADER.size + manifest_length) % FRAME_ALIGNMENT, 0)
+        self.assertEqual(decode_plan(frame), PLAN)
+        self.assertEqual(decode_plan(encode_plan({})), {})
+
+    def test_rejects_malformed_frames(self):
+        frame = encode_vertices(SITE)
+        for broken in (frame[:8], b'XXXX' + frame[4:], frame[:4] + b'\x02' + frame[5:],
+                       frame[:5] + b'\x03' + frame[6:], frame[:-3]):
+            with self.assertRaises(ValueError):
+                decode_vertices(broken)
+
+
+class BinaryNegotiationTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def test_binary_request_and_response_match_json(self):
+        for name in ('generate_plan', 'enhanced_generate_plan'):
+            get_plan_cache().clear()
+            expected = self.client.post(
+                reverse(name), json.dumps({'plan_flattened_vertices': SITE, 'plan_parameters': {'seed': 3}}),
+                content_type='application/json'
+            ).json()
+            response = self.client.post(
+                reverse(name), encode_vertices(SITE, {'seed': 3}), content_type=BINARY_MEDIA_TYPE,
+                HTTP_ACCEPT=BINARY_MEDIA_TYPE
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], BINARY_MEDIA_TYPE)
+            self.assertEqual(decode_plan(response.content), expected)
+
+            response = self.client.post(
+                reverse(name), encode_vertices(SITE, {'seed': 3}), content_type=BINARY_MEDIA_TYPE,
+                HTTP_ACCEPT=f'{BINARY_MEDIA_TYPE}; dtype=float32'
+            )
+            self.assertEqual(FRAME_HEADER.unpack_from(response.content, 0)[2], 4)
+            for key, values in decode_plan(response.content).items():
+                np.testing.assert_allclose(flatten(values), flatten(expected[key]), rtol=1e-6)
+
+    def test_malformed_and_short_bodies_are_rejected(self):
+        for body in (b'UGAI', encode_vertices(SITE[:6])):
+            response = self.client.post(reverse('generate_plan'), body, content_type=BINARY_MEDIA_TYPE)
+            self.assertEqual(response.status_code, 400)
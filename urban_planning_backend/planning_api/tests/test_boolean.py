@@ -0,0 +1,79 @@
+# planning_api/tests/test_boolean.py - Polygon booleans against point sampling
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.boolean import clip_polygons, clipped_areas, polygon_boolean
+from planning_api.geometry.sweep import has_self_intersection
+from planning_api.geometry.utils import points_in_polygon, signed_area
+from planning_api.tests.shapes import star
+
+OPERATIONS = {
+    'intersection': lambda a, b: a & b,
+    'union': lambda a, b: a | b,
+    'difference': lambda a, b: a & ~b,
+}
+
+
+def winding(points, rings):
+    """Signed ring count around each point: +1 per outer ring, -1 per hole"""
+    counts = np.zeros(len(points), dtype=int)
+    for ring in rings:
+        inside = points_in_polygon(points, ring[:, :2])
+        counts += np.where(inside, 1 if signed_area(ring[:, :2]) > 0 else -1, 0)
+    return counts
+
+
+def star_pairs(rng, trials):
+    grid = np.linspace(-25, 25, 160)
+    samples = np.column_stack([axis.ravel() for axis in np.meshgrid(grid, grid)])
+    for _ in range(trials):
+        first = star(rng, int(rng.integers(3, 25)), center=rng.uniform(-5, 5, 2))
+        second = star(rng, int(rng.integers(3, 25)), center=rng.uniform(-5, 5, 2))
+        if has_self_intersection(first) or has_self_intersection(second):
+            continue
+        yield first, second, samples
+
+
+class PolygonBooleanTests(SimpleTestCase):
+
+    def test_signed_area_orientation(self):
+        square = np.array([[0, 0], [4, 0], [4, 3], [0, 3]], dtype=float)
+        self.assertEqual(signed_area(square), 12.0)
+        self.assertEqual(signed_area(square[::-1]), -12.0)
+
+    def test_matches_point_sampling(self):
+        rng = np.random.default_rng(0)
+        for first, second, samples in star_pairs(rng, 25):
+            in_first, in_second = points_in_polygon(samples, first), points_in_polygon(samples, second)
+            for operation, rule in OPERATIONS.items():
+                rings = polygon_boolean(first, second, operation)
+                mismatches = np.count_nonzero(winding(samples, rings) != rule(in_first, in_second))
+                # Only samples lying on an edge may disagree
+                self.assertLessEqual(mismatches, 5, operation)
+
+    def test_areas_are_consistent(self):
+        rng = np.random.default_rng(1)
+        for first, second, _ in star_pairs(rng, 25):
+            area_first, area_second = abs(signed_area(first)), abs(signed_area(second))
+            area = {
+                operation: sum(signed_area(ring[:, :2]) for ring in polygon_boolean(first, second, operation))
+                for operation in OPERATIONS
+            }
+            scale = area_first + area_second
+            self.assertAlmostEqual(area['union'], area_first + area_second - area['intersection'],
+                                   delta=1e-6 * scale)
+            self.assertAlmostEqual(area['difference'], area_first - area['intersection'], delta=1e-6 * scale)
+
+    def test_batch_clip_matches_one_at_a_time(self):
+        rng = np.random.default_rng(2)
+        site = star(rng, 40, radius=30)
+        footprints = [star(rng, int(rng.integers(3, 9)), radius=4, center=rng.uniform(-30, 30, 2)) for _ in range(60)]
+        for operation in OPERATIONS:
+            batch = clip_polygons(footprints, site, operation)
+            for footprint, rings in zip(footprints, batch):
+                expected = polygon_boolean(footprint, site, operation)
+                self.assertAlmostEqual(sum(signed_area(ring[:, :2]) for ring in rings),
+                                       sum(signed_area(ring[:, :2]) for ring in expected), places=6)
+
+        areas = clipped_areas(footprints, site)
+        expected = [sum(signed_area(ring[:, :2]) for ring in polygon_boolean(footprint, site)) for footprint in footprints]
+        np.testing.assert_allclose(areas, expected, atol=1e-9)
@@ -0,0 +1,53 @@
+# planning_api/tests/test_bvh.py - Segment box tree queries against brute-force scans
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.bvh import SegmentBoxTree, closest_parameter, segments_near_box
+from planning_api.geometry.utils import ArcLengthTable, Point3D, Polyline, PolylineArray
+
+
+def random_walk(rng, count):
+    return np.cumsum(rng.normal(size=(count, 3)) * [1, 1, 0.1], axis=0)
+
+
+def segment_boxes(coords):
+    return np.minimum(coords[:-1], coords[1:]), np.maximum(coords[:-1], coords[1:])
+
+
+class SegmentBoxTreeTests(SimpleTestCase):
+
+    def test_box_queries_match_brute_force(self):
+        rng = np.random.default_rng(0)
+        for count in (2, 3, 10, 300):
+            coords = random_walk(rng, count)
+            tree = SegmentBoxTree(coords)
+            low, high = segment_boxes(coords)
+            for center in rng.normal(size=(30, 3)) * 5 + coords.mean(axis=0):
+                expected = np.flatnonzero(np.all((low <= center + 2) & (high >= center - 2), axis=1))
+                np.testing.assert_array_equal(tree.query_box(center - 1.5, center + 1.5, 0.5), expected)
+                np.testing.assert_array_equal(segments_near_box(coords.tolist(), center - 1.5, center + 1.5, 0.5),
+                                              expected)
+
+    def test_closest_parameter_matches_linear_scan(self):
+        rng = np.random.default_rng(1)
+        for count in (2, 10, 500):
+            coords = random_walk(rng, count)
+            tree = SegmentBoxTree(coords)
+            queries = rng.normal(size=(50, 3)) * 5 + coords.mean(axis=0)
+            distances, parameters = ArcLengthTable(coords).closest_parameters(queries)
+            polyline = Polyline([Point3D(*point) for point in coords.tolist()])
+            for query, distance, parameter in zip(queries.tolist(), distances.tolist(), parameters.tolist()):
+                self.assertEqual(tree.closest_parameter(Point3D(*query)), (distance, parameter))
+                self.assertEqual(polyline.closest_parameter(Point3D(*query)), (distance, parameter))
+                self.assertEqual(closest_parameter(PolylineArray(coords), Point3D(*query)), (distance, parameter))
+
+    def test_overlapping_pairs_match_brute_force(self):
+        rng = np.random.default_rng(2)
+        for count in (2, 20, 150):
+            coords_a, coords_b = random_walk(rng, count), random_walk(rng, count)
+            low_a, high_a = segment_boxes(coords_a)
+            low_b, high_b = segment_boxes(coords_b)
+            expected = [
+                (i, j) for i in range(len(low_a)) for j in range(len(low_b))
+                if np.all((low_a[i] <= high_b[j] + 0.1) & (low_b[j] <= high_a[i] + 0.1))
+            ]
+            self.assertEqual(SegmentBoxTree(coords_a).overlapping_pairs(SegmentBoxTree(coords_b), 0.1), expected)
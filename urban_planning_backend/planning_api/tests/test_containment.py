@@ -0,0 +1,78 @@
+# planning_api/tests/test_containment.py - Point-in-polygon kernels against the scalar crossing test
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.curve_addon import CurveAddOn
+from planning_api.geometry.polyline_addon import PointContainment
+from planning_api.geometry.utils import (
+    GeometryUtils, Plane, Point3D, Polyline, PolylineArray, PreparedPolygon, points_in_polygon,
+    rectangles_in_polygon
+)
+from planning_api.tests.shapes import star
+
+
+def random_polygons(rng):
+    """Random stars, plus grid polygons whose vertices and edges sit on the query grid"""
+    yield star(rng, 7)
+    yield star(rng, 200)
+    yield np.round(star(rng, 30))
+    yield np.array([[0, 0], [6, 0], [6, 2], [2, 2], [2, 4], [6, 4], [6, 6], [0, 6]], dtype=float)
+    yield np.array([[0, 0], [3, 0], [3, 0], [3, 3], [0, 3], [0, 0]], dtype=float)
+
+
+def query_points(rng, polygon):
+    low, high = polygon.min(axis=0) - 1, polygon.max(axis=0) + 1
+    grid = np.mgrid[low[0]:high[0]:0.5, low[1]:high[1]:0.5].reshape(2, -1).T
+    midpoints = (polygon + np.roll(polygon, -1, axis=0)) / 2
+    return np.vstack([rng.uniform(low, high, (500, 2)), grid, polygon, midpoints])
+
+
+class PointsInPolygonTests(SimpleTestCase):
+
+    def test_batch_and_prepared_match_scalar(self):
+        rng = np.random.default_rng(0)
+        for polygon in random_polygons(rng):
+            vertices = [Point3D(x, y, 0.0) for x, y in polygon.tolist()]
+            points = query_points(rng, polygon)
+            expected = [GeometryUtils.point_in_polygon_2d(Point3D(x, y, 0.0), vertices) for x, y in points.tolist()]
+
+            self.assertEqual(points_in_polygon(points, polygon).tolist(), expected)
+            self.assertEqual(points_in_polygon(points, polygon, chunk_size=7).tolist(), expected)
+            for max_index_size in (None, len(polygon)):
+                prepared = PreparedPolygon(polygon, max_index_size)
+                self.assertEqual(prepared.contains_points(points).tolist(), expected)
+                self.assertEqual(points_in_polygon(points, prepared).tolist(), expected)
+                self.assertEqual([prepared.contains(Point3D(x, y, 0.0)) for x, y in points.tolist()], expected)
+
+    def test_prepared_polygon_is_cached_on_polyline_arrays(self):
+        polyline = PolylineArray(np.array([[0, 0, 0], [4, 0, 0], [4, 4, 0], [0, 4, 0], [0, 0, 0]], dtype=float))
+        self.assertIs(PreparedPolygon.of(polyline), PreparedPolygon.of(polyline))
+
+    def test_rectangles_need_all_corners_inside(self):
+        rng = np.random.default_rng(1)
+        polygon = star(rng, 40)
+        centers = rng.uniform(-10, 10, (300, 2))
+        widths, depths = rng.uniform(0.5, 4, 300), rng.uniform(0.5, 4, 300)
+        expected = []
+        for (x, y), width, depth in zip(centers.tolist(), widths.tolist(), depths.tolist()):
+            corners = [(x - width / 2, y - depth / 2), (x + width / 2, y - depth / 2),
+                       (x + width / 2, y + depth / 2), (x - width / 2, y + depth / 2)]
+            expected.append(bool(points_in_polygon(np.array(corners), polygon).all()))
+        self.assertEqual(rectangles_in_polygon(centers, widths, depths, polygon).tolist(), expected)
+
+
+class CurveContainsTests(SimpleTestCase):
+
+    def test_matches_scalar_crossing_test_off_the_boundary(self):
+        rng = np.random.default_rng(2)
+        polygon = star(rng, 25)
+        vertices = [Point3D(x, y, 0.0) for x, y in polygon.tolist()]
+        curve = Polyline(vertices + vertices[:1])
+        for x, y in rng.uniform(-11, 11, (300, 2)).tolist():
+            point = Point3D(x, y, 2.0)
+            expected = GeometryUtils.point_in_polygon_2d(point, vertices)
+            result = CurveAddOn.contains(curve, point, Plane.world_xy(), 1e-9)
+            self.assertEqual(result, PointContainment.INSIDE if expected else PointContainment.OUTSIDE)
+
+        middle = Point3D((polygon[0, 0] + polygon[1, 0]) / 2, (polygon[0, 1] + polygon[1, 1]) / 2, 0.0)
+        self.assertEqual(CurveAddOn.contains(curve, middle, Plane.world_xy(), 1e-6), PointContainment.COINCIDENT)
+
@@ -0,0 +1,125 @@
+# planning_api/tests/test_distance_field.py - Site distance field against exact containment and distances
+import json
+import pickle
+from unittest import mock
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from planning_api import sweep_views
+from planning_api.geometry.distance_field import SiteDistanceField
+from planning_api.plan_cache import get_plan_cache
+from planning_api.tests.shapes import star
+from planning_api.geometry.utils import PolylineArray, points_in_polygon, rectangle_corners, rectangles_in_polygon
+
+
+def boundary_distances(polygon, points):
+    """Distance from each point to the nearest edge, one edge at a time"""
+    best = np.full(len(points), np.inf)
+    for start, end in zip(polygon, np.roll(polygon, -1, axis=0)):
+        direction = end - start
+        t = np.clip((points - start) @ direction / (direction @ direction), 0, 1)
+        best = np.minimum(best, np.linalg.norm(points - (start + t[:, None] * direction), axis=1))
+    return best
+
+
+def segment_distances(starts, ends, polygon):
+    """Smallest distance between each query segment and the polygon boundary, by dense sampling"""
+    samples = starts[:, None] + np.linspace(0, 1, 201)[None, :, None] * (ends - starts)[:, None]
+    return boundary_distances(polygon, samples.reshape(-1, 2)).reshape(len(starts), -1).min(axis=1)
+
+
+class SiteDistanceFieldTests(SimpleTestCase):
+
+    def test_within_matches_points_in_polygon(self):
+        rng = np.random.default_rng(0)
+        for resolution in (None, 0.7, 10.0):
+            polygon = star(rng, 40, radius=50.0, inner=0.4)
+            field = SiteDistanceField(polygon, resolution)
+            points = np.vstack([rng.uniform(-60, 60, (3000, 2)), polygon, np.round(polygon)])
+            np.testing.assert_array_equal(field.within(points), points_in_polygon(points, polygon))
+
+    def test_distances_and_bounds(self):
+        rng = np.random.default_rng(1)
+        polygon = star(rng, 40, radius=50.0, inner=0.4)
+        field = SiteDistanceField(polygon)
+        points = rng.uniform(-60, 60, (2000, 2))
+        expected = np.where(points_in_polygon(points, polygon), 1, -1) * boundary_distances(polygon, points)
+        np.testing.assert_allclose(field.distances(points), expected, atol=1e-9)
+
+        low, high = field.bounds(points)
+        self.assertTrue(np.all(low <= expected) and np.all(expected <= high))
+        for clearance in (-3.0, 2.0, 5.0):
+            inside = points_in_polygon(points, polygon)
+            exact = boundary_distances(polygon, points)
+            wanted = np.where(inside, exact >= clearance, -exact > clearance)
+            np.testing.assert_array_equal(field.within(points, clearance), wanted)
+
+    def test_rectangles_within_matches_rectangles_in_polygon(self):
+        rng = np.random.default_rng(2)
+        polygon = star(rng, 40, radius=50.0, inner=0.4)
+        field = SiteDistanceField(polygon)
+        centers = rng.uniform(-55, 55, (2000, 2))
+        widths, depths = rng.uniform(2, 20, 2000), rng.uniform(2, 20, 2000)
+        np.testing.assert_array_equal(field.rectangles_within(centers, widths, depths),
+                                      rectangles_in_polygon(centers, widths, depths, polygon))
+
+    def test_rectangle_clearance_holds_along_edges(self):
+        rng = np.random.default_rng(3)
+        polygon = star(rng, 40, radius=50.0, inner=0.4)
+        field = SiteDistanceField(polygon)
+        centers = rng.uniform(-40, 40, (300, 2))
+        width, depth, clearance = 6.0, 4.0, 1.5
+        result = field.rectangles_within(centers, width, depth, clearance)
+
+        corners = rectangle_corners(centers, width, depth)
+        starts, ends = corners.reshape(-1, 2), np.roll(corners, -1, axis=1).reshape(-1, 2)
+        corners_inside = points_in_polygon(starts, polygon).reshape(-1, 4).all(axis=1)
+        gaps = segment_distances(starts, ends, polygon).reshape(-1, 4).min(axis=1)
+        # Dense sampling can only overestimate the gap, so clear misses must be rejected
+        self.assertFalse(np.any(result & (gaps < clearance - 1e-9)))
+        self.assertFalse(np.any(result & ~corners_inside))
+        self.assertTrue(np.all(result[corners_inside & (gaps > clearance + 0.1)]))
+
+    def test_rejects_degenerate_sites_and_caches(self):
+        with self.assertRaises(ValueError):
+            SiteDistanceField([[0, 0], [1, 1]])
+        with self.assertRaises(ValueError):
+            SiteDistanceField([[0, 0], [1, 0], [0, 1]], resolution=0)
+        square = PolylineArray(np.array([[0, 0, 0], [9, 0, 0], [9, 9, 0], [0, 9, 0], [0, 0, 0]], dtype=float))
+        self.assertIs(SiteDistanceField.of(square), SiteDistanceField.of(square))
+        self.assertIs(SiteDistanceField.of(square.points), SiteDistanceField.of(square))
+
+
+class SiteFieldReuseTests(TestCase):
+    SITE = [0, 0, 0, 120, 0, 0, 120, 90, 0, 0, 90, 0, 0, 0, 0]
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def field_builds(self, name, payload):
+        with mock.patch.object(SiteDistanceField, '__init__', autospec=True,
+                               side_effect=SiteDistanceField.__init__) as build:
+            response = self.client.post(reverse(name), json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return build.call_count
+
+    def test_generateplan_builds_one_field_per_site(self):
+        # Scattered, organic (grid plus jitter) and grid placement
+        for density in (0.2, 0.5, 0.9):
+            payload = {'plan_flattened_vertices': self.SITE, 'plan_parameters': {'density': density, 'seed': 1}}
+            self.assertEqual(self.field_builds('generate_plan', payload), 1, density)
+
+    def test_sweep_builds_the_field_before_grouping(self):
+        payload = {'plan_flattened_vertices': self.SITE, 'sweep': {'far': [1.0, 2.0, 3.0]}}
+        self.assertEqual(self.field_builds('plan_sweep', payload), 1)
+
+        # Worker processes receive the field with the pickled site
+        site_parameters = sweep_views.PROCESSORS['standard'][0].compute_parameters(self.SITE)[0]
+        sweep_views._prepare_site(site_parameters)
+        polyline = pickle.loads(pickle.dumps(site_parameters)).site_polyline
+        with mock.patch.object(SiteDistanceField, '__init__', autospec=True) as build:
+            SiteDistanceField.of(polyline.points)
+        build.assert_not_called()
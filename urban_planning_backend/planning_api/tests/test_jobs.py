@@ -0,0 +1,119 @@
+# planning_api/tests/test_jobs.py - Job claiming, heartbeats and recovery
+import os
+import socket
+import subprocess
+import sys
+from datetime import timedelta
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from planning_api import jobs
+from planning_api.models import PlanningJob
+
+
+class RecordingExecutor:
+    """Stands in for the worker pool, recording submitted job ids"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, function, job_id):
+        self.submitted.append(job_id)
+
+
+def exited_pid() -> int:
+    """pid of a process that has already exited"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class RecoverJobsTests(TestCase):
+
+    def running_job(self, worker, heartbeat_age=0.0):
+        now = timezone.now()
+        return PlanningJob.objects.create(
+            kind='clustering', status=PlanningJob.RUNNING, worker=worker,
+            started_at=now - timedelta(seconds=heartbeat_age), heartbeat_at=now - timedelta(seconds=heartbeat_age)
+        )
+
+    def assertStatus(self, job, status):
+        job.refresh_from_db()
+        self.assertEqual(job.status, status)
+
+    def test_fails_jobs_of_exited_local_workers_only(self):
+        host = socket.gethostname()
+        orphaned = self.running_job(f'{host}:{exited_pid()}')
+        live = self.running_job(jobs.worker_id())
+        self.assertEqual(jobs.recover_jobs(RecordingExecutor()), (1, 0))
+        self.assertStatus(orphaned, PlanningJob.FAILED)
+        self.assertStatus(live, PlanningJob.RUNNING)
+
+    def test_remote_workers_are_judged_by_heartbeat(self):
+        fresh = self.running_job('elsewhere:1234', heartbeat_age=5)
+        stale = self.running_job('elsewhere:1235', heartbeat_age=3600)
+        jobs.recover_jobs(RecordingExecutor())
+        self.assertStatus(fresh, PlanningJob.RUNNING)
+        self.assertStatus(stale, PlanningJob.FAILED)
+
+    def test_resubmits_queued_jobs_in_creation_order(self):
+        first = PlanningJob.objects.create(kind='clustering')
+        second = PlanningJob.objects.create(kind='clustering')
+        executor = RecordingExecutor()
+        self.assertEqual(jobs.recover_jobs(executor), (0, 2))
+        self.assertEqual(executor.submitted, [first.pk, second.pk])
+        self.assertEqual(jobs.recover_jobs(executor, resubmit=False), (0, 0))
+
+    def test_submit_does_not_recover(self):
+        live = self.running_job('elsewhere:1234', heartbeat_age=3600)
+        executor = RecordingExecutor()
+        with mock.patch.object(jobs, 'get_job_executor', return_value=executor):
+            job = jobs.submit_job('clustering', {'vertices': [0, 0, 0] * 3, 'cluster_diameter': 1})
+        self.assertEqual(executor.submitted, [job.pk])
+        self.assertStatus(live, PlanningJob.RUNNING)
+
+
+class RunJobTests(TransactionTestCase):
+
+    def test_claim_records_owner_and_heartbeat(self):
+        job = PlanningJob.objects.create(
+            kind='clustering', parameters={'vertices': [0, 0, 0, 1, 0, 0, 9, 9, 0], 'cluster_diameter': 2}
+        )
+        with mock.patch.object(jobs, 'JobHeartbeat', wraps=jobs.JobHeartbeat) as heartbeat:
+            jobs.run_job(job.pk)
+        heartbeat.assert_called_once_with(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PlanningJob.SUCCEEDED)
+        self.assertEqual(job.worker, jobs.worker_id())
+        self.assertIsNotNone(job.heartbeat_at)
+
+        # A second run finds the job already claimed
+        jobs.run_job(job.pk)
+        self.assertEqual(PlanningJob.objects.get(pk=job.pk).finished_at, job.finished_at)
+
+
+class StartupRecoveryTests(SimpleTestCase):
+
+    def test_recovery_is_opt_in(self):
+        with mock.patch.object(jobs.threading, 'Thread') as thread:
+            with self.settings(PLANNING_JOB_RECOVER_ON_STARTUP=False):
+                jobs.start_recovery()
+            thread.assert_not_called()
+
+            with self.settings(PLANNING_JOB_RECOVER_ON_STARTUP=True):
+                jobs.start_recovery()
+            thread.assert_called_once_with(target=jobs._recover_on_startup, name='job-recovery', daemon=True)
+
+
+class StartupImportTests(SimpleTestCase):
+
+    def test_app_setup_is_inert(self):
+        # App loading must not pull in NumPy, start threads or touch the database
+        script = ('import sys, threading, django; django.setup(); '
+                  'print("numpy" in sys.modules, threading.active_count())')
+        environment = dict(os.environ, DJANGO_SETTINGS_MODULE='urban_planning_backend.settings')
+        output = subprocess.run([sys.executable, '-c', script], env=environment, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        self.assertEqual(output.stdout.strip(), 'False 1', output.stderr)
+        self.assertEqual(output.stderr, '')
@@ -0,0 +1,96 @@
+# planning_api/tests/test_metrics.py - Metrics registry output and multi-process snapshot merging
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+from django.test import SimpleTestCase
+from planning_api.metrics import MetricsRegistry
+
+
+def registry(directory=None, enabled=True):
+    result = MetricsRegistry()
+    result.configure(enabled=enabled, directory=directory, flush_interval=3600.0)
+    return result
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    return process.pid
+
+
+class MetricsRegistryTests(SimpleTestCase):
+
+    def test_renders_prometheus_text(self):
+        metrics = registry()
+        requests = metrics.counter('requests_total', 'Requests', ['view'])
+        latency = metrics.histogram('latency_seconds', 'Latency', ['view'], buckets=(0.1, 1.0))
+        requests.inc(view='plan')
+        requests.inc(2, view='plan')
+        for seconds in (0.05, 0.5, 5.0):
+            latency.observe(seconds, view='plan')
+
+        text = metrics.render()
+        self.assertIn('# TYPE requests_total counter', text)
+        self.assertIn('requests_total{view="plan"} 3', text)
+        self.assertIn('latency_seconds_bucket{view="plan",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{view="plan",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{view="plan",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{view="plan"} 3', text)
+        self.assertIn('latency_seconds_sum{view="plan"} 5.55', text)
+
+    def test_disabled_registry_records_nothing(self):
+        metrics = registry(enabled=False)
+        metrics.counter('requests_total', 'Requests').inc()
+        self.assertEqual(metrics.snapshot()['requests_total']['samples'], {})
+
+    def test_labels_must_match(self):
+        with self.assertRaises(ValueError):
+            registry().counter('requests_total', 'Requests', ['view']).inc(status=200)
+
+
+class MultiProcessSnapshotTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def registry(self):
+        metrics = registry(self.directory.name)
+        # Registries flush at exit; detach them before the directory goes
+        self.addCleanup(metrics.configure, directory=None)
+        return metrics
+
+    def exited_process(self, pid, count, workers):
+        """Registry whose snapshot looks like one left by an exited process"""
+        metrics = self.registry()
+        metrics._pid = pid
+        metrics.counter('requests_total', 'Requests').inc(count)
+        metrics.gauge('workers', 'Workers').set(workers)
+        metrics.flush()
+
+    def totals(self, metrics):
+        collected = metrics.collect()
+        return collected['requests_total']['samples']['[]'], collected['workers']['samples']['[]']
+
+    def test_reused_pid_keeps_both_snapshots(self):
+        pid = exited_pid()
+        self.exited_process(pid, 2, 7)
+        self.exited_process(pid, 3, 7)
+        self.assertEqual(len(glob.glob(os.path.join(self.directory.name, f'metrics_{pid}_*.json'))), 2)
+
+    def test_exited_processes_are_folded_once(self):
+        pid = exited_pid()
+        self.exited_process(pid, 2, 7)
+        self.exited_process(pid, 3, 7)
+        live = self.registry()
+        live.counter('requests_total', 'Requests').inc()
+        live.gauge('workers', 'Workers').set(1)
+
+        self.assertEqual(self.totals(live), (6.0, 1.0))
+        self.assertEqual(glob.glob(os.path.join(self.directory.name, 'metrics_*.json')), [live.snapshot_path])
+        self.assertEqual(self.totals(live), (6.0, 1.0))
+
+        # Another scraper sees the folded counts through the live process's file
+        self.assertEqual(self.registry().collect()['requests_total']['samples']['[]'], 6.0)
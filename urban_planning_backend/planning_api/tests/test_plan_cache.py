@@ -0,0 +1,132 @@
+# planning_api/tests/test_plan_cache.py - Plan result cache keys, fallbacks and copies
+import json
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from planning_api.plan_cache import PlanResultCache, cached_design, get_plan_cache, polygon_hash
+
+L_SITE = [0, 0, 0, 100, 0, 0, 100, 40, 0, 40, 40, 0, 40, 100, 0, 0, 100, 0]
+
+
+def rotated(flattened_vertices, steps):
+    """The same polygon starting steps vertices later"""
+    return flattened_vertices[3 * steps:] + flattened_vertices[:3 * steps]
+
+
+class SiteParameters:
+    seed = None
+
+
+class PolygonHashTests(SimpleTestCase):
+
+    def test_identical_sequences_share_a_hash(self):
+        self.assertEqual(polygon_hash(L_SITE), polygon_hash(list(L_SITE)))
+        self.assertEqual(polygon_hash([0.0, -0.0, 0.0] * 3), polygon_hash([0.0, 0.0, 0.0] * 3))
+
+    def test_start_vertex_and_winding_change_the_hash(self):
+        reversed_site = [value for i in range(len(L_SITE) // 3 - 1, -1, -1) for value in L_SITE[3 * i:3 * i + 3]]
+        self.assertNotEqual(polygon_hash(L_SITE), polygon_hash(rotated(L_SITE, 1)))
+        self.assertNotEqual(polygon_hash(L_SITE), polygon_hash(reversed_site))
+
+
+class CachedDesignTests(SimpleTestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+        self.calls = 0
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def design(self, response):
+        def compute():
+            self.calls += 1
+            return response
+        return cached_design('test', L_SITE, {'seed': 5}, SiteParameters(), compute,
+                             lambda: {'subSiteVertices': [[1.0]]}, self.default_response)
+
+    @staticmethod
+    def default_response():
+        return {'buildingLayersHeights': [[3.0]], 'buildingLayersVertices': [[[0.0] * 12]]}
+
+    def test_hit_reuses_buildings_and_rebuilds_site_layers(self):
+        generated = {'buildingLayersHeights': [[4.0]], 'buildingLayersVertices': [[[1.0] * 12]],
+                     'subSiteVertices': [[2.0]]}
+        self.design(generated)
+        response = self.design(generated)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response['buildingLayersHeights'], [[4.0]])
+        self.assertEqual(response['subSiteVertices'], [[1.0]])
+
+    def test_fallback_response_is_not_cached(self):
+        self.design(self.default_response())
+        self.design(self.default_response())
+        self.assertEqual(self.calls, 2)
+
+    def test_callers_do_not_share_cached_lists(self):
+        generated = {'buildingLayersHeights': [[4.0]], 'buildingLayersVertices': [[[1.0] * 12]]}
+        self.design(generated)['buildingLayersHeights'][0].append(9.0)
+        generated['buildingLayersVertices'].clear()
+        response = self.design(generated)
+        self.assertEqual(response['buildingLayersHeights'], [[4.0]])
+        self.assertEqual(len(response['buildingLayersVertices']), 1)
+
+
+class PlanResultCacheTests(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = PlanResultCache(max_entries=2, ttl=None)
+        cache.set('a', [1])
+        cache.set('b', [2])
+        cache.get('a')
+        cache.set('c', [3])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), [1])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class GeneratePlanCacheTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def generate(self, vertices):
+        response = self.client.post(
+            reverse('enhanced_generate_plan'),
+            json.dumps({'plan_flattened_vertices': vertices, 'plan_parameters': {'seed': 5}}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cache_hit_matches_fresh_compute(self):
+        for steps in range(len(L_SITE) // 3):
+            site = rotated(L_SITE, steps)
+            get_plan_cache().clear()
+            fresh = self.generate(site)
+            self.assertEqual(self.generate(site), fresh)
+
+        # A rotated site never reuses the original site's layout
+        get_plan_cache().clear()
+        self.generate(L_SITE)
+        rotated_site = rotated(L_SITE, 1)
+        cached = self.generate(rotated_site)
+        get_plan_cache().clear()
+        self.assertEqual(cached, self.generate(rotated_site))
+
+    def test_generateplan_cache_hit_keeps_far_dependent_setback(self):
+        # The standard endpoint only measures sites whose last vertex repeats the first
+        closed_site = L_SITE + L_SITE[:3]
+        payload = json.dumps({'plan_flattened_vertices': closed_site, 'plan_parameters': {'far': 3.0, 'seed': 1}})
+
+        def generate():
+            response = self.client.post(reverse('generate_plan'), payload, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            return response.json()
+
+        fresh = generate()
+        # FAR above 2 widens the setback to 4m
+        self.assertEqual(fresh['subSiteSetbackVertices'][0][:2], [4.0, 4.0])
+        self.assertEqual(generate(), fresh)
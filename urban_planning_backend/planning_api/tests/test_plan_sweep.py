@@ -0,0 +1,41 @@
+# planning_api/tests/test_plan_sweep.py - Parameter sweeps against single-site generation
+import json
+from django.test import TestCase
+from django.urls import reverse
+from planning_api.plan_cache import get_plan_cache
+
+SITE = [0, 0, 0, 200, 0, 0, 200, 150, 0, 0, 150, 0, 0, 0, 0]
+
+
+class PlanSweepTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def post(self, name, payload):
+        response = self.client.post(reverse(name), json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_far_only_cells_share_placement_and_match_generateplan(self):
+        sweep = {'far': [1.0, 3.0], 'density': [0.3, 0.6]}
+        result = self.post('plan_sweep', {
+            'plan_flattened_vertices': SITE, 'sweep': sweep, 'include_geometry': [0, 1, 2, 3]
+        })
+
+        # One placement run per density, each shared by both FAR values
+        self.assertEqual(result['combinations'], 4)
+        self.assertEqual(result['placement_runs'], 2)
+        self.assertEqual(result['failed'], [])
+
+        columns = result['columns']
+        for row in result['rows']:
+            index = row[columns.index('index')]
+            parameters = {'far': row[columns.index('far')], 'density': row[columns.index('density')],
+                          'seed': row[columns.index('seed')]}
+            plan = self.post('generate_plan', {'plan_flattened_vertices': SITE, 'plan_parameters': parameters})
+            self.assertGreater(len(plan['buildingLayersVertices']), 0)
+            self.assertEqual(result['geometry'][str(index)], plan)
@@ -0,0 +1,75 @@
+# planning_api/tests/test_quantize.py - Rounding, quantized keys and dedup against plain Python
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.quantize import (
+    dequantize_coords, geometry_keys, key_hash, quantize_coords, ring_order, round_coords
+)
+from planning_api.geometry.geometry3d import GeometryIndex3D, UPoint, UPolyline
+
+
+class RoundCoordsTests(SimpleTestCase):
+
+    def test_matches_python_round(self):
+        rng = np.random.default_rng(0)
+        for decimal_places in (-1, 0, 1, 2, 3, 6, 9):
+            ties = (rng.integers(-10 ** 7, 10 ** 7, 5000) + 0.5) / 10.0 ** max(decimal_places, 0)
+            values = np.concatenate([ties, rng.uniform(-1e4, 1e4, 5000), [2.675, 5109.695, 1e300, -0.0]])
+            expected = [round(value, decimal_places) for value in values.tolist()]
+            self.assertEqual(round_coords(values, decimal_places).tolist(), expected)
+
+    def test_keeps_shape(self):
+        self.assertEqual(round_coords([[2.675, 1.005, 0.125]], 2).tolist(), [[2.67, 1.0, 0.12]])
+
+
+class QuantizeTests(SimpleTestCase):
+
+    def test_round_trip_to_grid(self):
+        coords = np.array([[1.23456, -7.5, 0.0]])
+        np.testing.assert_array_equal(quantize_coords(coords, 1e-3), [[1235, -7500, 0]])
+        np.testing.assert_array_equal(dequantize_coords([[1235, -7500, 0]], 1e-3), [[1.235, -7.5, 0.0]])
+
+    def test_rejects_bad_resolution_and_overflow(self):
+        with self.assertRaises(ValueError):
+            quantize_coords([[0, 0, 0]], 0)
+        with self.assertRaises(ValueError):
+            quantize_coords([[1e12, 0, 0]], 1e-9)
+
+
+class GeometryKeysTests(SimpleTestCase):
+
+    def test_batch_keys_match_one_at_a_time(self):
+        rng = np.random.default_rng(1)
+        geometries = []
+        for _ in range(200):
+            coords = rng.integers(0, 4, (int(rng.integers(1, 7)), 3)).astype(float)
+            if len(coords) >= 3 and rng.random() < 0.5:
+                coords = np.vstack([coords, coords[:1]])
+            geometries.append(coords)
+
+        for normalize in (False, True):
+            expected = []
+            for coords in geometries:
+                grid = quantize_coords(coords)
+                expected.append((grid[ring_order(grid)] if normalize else grid).tobytes())
+            self.assertEqual(geometry_keys(geometries, normalize=normalize), expected)
+
+    def test_rotated_rings_share_a_key(self):
+        ring = [[0, 0, 0], [4, 0, 0], [4, 3, 0], [0, 3, 0], [0, 0, 0]]
+        rotated = [[4, 3, 0], [0, 3, 0], [0, 0, 0], [4, 0, 0], [4, 3, 0]]
+        first, second = geometry_keys([ring, rotated])
+        self.assertEqual(first, second)
+        self.assertEqual(key_hash(first), key_hash(second))
+
+    def test_index_deduplicates_like_pairwise_comparison(self):
+        rng = np.random.default_rng(2)
+        coords = [rng.integers(0, 3, (3, 3)).astype(float) for _ in range(300)]
+        polylines = [UPolyline([UPoint(*point) for point in points.tolist()]) for points in coords]
+        unique = GeometryIndex3D.deduplicate(polylines)
+
+        expected = []
+        for points in coords:
+            grid = quantize_coords(points)
+            key = grid[ring_order(grid)].tolist()
+            if key not in expected:
+                expected.append(key)
+        self.assertEqual(len(unique), len(expected))
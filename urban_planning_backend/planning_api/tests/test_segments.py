@@ -0,0 +1,86 @@
+# planning_api/tests/test_segments.py - Batch segment kernels against the scalar tests they replace
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.geometry3d import LinesIntersection3D
+from planning_api.geometry.intersection_addon import IntersectionAddOn
+from planning_api.geometry.segments import closest_approaches, intersect_lines, intersect_segments_2d, pair_segments
+from planning_api.geometry.utils import GeometryUtils, Line, Point3D
+
+
+def segment_pairs(rng, count, planar=False):
+    """(p1, p2, q1, q2) mixing random segments with grid ones that touch, overlap and run parallel"""
+    floats = rng.uniform(-5, 5, (4, count, 3))
+    grid = rng.integers(-2, 3, (4, count, 3)).astype(float)
+    coords = np.where(rng.random((1, count, 1)) < 0.5, floats, grid)
+    # Every fifth Q lies on the line through P
+    collinear = slice(0, count, 5)
+    steps = rng.integers(-2, 4, (2, len(range(0, count, 5)), 1)) / 2.0
+    coords[2:, collinear] = coords[0, collinear] + steps * (coords[1, collinear] - coords[0, collinear])
+    if planar:
+        coords[..., 2] = 0.0
+    return tuple(coords)
+
+
+def points(coords):
+    return [Point3D(*point) for point in coords.tolist()]
+
+
+class IntersectSegments2DTests(SimpleTestCase):
+
+    def test_matches_line_intersection_2d(self):
+        p1, p2, q1, q2 = segment_pairs(np.random.default_rng(0), 2000)
+        for finite_segments in (True, False):
+            hits, t, u = intersect_segments_2d(p1, p2, q1, q2, finite_segments=finite_segments)
+            for index, (a, b, c, d) in enumerate(zip(points(p1), points(p2), points(q1), points(q2))):
+                line_a, line_b = Line(a, b), Line(c, d)
+                expected = GeometryUtils.line_intersection_2d(line_a, line_b)
+                if expected is None:
+                    self.assertTrue(np.isnan(t[index]) and np.isnan(u[index]))
+                else:
+                    self.assertEqual((t[index], u[index]), expected)
+                self.assertEqual(hits[index], GeometryUtils.lines_intersect_2d(line_a, line_b, 1e-6, finite_segments))
+
+    def test_pair_segments_gathers_end_points(self):
+        coords_a = np.arange(12, dtype=float).reshape(4, 3)
+        coords_b = -coords_a
+        p_starts, p_ends, q_starts, q_ends = pair_segments(coords_a, coords_b, [(0, 2), (2, 1)])
+        np.testing.assert_array_equal(p_starts, coords_a[[0, 2]])
+        np.testing.assert_array_equal(p_ends, coords_a[[1, 3]])
+        np.testing.assert_array_equal(q_starts, coords_b[[2, 1]])
+        np.testing.assert_array_equal(q_ends, coords_b[[3, 2]])
+
+
+class IntersectLinesTests(SimpleTestCase):
+
+    def test_matches_line_line(self):
+        p1, p2, q1, q2 = segment_pairs(np.random.default_rng(1), 2000, planar=True)
+        valid = np.any(p1 != p2, axis=1) & np.any(q1 != q2, axis=1)
+        p1, p2, q1, q2 = p1[valid], p2[valid], q1[valid], q2[valid]
+        for finite_segments in (False, True):
+            intersects, parameter_a, parameter_b = intersect_lines(p1, p2, q1, q2, finite_segments=finite_segments)
+            for index, (a, b, c, d) in enumerate(zip(points(p1), points(p2), points(q1), points(q2))):
+                expected = IntersectionAddOn.line_line(Line(a, b), Line(c, d), finite_segments=finite_segments)
+                self.assertEqual((bool(intersects[index]), parameter_a[index], parameter_b[index]), expected)
+
+
+class ClosestApproachesTests(SimpleTestCase):
+
+    def test_matches_lines_intersection_3d(self):
+        p1, p2, q1, q2 = segment_pairs(np.random.default_rng(2), 2000)
+        approaches = closest_approaches(p1, p2, q1, q2)
+        scalar = LinesIntersection3D()
+        for index, (a, b, c, d) in enumerate(zip(points(p1), points(p2), points(q1), points(q2))):
+            self.assertEqual(scalar.compute(a, b, c, d), approaches.has_intersection[index])
+            self.assertEqual(scalar.is_parallel, approaches.is_parallel[index])
+            self.assertEqual(scalar.is_collinear, approaches.is_collinear[index])
+            self.assertEqual(scalar.is_proper, approaches.is_proper[index])
+            if scalar.is_proper:
+                point = scalar.p_intersections[0]
+                self.assertEqual([point.x, point.y, point.z], approaches.points[index].tolist())
+
+    def test_compute_many_uses_the_same_kernel(self):
+        p1, p2, q1, q2 = segment_pairs(np.random.default_rng(3), 50)
+        many = LinesIntersection3D(1e-3).compute_many(points(p1), points(p2), points(q1), points(q2))
+        expected = closest_approaches(p1, p2, q1, q2, 1e-3)
+        np.testing.assert_array_equal(many.has_intersection, expected.has_intersection)
+        np.testing.assert_array_equal(many.s, expected.s)
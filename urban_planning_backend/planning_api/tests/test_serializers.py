@@ -0,0 +1,89 @@
+# planning_api/tests/test_serializers.py - Vectorized array fields and response validation switch
+import json
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from planning_api.plan_cache import get_plan_cache
+from planning_api.serializers import (
+    GeneratePlanRequestSerializer, GeneratePlanResponseSerializer, NumericArrayField, RaggedArrayField
+)
+
+SQUARE = [0, 0, 0, 50, 0, 0, 50, 50, 0, 0, 50, 0]
+
+
+class NumericArrayFieldTests(SimpleTestCase):
+
+    def assertRejects(self, field, data, message):
+        with self.assertRaises(serializers.ValidationError) as raised:
+            field.run_validation(data)
+        self.assertIn(message, str(raised.exception.detail))
+
+    def test_accepts_lists_and_arrays(self):
+        field = NumericArrayField(group_size=3, min_value=-1)
+        np.testing.assert_array_equal(field.run_validation([0, 1, 2.5]), [0, 1, 2.5])
+        array = np.array([1.0, 2.0, 3.0])
+        self.assertIs(field.run_validation(array), array)
+        self.assertEqual(field.to_representation(np.array([1.5, 2.0])), [1.5, 2.0])
+
+    def test_rejects_bad_values_and_shapes(self):
+        field = NumericArrayField(group_size=3, max_length=6, min_value=0, max_value=10)
+        self.assertRejects(field, 'abc', 'Expected a list of numbers')
+        self.assertRejects(field, [1, 'x', 2], 'All values must be numbers')
+        self.assertRejects(field, [[1, 2, 3]], 'All values must be numbers')
+        self.assertRejects(field, [1, 2, float('nan')], 'finite')
+        self.assertRejects(field, [1, 2], 'groups of 3')
+        self.assertRejects(field, [1] * 9, 'no more than 6')
+        self.assertRejects(field, [1, 2, -1], 'greater than or equal to 0')
+        self.assertRejects(field, [1, 2, 11], 'less than or equal to 10')
+
+    def test_vertex_field_keeps_its_messages(self):
+        field = GeneratePlanRequestSerializer().fields['plan_flattened_vertices']
+        self.assertRejects(field, [0, 0, 0, 1, 1], 'groups of 3')
+        self.assertRejects(field, [0, 0, 0, 1, 1, 1], 'At least 3 vertices')
+
+    def test_ragged_field_checks_inner_lists(self):
+        field = RaggedArrayField(depth=3, group_size=3)
+        nested = [[[0, 0, 0, 1, 1, 1]], [[2, 2, 2], [3, 3, 3]]]
+        self.assertEqual(field.run_validation(nested), [[[0.0] * 3 + [1.0] * 3], [[2.0] * 3, [3.0] * 3]])
+        self.assertRejects(field, [[[0, 0, 0, 1]]], 'groups of 3')
+        self.assertRejects(field, [[0, 0, 0]], 'nested 3 levels')
+        self.assertRejects(field, [[[0, 0, float('inf')]]], 'finite')
+
+    def test_response_serializer_round_trips_a_plan(self):
+        plan = {
+            'buildingLayersHeights': [[3.0, 6.0]],
+            'buildingLayersVertices': [[SQUARE, SQUARE]],
+            'subSiteVertices': [SQUARE],
+            'subSiteSetbackVertices': [],
+        }
+        serializer = GeneratePlanResponseSerializer(data=plan)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(json.loads(json.dumps(serializer.validated_data)), json.loads(json.dumps(plan)))
+
+
+class ResponseValidationSettingTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def generate(self, name, module):
+        rejecting = mock.Mock()
+        rejecting.return_value.is_valid.return_value = False
+        with mock.patch(f'planning_api.{module}.GeneratePlanResponseSerializer', rejecting):
+            response = self.client.post(
+                reverse(name), json.dumps({'plan_flattened_vertices': SQUARE}), content_type='application/json'
+            )
+        return response.status_code, rejecting.called
+
+    def test_setting_is_read_per_request(self):
+        for name, module in (('generate_plan', 'views'), ('enhanced_generate_plan', 'enhanced_views')):
+            with override_settings(PLANNING_VALIDATE_RESPONSES=False):
+                self.assertEqual(self.generate(name, module), (200, False))
+            with override_settings(PLANNING_VALIDATE_RESPONSES=True):
+                self.assertEqual(self.generate(name, module), (500, True))
@@ -0,0 +1,163 @@
+# planning_api/tests/test_skeleton.py - Straight skeleton offsets against boundary distances
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry import skeleton as skeleton_module
+from planning_api.geometry.skeleton import StraightSkeleton
+from planning_api.geometry.sweep import has_self_intersection
+from planning_api.geometry.utils import PolylineArray, points_in_polygon, signed_area
+from planning_api.tests.shapes import star
+
+SHAPES = {
+    'square': [[0, 0], [10, 0], [10, 10], [0, 10]],
+    'L': [[0, 0], [10, 0], [10, 4], [4, 4], [4, 10], [0, 10]],
+    'U': [[0, 0], [12, 0], [12, 10], [8, 10], [8, 4], [4, 4], [4, 10], [0, 10]],
+    'clockwise L': [[0, 10], [4, 10], [4, 4], [10, 4], [10, 0], [0, 0]],
+    'dumbbell': [[0, 0], [6, 0], [6, 2.5], [10, 2.5], [10, 0], [16, 0], [16, 6], [10, 6], [10, 3.5], [6, 3.5],
+                 [6, 6], [0, 6]],
+}
+
+
+def boundary_distances(polygon, points):
+    """Distance from each point to the nearest edge of a closed polygon, by brute force"""
+    starts, ends = polygon, np.roll(polygon, -1, axis=0)
+    directions = ends - starts
+    t = np.clip(np.einsum('mnk,nk->mn', points[:, None] - starts, directions) / np.einsum('nk,nk->n', directions,
+                                                                                         directions), 0, 1)
+    closest = starts + t[..., None] * directions
+    return np.linalg.norm(points[:, None] - closest, axis=2).min(axis=1)
+
+
+def random_shapes(rng):
+    for name, polygon in SHAPES.items():
+        yield name, np.array(polygon, dtype=float)
+    for index in range(10):
+        angles = np.sort(rng.uniform(0, 2 * np.pi, int(rng.integers(3, 12))))
+        yield f'convex {index}', 10 * np.column_stack([np.cos(angles), np.sin(angles)])
+    for index in range(30):
+        yield f'star {index}', star(rng, int(rng.integers(5, 30)), inner=0.2)
+
+
+def polyomino(rng, cells, size=8):
+    """Outline of randomly grown grid cells, or None when it touches itself or has holes"""
+    grid = np.zeros((size + 2, size + 2), dtype=bool)
+    grid[size // 2, size // 2] = True
+    steps = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    while grid.sum() < cells:
+        i, j = np.argwhere(grid)[rng.integers(grid.sum())]
+        di, dj = steps[rng.integers(4)]
+        grid[np.clip(i + di, 1, size), np.clip(j + dj, 1, size)] = True
+
+    # Counter-clockwise cell sides facing empty cells, chained into one loop
+    following = {}
+    for i, j in np.argwhere(grid).tolist():
+        corners = [(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)]
+        for side, (di, dj) in enumerate([(0, -1), (1, 0), (0, 1), (-1, 0)]):
+            if not grid[i + di, j + dj]:
+                if corners[side] in following:
+                    return None
+                following[corners[side]] = corners[(side + 1) % 4]
+    start = next(iter(following))
+    ring = [start]
+    while following[ring[-1]] != start:
+        ring.append(following[ring[-1]])
+    if len(ring) != len(following):
+        return None
+    ring = np.array(ring, dtype=float)
+    incoming, outgoing = ring - np.roll(ring, 1, axis=0), np.roll(ring, -1, axis=0) - ring
+    return ring[incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0] != 0]
+
+
+def chebyshev_distances(polygon, points):
+    """L-infinity distance from each point to the nearest edge of an axis-aligned polygon"""
+    low = np.minimum(polygon, np.roll(polygon, -1, axis=0))
+    high = np.maximum(polygon, np.roll(polygon, -1, axis=0))
+    gaps = np.maximum(np.maximum(low - points[:, None], points[:, None] - high), 0)
+    return gaps.max(axis=2).min(axis=1)
+
+
+class StraightSkeletonTests(SimpleTestCase):
+
+    def test_offsets_keep_their_distance(self):
+        rng = np.random.default_rng(0)
+        for name, polygon in random_shapes(rng):
+            skeleton = StraightSkeleton(polygon)
+            incoming, outgoing = polygon - np.roll(polygon, 1, axis=0), np.roll(polygon, -1, axis=0) - polygon
+            turns = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+            convex = bool(np.all(turns >= 0) or np.all(turns <= 0))
+            scale = float(np.ptp(polygon, axis=0).max())
+            previous = abs(signed_area(polygon))
+            distances = np.linspace(0, skeleton.end_distance, 12)[1:-1]
+            for distance, rings in zip(distances.tolist(), skeleton.offsets(distances)):
+                self.assertTrue(rings, (name, distance))
+                area = sum(abs(signed_area(ring[:, :2])) for ring in rings)
+                self.assertLess(area, previous, name)
+                previous = area
+                for ring in rings:
+                    xy = ring[:, :2]
+                    samples = np.vstack([xy + (np.roll(xy, -1, axis=0) - xy) * f for f in (0, 0.25, 0.5, 0.75)])
+                    self.assertTrue(points_in_polygon(samples, polygon).all(), name)
+                    gaps = boundary_distances(polygon, samples)
+                    # Nothing comes closer than distance; on convex shapes the offset is the erosion
+                    self.assertGreaterEqual(gaps.min(), distance - 1e-6 * scale, name)
+                    if convex:
+                        self.assertAlmostEqual(gaps.max(), distance, delta=1e-6 * scale, msg=name)
+                    self.assertFalse(len(xy) >= 4 and has_self_intersection(xy, True, 1e-12), name)
+            self.assertEqual(skeleton.offset(skeleton.end_distance * 1.01), [])
+
+    def test_orthogonal_offsets_are_square_erosions(self):
+        # Offsetting an axis-aligned polygon along its straight skeleton erodes it
+        # by a square, and simultaneous events at equal distances are the norm
+        rng = np.random.default_rng(1)
+        tested = 0
+        while tested < 40:
+            polygon = polyomino(rng, int(rng.integers(3, 30)))
+            if polygon is None:
+                continue
+            tested += 1
+            polygon = polygon[::-1] * 5 if tested % 2 else polygon
+            points = rng.uniform(polygon.min(axis=0), polygon.max(axis=0), (2000, 2))
+            inside, gaps = points_in_polygon(points, polygon), chebyshev_distances(polygon, points)
+            for outward in (False, True):
+                skeleton = StraightSkeleton(polygon, outward)
+                end = 3.0 * np.abs(polygon).max() if outward else skeleton.end_distance
+                distances = np.linspace(0, end, 8)[1:-1]
+                for distance, rings in zip(distances.tolist(), skeleton.offsets(distances)):
+                    covered = np.zeros(len(points), dtype=bool)
+                    for ring in rings:
+                        covered ^= points_in_polygon(points, ring[:, :2])
+                    expected = inside | (gaps <= distance) if outward else inside & (gaps >= distance)
+                    clear = np.abs(gaps - distance) > 1e-6
+                    np.testing.assert_array_equal(covered[clear], expected[clear], str(polygon.tolist()))
+
+        skeleton = StraightSkeleton([[0, 1], [9, 1], [9, 2], [16, 2], [16, 19], [9, 19], [9, 8], [0, 8]])
+        self.assertAlmostEqual(skeleton.end_distance, 3.5)
+        self.assertEqual(len(skeleton.offset(3.2)), 2)
+
+    def test_event_limit_raises(self):
+        rng = np.random.default_rng(2)
+        with mock.patch.object(skeleton_module, 'SKELETON_MAX_EVENTS_PER_VERTEX', 0):
+            with self.assertRaises(ValueError):
+                StraightSkeleton(star(rng, 60, inner=0.2))
+
+    def test_square_offsets_are_exact(self):
+        skeleton = StraightSkeleton(SHAPES['square'])
+        self.assertAlmostEqual(skeleton.end_distance, 5.0)
+        ring, = skeleton.offset(2.0)
+        np.testing.assert_allclose(ring, [[2, 2, 0], [8, 2, 0], [8, 8, 0], [2, 8, 0]], atol=1e-12)
+
+    def test_orientation_and_outward_offsets(self):
+        clockwise = np.array(SHAPES['clockwise L'])
+        ring, = StraightSkeleton(clockwise).offset(1.0)
+        self.assertLess(signed_area(ring[:, :2]), 0)
+
+        grown = StraightSkeleton(SHAPES['square'], outward=True).largest_ring(1.0)
+        self.assertAlmostEqual(abs(signed_area(grown[:, :2])), 144.0)
+
+    def test_skeleton_is_cached_per_site(self):
+        square = np.array(SHAPES['square'] + [[0, 0]], dtype=float)
+        polyline = PolylineArray(np.column_stack([square, np.zeros(len(square))]))
+        self.assertIs(StraightSkeleton.of(polyline), StraightSkeleton.of(polyline))
+        self.assertIsNot(StraightSkeleton.of(polyline), StraightSkeleton.of(polyline, outward=True))
+        self.assertIs(StraightSkeleton.of(SHAPES['L']), StraightSkeleton.of(np.array(SHAPES['L'], dtype=float)))
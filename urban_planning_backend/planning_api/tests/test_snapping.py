@@ -0,0 +1,73 @@
+# planning_api/tests/test_snapping.py - Vertex snapping against brute-force grouping
+import json
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from planning_api.geometry.snapping import snap_polylines, snap_vertices
+
+
+def brute_force_groups(coords, tolerance):
+    """Smallest vertex index of each vertex's group, by union-find over all pairs"""
+    parent = list(range(len(coords)))
+
+    def find(index):
+        while parent[index] != index:
+            index = parent[index]
+        return index
+
+    distances = np.linalg.norm(coords[:, None] - coords[None], axis=2)
+    for i, j in zip(*np.nonzero(np.triu(distances < tolerance, 1))):
+        a, b = find(i), find(j)
+        parent[max(a, b)] = min(a, b)
+    return np.array([find(index) for index in range(len(coords))])
+
+
+class SnapVerticesTests(SimpleTestCase):
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for _ in range(30):
+            coords = rng.uniform(0, 10, (int(rng.integers(2, 200)), 3)) * [1, 1, rng.choice([0, 1])]
+            tolerance = float(rng.uniform(0.05, 1.0))
+            snapped, representatives = snap_vertices(coords, tolerance)
+            np.testing.assert_array_equal(representatives, brute_force_groups(coords, tolerance))
+            np.testing.assert_array_equal(snapped, coords[representatives])
+
+    def test_tiny_tolerance_on_large_extent(self):
+        # UTM-sized coordinates with a micrometre tolerance overflow a dense cell index
+        rng = np.random.default_rng(1)
+        coords = rng.uniform([0, 0, 0], [800, 600, 12], (60, 3)) + [500000, 5400000, 100]
+        coords = np.vstack([coords, coords + rng.normal(size=coords.shape) * 2e-7])
+        _, representatives = snap_vertices(coords, 1e-6)
+        np.testing.assert_array_equal(representatives, brute_force_groups(coords, 1e-6))
+
+
+class SnapPolylinesTests(SimpleTestCase):
+
+    def test_repeated_vertices_are_collapsed(self):
+        polyline = [[0, 0, 0], [0.5, 0, 0], [0.55, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0]]
+        snapped, = snap_polylines([polyline], 0.1)
+        np.testing.assert_array_equal(snapped, [[0, 0, 0], [0.5, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0]])
+
+    def test_vertices_snap_across_polylines(self):
+        first, second = snap_polylines([[[0, 0, 0], [10, 0, 0]], [[10.05, 0, 0], [10, 5, 0]]], 0.1)
+        np.testing.assert_array_equal(second[0], first[1])
+
+    def test_vertices_snap_onto_segments(self):
+        _, second = snap_polylines([[[0, 0, 0], [10, 0, 0]], [[5, 0.05, 0], [5, 5, 0]]], 0.1, to_segments=True)
+        np.testing.assert_allclose(second[0], [5, 0, 0])
+
+
+class SnapEndpointTests(TestCase):
+
+    def test_default_tolerance_on_large_site(self):
+        rng = np.random.default_rng(2)
+        for origin in ([0, 0, 0], [500000, 5400000, 100]):
+            vertices = rng.uniform([0, 0, 0], [800, 600, 12], (40, 3)) + origin
+            response = self.client.post(
+                reverse('geometry_processing'),
+                json.dumps({'vertices': vertices.ravel().tolist(), 'operation': 'snap'}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['success'])
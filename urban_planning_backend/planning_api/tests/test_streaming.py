@@ -0,0 +1,52 @@
+# planning_api/tests/test_streaming.py - NDJSON plan streams against the buffered endpoint
+import json
+from django.test import TestCase
+from django.urls import reverse
+from planning_api.plan_cache import get_plan_cache
+
+SITE = [0, 0, 0, 160, 0, 0, 160, 120, 0, 0, 120, 0]
+PAYLOAD = json.dumps({'plan_flattened_vertices': SITE, 'plan_parameters': {'seed': 7, 'density': 0.6}})
+
+
+def rebuild_plan(records):
+    """Reassemble a buffered plan response from stream records"""
+    site, *buildings, end = records
+    return {
+        'buildingLayersHeights': [record['layerHeights'] for record in buildings],
+        'buildingLayersVertices': [record['layerVertices'] for record in buildings],
+        'subSiteVertices': site['subSiteVertices'],
+        'subSiteSetbackVertices': site['subSiteSetbackVertices'],
+    }
+
+
+class EnhancedPlanStreamTests(TestCase):
+
+    def setUp(self):
+        get_plan_cache().clear()
+
+    def tearDown(self):
+        get_plan_cache().clear()
+
+    def stream(self):
+        response = self.client.post(reverse('enhanced_generate_plan_stream'), PAYLOAD,
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_stream_rebuilds_buffered_plan_and_replays_from_cache(self):
+        records = self.stream()
+        self.assertEqual(records[0]['type'], 'site')
+        self.assertEqual(records[-1], {'type': 'end', 'buildingCount': len(records) - 2})
+        self.assertEqual([record['index'] for record in records[1:-1]], list(range(len(records) - 2)))
+        self.assertGreater(len(records), 2)
+
+        # The second request is served from the layout cached by the first
+        self.assertEqual(self.stream(), records)
+        self.assertEqual(get_plan_cache().stats()['hits'], 1)
+
+        get_plan_cache().clear()
+        response = self.client.post(reverse('enhanced_generate_plan'), PAYLOAD, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(rebuild_plan(records), response.json())
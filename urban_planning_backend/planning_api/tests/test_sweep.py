@@ -0,0 +1,61 @@
+# planning_api/tests/test_sweep.py - Plane sweep intersections against all-pairs checks
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.sweep import (
+    has_self_intersection, polyline_segments, ring_neighbours, segments_intersect_2d, self_intersections,
+    sweep_intersections
+)
+
+
+def all_pairs(segments, excluded=None):
+    rows = np.asarray(segments, dtype=float).tolist()
+    return [
+        (i, j) for i in range(len(rows)) for j in range(i + 1, len(rows))
+        if not (excluded and excluded(i, j)) and segments_intersect_2d(rows[i], rows[j])
+    ]
+
+
+def random_segments(rng, count):
+    """Random segments, half snapped to a coarse grid so they share end points and run vertical"""
+    segments = rng.uniform(0, 10, (count, 4))
+    snapped = rng.random(count) < 0.5
+    segments[snapped] = np.round(segments[snapped] / 2) * 2
+    return segments
+
+
+class SweepIntersectionsTests(SimpleTestCase):
+
+    def test_matches_all_pairs(self):
+        rng = np.random.default_rng(0)
+        for count in (1, 2, 10, 60, 200):
+            segments = random_segments(rng, count)
+            expected = all_pairs(segments)
+            self.assertEqual(sorted(sweep_intersections(segments)), expected)
+            self.assertEqual(bool(sweep_intersections(segments, first_only=True)), bool(expected))
+
+    def test_excluded_pairs_are_not_reported(self):
+        rng = np.random.default_rng(1)
+        segments = random_segments(rng, 80)
+        excluded = ring_neighbours(len(segments))
+        self.assertEqual(sorted(sweep_intersections(segments, excluded=excluded)), all_pairs(segments, excluded))
+
+
+class SelfIntersectionTests(SimpleTestCase):
+
+    def test_matches_all_pairs_of_edges(self):
+        rng = np.random.default_rng(2)
+        for _ in range(40):
+            coords = rng.uniform(0, 10, (int(rng.integers(3, 30)), 2))
+            for closed in (True, False):
+                segments = polyline_segments(coords, closed)
+                expected = all_pairs(segments, ring_neighbours(len(segments)))
+                found = self_intersections(coords, closed)
+                self.assertEqual(sorted((i, j) for i, j, _ in found), expected)
+                self.assertEqual(has_self_intersection(coords, closed), bool(expected))
+
+    def test_crossing_point(self):
+        bow_tie = [[0, 0], [4, 4], [4, 0], [0, 4]]
+        (i, j, point), = self_intersections(bow_tie)
+        self.assertEqual((i, j), (0, 2))
+        np.testing.assert_allclose(point, (2, 2))
+        self.assertFalse(has_self_intersection([[0, 0], [4, 0], [4, 4], [0, 4]]))
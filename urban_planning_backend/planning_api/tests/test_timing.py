@@ -0,0 +1,91 @@
+# planning_api/tests/test_timing.py - Timing middleware over plain and streamed responses
+import json
+import time
+from unittest import mock
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from planning_api import metrics, timing
+from planning_api.middleware import RequestMetricsMiddleware, ServerTimingMiddleware
+from planning_api.timing import span
+
+STREAM_DELAY = 0.05
+
+
+def streamed_view(request):
+    def body():
+        yield b'first\n'
+        with span('stream'):
+            time.sleep(STREAM_DELAY)
+        yield b'second\n'
+    return StreamingHttpResponse(body())
+
+
+def plain_view(request):
+    with span('build'):
+        pass
+    return HttpResponse(b'done')
+
+
+@override_settings(PLANNING_SERVER_TIMING=True, PLANNING_METRICS={'ENABLED': True})
+class TimingMiddlewareTests(SimpleTestCase):
+
+    def handle(self, view):
+        handler = RequestMetricsMiddleware(ServerTimingMiddleware(view))
+        return handler(RequestFactory().get('/stream/'))
+
+    def test_plain_response_reports_total(self):
+        with mock.patch.object(metrics.STAGE_LATENCY, 'observe') as stage:
+            response = self.handle(plain_view)
+        self.assertIn('build;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertEqual([call.kwargs['stage'] for call in stage.call_args_list], ['build'])
+
+    def test_streamed_response_is_timed_to_completion(self):
+        with mock.patch.object(metrics.REQUEST_LATENCY, 'observe') as latency, \
+                mock.patch.object(metrics.STAGE_LATENCY, 'observe') as stage:
+            response = self.handle(streamed_view)
+            # Headers only cover time to first byte; nothing is observed yet
+            self.assertIn('ttfb;dur=', response['Server-Timing'])
+            latency.assert_not_called()
+
+            self.assertEqual(b''.join(response.streaming_content), b'first\nsecond\n')
+            response.close()
+
+        latency.assert_called_once()
+        self.assertGreaterEqual(latency.call_args.args[0], STREAM_DELAY)
+        (seconds,), labels = stage.call_args
+        self.assertEqual(labels['stage'], 'stream')
+        self.assertGreaterEqual(seconds, STREAM_DELAY)
+
+    def test_closing_early_still_observes_once(self):
+        with mock.patch.object(metrics.REQUEST_LATENCY, 'observe') as latency, \
+                mock.patch.object(ServerTimingMiddleware, '_log') as log:
+            response = self.handle(streamed_view)
+            next(iter(response.streaming_content))
+            response.close()
+            response.close()
+        latency.assert_called_once()
+        log.assert_called_once()
+
+
+@override_settings(PLANNING_SERVER_TIMING=False, PLANNING_METRICS={'ENABLED': False})
+class TimingDisabledTests(TestCase):
+
+    def test_middleware_is_dropped(self):
+        for middleware in (ServerTimingMiddleware, RequestMetricsMiddleware):
+            with self.assertRaises(MiddlewareNotUsed):
+                middleware(plain_view)
+
+    def test_spans_are_shared_no_ops(self):
+        self.assertIs(span('build'), span('other'))
+        with mock.patch.object(timing, '_Span') as recorded:
+            response = self.client.post(
+                reverse('generate_plan'),
+                json.dumps({'plan_flattened_vertices': [0, 0, 0, 50, 0, 0, 50, 50, 0, 0, 50, 0]}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        recorded.assert_not_called()
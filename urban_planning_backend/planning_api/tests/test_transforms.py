@@ -0,0 +1,148 @@
+# planning_api/tests/test_transforms.py - Batch transform kernels against the scalar AddOn methods
+import math
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.curve_addon import CurveAddOn
+from planning_api.geometry.polyline_addon import PointContainment, PolylineAddOn
+from planning_api.geometry.transforms import (
+    PreparedPlanarCurve, fit_plane, planar_contains, plane_to_plane_matrix, project_onto_plane, rotate_vectors,
+    rotation_matrix, transform_coords,
+)
+from planning_api.geometry.utils import (
+    GeometryUtils, Plane, Point3D, Polyline, PolylineArray, Vector3D, points_in_polygon,
+)
+from planning_api.geometry.vector3d_addon import Vector3DAddOn
+
+L_SHAPE = np.array([[0, 0], [10, 0], [10, 4], [4, 4], [4, 10], [0, 10], [0, 0]], dtype=float)
+
+
+def as_array(points):
+    return np.array([(p.x, p.y, p.z) for p in points])
+
+
+class TransformKernelTests(SimpleTestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.points = self.rng.uniform(-10, 10, (50, 3))
+
+    def random_plane(self):
+        origin, normal = self.rng.uniform(-5, 5, 3), self.rng.normal(size=3)
+        return Plane(Point3D(*origin.tolist()), Vector3D(*normal.tolist()))
+
+    def test_transform_coords_matches_transform_point(self):
+        for _ in range(10):
+            matrix = np.eye(4)
+            matrix[:3, :] = self.rng.uniform(-2, 2, (3, 4))
+            expected = as_array(GeometryUtils.transform_point(Point3D(*p), matrix) for p in self.points.tolist())
+            np.testing.assert_allclose(transform_coords(self.points, matrix), expected, atol=1e-12)
+
+    def test_rotation_matrix_matches_vector_rotate(self):
+        for _ in range(10):
+            angle = float(self.rng.uniform(-math.pi, math.pi))
+            axis = Vector3D(*self.rng.normal(size=3).tolist())
+            expected = as_array(Vector3DAddOn.rotate(Vector3D(*v), angle, axis) for v in self.points.tolist())
+            np.testing.assert_allclose(rotate_vectors(self.points, angle, axis), expected, atol=1e-12)
+
+            # About a center: rotate the offset from the center, then move back
+            center = self.rng.uniform(-5, 5, 3)
+            offsets = as_array(Vector3DAddOn.rotate(Vector3D(*v), angle, axis) for v in (self.points - center).tolist())
+            np.testing.assert_allclose(transform_coords(self.points, rotation_matrix(angle, axis, center)),
+                                       offsets + center, atol=1e-12)
+
+        np.testing.assert_array_equal(rotation_matrix(1.0, (0, 0, 0)), np.eye(4))
+
+    def test_project_onto_plane_matches_closest_point(self):
+        for _ in range(10):
+            plane = self.random_plane()
+            expected = as_array(plane.closest_point(Point3D(*p)) for p in self.points.tolist())
+            np.testing.assert_allclose(project_onto_plane(self.points, plane), expected, atol=1e-12)
+
+    def test_plane_to_plane_matrix_maps_frames(self):
+        for _ in range(10):
+            source, target = self.random_plane(), self.random_plane()
+            matrix = plane_to_plane_matrix(source, target)
+            moved = GeometryUtils.transform_point(source.origin, matrix)
+            np.testing.assert_allclose(moved.as_tuple(), target.origin.as_tuple(), atol=1e-12)
+
+            # Points on the source plane land on the target plane, distances preserved
+            on_source = project_onto_plane(self.points, source)
+            on_target = transform_coords(on_source, matrix)
+            expected = as_array(target.closest_point(Point3D(*p)) for p in on_target.tolist())
+            np.testing.assert_allclose(on_target, expected, atol=1e-9)
+            np.testing.assert_allclose(np.linalg.norm(on_target - on_target[0], axis=1),
+                                       np.linalg.norm(on_source - on_source[0], axis=1), atol=1e-9)
+
+    def test_fit_plane(self):
+        plane = self.random_plane()
+        polygon = transform_coords(np.column_stack([L_SHAPE[:-1], np.zeros(6)]),
+                                   plane_to_plane_matrix(Plane.world_xy(), plane))
+        fitted = fit_plane(polygon)
+        self.assertAlmostEqual(abs(fitted.normal.dot(plane.normal)), 1.0)
+        expected = as_array(fitted.closest_point(Point3D(*p)) for p in polygon.tolist())
+        np.testing.assert_allclose(polygon, expected, atol=1e-9)
+
+        self.assertIsNone(fit_plane([[0, 0, 0], [1, 1, 1], [2, 2, 2]]))
+        self.assertIsNone(fit_plane([[0, 0, 0], [1, 0, 0]]))
+
+
+class PreparedPlanarCurveTests(SimpleTestCase):
+
+    def test_tilted_curve_matches_flat_queries(self):
+        rng = np.random.default_rng(1)
+        flat = np.column_stack([rng.uniform(-2, 12, (200, 2)), rng.uniform(-1, 1, 200)])
+        inside = points_in_polygon(flat[:, :2], L_SHAPE[:-1])
+        polyline = Polyline([Point3D(x, y, 0.0) for x, y in L_SHAPE.tolist()])
+
+        for _ in range(5):
+            # Carry the curve and the queries into a random plane together
+            plane = Plane(Point3D(*rng.uniform(-5, 5, 3).tolist()), Vector3D(*rng.normal(size=3).tolist()))
+            matrix = plane_to_plane_matrix(Plane.world_xy(), plane)
+            curve = transform_coords(np.column_stack([L_SHAPE, np.zeros(len(L_SHAPE))]), matrix)
+            queries = transform_coords(flat, matrix)
+
+            prepared = PreparedPlanarCurve(curve, plane)
+            self.assertTrue(prepared.is_closed)
+            expected = np.where(inside, PointContainment.INSIDE, PointContainment.OUTSIDE)
+            np.testing.assert_array_equal(prepared.contains_points(queries, 1e-9), expected)
+            self.assertEqual([prepared.contains(Point3D(*q), 1e-9) for q in queries[:20].tolist()],
+                             expected[:20].tolist())
+            self.assertEqual(prepared.contains(Point3D(*curve[1].tolist()), 1e-9), PointContainment.COINCIDENT)
+
+            for query, point in zip(queries[:20].tolist(), flat[:20].tolist()):
+                distance, parameter = prepared.closest_parameter(Point3D(*query))
+                expected_distance, expected_parameter = polyline.closest_parameter(Point3D(*point))
+                self.assertAlmostEqual(distance, expected_distance)
+                self.assertAlmostEqual(parameter, expected_parameter)
+
+    def test_fitted_plane_and_open_curve(self):
+        curve = np.column_stack([L_SHAPE, np.full(len(L_SHAPE), 3.0)])
+        prepared = PreparedPlanarCurve(curve)
+        self.assertEqual(prepared.contains(Point3D(2, 2, 0), 1e-9), PointContainment.INSIDE)
+        self.assertEqual(prepared.contains(Point3D(8, 8, 0), 1e-9), PointContainment.OUTSIDE)
+
+        opened = PreparedPlanarCurve(curve[:-1])
+        self.assertFalse(opened.is_closed)
+        self.assertEqual(opened.contains(Point3D(2, 2, 0), 1e-9), PointContainment.UNSET)
+
+    def test_uncached_curves_scan_like_prepared_curve(self):
+        rng = np.random.default_rng(2)
+        plane = Plane(Point3D(1, 2, 3), Vector3D(0.3, -0.2, 1.0))
+        matrix = plane_to_plane_matrix(Plane.world_xy(), plane)
+        curve = transform_coords(np.column_stack([L_SHAPE, np.zeros(len(L_SHAPE))]), matrix)
+        flat = np.vstack([np.column_stack([rng.uniform(-2, 12, (100, 2)), rng.uniform(-1, 1, 100)]),
+                          [[10, 2, 0.5], [4, 7, 0], [0, 0, 0]]])
+        queries = [Point3D(*q) for q in transform_coords(flat, matrix).tolist()]
+
+        polyline = Polyline([Point3D(*p) for p in curve.tolist()])
+        prepared = PreparedPlanarCurve(curve, plane)
+        expected = [prepared.contains(q, 1e-9) for q in queries]
+        self.assertIn(PointContainment.COINCIDENT, expected)
+        self.assertEqual([planar_contains(polyline, q, plane, 1e-9) for q in queries], expected)
+        self.assertEqual([planar_contains(curve.tolist(), q, None, 1e-9) for q in queries],
+                         [PreparedPlanarCurve(curve).contains(q, 1e-9) for q in queries])
+        self.assertEqual([CurveAddOn.contains(polyline, q, plane, 1e-9) for q in queries],
+                         [CurveAddOn.contains(PolylineArray(curve), q, plane, 1e-9) for q in queries])
+        self.assertEqual([PolylineAddOn.contains(polyline, q, plane) for q in queries],
+                         [PolylineAddOn.contains(PolylineArray(curve), q, plane) for q in queries])
+        self.assertEqual(planar_contains(curve[:-1], queries[0], plane, 1e-9), PointContainment.UNSET)
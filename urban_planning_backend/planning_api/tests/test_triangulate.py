@@ -0,0 +1,71 @@
+# planning_api/tests/test_triangulate.py - Ear clipping against polygon area and containment
+import numpy as np
+from django.test import SimpleTestCase
+from planning_api.geometry.sweep import has_self_intersection
+from planning_api.geometry.triangulate import triangulate_polygon
+from planning_api.geometry.utils import points_in_polygon, signed_area
+from planning_api.tests.shapes import star
+
+
+def triangle_areas(triangles):
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    return 0.5 * ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+
+
+class TriangulatePolygonTests(SimpleTestCase):
+
+    def test_triangles_tile_the_polygon(self):
+        rng = np.random.default_rng(0)
+        tested = 0
+        for trial in range(200):
+            polygon = star(rng, int(rng.integers(3, 60)), radius=1.0, inner=0.1)
+            if trial % 4 == 1:
+                polygon = np.round(polygon * 4) / 4
+            if trial % 2:
+                polygon = polygon[::-1]
+            area = signed_area(polygon)
+            if has_self_intersection(polygon) or abs(area) < 1e-3:
+                continue
+            if trial % 3 == 2:
+                repeated = int(rng.integers(len(polygon)))
+                polygon = np.insert(polygon, repeated, polygon[repeated], axis=0)
+            tested += 1
+
+            indices = triangulate_polygon(polygon)
+            self.assertLessEqual(len(indices), len(polygon) - 2)
+            triangles = polygon[indices]
+            areas = triangle_areas(triangles)
+            self.assertAlmostEqual(areas.sum(), area, delta=1e-9)
+            self.assertTrue(np.all(areas * np.sign(area) >= 0))
+            solid = np.abs(areas) > 1e-12
+            self.assertTrue(points_in_polygon(triangles[solid].mean(axis=1), polygon).all())
+        self.assertGreater(tested, 100)
+
+    def test_convex_polygon_gives_n_minus_two_triangles(self):
+        angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+        polygon = np.column_stack([np.cos(angles), np.sin(angles), np.zeros(12)])
+        self.assertEqual(triangulate_polygon(np.vstack([polygon, polygon[:1]])).shape, (10, 3))
+
+    def test_tilted_and_vertical_polygons(self):
+        roof = np.array([[0, 0, 0], [10, 0, 0], [10, 5, 5], [0, 5, 5]], dtype=float)
+        wall = np.array([[0, 0, 0], [0, 10, 0], [0, 10, 5], [0, 5, 8], [0, 0, 5]], dtype=float)
+        for polygon, expected in ((roof, 10 * np.sqrt(50)), (wall, 65.0)):
+            indices = triangulate_polygon(polygon)
+            self.assertEqual(len(indices), len(polygon) - 2)
+            a, b, c = polygon[indices].transpose(1, 0, 2)
+            self.assertAlmostEqual(0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum(), expected)
+
+    def test_degenerate_input(self):
+        self.assertEqual(triangulate_polygon([[0, 0, 0], [1, 0, 0]]).shape, (0, 3))
+        polygon = np.array([[0, 0], [1, 0], [1, 0], [2, 0], [2, 1], [0, 1]], dtype=float)
+        areas = triangle_areas(polygon[triangulate_polygon(polygon)])
+        self.assertAlmostEqual(areas.sum(), 2.0)
+        self.assertTrue(np.all(areas > 0))
+
+    def test_repeated_reflex_vertex(self):
+        polygon = np.array([[0, 0], [10, 0], [10, 10], [5, 2], [5, 2], [0, 10]], dtype=float)
+        indices = triangulate_polygon(polygon)
+        self.assertNotIn(4, indices)
+        areas = triangle_areas(polygon[indices])
+        self.assertAlmostEqual(areas.sum(), 60.0)
+        self.assertTrue(np.all(areas > 0))
@@ -0,0 +1,150 @@
+# planning_api/timing.py - Lightweight per-request stage timing
+import functools
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+_recorder = ContextVar('planning_timing_recorder', default=None)
+
+# Returned by span() when no recorder is active; reusable and allocation free
+_NULL_SPAN = nullcontext()
+
+
+class TimingRecorder:
+    """Accumulates span durations for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}  # name -> [total seconds, count], in first-seen order
+
+    def add(self, name, seconds):
+        entry = self.durations.get(name)
+        if entry is None:
+            self.durations[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        """Span durations in milliseconds"""
+        return {name: round(seconds * 1000.0, 3) for name, (seconds, _) in self.durations.items()}
+
+    def server_timing(self, final: bool = True):
+        """Format the spans plus the elapsed time as a Server-Timing header value
+
+        The elapsed time is reported as total, or as ttfb when the body is
+        still to come (streaming responses send headers first).
+        """
+        entries = [
+            f'{name};dur={seconds * 1000.0:.2f}' + (f';desc="x{count}"' if count > 1 else '')
+            for name, (seconds, count) in self.durations.items()
+        ]
+        entries.append(f'{"total" if final else "ttfb"};dur={self.total() * 1000.0:.2f}')
+        return ', '.join(entries)
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'started')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def span(name):
+    """Time a block under name when request timing is active
+
+    Span names appear in the Server-Timing header, so they must be tokens
+    (letters, digits, '_' or '-'). Repeated spans with the same name add up.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name)
+
+
+def timed(name):
+    """Decorator form of span()"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            with _Span(recorder, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_recorder():
+    """Return the active recorder, or None when timing is off"""
+    return _recorder.get()
+
+
+def start_recording():
+    """Activate a recorder in the current context, returning (recorder, reset token)"""
+    recorder = TimingRecorder()
+    return recorder, _recorder.set(recorder)
+
+
+def stop_recording(token):
+    _recorder.reset(token)
+
+
+class RecordedStream:
+    """Streaming response body that keeps a recorder active while it is iterated
+
+    Spans inside the body's generator are recorded, and on_finish runs once
+    when the body is exhausted or closed (the WSGI server closes every
+    response), so totals taken there cover the whole stream.
+    """
+
+    def __init__(self, content, recorder, on_finish):
+        self.content = content
+        self.recorder = recorder
+        self.on_finish = on_finish
+        self.finished = False
+
+    def __iter__(self):
+        iterator = iter(self.content)
+        end = object()
+        while True:
+            token = _recorder.set(self.recorder)
+            try:
+                chunk = next(iterator, end)
+            finally:
+                _recorder.reset(token)
+            if chunk is end:
+                break
+            yield chunk
+        self.close()
+
+    def close(self):
+        if self.finished:
+            return
+        self.finished = True
+        close = getattr(self.content, 'close', None)
+        if close is not None:
+            close()
+        self.on_finish()
+
+
+def record_stream(response, recorder, on_finish):
+    """Wrap a streaming response's body in a RecordedStream"""
+    response.streaming_content = RecordedStream(response.streaming_content, recorder, on_finish)
+
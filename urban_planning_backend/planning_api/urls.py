@@ -1,49 +1,63 @@
 # planning_api/urls.py - Complete updated URL configuration
+from importlib import import_module
 from django.urls import path, include
-from .views import GeneratePlanView, GeometryAnalysisView
-from .additional_views import (
-    GeometryValidationView,
-    PolygonOffsetView,
-    IntersectionTestView,
-    GeometryInfoView
-)
-from .enhanced_views import EnhancedGeneratePlanView
-from .clustering_views import (
-    ClusteringAnalysisView,
-    VoronoiGenerationView,
-    BuildingDistributionView,
-    GeometryProcessingView
-)
-from .algorithms_views import (
-    GraphAnalysisView,
-    IntervalAnalysisView,
-    MathematicsView,
-    UtilitiesView
-)
+
+
+def lazy_view(dotted_path):
+    """View that imports its APIView class on the first request
+
+    Keeps the view modules, and NumPy with them, out of URLconf loading.
+    """
+    module_name, class_name = dotted_path.rsplit('.', 1)
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = getattr(import_module(module_name, __package__), class_name).as_view()
+        return view(request, *args, **kwargs)
+
+    # APIView.as_view() is csrf_exempt, and CsrfViewMiddleware checks the
+    # callback before the first request has loaded the real view
+    dispatch.csrf_exempt = True
+    dispatch.__name__ = class_name
+    return dispatch
+
 
 urlpatterns = [
     # Main planning endpoints
-    path('planning/main/generateplan/', GeneratePlanView.as_view(), name='generate_plan'),
-    path('planning/main/enhanced_generateplan/', EnhancedGeneratePlanView.as_view(), name='enhanced_generate_plan'),
+    path('planning/main/generateplan/', lazy_view('.views.GeneratePlanView'), name='generate_plan'),
+    path('planning/main/enhanced_generateplan/', lazy_view('.enhanced_views.EnhancedGeneratePlanView'), name='enhanced_generate_plan'),
+    path('planning/main/enhanced_generateplan/stream/', lazy_view('.enhanced_views.EnhancedGeneratePlanStreamView'),
+         name='enhanced_generate_plan_stream'),
+    path('planning/main/batch_generateplan/', lazy_view('.batch_views.BatchGeneratePlanView'), name='batch_generate_plan'),
+    path('planning/main/sweep/', lazy_view('.sweep_views.PlanSweepView'), name='plan_sweep'),
+    
+    # Asynchronous job endpoints
+    path('planning/jobs/', lazy_view('.job_views.JobSubmitView'), name='job_submit'),
+    path('planning/jobs/<uuid:job_id>/', lazy_view('.job_views.JobDetailView'), name='job_detail'),
+    path('planning/jobs/<uuid:job_id>/cancel/', lazy_view('.job_views.JobCancelView'), name='job_cancel'),
+    path('planning/jobs/<uuid:job_id>/result/', lazy_view('.job_views.JobResultView'), name='job_result'),
     
     # Geometry analysis endpoints
-    path('planning/geometry/analyze/', GeometryAnalysisView.as_view(), name='geometry_analysis'),
-    path('planning/geometry/validate/', GeometryValidationView.as_view(), name='geometry_validation'),
-    path('planning/geometry/offset/', PolygonOffsetView.as_view(), name='polygon_offset'),
-    path('planning/geometry/intersection/', IntersectionTestView.as_view(), name='intersection_test'),
-    path('planning/geometry/info/', GeometryInfoView.as_view(), name='geometry_info'),
-    path('planning/geometry/process/', GeometryProcessingView.as_view(), name='geometry_processing'),
+    path('planning/geometry/analyze/', lazy_view('.views.GeometryAnalysisView'), name='geometry_analysis'),
+    path('planning/geometry/validate/', lazy_view('.additional_views.GeometryValidationView'), name='geometry_validation'),
+    path('planning/geometry/offset/', lazy_view('.additional_views.PolygonOffsetView'), name='polygon_offset'),
+    path('planning/geometry/intersection/', lazy_view('.additional_views.IntersectionTestView'), name='intersection_test'),
+    path('planning/geometry/info/', lazy_view('.additional_views.GeometryInfoView'), name='geometry_info'),
+    path('planning/metrics/', lazy_view('.additional_views.MetricsView'), name='metrics'),
+    path('planning/geometry/process/', lazy_view('.clustering_views.GeometryProcessingView'), name='geometry_processing'),
     
     # Enhanced clustering and distribution endpoints
-    path('planning/clustering/analyze/', ClusteringAnalysisView.as_view(), name='clustering_analysis'),
-    path('planning/clustering/voronoi/', VoronoiGenerationView.as_view(), name='voronoi_generation'),
-    path('planning/clustering/distribution/', BuildingDistributionView.as_view(), name='building_distribution'),
+    path('planning/clustering/analyze/', lazy_view('.clustering_views.ClusteringAnalysisView'), name='clustering_analysis'),
+    path('planning/clustering/voronoi/', lazy_view('.clustering_views.VoronoiGenerationView'), name='voronoi_generation'),
+    path('planning/clustering/distribution/', lazy_view('.clustering_views.BuildingDistributionView'), name='building_distribution'),
     
     # Algorithm endpoints (converted from C#)
-    path('planning/algorithms/graph/analysis/', GraphAnalysisView.as_view(), name='graph_analysis'),
-    path('planning/algorithms/intervals/analysis/', IntervalAnalysisView.as_view(), name='interval_analysis'),
-    path('planning/algorithms/mathematics/', MathematicsView.as_view(), name='mathematics'),
-    path('planning/algorithms/utilities/', UtilitiesView.as_view(), name='utilities'),
+    path('planning/algorithms/graph/analysis/', lazy_view('.algorithms_views.GraphAnalysisView'), name='graph_analysis'),
+    path('planning/algorithms/intervals/analysis/', lazy_view('.algorithms_views.IntervalAnalysisView'), name='interval_analysis'),
+    path('planning/algorithms/mathematics/', lazy_view('.algorithms_views.MathematicsView'), name='mathematics'),
+    path('planning/algorithms/utilities/', lazy_view('.algorithms_views.UtilitiesView'), name='utilities'),
     
     # Future algorithm endpoints (can be added as needed)
     # path('planning/algorithms/spatial/', SpatialAnalysisView.as_view(), name='spatial_analysis'),
@@ -2,10 +2,17 @@
 import logging
 import math
 import random
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from .serializers import GeneratePlanRequestSerializer, GeneratePlanResponseSerializer
+from .binary_transport import BinaryVertexParser, BinaryPlanRenderer
+from .plan_cache import cached_design
+from .timing import span, timed
 from .geometry import (
     Point3D, Polyline, CurveOperations, ParametricDesign, 
     BuildingPlacement, OffsetOperations, SurfaceOperations
@@ -24,7 +31,6 @@ class SiteParameters:
         self.building_style = 0
         self.radiant = 0.0
         self.site_area = 0.0
-        self.site_curve = None
         self.site_polyline = None
         self.site_bounds = None
         
@@ -34,6 +40,7 @@ class SiteParameters:
         self.use_grid_layout = False
         self.adaptive_orientation = True
         self.max_buildings = 50  # Increased from 8
+        self.seed = None
     
     def set_site_from_polyline(self, flattened_vertices):
         """Set site parameters from flattened vertices using geometry classes"""
@@ -51,8 +58,13 @@ class SiteParameters:
                 'min_y': min_point.y,
                 'max_y': max_point.y
             }
-            
-            self.site_curve = [{'x': p.x, 'y': p.y, 'z': p.z} for p in self.site_polyline.points]
+    
+    @property
+    def site_curve(self):
+        """Site boundary as {'x', 'y', 'z'} dicts, built on demand"""
+        if self.site_polyline is None:
+            return None
+        return [point.to_dict() for point in self.site_polyline.points]
 
     def update_dependent_parameters(self):
         """Update dependent parameters based on site type and other settings"""
@@ -113,6 +125,7 @@ class EnhancedGeometryProcessor:
     """Enhanced geometry processor with better building generation"""
     
     @staticmethod
+    @timed('site_parameters')
     def compute_parameters(flattened_vertices):
         """Create site parameters from flattened vertices"""
         site_params = SiteParameters()
@@ -131,63 +144,10 @@ class EnhancedGeometryProcessor:
             return EnhancedGeometryProcessor._get_default_response()
         
         try:
-            # Update dependent parameters
-            site_params.update_dependent_parameters()
-            
-            # Use parametric design to generate layout
-            design_result = ParametricDesign.apply_site_parameters(
-                site_params.site_polyline.points,
-                site_params.site_area,
-                site_params.density,
-                site_params.site_far,
-                site_params.mix_ratio,
-                site_params.building_style,
-                site_params.radiant,
-                site_params.max_buildings  # Pass max buildings limit
-            )
-            
-            response = {
-                'buildingLayersHeights': [],
-                'buildingLayersVertices': [],
-                'subSiteVertices': [],
-                'subSiteSetbackVertices': []
-            }
-            
-            # Generate buildings from parametric design
-            building_positions = design_result['building_positions']
-            building_width = design_result['building_width']
-            building_depth = design_result['building_depth']
-            floors_per_building = design_result['floors_per_building']
-            floor_height = design_result['floor_height']
-            
-            logger.info(f"Generated {len(building_positions)} buildings with width={building_width:.1f}, depth={building_depth:.1f}")
-            
-            # Create buildings using surface operations
-            for pos in building_positions:
-                building_vertices = SurfaceOperations.create_building_vertices_array(
-                    pos, building_width, building_depth, floors_per_building, floor_height
-                )
-                
-                heights = [floor_height] * floors_per_building
-                response['buildingLayersHeights'].append(heights)
-                response['buildingLayersVertices'].append(building_vertices)
+            design_result = EnhancedGeometryProcessor.compute_layout(site_params)
             
-            # Generate sub-site (original polygon)
-            site_vertices = []
-            for point in site_params.site_polyline.points:
-                site_vertices.extend([point.x, point.y, point.z])
-            response['subSiteVertices'].append(site_vertices)
-            
-            # Generate setback using offset operations
-            offset_polyline = OffsetOperations.offset_polygon(
-                site_params.site_polyline, site_params.setback_distance
-            )
-            
-            if offset_polyline:
-                setback_vertices = []
-                for point in offset_polyline.points:
-                    setback_vertices.extend([point.x, point.y, point.z + 0.2])
-                response['subSiteSetbackVertices'].append(setback_vertices)
+            response = EnhancedGeometryProcessor.compute_buildings(design_result)
+            response.update(EnhancedGeometryProcessor.compute_site_layers(site_params))
             
             return response
             
@@ -195,6 +155,84 @@ class EnhancedGeometryProcessor:
             logger.error(f"Error in parametric design generation: {str(e)}")
             return EnhancedGeometryProcessor._get_default_response()
     
+    @staticmethod
+    @timed('placement')
+    def compute_layout(site_params):
+        """Run parametric placement for a site"""
+        # Update dependent parameters
+        site_params.update_dependent_parameters()
+        
+        # Use parametric design to generate layout
+        return ParametricDesign.apply_site_parameters(
+            site_params.site_polyline.points,
+            site_params.site_area,
+            site_params.density,
+            site_params.site_far,
+            site_params.mix_ratio,
+            site_params.building_style,
+            site_params.radiant,
+            site_params.max_buildings,  # Pass max buildings limit
+            random.Random(site_params.seed)
+        )
+    
+    @staticmethod
+    @timed('building_vertices')
+    def compute_buildings(design_result):
+        """Create the building layers for a parametric layout"""
+        response = {
+            'buildingLayersHeights': [],
+            'buildingLayersVertices': []
+        }
+        
+        # Generate buildings from parametric design
+        building_positions = design_result['building_positions']
+        building_width = design_result['building_width']
+        building_depth = design_result['building_depth']
+        floors_per_building = design_result['floors_per_building']
+        floor_height = design_result['floor_height']
+        
+        logger.info(f"Generated {len(building_positions)} buildings with width={building_width:.1f}, depth={building_depth:.1f}")
+        
+        # Create buildings using surface operations
+        for pos in building_positions:
+            building_vertices = SurfaceOperations.create_building_vertices_array(
+                pos, building_width, building_depth, floors_per_building, floor_height
+            )
+            
+            heights = [floor_height] * floors_per_building
+            response['buildingLayersHeights'].append(heights)
+            response['buildingLayersVertices'].append(building_vertices)
+        
+        return response
+    
+    @staticmethod
+    @timed('site_layers')
+    def compute_site_layers(site_params):
+        """Create the site boundary and setback layers for a site"""
+        response = {
+            'subSiteVertices': [],
+            'subSiteSetbackVertices': []
+        }
+        
+        # Generate sub-site (original polygon)
+        site_vertices = []
+        for point in site_params.site_polyline.points:
+            site_vertices.extend([point.x, point.y, point.z])
+        response['subSiteVertices'].append(site_vertices)
+        
+        # Generate setback using offset operations
+        offset_polyline = OffsetOperations.offset_polygon(
+            site_params.site_polyline, site_params.setback_distance
+        )
+        
+        if offset_polyline:
+            setback_vertices = []
+            for point in offset_polyline.points:
+                setback_vertices.extend([point.x, point.y, point.z + 0.2])
+            response['subSiteSetbackVertices'].append(setback_vertices)
+        
+        return response
+    
     @staticmethod
     def _get_default_response():
         """Return a default response structure"""
@@ -226,12 +264,21 @@ class EnhancedGeometryProcessor:
 
 class GeneratePlanView(APIView):
     """Enhanced generate urban plan endpoint with better parameter handling"""
+    parser_classes = [JSONParser, BinaryVertexParser]
+    renderer_classes = [JSONRenderer, BinaryPlanRenderer]
+
+    @property
+    def validate_response(self):
+        """Re-validate generated plans, read per request so settings overrides apply"""
+        return getattr(settings, 'PLANNING_VALIDATE_RESPONSES', False)
     
     def post(self, request):
         try:
             # Validate input data
             serializer = GeneratePlanRequestSerializer(data=request.data)
-            if not serializer.is_valid():
+            with span('validate'):
+                is_valid = serializer.is_valid()
+            if not is_valid:
                 logger.error(f"Validation failed: {serializer.errors}")
                 return Response(
                     {'error': 'Invalid input data', 'details': serializer.errors}, 
@@ -254,12 +301,24 @@ class GeneratePlanView(APIView):
             
             logger.info(f"Final parameters: area={site_parameters.site_area:.2f}, FAR={site_parameters.site_far}, density={site_parameters.density}, site_type={site_parameters.site_type}, building_style={site_parameters.building_style}")
             
-            # Compute design using enhanced processor
-            design_result = EnhancedGeometryProcessor.compute_design(site_parameters_list)
+            # Compute design using enhanced processor, reusing cached layouts for repeated sites
+            design_result = cached_design(
+                'generateplan', flattened_vertices, plan_parameters_data, site_parameters,
+                lambda: EnhancedGeometryProcessor.compute_design(site_parameters_list),
+                lambda: EnhancedGeometryProcessor.compute_site_layers(site_parameters),
+                EnhancedGeometryProcessor._get_default_response
+            )
+            
+            # Internal results are trusted unless response validation is enabled
+            if not self.validate_response:
+                logger.info(f"Plan generation successful - {len(design_result['buildingLayersVertices'])} buildings generated")
+                return Response(design_result, status=status.HTTP_200_OK)
             
             # Serialize response
             response_serializer = GeneratePlanResponseSerializer(data=design_result)
-            if response_serializer.is_valid():
+            with span('validate_response'):
+                is_valid = response_serializer.is_valid()
+            if is_valid:
                 logger.info(f"Plan generation successful - {len(design_result['buildingLayersVertices'])} buildings generated")
                 return Response(response_serializer.validated_data, status=status.HTTP_200_OK)
             else:
@@ -269,6 +328,13 @@ class GeneratePlanView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             
+        except ParseError as e:
+            logger.error(f"Request parsing failed: {str(e)}")
+            return Response(
+                {'error': 'Invalid input data', 'details': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+            
         except Exception as e:
             logger.error(f"Error in GeneratePlan: {str(e)}", exc_info=True)
             return Response(
@@ -280,6 +346,7 @@ class GeneratePlanView(APIView):
         """Fill site parameters from request data - FIXED VERSION"""
         if not plan_params_data:
             logger.warning("No plan parameters provided, using defaults")
+            site_parameters.update_dependent_parameters()
             return
         
         logger.info(f"Processing plan parameters: {plan_params_data}")
@@ -338,6 +405,9 @@ class GeneratePlanView(APIView):
             else:
                 logger.warning(f"Invalid orientation: {orientation}")
 
+        # Setback and spacing must be final before site layers are built from the cache
+        site_parameters.update_dependent_parameters()
+
 
 class GeometryAnalysisView(APIView):
     """Enhanced geometry analysis endpoint"""
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'urban_planning_backend.settings')
 
 application = get_asgi_application()
+
+# Opt-in recovery of interrupted jobs, see PLANNING_JOB_RECOVER_ON_STARTUP
+from planning_api.jobs import start_recovery  # noqa: E402
+
+start_recovery()
@@ -22,6 +22,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'planning_api.middleware.RequestMetricsMiddleware',
+    'planning_api.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,6 +86,40 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Re-validate internally generated plan results with their response serializers
+PLANNING_VALIDATE_RESPONSES = False
+
+# Per-process cache of generated building layouts (see planning_api/plan_cache.py)
+PLANNING_RESULT_CACHE = {
+    'MAX_ENTRIES': 256,
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'TTL': 600,  # seconds
+}
+
+# Worker processes for batch plan generation (None uses all CPU cores)
+PLANNING_BATCH_WORKERS = None
+
+# Per-stage request timing as Server-Timing headers and log fields (see planning_api/timing.py)
+PLANNING_SERVER_TIMING = DEBUG
+
+# In-process metrics scraped from planning/metrics/ (see planning_api/metrics.py).
+# Off unless DEBUG; enable it where planning/metrics/ is scraped. Set
+# MULTIPROCESS_DIR to a directory shared by all worker processes to
+# aggregate metrics across them; empty it on each deploy.
+PLANNING_METRICS = {
+    'ENABLED': DEBUG,
+    'MULTIPROCESS_DIR': os.environ.get('PLANNING_METRICS_DIR'),
+    'FLUSH_INTERVAL': 1.0,  # seconds between snapshot writes per process
+}
+
+# Asynchronous job queue (see planning_api/jobs.py)
+PLANNING_JOB_WORKERS = 2
+PLANNING_JOB_CHUNK_SIZE = 100  # result items per stored chunk
+PLANNING_JOB_HEARTBEAT_TIMEOUT = 60  # seconds without a heartbeat before a running job counts as orphaned
+# Recover jobs when the WSGI/ASGI application loads (runserver, gunicorn workers).
+# Leave off with gunicorn --preload and run manage.py recover_jobs instead.
+PLANNING_JOB_RECOVER_ON_STARTUP = False
+
 # Logging
 LOGGING = {
     'version': 1,